@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Pattern Set - many regex rules matched in one pass over a file
+
+The rules are compiled into a single regex that the file is passed through
+once. An alternation of all active rules finds each offset where at least
+one of them matches; there, every active rule is tried again in its own
+lookahead with a named group, so rules do not hide each other. The regex
+engine still tries each active rule at every candidate offset, so the cost
+grows with the number of active rules; the literal prefilter below is what
+keeps that number small. Each rule
+reports the same non-overlapping matches as running it alone with
+re.finditer, e.g. a Bearer token inside an `auth_token = "..."` assignment
+is reported both as Token and as Bearer Token. Hits come in text order, and
+at the same offset in rule order.
+
+Each rule may name literals, one of which must occur in any text it can
+match (e.g. 'aiza' for Google API keys). Before any regex runs, the file is
+checked for those literals and only the rules that can match are compiled
+into the alternation (cached per combination), so most files skip most
+rules, and files without any literal skip the regex entirely.
+
+first_line(text, pattern) locates a single check's trigger for reports that
+only need a line number.
+
+Usage:
+    rules = PatternSet([(r'AIza[0-9A-Za-z_-]{35}', ['aiza'], 'Google API Key'), ...])
+    for hit in rules.finditer(text):
+        print(hit.line, hit.column, hit.rule, hit.text)
+"""
+
+import re
+from functools import lru_cache
+
+
+class Hit:
+    """One match: the rule's data, 1-based line/column and the matched text."""
+
+    __slots__ = ('rule', 'start', 'end', 'line', 'column', 'text')
+
+    def __init__(self, rule, start, end, line, column, text):
+        self.rule = rule
+        self.start = start
+        self.end = end
+        self.line = line
+        self.column = column
+        self.text = text
+
+    def __repr__(self):
+        return f"Hit({self.rule!r}, {self.line}:{self.column})"
+
+
+class PatternSet:
+    """Rules of (pattern, literals, data), matched together."""
+
+    def __init__(self, rules, flags=re.IGNORECASE):
+        self.flags = flags
+        self.patterns = []
+        self.literals = []
+        self.data = []
+        fold = bool(flags & re.IGNORECASE)
+        for pattern, literals, data in rules:
+            self.patterns.append(pattern)
+            self.literals.append(tuple(l.lower() for l in literals) if fold and literals else tuple(literals or ()))
+            self.data.append(data)
+        self.fold = fold
+        self._compile = lru_cache(maxsize=256)(self._build)
+
+    def __len__(self):
+        return len(self.patterns)
+
+    def _build(self, active):
+        # Stop only where some rule matches, then capture each rule that does in
+        # an optional lookahead group r<index>; the rule's own groups stay intact
+        anchor = '|'.join(f"(?:{self.patterns[i]})" for i in active)
+        probes = ''.join(f"(?:(?=(?P<r{i}>{self.patterns[i]})))?" for i in active)
+        return re.compile(f"(?={anchor}){probes}", self.flags)
+
+    def active(self, text):
+        """Indexes of the rules whose literal prefilter passes for text."""
+        haystack = text.lower() if self.fold else text
+        return tuple(i for i, literals in enumerate(self.literals)
+                     if not literals or any(l in haystack for l in literals))
+
+    def finditer(self, text):
+        """
+        Yield a Hit for every match of every rule, in text order; matches of
+        the same rule do not overlap, matches of different rules may.
+        """
+        active = self.active(text)
+        if not active:
+            return
+        groups = [(index, f"r{index}") for index in active]
+        # Per rule, where its last reported match ended (re.finditer semantics)
+        resume = dict.fromkeys(active, 0)
+        line, line_start, scanned = 1, 0, 0
+        for match in self._compile(active).finditer(text):
+            start = match.start()
+            newlines = text.count('\n', scanned, start)
+            if newlines:
+                line += newlines
+                line_start = text.rindex('\n', scanned, start) + 1
+            scanned = start
+            for index, group in groups:
+                end = match.end(group)
+                if end < 0 or start < resume[index]:
+                    continue
+                resume[index] = max(end, start + 1)
+                yield Hit(self.data[index], start, end, line, start - line_start + 1, text[start:end])
+
+
+def first_line(text, pattern, flags=re.IGNORECASE):
+    """1-based line of the first match of pattern in text, or None."""
+    match = re.search(pattern, text, flags)
+    return text.count('\n', 0, match.start()) + 1 if match else None
@@ -0,0 +1,477 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Project Scan - shared single-pass file walker for the .agent audit scripts
+
+The audit scripts (ux_audit, mobile_audit, security_scan, i18n_checker,
+type_coverage, seo_checker, geo_checker, accessibility_checker) register
+per-file checkers on a ProjectScanner instead of walking the tree
+themselves. The project is walked once with one ignore list, each file is
+read at most once, and its text is handed to every checker that wants it.
+
+Checker results are cached per file, keyed on (size, mtime) and on the
+checker's source, so an unchanged file is not read again on the next run.
+When only the mtime moved (checkout, rebase, touch), the file is read and
+its content hash decides whether the cached results still hold. Results
+must therefore be JSON-serializable.
+
+Incremental mode (since=<git revision>): git lists the files that differ
+from the revision (committed, staged, unstaged or untracked) and the blob
+id of every other file at that revision. Files git reports as unchanged
+whose cached blob id matches are reused without a stat comparison or a
+read, so only the changed files are checked again; their results are
+merged with the cached ones as usual. Without git the scan falls back to
+the normal cache.
+
+Ignore list: IGNORE_DIRS (dependency, VCS and build output folders) plus
+the entries of a `.agentignore` file in the project root, one per line:
+a bare name ignores that folder anywhere, a path ignores it relative to
+the root; shell wildcards are allowed.
+
+Walk order is sorted (directories and file names, per directory), so a
+checker's `limit` samples the first N matching files in that order. This
+is deterministic but is not the order the scripts' former rglob/glob/os.walk
+loops used (filesystem order, one extension after another), so sampled
+reports such as accessibility_checker's 50 files can cover a different set
+than before.
+
+Checks can run across a process pool (run(workers=N)); results are merged
+in walk order either way, and can be streamed through on_result as they
+arrive.
+
+Usage:
+    scanner = ProjectScanner(project_path, name='ux_audit')
+    scanner.register('ux', check_file, extensions={'.tsx', '.html'})
+    for scan_file, result in scanner.run(workers=4)['ux']:
+        ...
+
+    scanner = ProjectScanner(project_path, name='ux_audit', since='origin/main')
+
+    python project_scan.py <project_path>          # walk statistics
+    python project_scan.py <project_path> --since HEAD  # files changed since HEAD
+    python project_scan.py <project_path> --clear  # drop cached results
+"""
+
+import argparse
+import fnmatch
+import hashlib
+import inspect
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path, PurePosixPath
+
+# ============ CONFIGURATION ============
+IGNORE_DIRS = {
+    # VCS / editors
+    '.git', '.hg', '.svn', '.idea', '.vscode',
+    # Dependencies and virtualenvs
+    'node_modules', 'bower_components', '.venv', 'venv', '.tox', '.nox',
+    'Pods', '.pub-cache', '.symlinks',
+    # Build output and tool caches
+    'dist', 'build', '.next', '.nuxt', '.svelte-kit', '.dart_tool', '.gradle',
+    'ephemeral', 'DerivedData', 'coverage', '__pycache__', '.pytest_cache',
+    '.mypy_cache', '.ruff_cache', '.cache',
+}
+IGNORE_FILE = '.agentignore'
+
+CACHE_DIR = Path(__file__).parent / ".cache"
+CACHE_VERSION = 2
+
+
+def load_ignore_patterns(root):
+    """Entries of <root>/.agentignore, without comments and blank lines."""
+    try:
+        with open(Path(root) / IGNORE_FILE, 'r', encoding='utf-8') as f:
+            lines = [line.strip() for line in f]
+    except OSError:
+        return []
+    return [line.strip('/') for line in lines if line and not line.startswith('#')]
+
+
+def is_ignored(rel_dir, name, patterns):
+    """True when directory `name` at `rel_dir` (posix, relative) matches an ignore pattern."""
+    rel = f"{rel_dir}/{name}" if rel_dir else name
+    for pattern in patterns:
+        target = rel if '/' in pattern else name
+        if fnmatch.fnmatchcase(target, pattern):
+            return True
+    return False
+
+
+def content_hash(data):
+    """Git blob id of raw file content (what `git hash-object` prints)."""
+    return hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()
+
+
+def git_changes(root, since):
+    """
+    Ask git what changed under root since revision `since`. Returns
+    (blobs, changed): {rel path: blob id at `since`} for tracked files, and
+    the set of rel paths that differ from it now (including untracked
+    files). None when root is not in a git work tree or `since` is unknown.
+    """
+    def git(*args):
+        return subprocess.run(['git', '-C', str(root), *args], capture_output=True,
+                              text=True, encoding='utf-8', check=True).stdout
+
+    try:
+        listing = git('ls-tree', '-r', '-z', since, '--', '.')
+        diff = git('diff', '--name-only', '-z', '--relative', since, '--')
+        untracked = git('ls-files', '--others', '--exclude-standard', '-z')
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+    blobs = {}
+    for record in listing.split('\0'):
+        meta, _, rel = record.partition('\t')
+        fields = meta.split()
+        if len(fields) == 3 and fields[1] == 'blob':
+            blobs[rel] = fields[2]
+    changed = {rel for rel in (diff + untracked).split('\0') if rel}
+    return blobs, changed
+
+
+def pop_option(argv, flag):
+    """
+    (argv without `flag VALUE`, VALUE or None), for the scripts that read
+    sys.argv by hand; a flag without a value yields ''.
+    """
+    if flag not in argv:
+        return list(argv), None
+    i = argv.index(flag)
+    value = argv[i + 1] if i + 1 < len(argv) and not argv[i + 1].startswith('--') else ''
+    return list(argv[:i]) + list(argv[i + 1 + bool(value):]), value
+
+
+class ScanFile:
+    """One project file. `text` is read on first access and then shared by all checkers."""
+
+    __slots__ = ('path', 'rel', 'name', 'suffix', 'parts', 'size', 'mtime_ns', '_text', '_hash')
+
+    def __init__(self, path, rel, stat):
+        self.path = path
+        self.rel = rel
+        self.name = path.name
+        self.suffix = path.suffix.lower()
+        self.parts = PurePosixPath(rel).parts[:-1]
+        self.size = stat.st_size
+        self.mtime_ns = stat.st_mtime_ns
+        self._text = None
+        self._hash = None
+
+    def _read(self):
+        with open(self.path, 'rb') as f:
+            data = f.read()
+        self._hash = content_hash(data)
+        # Same text as open(..., 'r', errors='replace'): universal newlines
+        self._text = data.decode('utf-8', errors='replace').replace('\r\n', '\n').replace('\r', '\n')
+
+    @property
+    def text(self):
+        if self._text is None:
+            self._read()
+        return self._text
+
+    @property
+    def hash(self):
+        """Content hash (git blob id); reads the file if it was not read yet."""
+        if self._hash is None:
+            self._read()
+        return self._hash
+
+    def __fspath__(self):
+        return str(self.path)
+
+    def __repr__(self):
+        return f"ScanFile({self.rel!r})"
+
+
+class Checker:
+    """A registered per-file check and the files it applies to."""
+
+    def __init__(self, name, fn, extensions=None, accept=None, skip_dirs=(), limit=None, version=None):
+        self.name = name
+        self.fn = fn
+        self.extensions = {e.lower() for e in extensions} if extensions else None
+        self.accept = accept
+        self.skip_dirs = set(skip_dirs)
+        self.limit = limit
+        self.version = version or _source_version(fn)
+        self.matched = 0
+
+    def wants(self, scan_file):
+        if self.extensions is not None and scan_file.suffix not in self.extensions:
+            return False
+        if self.skip_dirs and not self.skip_dirs.isdisjoint(scan_file.parts):
+            return False
+        return self.accept is None or bool(self.accept(scan_file))
+
+
+def _source_version(fn):
+    """Hash of the checker's qualified name and its module's source file."""
+    digest = hashlib.sha1(f"{fn.__module__}.{getattr(fn, '__qualname__', fn)}".encode('utf-8'))
+    try:
+        with open(inspect.getsourcefile(fn), 'rb') as f:
+            digest.update(f.read())
+    except (TypeError, OSError):
+        pass
+    return digest.hexdigest()[:16]
+
+
+def _run_checks(job):
+    """Read one file and apply checker functions to it (runs in pool workers)."""
+    scan_file, fns = job
+    try:
+        scan_file.text
+    except OSError:
+        return None
+    try:
+        return scan_file.hash, [fn(scan_file) for fn in fns]
+    finally:
+        scan_file._text = None
+
+
+class ProjectScanner:
+    """Walks a project once and runs every registered checker over each file."""
+
+    def __init__(self, root, name='scan', use_cache=True, cache_dir=CACHE_DIR, ignore_dirs=IGNORE_DIRS,
+                 since=None):
+        self.root = Path(root).resolve()
+        self.name = name
+        self.use_cache = use_cache
+        self.since = since
+        self.ignore_dirs = set(ignore_dirs)
+        self.ignore_patterns = load_ignore_patterns(self.root)
+        root_key = hashlib.sha1(str(self.root).encode('utf-8')).hexdigest()[:16]
+        self.cache_path = Path(cache_dir) / f"{name}-{root_key}.json"
+        self.checkers = []
+        self.stats = {'files': 0, 'read': 0, 'cached': 0, 'errors': 0, 'changed': None}
+
+    def register(self, name, fn, extensions=None, accept=None, skip_dirs=(), limit=None, version=None):
+        """
+        Add a checker. fn(scan_file) returns a JSON-serializable result for
+        every file with a matching extension, outside skip_dirs, for which
+        accept(scan_file) is true; at most `limit` files are checked, the
+        first ones in sorted walk order.
+        """
+        self.checkers.append(Checker(name, fn, extensions, accept, skip_dirs, limit, version))
+        return self
+
+    # -- walk ---------------------------------------------------------------
+
+    def walk(self):
+        """Yield every non-ignored file once, in a stable (sorted) order."""
+        for dirpath, dirs, files in os.walk(self.root):
+            rel_dir = os.path.relpath(dirpath, self.root).replace(os.sep, '/')
+            rel_dir = '' if rel_dir == '.' else rel_dir
+            dirs[:] = sorted(d for d in dirs if d not in self.ignore_dirs
+                             and not is_ignored(rel_dir, d, self.ignore_patterns))
+            for file_name in sorted(files):
+                path = Path(dirpath) / file_name
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                rel = f"{rel_dir}/{file_name}" if rel_dir else file_name
+                yield ScanFile(path, rel, stat)
+
+    # -- cache --------------------------------------------------------------
+
+    def _load_cache(self):
+        if not self.use_cache:
+            return {}
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return data.get('files', {}) if data.get('version') == CACHE_VERSION else {}
+
+    def _save_cache(self, entries):
+        if not self.use_cache:
+            return
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.cache_path.with_name(f"{self.cache_path.name}.{os.getpid()}.tmp")
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': CACHE_VERSION, 'root': str(self.root), 'files': entries}, f)
+            os.replace(tmp_path, self.cache_path)
+        except OSError:
+            if tmp_path.exists():
+                tmp_path.unlink()
+
+    def clear_cache(self):
+        if self.cache_path.exists():
+            self.cache_path.unlink()
+
+    # -- run ----------------------------------------------------------------
+
+    def run(self, workers=None, on_result=None):
+        """
+        Walk the project and apply the checkers. Returns
+        {checker name: [(scan_file, result), ...]} in walk order.
+
+        With workers > 1 (0: one per CPU) files are checked across a process
+        pool; checker functions must then be module-level so they pickle.
+        Results are still merged in walk order, so the output does not
+        depend on scheduling. on_result(name, scan_file, result) is called
+        for each result as soon as it is available, in that same order.
+        """
+        cache = self._load_cache()
+        seen = {}
+        blobs, changed = {}, None
+        if self.since:
+            git_state = git_changes(self.root, self.since)
+            if git_state is None:
+                print(f"[project-scan] git revision {self.since!r} unavailable; using the file cache",
+                      file=sys.stderr)
+            else:
+                blobs, changed = git_state
+                self.stats['changed'] = len(changed)
+        results = {checker.name: [] for checker in self.checkers}
+        for checker in self.checkers:
+            checker.matched = 0
+
+        # Plan: per file, the checkers to apply and their cached results
+        plan = []
+        jobs = []
+        for scan_file in self.walk():
+            self.stats['files'] += 1
+            wanted = []
+            for checker in self.checkers:
+                if checker.wants(scan_file):
+                    checker.matched += 1
+                    if checker.limit is None or checker.matched <= checker.limit:
+                        wanted.append(checker)
+
+            rel = scan_file.rel
+            entry = cache.get(rel)
+            if entry and changed is not None and rel not in changed and rel in blobs \
+                    and entry.get('blob') == blobs[rel]:
+                # git: same content as at `since`, which is what the results were computed from
+                entry.update(size=scan_file.size, mtime_ns=scan_file.mtime_ns)
+            elif not entry or entry.get('size') != scan_file.size or entry.get('mtime_ns') != scan_file.mtime_ns:
+                if not wanted:
+                    continue
+                entry = self._revalidate(scan_file, entry)
+            if changed is not None and rel not in changed and rel in blobs:
+                entry['blob'] = blobs[rel]
+            # Unchanged files keep the results of checkers not run this time
+            seen[scan_file.rel] = entry
+            if not wanted:
+                continue
+
+            stored = entry['results']
+            pending = [c for c in wanted if (stored.get(c.name) or [None])[0] != c.version]
+            plan.append((scan_file, stored, wanted, pending))
+            if pending:
+                jobs.append((scan_file, tuple(c.fn for c in pending)))
+
+        computed = self._compute(jobs, workers)
+        for scan_file, stored, wanted, pending in plan:
+            outputs = []
+            if pending:
+                outputs = next(computed)
+            if outputs is None:
+                self.stats['errors'] += 1
+            elif pending:
+                self.stats['read'] += 1
+                file_hash, outputs = outputs
+                seen[scan_file.rel]['hash'] = file_hash
+                for checker, result in zip(pending, outputs):
+                    stored[checker.name] = [checker.version, result]
+            for checker in wanted:
+                if checker in pending and outputs is None:
+                    continue
+                if checker not in pending:
+                    self.stats['cached'] += 1
+                result = stored[checker.name][1]
+                results[checker.name].append((scan_file, result))
+                if on_result:
+                    on_result(checker.name, scan_file, result)
+
+        # Entries of deleted or now-ignored files are dropped here
+        self._save_cache(seen)
+        return results
+
+    def _revalidate(self, scan_file, entry):
+        """
+        Entry for a file whose size or mtime changed: the cached results are
+        kept when the content hash still matches, dropped otherwise.
+        """
+        fresh = {'size': scan_file.size, 'mtime_ns': scan_file.mtime_ns, 'results': {}}
+        if not entry or entry.get('size') != scan_file.size or not entry.get('hash'):
+            return fresh
+        try:
+            same = scan_file.hash == entry['hash']
+        except OSError:
+            return fresh
+        # Checks (possibly in another process) read the file again if needed
+        scan_file._text = None
+        if not same:
+            return fresh
+        entry.update(size=scan_file.size, mtime_ns=scan_file.mtime_ns)
+        return entry
+
+    @staticmethod
+    def _compute(jobs, workers):
+        """Yield each job's checker outputs (None if unreadable), in job order."""
+        if workers == 0:
+            workers = os.cpu_count() or 1
+        if not workers or workers < 2 or len(jobs) < 2:
+            yield from map(_run_checks, jobs)
+            return
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            yield from pool.map(_run_checks, jobs, chunksize=max(1, len(jobs) // (workers * 8)))
+
+    def matched(self, name):
+        """How many files checker `name` matched, including any beyond its limit."""
+        return next(c.matched for c in self.checkers if c.name == name)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Walk a project with the shared .agent ignore list")
+    parser.add_argument('project_path', nargs='?', default='.')
+    parser.add_argument('--clear', action='store_true', help="Delete every cached scan result")
+    parser.add_argument('--since', metavar='REV', help="List the files git reports changed since REV")
+    args = parser.parse_args()
+
+    if args.clear:
+        removed = 0
+        for path in CACHE_DIR.glob('*.json'):
+            path.unlink()
+            removed += 1
+        print(f"Removed {removed} cache file(s) from {CACHE_DIR}")
+        return 0
+
+    scanner = ProjectScanner(args.project_path, use_cache=False)
+    if args.since:
+        git_state = git_changes(scanner.root, args.since)
+        if git_state is None:
+            print(f"Not a git work tree, or unknown revision: {args.since}")
+            return 1
+        for rel in sorted(git_state[1]):
+            print(rel)
+        return 0
+
+    by_suffix = {}
+    total = 0
+    for scan_file in scanner.walk():
+        total += scan_file.size
+        count, size = by_suffix.get(scan_file.suffix, (0, 0))
+        by_suffix[scan_file.suffix] = (count + 1, size + scan_file.size)
+
+    print(f"Project: {scanner.root}")
+    if scanner.ignore_patterns:
+        print(f"{IGNORE_FILE}: {', '.join(scanner.ignore_patterns)}")
+    print(f"{sum(c for c, _ in by_suffix.values())} files, {total / 1048576:.1f} MB")
+    for suffix, (count, size) in sorted(by_suffix.items(), key=lambda kv: -kv[1][1])[:15]:
+        print(f"  {suffix or '(none)':<12} {count:>6} files {size / 1048576:>9.2f} MB")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Run History - timing, reporter parsing and trend history for the .agent runners
+
+lint_runner and test_runner use this to:
+  - time each tool they shell out to (wall clock and child CPU seconds),
+  - read machine-readable reports (JUnit XML, Jest/Vitest JSON) instead of
+    scraping counts from console text,
+  - append every run to a per-project history file and flag tools, test
+    files and tests that got slower than their recent median.
+
+History lives in .history/<runner>-<project hash>.jsonl next to this
+script, one JSON record per run, trimmed to the last MAX_RUNS runs. Test
+timings below MIN_RECORDED_SECONDS are not stored; a test with no history
+is flagged only when it exceeds the runner's absolute threshold.
+
+Usage:
+    proc, timing = timed_run(cmd, cwd, timeout=120)
+    history = RunHistory('test_runner', project_path)
+    slow = history.flag_slow('files', {path: seconds, ...}, absolute=5.0)
+    history.append({'wall': timing['wall'], 'timings': {'files': {...}}})
+
+    python run_history.py <runner> <project_path>   # recent runs, newest last
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+import xml.etree.ElementTree as ET
+from datetime import datetime
+from pathlib import Path
+
+# ============ CONFIGURATION ============
+HISTORY_DIR = Path(__file__).parent / ".history"
+MAX_RUNS = 50
+BASELINE_RUNS = 10          # runs the median baseline is taken over
+SLOW_FACTOR = 1.5           # flag when this much slower than the baseline...
+MIN_SLOW_DELTA = 0.5        # ...and at least this many seconds slower
+MIN_RECORDED_SECONDS = 0.01
+
+
+def timed_run(cmd, cwd, timeout):
+    """
+    subprocess.run with captured text output. Returns (proc, timing) where
+    timing is {'wall': seconds, 'cpu': child user+system seconds}; CPU is
+    None on Windows, where child times are not reported.
+    """
+    before = os.times()
+    start = time.perf_counter()
+    proc = subprocess.run(cmd, cwd=str(cwd), capture_output=True, text=True,
+                          encoding='utf-8', errors='replace', timeout=timeout)
+    wall = time.perf_counter() - start
+    after = os.times()
+    cpu = None
+    if os.name != 'nt':
+        cpu = (after.children_user - before.children_user) + (after.children_system - before.children_system)
+        cpu = round(cpu, 3)
+    return proc, {'wall': round(wall, 3), 'cpu': cpu}
+
+
+# ============ REPORT PARSERS ============
+
+def parse_junit(path):
+    """
+    Test cases of a JUnit XML report as [{id, file, seconds, status, message}],
+    status being passed, failed or skipped.
+    """
+    cases = []
+    for case in ET.parse(path).getroot().iter('testcase'):
+        status, message = 'passed', ''
+        for child in case:
+            if child.tag in ('failure', 'error'):
+                # The body holds the full output (traceback, or every mypy diagnostic)
+                status, message = 'failed', child.text or child.get('message') or ''
+                break
+            if child.tag == 'skipped':
+                status = 'skipped'
+        classname = case.get('classname') or ''
+        name = case.get('name') or ''
+        cases.append({
+            'id': f"{classname}::{name}" if classname else name,
+            'file': case.get('file') or classname,
+            'seconds': float(case.get('time') or 0),
+            'status': status,
+            'message': message,
+        })
+    return cases
+
+
+def parse_jest_json(path):
+    """Test cases of a Jest (or Vitest --reporter=json) result file, as parse_junit."""
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    cases = []
+    for suite in data.get('testResults', []):
+        file = suite.get('name') or suite.get('testFilePath') or ''
+        for assertion in suite.get('assertionResults', []):
+            status = assertion.get('status')
+            cases.append({
+                'id': f"{file}::{assertion.get('fullName') or assertion.get('title')}",
+                'file': file,
+                'seconds': (assertion.get('duration') or 0) / 1000,
+                'status': status if status in ('passed', 'failed') else 'skipped',
+                'message': '\n'.join(assertion.get('failureMessages') or [])[:500],
+            })
+    return cases
+
+
+def file_seconds(cases):
+    """Summed test time per file."""
+    files = {}
+    for case in cases:
+        files[case['file']] = files.get(case['file'], 0) + case['seconds']
+    return {file: round(seconds, 3) for file, seconds in files.items()}
+
+
+def slowest(timings, n=10):
+    """The n largest {key: seconds} entries, slowest first."""
+    return [{'name': k, 'seconds': v} for k, v in sorted(timings.items(), key=lambda kv: -kv[1])[:n]]
+
+
+# ============ HISTORY ============
+
+def _git_head(cwd):
+    try:
+        return subprocess.run(['git', '-C', str(cwd), 'rev-parse', '--short', 'HEAD'],
+                              capture_output=True, text=True, check=True).stdout.strip() or None
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class RunHistory:
+    """Past runs of one runner on one project."""
+
+    def __init__(self, name, project_path, history_dir=HISTORY_DIR):
+        self.project = Path(project_path).resolve()
+        self.name = name
+        root_key = hashlib.sha1(str(self.project).encode('utf-8')).hexdigest()[:16]
+        self.path = Path(history_dir) / f"{name}-{root_key}.jsonl"
+        self._runs = None
+
+    def runs(self):
+        """Recorded runs, oldest first; unreadable lines are skipped."""
+        if self._runs is None:
+            self._runs = []
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        try:
+                            self._runs.append(json.loads(line))
+                        except ValueError:
+                            continue
+            except OSError:
+                pass
+        return self._runs
+
+    def baseline(self, kind):
+        """{key: median seconds} for timings of `kind` over the last BASELINE_RUNS runs."""
+        samples = {}
+        for run in self.runs()[-BASELINE_RUNS:]:
+            for key, seconds in run.get('timings', {}).get(kind, {}).items():
+                samples.setdefault(key, []).append(seconds)
+        return {key: statistics.median(values) for key, values in samples.items()}
+
+    def flag_slow(self, kind, timings, absolute=None):
+        """
+        Entries of {key: seconds} that regressed against the baseline
+        (SLOW_FACTOR slower and MIN_SLOW_DELTA seconds more), or, with no
+        baseline, that exceed `absolute`. Sorted by seconds, slowest first.
+        """
+        baseline = self.baseline(kind)
+        flagged = []
+        for key, seconds in timings.items():
+            base = baseline.get(key)
+            if base is not None:
+                if seconds > base * SLOW_FACTOR and seconds - base >= MIN_SLOW_DELTA:
+                    flagged.append({'name': key, 'seconds': seconds, 'baseline': round(base, 3),
+                                    'ratio': round(seconds / base, 2) if base else None})
+            elif absolute is not None and seconds > absolute:
+                flagged.append({'name': key, 'seconds': seconds, 'baseline': None, 'ratio': None})
+        return sorted(flagged, key=lambda f: -f['seconds'])
+
+    def append(self, record):
+        """Store a run (timestamp and git revision are added) and trim old runs."""
+        record = {'timestamp': datetime.now().isoformat(timespec='seconds'),
+                  'revision': _git_head(self.project), **record}
+        for kind, timings in record.get('timings', {}).items():
+            record['timings'][kind] = {k: round(v, 3) for k, v in timings.items()
+                                       if v >= MIN_RECORDED_SECONDS}
+        runs = self.runs() + [record]
+        self._runs = runs[-MAX_RUNS:]
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                for run in self._runs:
+                    f.write(json.dumps(run, ensure_ascii=False) + "\n")
+            os.replace(tmp_path, self.path)
+        except OSError:
+            if tmp_path.exists():
+                tmp_path.unlink()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Show the recorded runs of an .agent runner")
+    parser.add_argument('runner', help="lint_runner or test_runner")
+    parser.add_argument('project_path', nargs='?', default='.')
+    parser.add_argument('--last', type=int, default=20, help="Number of runs to show")
+    args = parser.parse_args()
+
+    history = RunHistory(args.runner, args.project_path)
+    runs = history.runs()[-args.last:]
+    if not runs:
+        print(f"No history for {args.runner} in {history.project}")
+        return 0
+
+    print(f"{args.runner}: {history.project}")
+    print(f"{'time':<20} {'rev':<10} {'wall s':>8} {'cpu s':>8}  status")
+    for run in runs:
+        cpu = run.get('cpu')
+        print(f"{run.get('timestamp', '?'):<20} {run.get('revision') or '-':<10} "
+              f"{run.get('wall', 0):>8.2f} {cpu if cpu is not None else '-':>8}  "
+              f"{'PASS' if run.get('passed') else 'FAIL'}")
+
+    # Slowest entries of the latest run, against the runs before it
+    latest = runs[-1]
+    for kind, timings in latest.get('timings', {}).items():
+        if timings:
+            top = ', '.join(f"{e['name']} {e['seconds']:.2f}s" for e in slowest(timings, 3))
+            print(f"  slowest {kind}: {top}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
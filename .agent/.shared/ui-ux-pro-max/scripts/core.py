@@ -2,13 +2,24 @@
 # -*- coding: utf-8 -*-
 """
 UI/UX Pro Max Core - BM25 search engine for UI/UX style guides
+
+Each CSV is indexed once (postings + document norms) and the index is
+cached in memory and on disk under scripts/.cache, invalidated by
+mtime/size and content hash.
 """
 
 import csv
+import hashlib
+import heapq
+import json
+import os
+import pickle
 import re
+import threading
 from pathlib import Path
 from math import log
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 
 # ============ CONFIGURATION ============
 DATA_DIR = Path(__file__).parent.parent / "data"
@@ -97,66 +108,170 @@ AVAILABLE_STACKS = list(STACK_CONFIG.keys())
 
 
 # ============ BM25 IMPLEMENTATION ============
+_TOKEN_RE = re.compile(r'[^\w\s]')
+
+
+def tokenize(text):
+    """Lowercase, split, remove punctuation, filter short words"""
+    text = _TOKEN_RE.sub(' ', str(text).lower())
+    return [w for w in text.split() if len(w) > 2]
+
+
 class BM25:
-    """BM25 ranking algorithm for text search"""
+    """
+    BM25 over an inverted index. fit() builds postings (term -> [(doc, tf)])
+    and per-document length norms once; score() then only walks the postings
+    of the query terms instead of re-counting every document.
+    """
 
     def __init__(self, k1=1.5, b=0.75):
         self.k1 = k1
         self.b = b
-        self.corpus = []
-        self.doc_lengths = []
+        self.postings = {}
+        self.norms = []
         self.avgdl = 0
         self.idf = {}
-        self.doc_freqs = defaultdict(int)
         self.N = 0
 
     def tokenize(self, text):
         """Lowercase, split, remove punctuation, filter short words"""
-        text = re.sub(r'[^\w\s]', ' ', str(text).lower())
-        return [w for w in text.split() if len(w) > 2]
+        return tokenize(text)
 
     def fit(self, documents):
         """Build BM25 index from documents"""
-        self.corpus = [self.tokenize(doc) for doc in documents]
-        self.N = len(self.corpus)
-        if self.N == 0:
-            return
-        self.doc_lengths = [len(doc) for doc in self.corpus]
-        self.avgdl = sum(self.doc_lengths) / self.N
-
-        for doc in self.corpus:
-            seen = set()
-            for word in doc:
-                if word not in seen:
-                    self.doc_freqs[word] += 1
-                    seen.add(word)
-
-        for word, freq in self.doc_freqs.items():
-            self.idf[word] = log((self.N - freq + 0.5) / (freq + 0.5) + 1)
-
-    def score(self, query):
-        """Score all documents against query"""
-        query_tokens = self.tokenize(query)
-        scores = []
-
-        for idx, doc in enumerate(self.corpus):
-            score = 0
-            doc_len = self.doc_lengths[idx]
+        postings = defaultdict(list)
+        doc_lengths = []
+        for idx, doc in enumerate(documents):
+            tokens = tokenize(doc)
+            doc_lengths.append(len(tokens))
             term_freqs = defaultdict(int)
-            for word in doc:
+            for word in tokens:
                 term_freqs[word] += 1
+            for word, tf in term_freqs.items():
+                postings[word].append((idx, tf))
 
-            for token in query_tokens:
-                if token in self.idf:
-                    tf = term_freqs[token]
-                    idf = self.idf[token]
-                    numerator = tf * (self.k1 + 1)
-                    denominator = tf + self.k1 * (1 - self.b + self.b * doc_len / self.avgdl)
-                    score += idf * numerator / denominator
-
-            scores.append((idx, score))
-
-        return sorted(scores, key=lambda x: x[1], reverse=True)
+        self.N = len(doc_lengths)
+        if self.N == 0:
+            return
+        self.avgdl = sum(doc_lengths) / self.N or 1
+        # k1 * (1 - b + b * |d| / avgdl), the length part of the denominator
+        self.norms = [self.k1 * (1 - self.b + self.b * dl / self.avgdl) for dl in doc_lengths]
+        self.postings = dict(postings)
+        self.idf = {word: log((self.N - len(plist) + 0.5) / (len(plist) + 0.5) + 1)
+                    for word, plist in self.postings.items()}
+
+    def score_tokens(self, query_tokens, top_k=None):
+        """[(idx, score)] for documents matching any token, best first."""
+        scores = defaultdict(float)
+        k1_plus_1 = self.k1 + 1
+        norms = self.norms
+        for token in query_tokens:
+            idf = self.idf.get(token)
+            if idf is None:
+                continue
+            for idx, tf in self.postings[token]:
+                scores[idx] += idf * tf * k1_plus_1 / (tf + norms[idx])
+
+        # Ties keep document order, as a stable sort by score would
+        key = lambda item: (item[1], -item[0])
+        if top_k is None:
+            return sorted(scores.items(), key=key, reverse=True)
+        return heapq.nlargest(top_k, scores.items(), key=key)
+
+    def score(self, query, top_k=None):
+        """Score documents against query (only documents with a matching term)"""
+        return self.score_tokens(tokenize(query), top_k)
+
+
+# ============ INDEX CACHE ============
+# Fitted indexes are kept per process and pickled per CSV under INDEX_DIR,
+# keyed on the search columns; a changed mtime/size triggers a content-hash
+# check and a refit only when the bytes actually changed.
+INDEX_DIR = Path(__file__).parent / ".cache"
+INDEX_VERSION = 1
+
+_INDEXES = {}
+_INDEX_LOCK = threading.Lock()
+
+
+class CsvIndex:
+    """Rows of one CSV plus the BM25 index over its search columns."""
+
+    def __init__(self, rows, bm25, stamp, digest):
+        self.rows = rows
+        self.bm25 = bm25
+        self.stamp = stamp
+        self.digest = digest
+
+    def top(self, query_tokens, output_cols, max_results):
+        results = []
+        for idx, score in self.bm25.score_tokens(query_tokens, max_results):
+            if score > 0:
+                row = self.rows[idx]
+                results.append({col: row.get(col, "") for col in output_cols if col in row})
+        return results
+
+
+def _index_path(filepath, search_cols):
+    key = hashlib.sha1(json.dumps([str(filepath.resolve()), search_cols, INDEX_VERSION]).encode()).hexdigest()[:12]
+    return INDEX_DIR / f"{filepath.stem}.{key}.idx"
+
+
+def _build_index(filepath, search_cols, stamp, digest):
+    data = _load_csv(filepath)
+    documents = [" ".join(str(row.get(col, "")) for col in search_cols) for row in data]
+    bm25 = BM25()
+    bm25.fit(documents)
+    return CsvIndex(data, bm25, stamp, digest)
+
+
+def load_index(filepath, search_cols):
+    """Fitted index for a CSV: from memory, then disk, else built and saved."""
+    filepath = Path(filepath)
+    stat = filepath.stat()
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    mem_key = (str(filepath), tuple(search_cols))
+
+    with _INDEX_LOCK:
+        index = _INDEXES.get(mem_key)
+        if index is not None and index.stamp == stamp:
+            return index
+
+        cache_path = _index_path(filepath, search_cols)
+        if index is None:
+            try:
+                with open(cache_path, 'rb') as f:
+                    index = pickle.load(f)
+            except (OSError, pickle.PickleError, EOFError, AttributeError):
+                index = None
+
+        if index is not None and index.stamp != stamp:
+            # Touched but maybe not edited: compare content before refitting
+            digest = hashlib.sha1(filepath.read_bytes()).hexdigest()
+            if digest == index.digest:
+                index.stamp = stamp
+                _save_index(cache_path, index)
+            else:
+                index = None
+
+        if index is None:
+            digest = hashlib.sha1(filepath.read_bytes()).hexdigest()
+            index = _build_index(filepath, search_cols, stamp, digest)
+            _save_index(cache_path, index)
+
+        _INDEXES[mem_key] = index
+        return index
+
+
+def _save_index(cache_path, index):
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(index, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass  # Read-only checkout: the in-memory index still serves this process
 
 
 # ============ SEARCH FUNCTIONS ============
@@ -171,24 +286,7 @@ def _search_csv(filepath, search_cols, output_cols, query, max_results):
     if not filepath.exists():
         return []
 
-    data = _load_csv(filepath)
-
-    # Build documents from search columns
-    documents = [" ".join(str(row.get(col, "")) for col in search_cols) for row in data]
-
-    # BM25 search
-    bm25 = BM25()
-    bm25.fit(documents)
-    ranked = bm25.score(query)
-
-    # Get top results with score > 0
-    results = []
-    for idx, score in ranked[:max_results]:
-        if score > 0:
-            row = data[idx]
-            results.append({col: row.get(col, "") for col in output_cols if col in row})
-
-    return results
+    return load_index(filepath, search_cols).top(tokenize(query), output_cols, max_results)
 
 
 def detect_domain(query):
@@ -236,6 +334,80 @@ def search(query, domain=None, max_results=MAX_RESULTS):
     }
 
 
+def search_many(requests, max_workers=None, warm=()):
+    """
+    Run many searches in one batch and return {domain: result}, each result
+    shaped like search()'s. `requests` is a list of (query, domain) or
+    (query, domain, max_results) tuples; a domain given twice keeps its last
+    request. Every CSV index involved (plus those named in `warm`) is loaded
+    once up front, identical queries are tokenized once, and the lookups
+    run on a thread pool.
+    """
+    jobs = {}
+    for request in requests:
+        query, domain = request[0], request[1] or detect_domain(request[0])
+        max_results = request[2] if len(request) > 2 else MAX_RESULTS
+        jobs[domain] = (query, max_results)
+
+    configs = {d: CSV_CONFIG.get(d, CSV_CONFIG["style"]) for d in set(jobs) | set(warm)}
+    tokens = {query: tokenize(query) for query, _ in jobs.values()}
+
+    def warm_up(domain):
+        filepath = DATA_DIR / configs[domain]["file"]
+        if filepath.exists():
+            load_index(filepath, configs[domain]["search_cols"])
+
+    def run(domain):
+        query, max_results = jobs[domain]
+        config = configs[domain]
+        filepath = DATA_DIR / config["file"]
+        if not filepath.exists():
+            return domain, {"error": f"File not found: {filepath}", "domain": domain}
+        results = load_index(filepath, config["search_cols"]).top(tokens[query], config["output_cols"], max_results)
+        return domain, {
+            "domain": domain,
+            "query": query,
+            "file": config["file"],
+            "count": len(results),
+            "results": results
+        }
+
+    pool = _search_pool(max_workers)
+    # Only indexes not yet in memory are worth a thread each
+    cold = [d for d in configs if not _is_warm(configs[d])]
+    if len(cold) > 1:
+        list(pool.map(warm_up, cold))
+    if len(jobs) > 1:
+        return dict(pool.map(run, jobs))
+    return dict(run(domain) for domain in jobs)
+
+
+_POOL = None
+_POOL_SIZE = None  # max_workers the current pool was created with (None: executor default)
+
+
+def _search_pool(max_workers=None):
+    """Process-wide executor, so batches do not pay for thread start-up."""
+    global _POOL, _POOL_SIZE
+    with _INDEX_LOCK:
+        if _POOL is None or (max_workers and max_workers != _POOL_SIZE):
+            if _POOL is not None:
+                # Already-submitted searches still finish; only the threads go away
+                _POOL.shutdown(wait=False)
+            _POOL = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="uiux-search")
+            _POOL_SIZE = max_workers
+        return _POOL
+
+
+def _is_warm(config):
+    filepath = DATA_DIR / config["file"]
+    index = _INDEXES.get((str(filepath), tuple(config["search_cols"])))
+    if index is None or not filepath.exists():
+        return False
+    stat = filepath.stat()
+    return index.stamp == (stat.st_mtime_ns, stat.st_size)
+
+
 def search_stack(query, stack, max_results=MAX_RESULTS):
     """Search stack-specific guidelines"""
     if stack not in STACK_CONFIG:
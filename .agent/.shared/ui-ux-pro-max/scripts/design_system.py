@@ -12,7 +12,7 @@ Usage:
 import csv
 import json
 from pathlib import Path
-from core import search, DATA_DIR
+from core import search_many, DATA_DIR
 
 
 # ============ CONFIGURATION ============
@@ -42,17 +42,22 @@ class DesignSystemGenerator:
         with open(filepath, 'r', encoding='utf-8') as f:
             return list(csv.DictReader(f))
 
-    def _multi_domain_search(self, query: str, style_priority: list = None) -> dict:
-        """Execute searches across multiple domains."""
-        results = {}
+    def _multi_domain_search(self, query: str, style_priority: list = None, prefetched: dict = None) -> dict:
+        """Execute searches across multiple domains in one batch (skipping prefetched ones)."""
+        results = dict(prefetched or {})
+        requests = []
         for domain, config in SEARCH_CONFIG.items():
+            if domain in results:
+                continue
             if domain == "style" and style_priority:
                 # For style, also search with priority keywords
                 priority_query = " ".join(style_priority[:2]) if style_priority else query
                 combined_query = f"{query} {priority_query}"
-                results[domain] = search(combined_query, domain, config["max_results"])
+                requests.append((combined_query, domain, config["max_results"]))
             else:
-                results[domain] = search(query, domain, config["max_results"])
+                requests.append((query, domain, config["max_results"]))
+        if requests:
+            results.update(search_many(requests))
         return results
 
     def _find_reasoning_rule(self, category: str) -> dict:
@@ -156,8 +161,13 @@ class DesignSystemGenerator:
 
     def generate(self, query: str, project_name: str = None) -> dict:
         """Generate complete design system recommendation."""
-        # Step 1: First search product to get category
-        product_result = search(query, "product", 1)
+        # Step 1: Search product (to get the category) together with every
+        # domain that does not depend on it; the style index is warmed too
+        prefetched = search_many(
+            [(query, domain, config["max_results"]) for domain, config in SEARCH_CONFIG.items() if domain != "style"],
+            warm=["style"],
+        )
+        product_result = prefetched["product"]
         product_results = product_result.get("results", [])
         category = "General"
         if product_results:
@@ -168,8 +178,7 @@ class DesignSystemGenerator:
         style_priority = reasoning.get("style_priority", [])
 
         # Step 3: Multi-domain search with style priority hints
-        search_results = self._multi_domain_search(query, style_priority)
-        search_results["product"] = product_result  # Reuse product search
+        search_results = self._multi_domain_search(query, style_priority, prefetched)
 
         # Step 4: Select best matches from each domain using priority
         style_results = self._extract_results(search_results.get("style", {}))
@@ -20,6 +20,10 @@ import re
 from pathlib import Path
 from datetime import datetime
 
+# Shared single-pass walker (.agent/.shared/project-scan)
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / ".shared" / "project-scan" / "scripts"))
+from project_scan import ProjectScanner
+
 # Fix Windows console encoding
 try:
     sys.stdout.reconfigure(encoding='utf-8', errors='replace')
@@ -27,26 +31,20 @@ except:
     pass
 
 
-def find_html_files(project_path: Path) -> list:
-    """Find all HTML/JSX/TSX files."""
-    patterns = ['**/*.html', '**/*.jsx', '**/*.tsx']
-    skip_dirs = {'node_modules', '.next', 'dist', 'build', '.git'}
-    
-    files = []
-    for pattern in patterns:
-        for f in project_path.glob(pattern):
-            if not any(skip in f.parts for skip in skip_dirs):
-                files.append(f)
-    
-    return files[:50]
+def scan_html_files(project_path: Path, use_cache: bool = True) -> list:
+    """Check the first 50 HTML/JSX/TSX files in sorted path order. Returns [(file, issues)]."""
+    scanner = ProjectScanner(project_path, name='accessibility_checker', use_cache=use_cache)
+    scanner.register('a11y', check_scan_file, extensions={'.html', '.jsx', '.tsx'}, limit=50)
+    return scanner.run()['a11y']
 
 
-def check_accessibility(file_path: Path) -> list:
+def check_accessibility(file_path: Path, content: str = None) -> list:
     """Check a single file for accessibility issues."""
     issues = []
     
     try:
-        content = file_path.read_text(encoding='utf-8', errors='ignore')
+        if content is None:
+            content = file_path.read_text(encoding='utf-8', errors='ignore')
         
         # Check for form inputs without labels
         inputs = re.findall(r'<input[^>]*>', content, re.IGNORECASE)
@@ -108,8 +106,13 @@ def check_accessibility(file_path: Path) -> list:
     return issues
 
 
+
+def check_scan_file(scan_file) -> list:
+    return check_accessibility(scan_file.path, scan_file.text)
+
 def main():
-    project_path = Path(sys.argv[1] if len(sys.argv) > 1 else ".").resolve()
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    project_path = Path(args[0] if args else ".").resolve()
     
     print(f"\n{'='*60}")
     print(f"[ACCESSIBILITY CHECKER] WCAG Compliance Audit")
@@ -118,8 +121,8 @@ def main():
     print(f"Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print("-"*60)
     
-    # Find HTML files
-    files = find_html_files(project_path)
+    # Find and check HTML files in one pass
+    files = scan_html_files(project_path, use_cache="--no-cache" not in sys.argv)
     print(f"Found {len(files)} HTML/JSX/TSX files")
     
     if not files:
@@ -137,8 +140,7 @@ def main():
     # Check each file
     all_issues = []
     
-    for f in files:
-        issues = check_accessibility(f)
+    for f, issues in files:
         if issues:
             all_issues.append({
                 "file": str(f.name),
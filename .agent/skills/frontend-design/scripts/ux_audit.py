@@ -95,20 +95,35 @@ import re
 import json
 from pathlib import Path
 
+# Shared single-pass walker (.agent/.shared/project-scan)
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / ".shared" / "project-scan" / "scripts"))
+from project_scan import ProjectScanner, pop_option
+from pattern_set import first_line
+
+EXTENSIONS = {'.tsx', '.jsx', '.html', '.vue', '.svelte', '.css'}
+
 class UXAuditor:
     def __init__(self):
         self.issues = []
         self.warnings = []
         self.passed_count = 0
         self.files_checked = 0
+        # Structured form of issues/warnings: file, line, severity, category, message
+        self.findings = []
+        self._filepath = None
+        self._content = ''
     
     def audit_file(self, filepath: str) -> None:
         try:
             with open(filepath, 'r', encoding='utf-8', errors='replace') as f:
                 content = f.read()
         except: return
-        
+        self.audit_content(content, filepath)
+
+    def audit_content(self, content: str, filepath: str) -> None:
         self.files_checked += 1
+        self._filepath = filepath
+        self._content = content
         filename = os.path.basename(filepath)
 
         # Pre-calculate common flags
@@ -120,20 +135,20 @@ class UXAuditor:
         # Hick's Law
         nav_items = len(re.findall(r'<NavLink|<Link|<a\s+href|nav-item', content, re.IGNORECASE))
         if nav_items > 7:
-            self.issues.append(f"[Hick's Law] {filename}: {nav_items} nav items (Max 7)")
+            self._issue(f"[Hick's Law] {filename}: {nav_items} nav items (Max 7)", r'<NavLink|<Link|<a\s+href|nav-item')
         
         # Fitts' Law
         if re.search(r'height:\s*([0-3]\d)px', content) or re.search(r'h-[1-9]\b|h-10\b', content):
-            self.warnings.append(f"[Fitts' Law] {filename}: Small targets (< 44px)")
+            self._warn(f"[Fitts' Law] {filename}: Small targets (< 44px)", r'height:\s*[0-3]\dpx|h-[1-9]\b|h-10\b')
         
         # Miller's Law
         form_fields = len(re.findall(r'<input|<select|<textarea', content, re.IGNORECASE))
         if form_fields > 7 and not re.search(r'step|wizard|stage', content, re.IGNORECASE):
-            self.warnings.append(f"[Miller's Law] {filename}: Complex form ({form_fields} fields)")
+            self._warn(f"[Miller's Law] {filename}: Complex form ({form_fields} fields)", r'<input|<select|<textarea')
             
         # Von Restorff
         if 'button' in content.lower() and not re.search(r'primary|bg-primary|Button.*primary|variant=["\']primary', content, re.IGNORECASE):
-            self.warnings.append(f"[Von Restorff] {filename}: No primary CTA")
+            self._warn(f"[Von Restorff] {filename}: No primary CTA", r'button')
 
         # Serial Position Effect - Important items at beginning/end
         if nav_items > 3:
@@ -142,7 +157,7 @@ class UXAuditor:
             if nav_content and len(nav_content) > 2:
                 last_item = nav_content[-1].lower() if nav_content else ''
                 if not any(x in last_item for x in ['contact', 'login', 'sign', 'get started', 'cta', 'button']):
-                    self.warnings.append(f"[Serial Position] {filename}: Last nav item may not be important. Place key actions at start/end.")
+                    self._warn(f"[Serial Position] {filename}: Last nav item may not be important. Place key actions at start/end.", r'<a\s+href[^>]*>[^<]+</a>')
 
         # --- 1.5 EMOTIONAL DESIGN (Don Norman) ---
 
@@ -155,7 +170,7 @@ class UXAuditor:
             has_visual_interest = has_gradient or has_animation
 
             if not has_visual_interest and not re.search(r'background:|bg-', content):
-                self.warnings.append(f"[Visceral] {filename}: Hero section lacks visual appeal. Consider gradients or subtle animations.")
+                self._warn(f"[Visceral] {filename}: Hero section lacks visual appeal. Consider gradients or subtle animations.", r'hero|<h1|banner')
 
         # Behavioral: Instant feedback and usability
         if 'onClick' in content or '@click' in content or 'onclick' in content:
@@ -163,12 +178,12 @@ class UXAuditor:
             has_state_change = re.search(r'setState|useState|disabled|loading', content)
 
             if not has_feedback and not has_state_change:
-                self.warnings.append(f"[Behavioral] {filename}: Interactive elements lack immediate feedback. Add hover/focus/disabled states.")
+                self._warn(f"[Behavioral] {filename}: Interactive elements lack immediate feedback. Add hover/focus/disabled states.", r'onClick|@click')
 
         # Reflective: Brand story, values, identity
         has_reflective = bool(re.search(r'about|story|mission|values|why we|our journey|testimonials', content, re.IGNORECASE))
         if has_long_text and not has_reflective:
-            self.warnings.append(f"[Reflective] {filename}: Long-form content without brand story/values. Add 'About' or 'Why We Exist' section.")
+            self._warn(f"[Reflective] {filename}: Long-form content without brand story/values. Add 'About' or 'Why We Exist' section.")
 
         # --- 1.6 TRUST BUILDING (Enhanced) ---
 
@@ -176,7 +191,7 @@ class UXAuditor:
         if has_form:
             security_signals = re.findall(r'ssl|secure|encrypt|lock|padlock|https', content, re.IGNORECASE)
             if len(security_signals) == 0 and not re.search(r'checkout|payment', content, re.IGNORECASE):
-                self.warnings.append(f"[Trust] {filename}: Form without security indicators. Add 'SSL Secure' or lock icon.")
+                self._warn(f"[Trust] {filename}: Form without security indicators. Add 'SSL Secure' or lock icon.", r'<form|<input|password|credit|card|payment')
 
         # Social proof elements
         social_proof = re.findall(r'review|testimonial|rating|star|trust|trusted by|customer|logo', content, re.IGNORECASE)
@@ -184,14 +199,14 @@ class UXAuditor:
             self.passed_count += 1
         else:
             if has_long_text:
-                self.warnings.append(f"[Trust] {filename}: No social proof detected. Consider adding testimonials, ratings, or 'Trusted by' logos.")
+                self._warn(f"[Trust] {filename}: No social proof detected. Consider adding testimonials, ratings, or 'Trusted by' logos.")
 
         # Authority indicators
         has_footer = bool(re.search(r'footer|<footer', content, re.IGNORECASE))
         if has_footer:
             authority = re.findall(r'certif|award|media|press|featured|as seen in', content, re.IGNORECASE)
             if len(authority) == 0:
-                self.warnings.append(f"[Trust] {filename}: Footer lacks authority signals. Add certifications, awards, or media mentions.")
+                self._warn(f"[Trust] {filename}: Footer lacks authority signals. Add certifications, awards, or media mentions.", r'<footer|footer')
 
         # --- 1.7 COGNITIVE LOAD MANAGEMENT ---
 
@@ -199,19 +214,19 @@ class UXAuditor:
         if complex_elements > 5:
             has_progressive = re.search(r'step|wizard|stage|accordion|collapsible|tab|more\.\.\.|advanced|show more', content, re.IGNORECASE)
             if not has_progressive:
-                self.warnings.append(f"[Cognitive Load] {filename}: Many form elements without progressive disclosure. Consider accordion, tabs, or 'Advanced' toggle.")
+                self._warn(f"[Cognitive Load] {filename}: Many form elements without progressive disclosure. Consider accordion, tabs, or 'Advanced' toggle.", r'<input|<select|<textarea|<option')
 
         # Visual noise check
         has_many_colors = len(re.findall(r'#[0-9a-fA-F]{3,6}|rgb|hsl', content)) > 15
         has_many_borders = len(re.findall(r'border:|border-', content)) > 10
         if has_many_colors and has_many_borders:
-            self.warnings.append(f"[Cognitive Load] {filename}: High visual noise detected. Many colors and borders increase cognitive load.")
+            self._warn(f"[Cognitive Load] {filename}: High visual noise detected. Many colors and borders increase cognitive load.")
 
         # Familiar patterns
         if has_form:
             has_standard_labels = bool(re.search(r'<label|placeholder|aria-label', content, re.IGNORECASE))
             if not has_standard_labels:
-                self.issues.append(f"[Cognitive Load] {filename}: Form inputs without labels. Use <label> for accessibility and clarity.")
+                self._issue(f"[Cognitive Load] {filename}: Form inputs without labels. Use <label> for accessibility and clarity.", r'<form|<input')
 
         # --- 1.8 PERSUASIVE DESIGN (Ethical) ---
 
@@ -220,26 +235,26 @@ class UXAuditor:
             has_defaults = bool(re.search(r'checked|selected|default|value=["\'].*["\']', content))
             radio_inputs = len(re.findall(r'type=["\']radio', content, re.IGNORECASE))
             if radio_inputs > 0 and not has_defaults:
-                self.warnings.append(f"[Persuasion] {filename}: Radio buttons without default selection. Pre-select recommended option.")
+                self._warn(f"[Persuasion] {filename}: Radio buttons without default selection. Pre-select recommended option.", r'type=["\']radio')
 
         # Anchoring (showing original price)
         if re.search(r'price|pricing|cost|\$\d+', content, re.IGNORECASE):
             has_anchor = bool(re.search(r'original|was|strike|del|save \d+%', content, re.IGNORECASE))
             if not has_anchor:
-                self.warnings.append(f"[Persuasion] {filename}: Prices without anchoring. Show original price to frame discount value.")
+                self._warn(f"[Persuasion] {filename}: Prices without anchoring. Show original price to frame discount value.", r'price|pricing|cost|\$\d+')
 
         # Social proof live indicators
         has_social = bool(re.search(r'join|subscriber|member|user', content, re.IGNORECASE))
         if has_social:
             has_count = bool(re.findall(r'\d+[+kmb]|\d+,\d+', content))
             if not has_count:
-                self.warnings.append(f"[Persuasion] {filename}: Social proof without specific numbers. Use 'Join 10,000+' format.")
+                self._warn(f"[Persuasion] {filename}: Social proof without specific numbers. Use 'Join 10,000+' format.", r'join|subscriber|member|user')
 
         # Progress indicators
         if has_form:
             has_progress = bool(re.search(r'progress|step \d+|complete|%|bar', content, re.IGNORECASE))
             if complex_elements > 5 and not has_progress:
-                self.warnings.append(f"[Persuasion] {filename}: Long form without progress indicator. Add progress bar or 'Step X of Y'.")
+                self._warn(f"[Persuasion] {filename}: Long form without progress indicator. Add progress bar or 'Step X of Y'.", r'<form|<input')
 
         # --- 2. TYPOGRAPHY SYSTEM (Complete Coverage) ---
 
@@ -262,17 +277,17 @@ class UXAuditor:
                 font_families.add(first_font.lower())
 
         if len(font_families) > 3:
-            self.issues.append(f"[Typography] {filename}: {len(font_families)} font families detected. Limit to 2-3 for cohesion.")
+            self._issue(f"[Typography] {filename}: {len(font_families)} font families detected. Limit to 2-3 for cohesion.", r'@font-face|fonts\.googleapis\.com|font-family:')
 
         # 2.2 Line Length - Character-based width
         if has_long_text and not re.search(r'max-w-(?:prose|[\[\\]?\d+ch[\]\\]?)|max-width:\s*\d+ch', content):
-            self.warnings.append(f"[Typography] {filename}: No line length constraint (45-75ch). Use max-w-prose or max-w-[65ch].")
+            self._warn(f"[Typography] {filename}: No line length constraint (45-75ch). Use max-w-prose or max-w-[65ch].")
 
         # 2.3 Line Height - Proper leading ratios
         # Check for text without proper line-height
         text_elements = len(re.findall(r'<p|<span|<div.*text|<h[1-6]', content, re.IGNORECASE))
         if text_elements > 0 and not re.search(r'leading-|line-height:', content):
-            self.warnings.append(f"[Typography] {filename}: Text elements found without line-height. Body: 1.4-1.6, Headings: 1.1-1.3")
+            self._warn(f"[Typography] {filename}: Text elements found without line-height. Body: 1.4-1.6, Headings: 1.1-1.3", r'<p|<span|<div.*text|<h[1-6]')
 
         # Check for heading-specific line height issues
         if re.search(r'<h[1-6]|text-(?:xl|2xl|3xl|4xl|5xl|6xl)', content, re.IGNORECASE):
@@ -280,18 +295,18 @@ class UXAuditor:
             line_heights = re.findall(r'(?:leading-|line-height:\s*)([\d.]+)', content)
             for lh in line_heights:
                 if float(lh) > 1.5:
-                    self.warnings.append(f"[Typography] {filename}: Heading has line-height {lh} (>1.3). Headings should be tighter (1.1-1.3).")
+                    self._warn(f"[Typography] {filename}: Heading has line-height {lh} (>1.3). Headings should be tighter (1.1-1.3).", rf'(?:leading-|line-height:\s*){re.escape(lh)}')
 
         # 2.4 Letter Spacing (Tracking)
         # Uppercase without tracking
         if re.search(r'uppercase|text-transform:\s*uppercase', content, re.IGNORECASE):
             if not re.search(r'tracking-|letter-spacing:', content):
-                self.warnings.append(f"[Typography] {filename}: Uppercase text without tracking. ALL CAPS needs +5-10% spacing.")
+                self._warn(f"[Typography] {filename}: Uppercase text without tracking. ALL CAPS needs +5-10% spacing.", r'uppercase')
 
         # Large text (display/hero) should have negative tracking
         if re.search(r'text-(?:4xl|5xl|6xl|7xl|8xl|9xl)|font-size:\s*[3-9]\dpx', content):
             if not re.search(r'tracking-tight|letter-spacing:\s*-[0-9]', content):
-                self.warnings.append(f"[Typography] {filename}: Large display text without tracking-tight. Big text needs -1% to -4% spacing.")
+                self._warn(f"[Typography] {filename}: Large display text without tracking-tight. Big text needs -1% to -4% spacing.", r'text-(?:4xl|5xl|6xl|7xl|8xl|9xl)|font-size:\s*[3-9]\dpx')
 
         # 2.5 Weight and Emphasis - Contrast levels
         # Check for adjacent weight levels (poor contrast)
@@ -311,17 +326,17 @@ class UXAuditor:
         for i in range(len(weight_values) - 1):
             diff = abs(weight_values[i] - weight_values[i+1])
             if diff == 100:
-                self.warnings.append(f"[Typography] {filename}: Adjacent font weights ({weight_values[i]}/{weight_values[i+1]}). Skip at least 2 levels for contrast.")
+                self._warn(f"[Typography] {filename}: Adjacent font weights ({weight_values[i]}/{weight_values[i+1]}). Skip at least 2 levels for contrast.")
 
         # Too many weight levels
         unique_weights = set(weight_values)
         if len(unique_weights) > 4:
-            self.warnings.append(f"[Typography] {filename}: {len(unique_weights)} font weights. Limit to 3-4 per page.")
+            self._warn(f"[Typography] {filename}: {len(unique_weights)} font weights. Limit to 3-4 per page.")
 
         # 2.6 Responsive Typography - Fluid sizing with clamp()
         has_font_sizes = bool(re.search(r'font-size:|text-(?:xs|sm|base|lg|xl|2xl)', content))
         if has_font_sizes and not re.search(r'clamp\(|responsive:', content):
-            self.warnings.append(f"[Typography] {filename}: Fixed font sizes without clamp(). Consider fluid typography: clamp(MIN, PREFERRED, MAX)")
+            self._warn(f"[Typography] {filename}: Fixed font sizes without clamp(). Consider fluid typography: clamp(MIN, PREFERRED, MAX)", r'font-size:|text-(?:xs|sm|base|lg|xl|2xl)')
 
         # 2.7 Hierarchy - Heading structure
         headings = re.findall(r'<(h[1-6])', content, re.IGNORECASE)
@@ -331,11 +346,11 @@ class UXAuditor:
                 curr = int(headings[i][1])
                 next_h = int(headings[i+1][1])
                 if next_h > curr + 1:
-                    self.warnings.append(f"[Typography] {filename}: Skipped heading level (h{curr} -> h{next_h}). Maintain sequential hierarchy.")
+                    self._warn(f"[Typography] {filename}: Skipped heading level (h{curr} -> h{next_h}). Maintain sequential hierarchy.", rf'<h{next_h}')
 
             # Check if h1 exists for main content
             if 'h1' not in [h.lower() for h in headings] and has_long_text:
-                self.warnings.append(f"[Typography] {filename}: No h1 found. Each page should have one primary heading.")
+                self._warn(f"[Typography] {filename}: No h1 found. Each page should have one primary heading.")
 
         # 2.8 Modular Scale - Consistent sizing
         # Extract font-size values
@@ -359,7 +374,7 @@ class UXAuditor:
             common_ratios = {1.067, 1.125, 1.2, 1.25, 1.333, 1.5, 1.618}
             for ratio in ratios[:3]:  # Check first 3 ratios
                 if not any(abs(ratio - cr) < 0.05 for cr in common_ratios):
-                    self.warnings.append(f"[Typography] {filename}: Font sizes may not follow modular scale (ratio: {ratio:.2f}). Consider consistent ratio like 1.25 (Major Third).")
+                    self._warn(f"[Typography] {filename}: Font sizes may not follow modular scale (ratio: {ratio:.2f}). Consider consistent ratio like 1.25 (Major Third).", r'font-size:\s*\d')
                     break
 
         # 2.9 Readability - Content chunking
@@ -368,37 +383,37 @@ class UXAuditor:
         for p in paragraphs:
             word_count = len(p.split())
             if word_count > 100:  # ~5-6 lines
-                self.warnings.append(f"[Typography] {filename}: Long paragraph detected ({word_count} words). Break into 3-4 line chunks for readability.")
+                self._warn(f"[Typography] {filename}: Long paragraph detected ({word_count} words). Break into 3-4 line chunks for readability.", re.escape(p[:80]))
 
         # Check for missing subheadings in long content
         if len(paragraphs) > 5:
             subheadings = len(re.findall(r'<h[2-6]', content, re.IGNORECASE))
             if subheadings == 0:
-                self.warnings.append(f"[Typography] {filename}: Long content without subheadings. Add h2/h3 to break up text.")
+                self._warn(f"[Typography] {filename}: Long content without subheadings. Add h2/h3 to break up text.")
 
         # --- 3. VISUAL EFFECTS (visual-effects.md) ---
         
         # Glassmorphism Check
         if 'backdrop-filter' in content or 'blur(' in content:
             if not re.search(r'background:\s*rgba|bg-opacity|bg-[a-z0-9]+\/\d+', content):
-                self.warnings.append(f"[Visual] {filename}: Blur used without semi-transparent background (Glassmorphism fail)")
+                self._warn(f"[Visual] {filename}: Blur used without semi-transparent background (Glassmorphism fail)", r'backdrop-filter|blur\(')
         
         # GPU Acceleration / Performance
         if re.search(r'@keyframes|transition:', content):
             expensive_props = re.findall(r'width|height|top|left|right|bottom|margin|padding', content)
             if expensive_props:
-                self.warnings.append(f"[Performance] {filename}: Animating expensive properties ({', '.join(set(expensive_props))}). Use transform/opacity where possible.")
+                self._warn(f"[Performance] {filename}: Animating expensive properties ({', '.join(set(expensive_props))}). Use transform/opacity where possible.", r'@keyframes|transition:')
             
             # Reduced Motion
             if not re.search(r'prefers-reduced-motion', content):
-                self.warnings.append(f"[Accessibility] {filename}: Animations found without prefers-reduced-motion check")
+                self._warn(f"[Accessibility] {filename}: Animations found without prefers-reduced-motion check", r'@keyframes|transition:')
 
         # Natural Shadows
         shadows = re.findall(r'box-shadow:\s*([^;]+)', content)
         for shadow in shadows:
             # Check if natural (Y > X) or multiple layers
             if ',' not in shadow and not re.search(r'\d+px\s+[1-9]\d*px', shadow): # Simple heuristic for Y-offset
-                 self.warnings.append(f"[Visual] {filename}: Simple/Unnatural shadow detected. Consider multiple layers or Y > X offset for realism.")
+                 self._warn(f"[Visual] {filename}: Simple/Unnatural shadow detected. Consider multiple layers or Y > X offset for realism.", re.escape(shadow))
 
         # --- 3.1 NEOMORPHISM CHECK ---
         # Check for neomorphism patterns (dual shadows with opposite directions)
@@ -408,7 +423,7 @@ class UXAuditor:
             if ',' in shadow and '-' in shadow:
                 # Check for inset pattern (pressed state)
                 if 'inset' in shadow:
-                    self.warnings.append(f"[Visual] {filename}: Neomorphism inset detected. Ensure adequate contrast for accessibility.")
+                    self._warn(f"[Visual] {filename}: Neomorphism inset detected. Ensure adequate contrast for accessibility.", re.escape(shadow))
 
         # --- 3.2 SHADOW HIERARCHY ---
         # Count shadow levels to check for elevation consistency
@@ -421,7 +436,7 @@ class UXAuditor:
                 # Check if there's variety in shadow opacities for different elevations
                 unique_opacities = len(set(shadow_opacities))
                 if unique_opacities < 2:
-                    self.warnings.append(f"[Visual] {filename}: All shadows at same opacity level. Vary shadow intensity for elevation hierarchy.")
+                    self._warn(f"[Visual] {filename}: All shadows at same opacity level. Vary shadow intensity for elevation hierarchy.")
 
         # --- 3.3 GRADIENT CHECKS ---
         # Check for gradient usage
@@ -430,11 +445,11 @@ class UXAuditor:
             # Warn about mesh/aurora gradients (can be overused)
             gradient_count = len(re.findall(r'gradient', content, re.IGNORECASE))
             if gradient_count > 5:
-                self.warnings.append(f"[Visual] {filename}: Many gradients detected ({gradient_count}). Ensure this serves purpose, not decoration.")
+                self._warn(f"[Visual] {filename}: Many gradients detected ({gradient_count}). Ensure this serves purpose, not decoration.")
         else:
             # Check if hero section exists without gradient
             if has_hero and not re.search(r'background:|bg-', content):
-                self.warnings.append(f"[Visual] {filename}: Hero section without visual interest. Consider gradient for depth.")
+                self._warn(f"[Visual] {filename}: Hero section without visual interest. Consider gradient for depth.", r'hero|<h1|banner')
 
         # --- 3.4 BORDER EFFECTS ---
         # Check for gradient borders or animated borders
@@ -443,7 +458,7 @@ class UXAuditor:
             # Check for overly complex borders
             border_count = len(re.findall(r'border:', content))
             if border_count > 8:
-                self.warnings.append(f"[Visual] {filename}: Many border declarations ({border_count}). Simplify for cleaner look.")
+                self._warn(f"[Visual] {filename}: Many border declarations ({border_count}). Simplify for cleaner look.")
 
         # --- 3.5 GLOW EFFECTS ---
         # Check for text-shadow or multiple box-shadow layers (glow effects)
@@ -451,12 +466,12 @@ class UXAuditor:
         for ts in text_shadows:
             # Multiple text-shadow layers indicate glow
             if ',' in ts:
-                self.warnings.append(f"[Visual] {filename}: Text glow effect detected. Ensure readability is maintained.")
+                self._warn(f"[Visual] {filename}: Text glow effect detected. Ensure readability is maintained.", r'text-shadow:')
 
         # Check for box-shadow glow (multiple layers with 0 offset)
         glow_shadows = re.findall(r'box-shadow:\s*[^;]*0\s+0\s+', content)
         if len(glow_shadows) > 2:
-            self.warnings.append(f"[Visual] {filename}: Multiple glow effects detected. Use sparingly for emphasis only.")
+            self._warn(f"[Visual] {filename}: Multiple glow effects detected. Use sparingly for emphasis only.")
 
         # --- 3.6 OVERLAY TECHNIQUES ---
         # Check for image overlays (for readability)
@@ -464,7 +479,7 @@ class UXAuditor:
         if has_images and has_long_text:
             has_overlay = bool(re.search(r'overlay|rgba\(0|gradient.*transparent|::after|::before', content))
             if not has_overlay:
-                self.warnings.append(f"[Visual] {filename}: Text over image without overlay. Add gradient overlay for readability.")
+                self._warn(f"[Visual] {filename}: Text over image without overlay. Add gradient overlay for readability.", r'<img|background-image:|bg-\[url')
 
         # --- 3.7 PERFORMANCE: will-change ---
         # Check for will-change usage
@@ -473,12 +488,12 @@ class UXAuditor:
             for prop in will_change_props:
                 prop = prop.strip().lower()
                 if prop in ['width', 'height', 'top', 'left', 'right', 'bottom', 'margin', 'padding']:
-                    self.issues.append(f"[Performance] {filename}: will-change on '{prop}' (layout property). Use only for transform/opacity.")
+                    self._issue(f"[Performance] {filename}: will-change on '{prop}' (layout property). Use only for transform/opacity.", rf'will-change:\s*{re.escape(prop)}')
 
         # Check for excessive will-change usage
         will_change_count = len(re.findall(r'will-change:', content))
         if will_change_count > 3:
-            self.warnings.append(f"[Performance] {filename}: Many will-change declarations ({will_change_count}). Use sparingly, only for heavy animations.")
+            self._warn(f"[Performance] {filename}: Many will-change declarations ({will_change_count}). Use sparingly, only for heavy animations.")
 
         # --- 3.8 EFFECT SELECTION ---
         # Check for effect overuse (too many visual effects)
@@ -489,11 +504,11 @@ class UXAuditor:
             len(re.findall(r'text-shadow:', content))
         )
         if effect_count > 10:
-            self.warnings.append(f"[Visual] {filename}: Many visual effects ({effect_count}). Ensure effects serve purpose, not decoration.")
+            self._warn(f"[Visual] {filename}: Many visual effects ({effect_count}). Ensure effects serve purpose, not decoration.")
 
         # Check for static/flat design (no depth)
         if has_long_text and effect_count == 0:
-            self.warnings.append(f"[Visual] {filename}: Flat design with no depth. Consider shadows or subtle gradients for hierarchy.")
+            self._warn(f"[Visual] {filename}: Flat design with no depth. Consider shadows or subtle gradients for hierarchy.")
 
         # --- 4. COLOR SYSTEM (color-system.md) ---
 
@@ -504,7 +519,7 @@ class UXAuditor:
                         'purple', 'violet', 'fuchsia', 'magenta', 'lavender']
         for purple in purple_hexes:
             if purple.lower() in content.lower():
-                self.issues.append(f"[Color] {filename}: PURPLE DETECTED ('{purple}'). Banned by Maestro rules. Use Teal/Cyan/Emerald instead.")
+                self._issue(f"[Color] {filename}: PURPLE DETECTED ('{purple}'). Banned by Maestro rules. Use Teal/Cyan/Emerald instead.", re.escape(purple))
                 break
 
         # 4.2 60-30-10 Rule check
@@ -520,7 +535,7 @@ class UXAuditor:
                 # Just warn if too many distinct colors
                 unique_hexes = set(re.findall(r'#[0-9a-fA-F]{6}', content))
                 if len(unique_hexes) > 5:
-                    self.warnings.append(f"[Color] {filename}: {len(unique_hexes)} distinct colors. Consider 60-30-10 rule: dominant (60%), secondary (30%), accent (10%).")
+                    self._warn(f"[Color] {filename}: {len(unique_hexes)} distinct colors. Consider 60-30-10 rule: dominant (60%), secondary (30%), accent (10%).")
 
         # 4.3 Color Scheme Pattern Detection
         # Detect monochromatic (same hue, different lightness)
@@ -529,34 +544,34 @@ class UXAuditor:
             hues = [int(h) for h in hsl_matches]
             hue_range = max(hues) - min(hues)
             if hue_range < 10:
-                self.warnings.append(f"[Color] {filename}: Monochromatic palette detected (hue variance: {hue_range}deg). Ensure adequate contrast.")
+                self._warn(f"[Color] {filename}: Monochromatic palette detected (hue variance: {hue_range}deg). Ensure adequate contrast.", r'hsl\(')
 
         # 4.4 Dark Mode Compliance
         # Check for pure black (#000000) or pure white (#FFFFFF) text (forbidden)
         if re.search(r'color:\s*#000000|#000\b', content):
-            self.warnings.append(f"[Color] {filename}: Pure black (#000000) detected. Use #1a1a1a or darker grays for better dark mode.")
+            self._warn(f"[Color] {filename}: Pure black (#000000) detected. Use #1a1a1a or darker grays for better dark mode.", r'color:\s*#000000|#000\b')
         if re.search(r'background:\s*#ffffff|#fff\b', content) and re.search(r'dark:\s*|dark:', content):
-            self.warnings.append(f"[Color] {filename}: Pure white background in dark mode context. Use slight off-white (#f9fafb) for reduced eye strain.")
+            self._warn(f"[Color] {filename}: Pure white background in dark mode context. Use slight off-white (#f9fafb) for reduced eye strain.", r'background:\s*#ffffff|#fff\b')
 
         # 4.5 WCAG Contrast Pattern Check
         # Look for potential low-contrast combinations
         light_bg_light_text = bool(re.search(r'bg-(?:gray|slate|zinc)-50|bg-white.*text-(?:gray|slate)-[12]', content))
         dark_bg_dark_text = bool(re.search(r'bg-(?:gray|slate|zinct)-9|bg-black.*text-(?:gray|slate)-[89]', content))
         if light_bg_light_text or dark_bg_dark_text:
-            self.warnings.append(f"[Color] {filename}: Possible low-contrast combination detected. Verify WCAG AA (4.5:1 for text).")
+            self._warn(f"[Color] {filename}: Possible low-contrast combination detected. Verify WCAG AA (4.5:1 for text).", r'bg-(?:gray|slate|zinc)-50|bg-white.*text-(?:gray|slate)-[12]|bg-(?:gray|slate|zinct)-9|bg-black.*text-(?:gray|slate)-[89]')
 
         # 4.6 Color Psychology Context Check
         # Warn if blue used for food/restaurant context
         has_blue = bool(re.search(r'bg-blue|text-blue|from-blue|#[0-9a-fA-F]*00[0-9A-Fa-f]{2}|#[0-9a-fA-F]*1[0-9A-Fa-f]{2}', content))
         has_food_context = bool(re.search(r'restaurant|food|cooking|recipe|menu|dish|meal', content, re.IGNORECASE))
         if has_blue and has_food_context:
-            self.warnings.append(f"[Color] {filename}: Blue color in food context. Blue suppresses appetite; consider warm colors (red, orange, yellow).")
+            self._warn(f"[Color] {filename}: Blue color in food context. Blue suppresses appetite; consider warm colors (red, orange, yellow).", r'bg-blue|text-blue|from-blue')
 
         # 4.7 HSL-Based Palette Detection
         # Check if using HSL for palette (recommended in color-system.md)
         has_color_vars = bool(re.search(r'--color-|color-|primary-|secondary-', content))
         if has_color_vars and not re.search(r'hsl\(', content):
-            self.warnings.append(f"[Color] {filename}: Color variables without HSL. Consider HSL for easier palette adjustment (Hue, Saturation, Lightness).")
+            self._warn(f"[Color] {filename}: Color variables without HSL. Consider HSL for easier palette adjustment (Hue, Saturation, Lightness).", r'--color-|color-|primary-|secondary-')
 
         # --- 5. ANIMATION GUIDE (animation-guide.md) ---
 
@@ -566,37 +581,37 @@ class UXAuditor:
         for duration, unit in durations:
             duration_ms = float(duration) * (1000 if unit == 's' else 1)
             if duration_ms < 50:
-                self.warnings.append(f"[Animation] {filename}: Very fast animation ({duration}{unit}). Minimum 50ms for visibility.")
+                self._warn(f"[Animation] {filename}: Very fast animation ({duration}{unit}). Minimum 50ms for visibility.", rf'(?:duration|animation-duration|transition-duration):\s*{re.escape(duration)}{unit}')
             elif duration_ms > 1000 and 'transition' in content.lower():
-                self.warnings.append(f"[Animation] {filename}: Long transition ({duration}{unit}). Transitions should be 100-300ms for responsiveness.")
+                self._warn(f"[Animation] {filename}: Long transition ({duration}{unit}). Transitions should be 100-300ms for responsiveness.", rf'(?:duration|animation-duration|transition-duration):\s*{re.escape(duration)}{unit}')
 
         # 5.2 Easing Function Correctness
         # Check for incorrect easing patterns
         if re.search(r'ease-in\s+.*entry|fade-in.*ease-in', content):
-            self.warnings.append(f"[Animation] {filename}: Entry animation with ease-in. Entry should use ease-out for snappy feel.")
+            self._warn(f"[Animation] {filename}: Entry animation with ease-in. Entry should use ease-out for snappy feel.", r'ease-in\s+.*entry|fade-in.*ease-in')
         if re.search(r'ease-out\s+.*exit|fade-out.*ease-out', content):
-            self.warnings.append(f"[Animation] {filename}: Exit animation with ease-out. Exit should use ease-in for natural feel.")
+            self._warn(f"[Animation] {filename}: Exit animation with ease-out. Exit should use ease-in for natural feel.", r'ease-out\s+.*exit|fade-out.*ease-out')
 
         # 5.3 Micro-interaction Feedback Patterns
         # Check for interactive elements without hover/focus states
         interactive_elements = len(re.findall(r'<button|<a\s+href|onClick|@click', content))
         has_hover_focus = bool(re.search(r'hover:|focus:|:hover|:focus', content))
         if interactive_elements > 2 and not has_hover_focus:
-            self.warnings.append(f"[Animation] {filename}: Interactive elements without hover/focus states. Add micro-interactions for feedback.")
+            self._warn(f"[Animation] {filename}: Interactive elements without hover/focus states. Add micro-interactions for feedback.", r'<button|<a\s+href|onClick|@click')
 
         # 5.4 Loading State Indicators
         # Check for loading patterns
         has_async = bool(re.search(r'async|await|fetch|axios|loading|isLoading', content))
         has_loading_indicator = bool(re.search(r'skeleton|spinner|progress|loading|<circle.*animate', content))
         if has_async and not has_loading_indicator:
-            self.warnings.append(f"[Animation] {filename}: Async operations without loading indicator. Add skeleton or spinner for perceived performance.")
+            self._warn(f"[Animation] {filename}: Async operations without loading indicator. Add skeleton or spinner for perceived performance.", r'async|await|fetch|axios')
 
         # 5.5 Page Transition Patterns
         # Check for page/view transitions
         has_routing = bool(re.search(r'router|navigate|Link.*to|useHistory', content))
         has_page_transition = bool(re.search(r'AnimatePresence|motion\.|transition.*page|fade.*route', content))
         if has_routing and not has_page_transition:
-            self.warnings.append(f"[Animation] {filename}: Routing detected without page transitions. Consider fade/slide for context continuity.")
+            self._warn(f"[Animation] {filename}: Routing detected without page transitions. Consider fade/slide for context continuity.", r'router|navigate|Link.*to|useHistory')
 
         # 5.6 Scroll Animation Performance
         # Check for scroll-driven animations
@@ -604,7 +619,7 @@ class UXAuditor:
         if has_scroll_anim:
             # Check if using expensive properties in scroll handlers
             if re.search(r'onScroll.*[^\w](width|height|top|left)', content):
-                self.issues.append(f"[Animation] {filename}: Scroll handler animating layout properties. Use transform/opacity for 60fps.")
+                self._issue(f"[Animation] {filename}: Scroll handler animating layout properties. Use transform/opacity for 60fps.", r'onScroll.*[^\w](width|height|top|left)')
 
         # --- 6. MOTION GRAPHICS (motion-graphics.md) ---
 
@@ -614,7 +629,7 @@ class UXAuditor:
             # Check for reduced motion fallback
             has_lottie_fallback = bool(re.search(r'prefers-reduced-motion.*lottie|lottie.*isPaused|lottie.*stop', content))
             if not has_lottie_fallback:
-                self.warnings.append(f"[Motion] {filename}: Lottie animation without reduced-motion fallback. Add pause/stop for accessibility.")
+                self._warn(f"[Motion] {filename}: Lottie animation without reduced-motion fallback. Add pause/stop for accessibility.", r'lottie')
 
         # 6.2 GSAP Memory Leak Risks
         has_gsap = bool(re.search(r'gsap|ScrollTrigger|from\(.*gsap', content))
@@ -622,12 +637,12 @@ class UXAuditor:
             # Check for cleanup patterns
             has_gsap_cleanup = bool(re.search(r'kill\(|revert\(|useEffect.*return.*gsap', content))
             if not has_gsap_cleanup:
-                self.issues.append(f"[Motion] {filename}: GSAP animation without cleanup (kill/revert). Memory leak risk on unmount.")
+                self._issue(f"[Motion] {filename}: GSAP animation without cleanup (kill/revert). Memory leak risk on unmount.", r'gsap|ScrollTrigger')
 
         # 6.3 SVG Animation Performance
         svg_animations = re.findall(r'<animate|<animateTransform|stroke-dasharray|stroke-dashoffset', content)
         if len(svg_animations) > 3:
-            self.warnings.append(f"[Motion] {filename}: Multiple SVG animations detected. Ensure stroke-dashoffset is used sparingly for mobile performance.")
+            self._warn(f"[Motion] {filename}: Multiple SVG animations detected. Ensure stroke-dashoffset is used sparingly for mobile performance.", r'<animate|stroke-dasharray|stroke-dashoffset')
 
         # 6.4 3D Transform Performance
         has_3d_transform = bool(re.search(r'transform3d|perspective\(|rotate3d|translate3d', content))
@@ -635,16 +650,16 @@ class UXAuditor:
             # Check for perspective on parent
             has_perspective_parent = bool(re.search(r'perspective:\s*\d+px|perspective\s*\(', content))
             if not has_perspective_parent:
-                self.warnings.append(f"[Motion] {filename}: 3D transform without perspective parent. Add perspective: 1000px for realistic depth.")
+                self._warn(f"[Motion] {filename}: 3D transform without perspective parent. Add perspective: 1000px for realistic depth.", r'transform3d|perspective\(|rotate3d|translate3d')
 
             # Warn about mobile performance
-            self.warnings.append(f"[Motion] {filename}: 3D transforms detected. Test on mobile; can impact performance on low-end devices.")
+            self._warn(f"[Motion] {filename}: 3D transforms detected. Test on mobile; can impact performance on low-end devices.", r'transform3d|perspective\(|rotate3d|translate3d')
 
         # 6.5 Particle Effect Warnings
         # Check for canvas/WebGL particle systems
         has_particles = bool(re.search(r'particle|canvas.*loop|requestAnimationFrame.*draw|Three\.js', content))
         if has_particles:
-            self.warnings.append(f"[Motion] {filename}: Particle effects detected. Ensure fallback or reduced-quality option for mobile devices.")
+            self._warn(f"[Motion] {filename}: Particle effects detected. Ensure fallback or reduced-quality option for mobile devices.", r'particle|canvas.*loop|requestAnimationFrame.*draw|Three\.js')
 
         # 6.6 Scroll-Driven Animation Performance
         has_scroll_driven = bool(re.search(r'IntersectionObserver.*animate|scroll.*progress|view-timeline', content))
@@ -652,7 +667,7 @@ class UXAuditor:
             # Check for throttling/debouncing
             has_throttle = bool(re.search(r'throttle|debounce|requestAnimationFrame', content))
             if not has_throttle:
-                self.issues.append(f"[Motion] {filename}: Scroll-driven animation without throttling. Add requestAnimationFrame for 60fps.")
+                self._issue(f"[Motion] {filename}: Scroll-driven animation without throttling. Add requestAnimationFrame for 60fps.", r'IntersectionObserver.*animate|scroll.*progress|view-timeline')
 
         # 6.7 Motion Decision Tree - Context Check
         # Check if animation serves purpose (not just decoration)
@@ -665,42 +680,102 @@ class UXAuditor:
             # Check if animations are functional
             functional_animations = len(re.findall(r'hover:|focus:|disabled|loading|error|success', content))
             if functional_animations < total_animations / 2:
-                self.warnings.append(f"[Motion] {filename}: Many animations ({total_animations}). Ensure majority serve functional purpose (feedback, guidance), not decoration.")
+                self._warn(f"[Motion] {filename}: Many animations ({total_animations}). Ensure majority serve functional purpose (feedback, guidance), not decoration.")
 
         # --- 7. ACCESSIBILITY ---
         if re.search(r'<img(?![^>]*alt=)[^>]*>', content):
-            self.issues.append(f"[Accessibility] {filename}: Missing img alt text")
-
-    def audit_directory(self, directory: str) -> None:
-        extensions = {'.tsx', '.jsx', '.html', '.vue', '.svelte', '.css'}
-        for root, dirs, files in os.walk(directory):
-            dirs[:] = [d for d in dirs if d not in {'node_modules', '.git', 'dist', 'build', '.next'}]
-            for file in files:
-                if Path(file).suffix in extensions:
-                    self.audit_file(os.path.join(root, file))
+            self._issue(f"[Accessibility] {filename}: Missing img alt text", r'<img(?![^>]*alt=)[^>]*>')
+
+    def _issue(self, message: str, anchor: str = None) -> None:
+        self.issues.append(message)
+        self._record('issue', message, anchor)
+
+    def _warn(self, message: str, anchor: str = None) -> None:
+        self.warnings.append(message)
+        self._record('warning', message, anchor)
+
+    def _record(self, severity: str, message: str, anchor: str = None) -> None:
+        """Add the structured finding; anchor locates the construct that triggered it."""
+        category, _, text = message.partition('] ')
+        text = text.partition(': ')[2]
+        self.findings.append({
+            "file": self._filepath,
+            "line": first_line(self._content, anchor) if anchor else None,
+            "severity": severity,
+            "category": category.lstrip('['),
+            "message": text,
+        })
+
+    def audit_directory(self, directory: str, use_cache: bool = True, workers: int = None, stream=None,
+                        since: str = None) -> None:
+        """
+        Audit every matching file under directory. workers > 1 (0: one per
+        CPU) audits files in parallel; findings are merged in path order
+        either way. With stream, each finding is written to it as a JSON line
+        as soon as its file is done. With since (a git revision), only files
+        changed since then are re-audited; the rest come from the cache.
+        """
+        scanner = ProjectScanner(directory, name='ux_audit', use_cache=use_cache, since=since)
+        scanner.register('ux', audit_scan_file, extensions=EXTENSIONS)
+        on_result = (lambda _, __, result: write_findings(stream, result)) if stream else None
+        for _, result in scanner.run(workers, on_result)['ux']:
+            self.merge(result)
+
+    def merge(self, report: dict) -> None:
+        """Fold a per-file report (see audit_scan_file) into this auditor."""
+        self.files_checked += report['files_checked']
+        self.issues.extend(report['issues'])
+        self.warnings.extend(report['warnings'])
+        self.findings.extend(report['findings'])
+        self.passed_count += report['passed_checks']
 
     def get_report(self):
         return {
             "files_checked": self.files_checked,
             "issues": self.issues,
             "warnings": self.warnings,
+            "findings": self.findings,
             "passed_checks": self.passed_count,
             "compliant": len(self.issues) == 0
         }
 
+def audit_scan_file(scan_file) -> dict:
+    """Audit one file with a fresh UXAuditor; returns its (cacheable) report."""
+    auditor = UXAuditor()
+    auditor.audit_content(scan_file.text, scan_file.rel)
+    return auditor.get_report()
+
+def write_findings(stream, report: dict) -> None:
+    """Write a report's findings as JSON lines and flush, for streaming consumers."""
+    for finding in report['findings']:
+        stream.write(json.dumps(finding) + "\n")
+    stream.flush()
+
 def main():
     if len(sys.argv) < 2: sys.exit(1)
     
     path = sys.argv[1]
     is_json = "--json" in sys.argv
+    is_jsonl = "--jsonl" in sys.argv
+    use_cache = "--no-cache" not in sys.argv
+    argv, since = pop_option(sys.argv[1:], "--since")
+    argv, workers = pop_option(argv, "--workers")
+    workers = None if workers is None else int(workers or 0)
     
     auditor = UXAuditor()
-    if os.path.isfile(path): auditor.audit_file(path)
-    else: auditor.audit_directory(path)
+    stream = sys.stdout if is_jsonl else None
+    if os.path.isfile(path):
+        auditor.audit_file(path)
+        if stream: write_findings(stream, auditor.get_report())
+    else: auditor.audit_directory(path, use_cache, workers, stream, since)
     
     report = auditor.get_report()
     
-    if is_json:
+    if is_jsonl:
+        summary = {k: v for k, v in report.items() if k not in ('issues', 'warnings', 'findings')}
+        summary.update(issues=len(report['issues']), warnings=len(report['warnings']))
+        print(json.dumps({"summary": summary}))
+    elif is_json:
         print(json.dumps(report))
     else:
         # Use ASCII-safe output for Windows console compatibility
@@ -21,6 +21,10 @@ import re
 import json
 from pathlib import Path
 
+# Shared single-pass walker (.agent/.shared/project-scan)
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / ".shared" / "project-scan" / "scripts"))
+from project_scan import ProjectScanner
+
 # Fix Windows console encoding
 try:
     sys.stdout.reconfigure(encoding='utf-8', errors='replace')
@@ -78,30 +82,24 @@ def is_page_file(file_path: Path) -> bool:
     return False
 
 
-def find_web_pages(project_path: Path) -> list:
-    """Find public-facing web pages only."""
-    patterns = ['**/*.html', '**/*.htm', '**/*.jsx', '**/*.tsx']
-    
-    files = []
-    for pattern in patterns:
-        for f in project_path.glob(pattern):
-            # Skip excluded directories
-            if any(skip in f.parts for skip in SKIP_DIRS):
-                continue
-            
-            # Check if it's likely a page
-            if is_page_file(f):
-                files.append(f)
-    
-    return files[:30]  # Limit to 30 pages
+PAGE_EXTENSIONS = {'.html', '.htm', '.jsx', '.tsx'}
+
+
+def scan_web_pages(project_path: Path, use_cache: bool = True) -> list:
+    """Check the first 30 public-facing pages in sorted path order. Returns [(file, check_page result)]."""
+    scanner = ProjectScanner(project_path, name='geo_checker', use_cache=use_cache)
+    scanner.register('geo', check_scan_file, extensions=PAGE_EXTENSIONS,
+                     accept=lambda f: is_page_file(f.path), skip_dirs=SKIP_DIRS, limit=30)
+    return scanner.run()['geo']
 
 
-def check_page(file_path: Path) -> dict:
+def check_page(file_path: Path, content: str = None) -> dict:
     """Check a single web page for GEO elements."""
-    try:
-        content = file_path.read_text(encoding='utf-8', errors='ignore')
-    except Exception as e:
-        return {'file': str(file_path.name), 'passed': [], 'issues': [f"Error: {e}"], 'score': 0}
+    if content is None:
+        try:
+            content = file_path.read_text(encoding='utf-8', errors='ignore')
+        except Exception as e:
+            return {'file': str(file_path.name), 'passed': [], 'issues': [f"Error: {e}"], 'score': 0}
     
     issues = []
     passed = []
@@ -219,8 +217,13 @@ def check_page(file_path: Path) -> dict:
     }
 
 
+
+def check_scan_file(scan_file) -> dict:
+    return check_page(scan_file.path, scan_file.text)
+
 def main():
-    target = sys.argv[1] if len(sys.argv) > 1 else "."
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    target = args[0] if args else "."
     target_path = Path(target).resolve()
     
     print("\n" + "=" * 60)
@@ -229,10 +232,10 @@ def main():
     print(f"Project: {target_path}")
     print("-" * 60)
     
-    # Find web pages only
-    pages = find_web_pages(target_path)
+    # Find and check web pages only, in one pass
+    results = [result for _, result in scan_web_pages(target_path, use_cache="--no-cache" not in sys.argv)]
     
-    if not pages:
+    if not results:
         print("\n[!] No public web pages found.")
         print("    Looking for: HTML, JSX, TSX files in pages/app directories")
         print("    Skipping: docs, tests, config files, node_modules")
@@ -240,13 +243,7 @@ def main():
         print("\n" + json.dumps(output, indent=2))
         sys.exit(0)
     
-    print(f"Found {len(pages)} public pages to analyze\n")
-    
-    # Check each page
-    results = []
-    for page in pages:
-        result = check_page(page)
-        results.append(result)
+    print(f"Found {len(results)} public pages to analyze\n")
     
     # Print results
     for result in results:
@@ -1,13 +1,30 @@
 #!/usr/bin/env python3
 """
 i18n Checker - Detects hardcoded strings and missing translations.
-Scans for untranslated text in React, Vue, and Python files.
+Scans for untranslated text in React, Vue, Flutter (Dart) and Python files.
+
+Locale files (JSON, ARB, .po) are read once into a key index per
+namespace: every key gets a bit, every locale a bitset of the keys it has,
+so missing and extra keys against the base locale ('en' when present) are
+set differences. Issues list the exact key paths.
+
+Code files are matched with one combined pattern set per file type, over
+a walk that can run across processes (--workers N); hardcoded strings are
+reported as file:line.
+
+Usage:
+    python i18n_checker.py <project_path> [--workers N] [--since REV] [--no-cache]
 """
 import sys
 import re
 import json
 from pathlib import Path
 
+# Shared single-pass walker (.agent/.shared/project-scan)
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / ".shared" / "project-scan" / "scripts"))
+from project_scan import ProjectScanner, pop_option
+from pattern_set import PatternSet
+
 # Fix Windows console encoding for Unicode output
 try:
     sys.stdout.reconfigure(encoding='utf-8', errors='replace')
@@ -35,82 +52,179 @@ HARDCODED_PATTERNS = {
         r'(print|raise\s+\w+)\s*\(\s*["\'][A-Z][^"\']{5,}["\']',
         # Flask flash messages
         r'flash\s*\(\s*["\'][A-Z][^"\']{5,}["\']',
+    ],
+    'dart': [
+        # Text('Hello'), in any script (no interpolation)
+        r'\bText\(\s*(?:\'[^\'$\n]{3,}\'|"[^"$\n]{3,}")',
+        # Widget string arguments: hintText: 'Search'
+        r'\b(?:hintText|labelText|helperText|tooltip|semanticLabel|label|title)\s*:\s*(?:\'[^\'$\n]{3,}\'|"[^"$\n]{3,}")',
     ]
 }
 
 # Patterns that indicate proper i18n usage
 I18N_PATTERNS = [
-    r't\(["\']',           # t('key') - react-i18next
+    r'\bt\(["\']',         # t('key') - react-i18next (not Text(' or print(')
     r'useTranslation',     # React hook
     r'\$t\(',              # Vue i18n
-    r'_\(["\']',           # Python gettext
+    r'\b_\(["\']',         # Python gettext
     r'gettext\(',          # Python gettext
     r'useTranslations',    # next-intl
     r'FormattedMessage',   # react-intl
     r'i18n\.',             # Generic i18n
+    r'AppLocalizations\.of\(',  # Flutter gen-l10n
+    r'\bS\.of\(',           # Flutter intl_utils
+    r'context\.l10n',       # Flutter l10n extension
+    r'[\'"]\.tr\b',          # easy_localization 'key'.tr()
+    r'Intl\.message\(',     # Dart intl
 ]
 
-def find_locale_files(project_path: Path) -> list:
-    """Find translation/locale files."""
-    patterns = [
-        "**/locales/**/*.json",
-        "**/translations/**/*.json",
-        "**/lang/**/*.json",
-        "**/i18n/**/*.json",
-        "**/messages/*.json",
-        "**/*.po",  # gettext
-    ]
-    
-    files = []
-    for pattern in patterns:
-        files.extend(project_path.glob(pattern))
-    
-    return [f for f in files if 'node_modules' not in str(f)]
+# One pass per file; any i18n marker hit marks the whole file as localized
+MATCHERS = {
+    file_type: PatternSet([(p, (), 'i18n') for p in I18N_PATTERNS] +
+                          [(p, (), 'hardcoded') for p in patterns], flags=0)
+    for file_type, patterns in HARDCODED_PATTERNS.items()
+}
+MAX_HITS_PER_FILE = 20
+MAX_EXAMPLES = 20
+MAX_KEYS_LISTED = 10
+
+# Folders whose JSON files are translations (messages/ only directly)
+LOCALE_DIRS = {'locales', 'translations', 'lang', 'i18n', 'l10n'}
+# en, my, ar, ur, zh_Hant, pt-BR: a file named like this is one whole locale
+LOCALE_CODE = re.compile(r'^[a-z]{2,3}(?:[-_][A-Za-z0-9]{2,4})?$')
+# app_en.arb, app_pt_BR.arb
+ARB_NAME = re.compile(r'^(?P<namespace>.+?)_(?P<locale>[a-z]{2,3}(?:_[A-Za-z0-9]{2,4})?)$')
+
+# Code files checked for hardcoded strings
+CODE_EXTENSIONS = {
+    '.tsx': 'jsx', '.jsx': 'jsx', '.ts': 'jsx', '.js': 'jsx',
+    '.vue': 'vue',
+    '.py': 'python',
+    '.dart': 'dart'
+}
+CODE_EXCLUDES = {'node_modules', '.git', 'dist', 'build', '__pycache__', 'venv', 'test', 'tests', 'spec', 'l10n'}
+TEST_FILE = re.compile(r'^test_|[._](test|spec)\.\w+$')
+
+def is_locale_file(scan_file) -> bool:
+    """Translation/locale files: ARB, JSON under a locale folder, or gettext .po."""
+    if scan_file.suffix in ('.po', '.arb'):
+        return True
+    if scan_file.suffix != '.json':
+        return False
+    return not LOCALE_DIRS.isdisjoint(scan_file.parts) or scan_file.parts[-1:] == ('messages',)
+
+def read_locale_keys(scan_file):
+    """
+    {'locale': declared locale or None, 'keys': flattened key paths} of a
+    JSON or ARB locale file; None for .po or unreadable files. ARB metadata
+    (@@locale, @key descriptions) is not a key.
+    """
+    if scan_file.suffix not in ('.json', '.arb'):
+        return None
+    try:
+        content = json.loads(scan_file.text)
+    except ValueError:
+        return None
+    if not isinstance(content, dict):
+        return None
+    locale = None
+    if scan_file.suffix == '.arb':
+        locale = content.get('@@locale') if isinstance(content.get('@@locale'), str) else None
+        content = {k: v for k, v in content.items() if not k.startswith('@')}
+    return {'locale': locale, 'keys': sorted(flatten_keys(content))}
+
+def locale_of(scan_file, declared: str = None) -> tuple:
+    """
+    (locale, namespace) of a locale file: app_my.arb -> (my, app),
+    translations/ur.json -> (ur, translations), locales/ar/common.json -> (ar, common).
+    JSON files take their locale from the parent folder; the file name is
+    the locale only in flat layouts, directly under a locale folder.
+    """
+    stem = scan_file.path.stem
+    if scan_file.suffix == '.arb':
+        match = ARB_NAME.match(stem)
+        if declared:
+            namespace = stem[:-len(declared) - 1] if stem.endswith('_' + declared) else stem
+            return declared, namespace
+        if match:
+            return match.group('locale'), match.group('namespace')
+    parent = scan_file.path.parent.name
+    # locales/en/app.json: a short namespace such as app or nav is not a locale
+    flat = parent in LOCALE_DIRS or parent == 'messages'
+    if flat and LOCALE_CODE.match(stem):
+        return stem, parent
+    return parent, stem
+
+def bit_keys(mask: int, names: list) -> list:
+    """Key names of the set bits of mask, in index order."""
+    keys = []
+    while mask:
+        low = mask & -mask
+        keys.append(names[low.bit_length() - 1])
+        mask ^= low
+    return keys
+
+def key_issues(marker: str, where: str, label: str, keys: list) -> list:
+    """An issue line and the first MAX_KEYS_LISTED key paths under it."""
+    lines = [f"{marker} {where}: {label} {len(keys)} keys"]
+    lines += [f"   → {key}" for key in keys[:MAX_KEYS_LISTED]]
+    if len(keys) > MAX_KEYS_LISTED:
+        lines.append(f"   → ... {len(keys) - MAX_KEYS_LISTED} more")
+    return lines
 
 def check_locale_completeness(locale_files: list) -> dict:
-    """Check if all locales have the same keys."""
+    """Check if all locales have the same keys (locale_files: [(file, read_locale_keys result)])."""
     issues = []
     passed = []
     
     if not locale_files:
         return {'passed': [], 'issues': ["[!] No locale files found"]}
     
-    # Group by parent folder (language)
-    locales = {}
-    for f in locale_files:
-        if f.suffix == '.json':
-            try:
-                lang = f.parent.name
-                content = json.loads(f.read_text(encoding='utf-8'))
-                if lang not in locales:
-                    locales[lang] = {}
-                locales[lang][f.stem] = set(flatten_keys(content))
-            except:
-                continue
+    # Key index per namespace: key -> bit, locale -> bitset of its keys
+    namespaces = {}
+    locales = []
+    for f, result in locale_files:
+        if result is None:
+            continue
+        lang, namespace = locale_of(f, result['locale'])
+        if lang not in locales:
+            locales.append(lang)
+        index, masks = namespaces.setdefault(namespace, ({}, {}))
+        mask = masks.get(lang, 0)
+        for key in result['keys']:
+            mask |= 1 << index.setdefault(key, len(index))
+        masks[lang] = mask
     
     if len(locales) < 2:
         passed.append(f"[OK] Found {len(locale_files)} locale file(s)")
         return {'passed': passed, 'issues': issues}
     
-    passed.append(f"[OK] Found {len(locales)} language(s): {', '.join(locales.keys())}")
+    passed.append(f"[OK] Found {len(locales)} language(s): {', '.join(locales)}")
     
-    # Compare keys across locales
-    all_langs = list(locales.keys())
-    base_lang = all_langs[0]
+    # Compare every locale with the base one
+    base_lang = 'en' if 'en' in locales else locales[0]
     
-    for namespace in locales.get(base_lang, {}):
-        base_keys = locales[base_lang].get(namespace, set())
+    for namespace, (index, masks) in namespaces.items():
+        names = list(index)
+        base_mask = masks.get(base_lang, 0)
         
-        for lang in all_langs[1:]:
-            other_keys = locales.get(lang, {}).get(namespace, set())
+        for lang in locales:
+            if lang == base_lang:
+                continue
+            if lang not in masks:
+                if not base_mask:
+                    continue
+                issues.append(f"[X] {lang}/{namespace}: No translation file ({bin(base_mask).count('1')} keys)")
+                continue
+            mask = masks[lang]
             
-            missing = base_keys - other_keys
+            missing = base_mask & ~mask
             if missing:
-                issues.append(f"[X] {lang}/{namespace}: Missing {len(missing)} keys")
+                issues += key_issues("[X]", f"{lang}/{namespace}", "Missing", bit_keys(missing, names))
             
-            extra = other_keys - base_keys
+            extra = mask & ~base_mask
             if extra:
-                issues.append(f"[!] {lang}/{namespace}: {len(extra)} extra keys")
+                issues += key_issues("[!]", f"{lang}/{namespace}", "Extra", bit_keys(extra, names))
     
     if not issues:
         passed.append("[OK] All locales have matching keys")
@@ -128,61 +242,50 @@ def flatten_keys(d, prefix=''):
             keys.add(new_key)
     return keys
 
-def check_hardcoded_strings(project_path: Path) -> dict:
-    """Check for hardcoded strings in code files."""
-    issues = []
-    passed = []
-    
-    # Find code files
-    extensions = {
-        '.tsx': 'jsx', '.jsx': 'jsx', '.ts': 'jsx', '.js': 'jsx',
-        '.vue': 'vue',
-        '.py': 'python'
-    }
+def check_code_file(scan_file) -> dict:
+    """
+    i18n usage and the hardcoded strings ([line, text], at most
+    MAX_HITS_PER_FILE) of one file, in a single pass of the combined
+    matcher. Files that use i18n are not reported for hardcoded text.
+    """
+    matcher = MATCHERS[CODE_EXTENSIONS.get(scan_file.suffix, 'jsx')]
     
-    code_files = []
-    for ext in extensions:
-        code_files.extend(project_path.rglob(f"*{ext}"))
+    hardcoded = []
+    for hit in matcher.finditer(scan_file.text):
+        if hit.rule == 'i18n':
+            return {'has_i18n': True, 'hardcoded': []}
+        if len(hardcoded) < MAX_HITS_PER_FILE:
+            hardcoded.append([hit.line, ' '.join(hit.text.split())[:60]])
     
-    code_files = [f for f in code_files if not any(x in str(f) for x in 
-                  ['node_modules', '.git', 'dist', 'build', '__pycache__', 'venv', 'test', 'spec'])]
+    return {'has_i18n': False, 'hardcoded': hardcoded}
+
+def is_code_file(scan_file) -> bool:
+    return CODE_EXCLUDES.isdisjoint(scan_file.parts) and not TEST_FILE.search(scan_file.name)
+
+def check_hardcoded_strings(code_files: list, analyzed: int) -> dict:
+    """Check for hardcoded strings (code_files: [(file, check_code_file result)])."""
+    issues = []
+    passed = []
     
     if not code_files:
         return {'passed': ["[!] No code files found"], 'issues': []}
     
     files_with_i18n = 0
     files_with_hardcoded = 0
+    hardcoded_total = 0
     hardcoded_examples = []
     
-    for file_path in code_files[:50]:  # Limit
-        try:
-            content = file_path.read_text(encoding='utf-8', errors='ignore')
-            ext = file_path.suffix
-            file_type = extensions.get(ext, 'jsx')
-            
-            # Check for i18n usage
-            has_i18n = any(re.search(p, content) for p in I18N_PATTERNS)
-            if has_i18n:
-                files_with_i18n += 1
-            
-            # Check for hardcoded strings
-            patterns = HARDCODED_PATTERNS.get(file_type, [])
-            hardcoded_found = False
-            
-            for pattern in patterns:
-                matches = re.findall(pattern, content)
-                if matches and not has_i18n:
-                    hardcoded_found = True
-                    if len(hardcoded_examples) < 5:
-                        hardcoded_examples.append(f"{file_path.name}: {str(matches[0])[:40]}...")
-            
-            if hardcoded_found:
-                files_with_hardcoded += 1
-                
-        except:
-            continue
+    for f, result in code_files:
+        if result['has_i18n']:
+            files_with_i18n += 1
+        if result['hardcoded']:
+            files_with_hardcoded += 1
+            hardcoded_total += len(result['hardcoded'])
+            for line, text in result['hardcoded']:
+                if len(hardcoded_examples) < MAX_EXAMPLES:
+                    hardcoded_examples.append(f"{f.rel}:{line}: {text}")
     
-    passed.append(f"[OK] Analyzed {len(code_files)} code files")
+    passed.append(f"[OK] Analyzed {analyzed} code files")
     
     if files_with_i18n > 0:
         passed.append(f"[OK] {files_with_i18n} files use i18n")
@@ -191,25 +294,41 @@ def check_hardcoded_strings(project_path: Path) -> dict:
         issues.append(f"[X] {files_with_hardcoded} files may have hardcoded strings")
         for ex in hardcoded_examples:
             issues.append(f"   → {ex}")
+        if hardcoded_total > len(hardcoded_examples):
+            issues.append(f"   → ... {hardcoded_total - len(hardcoded_examples)} more")
     else:
         passed.append("[OK] No obvious hardcoded strings detected")
     
     return {'passed': passed, 'issues': issues}
 
+def scan_project(project_path: Path, use_cache: bool = True, since: str = None, workers: int = None):
+    """
+    One walk for locale files and code files. Returns (locale_result, code_result).
+    With since (a git revision), only files changed since then are re-checked;
+    workers > 1 (0: one per CPU) checks files in parallel.
+    """
+    scanner = ProjectScanner(project_path, name='i18n_checker', use_cache=use_cache, since=since)
+    scanner.register('locales', read_locale_keys, accept=is_locale_file)
+    scanner.register('code', check_code_file, extensions=CODE_EXTENSIONS, accept=is_code_file)
+    scanned = scanner.run(workers)
+    return (check_locale_completeness(scanned['locales']),
+            check_hardcoded_strings(scanned['code'], scanner.matched('code')))
+
 def main():
-    target = sys.argv[1] if len(sys.argv) > 1 else "."
+    argv, since = pop_option(sys.argv[1:], "--since")
+    argv, workers = pop_option(argv, "--workers")
+    workers = None if workers is None else int(workers or 0)
+    args = [a for a in argv if not a.startswith("--")]
+    target = args[0] if args else "."
     project_path = Path(target)
     
     print("\n" + "=" * 60)
     print("  i18n CHECKER - Internationalization Audit")
     print("=" * 60 + "\n")
     
-    # Check locale files
-    locale_files = find_locale_files(project_path)
-    locale_result = check_locale_completeness(locale_files)
-    
-    # Check hardcoded strings
-    code_result = check_hardcoded_strings(project_path)
+    # Check locale files and hardcoded strings in one pass over the project
+    locale_result, code_result = scan_project(project_path, use_cache="--no-cache" not in argv, since=since,
+                                              workers=workers)
     
     # Print results
     print("[LOCALE FILES]")
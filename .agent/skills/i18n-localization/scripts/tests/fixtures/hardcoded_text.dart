@@ -0,0 +1,23 @@
+import 'package:flutter/material.dart';
+
+class BookmarksHeader extends StatelessWidget {
+  const BookmarksHeader({super.key, required this.count});
+
+  final int count;
+
+  @override
+  Widget build(BuildContext context) {
+    print('building header');
+    return Column(
+      children: [
+        Text('Bookmarks & Collections'),
+        Text('$count'),
+        IconButton(
+          tooltip: 'Search bookmarks',
+          icon: const Icon(Icons.search),
+          onPressed: () {},
+        ),
+      ],
+    );
+  }
+}
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests for i18n_checker on fixture sources and locale folders.
+
+    python -m pytest .agent/skills/i18n-localization/scripts/tests -q
+"""
+
+import sys
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parents[1]
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+from i18n_checker import check_code_file, check_locale_completeness, read_locale_keys
+from project_scan import ScanFile
+
+
+def scan(path):
+    return check_code_file(ScanFile(path, path.name, path.stat()))
+
+
+def locale_report(root):
+    files = [ScanFile(path, path.relative_to(root).as_posix(), path.stat())
+             for path in sorted(root.rglob("*.json"))]
+    return check_locale_completeness([(f, read_locale_keys(f)) for f in files])
+
+
+def test_dart_text_widgets_are_not_i18n_markers():
+    # Text(' and print(' end in t(' but are not calls to t()
+    result = scan(FIXTURES / "hardcoded_text.dart")
+    assert result["has_i18n"] is False
+    assert [line for line, _ in result["hardcoded"]] == [13, 16]
+    assert result["hardcoded"][0][1] == "Text('Bookmarks & Collections'"
+
+
+def test_dart_localized_file_is_not_reported(tmp_path):
+    source = tmp_path / "header.dart"
+    source.write_text("Text(AppLocalizations.of(context)!.bookmarks)\nText('Bookmarks & Collections')\n",
+                      encoding="utf-8")
+    assert scan(source) == {"has_i18n": True, "hardcoded": []}
+
+
+def test_t_call_still_counts_as_i18n(tmp_path):
+    source = tmp_path / "Header.tsx"
+    source.write_text("<h1>{t('header.title')}</h1>\n<p>{i18next.t(\"body\")}</p>\n", encoding="utf-8")
+    assert scan(source)["has_i18n"] is True
+
+
+def test_nested_locale_folders_with_short_namespace():
+    # locales/<code>/app.json: "app" looks like a locale code but is the namespace
+    report = locale_report(FIXTURES / "nested")
+    assert "[OK] Found 2 language(s): en, my" in report["passed"]
+    assert report["issues"] == ["[X] my/app: Missing 1 keys", "   → b.c"]
+
+
+def test_flat_locale_files():
+    report = locale_report(FIXTURES / "flat")
+    assert "[OK] Found 2 language(s): en, my" in report["passed"]
+    assert report["issues"] == ["[X] my/translations: Missing 1 keys", "   → count"]
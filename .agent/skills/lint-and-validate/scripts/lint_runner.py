@@ -4,19 +4,35 @@ Lint Runner - Unified linting and type checking
 Runs appropriate linters based on project type.
 
 Usage:
-    python lint_runner.py <project_path>
+    python lint_runner.py <project_path> [--no-history]
 
 Supports:
     - Node.js: npm run lint, npx tsc --noEmit
     - Python: ruff check, mypy
+
+Each linter is timed (wall and CPU seconds). Issue counts come from the
+linters' machine-readable output where they have one (ruff and eslint
+JSON, mypy JUnit XML; tsc's one-line diagnostics). Runs are recorded in
+the shared run history, and linters that got markedly slower than their
+recent median are flagged. See `run_history.py lint_runner <project_path>`
+for the trend.
 """
 
+import re
 import subprocess
 import sys
 import json
+import tempfile
 from pathlib import Path
 from datetime import datetime
 
+# Shared run timing and history (.agent/.shared/run-history)
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / ".shared" / "run-history" / "scripts"))
+from run_history import RunHistory, parse_junit, timed_run
+
+# A linter with no history is flagged slow above this
+SLOW_LINT_SECONDS = 60
+
 # Fix Windows console encoding
 try:
     sys.stdout.reconfigure(encoding='utf-8', errors='replace')
@@ -44,11 +60,13 @@ def detect_project_type(project_path: Path) -> dict:
             if "lint" in scripts:
                 result["linters"].append({"name": "npm lint", "cmd": ["npm", "run", "lint"]})
             elif "eslint" in deps:
-                result["linters"].append({"name": "eslint", "cmd": ["npx", "eslint", "."]})
+                result["linters"].append({"name": "eslint", "cmd": ["npx", "eslint", ".", "-f", "json"],
+                                          "report": "eslint-json"})
             
             # Check for TypeScript
             if "typescript" in deps or (project_path / "tsconfig.json").exists():
-                result["linters"].append({"name": "tsc", "cmd": ["npx", "tsc", "--noEmit"]})
+                result["linters"].append({"name": "tsc", "cmd": ["npx", "tsc", "--noEmit", "--pretty", "false"],
+                                          "report": "tsc"})
                 
         except:
             pass
@@ -58,51 +76,120 @@ def detect_project_type(project_path: Path) -> dict:
         result["type"] = "python"
         
         # Check for ruff
-        result["linters"].append({"name": "ruff", "cmd": ["ruff", "check", "."]})
+        result["linters"].append({"name": "ruff", "cmd": ["ruff", "check", ".", "--output-format=json"],
+                                  "report": "ruff-json"})
         
         # Check for mypy
         if (project_path / "mypy.ini").exists() or (project_path / "pyproject.toml").exists():
-            result["linters"].append({"name": "mypy", "cmd": ["mypy", "."]})
+            result["linters"].append({"name": "mypy", "cmd": ["mypy", "."], "report": "junit"})
     
     return result
 
 
+def parse_lint_report(report: str, stdout: str, report_file: Path = None) -> dict:
+    """
+    Issue counts from a linter's machine-readable output:
+    {"issues": n, "files": {path: n}, "messages": [...]}. For JSON reports,
+    "messages" renders each diagnostic as "path:line:col: CODE message" (the
+    raw JSON is not worth reading); it is None where stdout is already text.
+    """
+    files = {}
+    messages = None
+    if report == "ruff-json":
+        messages = []
+        for diagnostic in json.loads(stdout or "[]"):
+            files[diagnostic["filename"]] = files.get(diagnostic["filename"], 0) + 1
+            location = diagnostic.get("location") or {}
+            messages.append(f"{diagnostic['filename']}:{location.get('row', 0)}:{location.get('column', 0)}: "
+                            f"{diagnostic.get('code') or 'error'} {diagnostic.get('message', '')}")
+    elif report == "eslint-json":
+        messages = []
+        for entry in json.loads(stdout or "[]"):
+            count = entry.get("errorCount", 0) + entry.get("warningCount", 0)
+            if count:
+                files[entry["filePath"]] = count
+            for message in entry.get("messages", []):
+                level = "error" if message.get("severity") == 2 else "warning"
+                messages.append(f"{entry['filePath']}:{message.get('line', 0)}:{message.get('column', 0)}: "
+                                f"{level} {message.get('message', '')} ({message.get('ruleId') or 'fatal'})")
+    elif report == "junit":
+        # mypy puts every diagnostic line in the failure text of one test case
+        for case in parse_junit(report_file):
+            for line in case["message"].splitlines():
+                match = re.match(r'^(.+?):\d+(?::\d+)?: error:', line)
+                if match:
+                    files[match.group(1)] = files.get(match.group(1), 0) + 1
+    elif report == "tsc":
+        for line in stdout.splitlines():
+            match = re.match(r'^(.+?)\(\d+,\d+\): error TS\d+', line)
+            if match:
+                files[match.group(1)] = files.get(match.group(1), 0) + 1
+    return {"issues": sum(files.values()), "files": files, "messages": messages}
+
+
+def render_messages(messages: list, limit: int = 2000) -> str:
+    """Whole diagnostic lines up to `limit` characters, then a count of the rest."""
+    lines = []
+    size = 0
+    for message in messages:
+        size += len(message) + 1
+        if size > limit:
+            lines.append(f"... {len(messages) - len(lines)} more")
+            break
+        lines.append(message)
+    return "\n".join(lines)
+
+
 def run_linter(linter: dict, cwd: Path) -> dict:
-    """Run a single linter and return results."""
+    """Run a single linter and return results, with its timing and issue counts."""
     result = {
         "name": linter["name"],
         "passed": False,
         "output": "",
-        "error": ""
+        "error": "",
+        "timing": {"wall": None, "cpu": None},
+        "issues": None,
+        "files_with_issues": None
     }
     
-    try:
-        proc = subprocess.run(
-            linter["cmd"],
-            cwd=str(cwd),
-            capture_output=True,
-            text=True,
-            encoding='utf-8',
-            errors='replace',
-            timeout=120
-        )
-        
-        result["output"] = proc.stdout[:2000] if proc.stdout else ""
-        result["error"] = proc.stderr[:500] if proc.stderr else ""
-        result["passed"] = proc.returncode == 0
-        
-    except FileNotFoundError:
-        result["error"] = f"Command not found: {linter['cmd'][0]}"
-    except subprocess.TimeoutExpired:
-        result["error"] = "Timeout after 120s"
-    except Exception as e:
-        result["error"] = str(e)
+    report = linter.get("report")
+    with tempfile.TemporaryDirectory() as tmp:
+        cmd = list(linter["cmd"])
+        report_file = Path(tmp) / "report.xml"
+        if report == "junit":
+            cmd += ["--junit-xml", str(report_file)]
+        try:
+            proc, result["timing"] = timed_run(cmd, cwd, timeout=120)
+            
+            result["output"] = proc.stdout[:2000] if proc.stdout else ""
+            result["error"] = proc.stderr[:500] if proc.stderr else ""
+            result["passed"] = proc.returncode == 0
+            
+            if report:
+                try:
+                    counts = parse_lint_report(report, proc.stdout or "", report_file)
+                    result["issues"] = counts["issues"]
+                    result["files_with_issues"] = len(counts["files"])
+                    if counts["messages"] is not None:
+                        result["output"] = render_messages(counts["messages"])
+                except (ValueError, KeyError, OSError, TypeError):
+                    pass  # Crashed or printed something else; pass/fail still stands
+            
+        except FileNotFoundError:
+            result["error"] = f"Command not found: {linter['cmd'][0]}"
+        except subprocess.TimeoutExpired:
+            result["error"] = "Timeout after 120s"
+            result["timing"]["wall"] = 120
+        except Exception as e:
+            result["error"] = str(e)
     
     return result
 
 
 def main():
-    project_path = Path(sys.argv[1] if len(sys.argv) > 1 else ".").resolve()
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    project_path = Path(args[0] if args else ".").resolve()
+    history = None if "--no-history" in sys.argv else RunHistory("lint_runner", project_path)
     
     print(f"\n{'='*60}")
     print(f"[LINT RUNNER] Unified Linting")
@@ -138,10 +225,17 @@ def main():
         result = run_linter(linter, project_path)
         results.append(result)
         
+        timing = result["timing"]
+        detail = f"{timing['wall']}s wall" if timing["wall"] is not None else "not run"
+        if timing["cpu"] is not None:
+            detail += f", {timing['cpu']}s cpu"
+        if result["issues"] is not None:
+            detail += f", {result['issues']} issues in {result['files_with_issues']} files"
+        
         if result["passed"]:
-            print(f"  [PASS] {linter['name']}")
+            print(f"  [PASS] {linter['name']} ({detail})")
         else:
-            print(f"  [FAIL] {linter['name']}")
+            print(f"  [FAIL] {linter['name']} ({detail})")
             if result["error"]:
                 print(f"  Error: {result['error'][:200]}")
             all_passed = False
@@ -155,11 +249,33 @@ def main():
         icon = "[PASS]" if r["passed"] else "[FAIL]"
         print(f"{icon} {r['name']}")
     
+    # Timing against previous runs
+    tool_times = {r["name"]: r["timing"]["wall"] for r in results if r["timing"]["wall"] is not None}
+    cpu_times = [r["timing"]["cpu"] for r in results if r["timing"]["cpu"] is not None]
+    total_wall = round(sum(tool_times.values()), 3)
+    total_cpu = round(sum(cpu_times), 3) if cpu_times else None
+    slow = history.flag_slow("tools", tool_times, absolute=SLOW_LINT_SECONDS) if history else []
+    print(f"Total: {total_wall}s wall" + (f", {total_cpu}s cpu" if total_cpu is not None else ""))
+    for entry in slow:
+        baseline = f"usually {entry['baseline']}s" if entry["baseline"] is not None else "no history"
+        print(f"[SLOW] {entry['name']}: {entry['seconds']}s ({baseline})")
+    
+    if history:
+        history.append({
+            "wall": total_wall,
+            "cpu": total_cpu,
+            "passed": all_passed,
+            "issues": {r["name"]: r["issues"] for r in results if r["issues"] is not None},
+            "timings": {"tools": tool_times}
+        })
+    
     output = {
         "script": "lint_runner",
         "project": str(project_path),
         "type": project_info["type"],
         "checks": results,
+        "timing": {"wall": total_wall, "cpu": total_cpu},
+        "slow": slow,
         "passed": all_passed
     }
     
@@ -8,6 +8,10 @@ import re
 import subprocess
 from pathlib import Path
 
+# Shared single-pass walker (.agent/.shared/project-scan)
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / ".shared" / "project-scan" / "scripts"))
+from project_scan import ProjectScanner, pop_option
+
 # Fix Windows console encoding for Unicode output
 try:
     sys.stdout.reconfigure(encoding='utf-8', errors='replace')
@@ -15,40 +19,37 @@ try:
 except AttributeError:
     pass  # Python < 3.7
 
-def check_typescript_coverage(project_path: Path) -> dict:
-    """Check TypeScript type coverage."""
+def typescript_file_stats(scan_file) -> dict:
+    """'any' and typed/untyped function counts for one TypeScript file."""
+    content = scan_file.text
+    
+    # Count 'any' usage
+    any_count = len(re.findall(r':\s*any\b', content))
+    
+    # Find functions without return types
+    # function name(params) { - no return type
+    untyped = re.findall(r'function\s+\w+\s*\([^)]*\)\s*{', content)
+    # Arrow functions without types: const fn = (x) => or (x) =>
+    untyped += re.findall(r'=\s*\([^:)]*\)\s*=>', content)
+    
+    # Count typed functions
+    typed = re.findall(r'function\s+\w+\s*\([^)]*\)\s*:\s*\w+', content)
+    typed += re.findall(r':\s*\([^)]*\)\s*=>\s*\w+', content)
+    
+    return {'any_count': any_count, 'untyped_functions': len(untyped), 'total_functions': len(typed) + len(untyped)}
+
+def check_typescript_coverage(ts_files: list, file_count: int) -> dict:
+    """Check TypeScript type coverage (ts_files: [(file, typescript_file_stats result)])."""
     issues = []
     passed = []
     stats = {'any_count': 0, 'untyped_functions': 0, 'total_functions': 0}
     
-    ts_files = list(project_path.rglob("*.ts")) + list(project_path.rglob("*.tsx"))
-    ts_files = [f for f in ts_files if 'node_modules' not in str(f) and '.d.ts' not in str(f)]
-    
-    if not ts_files:
+    if not file_count:
         return {'type': 'typescript', 'files': 0, 'passed': [], 'issues': ["[!] No TypeScript files found"], 'stats': stats}
     
-    for file_path in ts_files[:30]:  # Limit
-        try:
-            content = file_path.read_text(encoding='utf-8', errors='ignore')
-            
-            # Count 'any' usage
-            any_matches = re.findall(r':\s*any\b', content)
-            stats['any_count'] += len(any_matches)
-            
-            # Find functions without return types
-            # function name(params) { - no return type
-            untyped = re.findall(r'function\s+\w+\s*\([^)]*\)\s*{', content)
-            # Arrow functions without types: const fn = (x) => or (x) =>
-            untyped += re.findall(r'=\s*\([^:)]*\)\s*=>', content)
-            stats['untyped_functions'] += len(untyped)
-            
-            # Count typed functions
-            typed = re.findall(r'function\s+\w+\s*\([^)]*\)\s*:\s*\w+', content)
-            typed += re.findall(r':\s*\([^)]*\)\s*=>\s*\w+', content)
-            stats['total_functions'] += len(typed) + len(untyped)
-            
-        except Exception:
-            continue
+    for _, file_stats in ts_files:
+        for key in stats:
+            stats[key] += file_stats[key]
     
     # Analyze results
     if stats['any_count'] == 0:
@@ -67,41 +68,39 @@ def check_typescript_coverage(project_path: Path) -> dict:
         else:
             issues.append(f"[X] Type coverage: {typed_ratio:.0f}% (too low)")
     
-    passed.append(f"[OK] Analyzed {len(ts_files)} TypeScript files")
+    passed.append(f"[OK] Analyzed {file_count} TypeScript files")
     
-    return {'type': 'typescript', 'files': len(ts_files), 'passed': passed, 'issues': issues, 'stats': stats}
+    return {'type': 'typescript', 'files': file_count, 'passed': passed, 'issues': issues, 'stats': stats}
 
-def check_python_coverage(project_path: Path) -> dict:
-    """Check Python type hints coverage."""
+def python_file_stats(scan_file) -> dict:
+    """'Any' and typed/untyped function counts for one Python file."""
+    content = scan_file.text
+    
+    # Count Any usage
+    any_count = len(re.findall(r':\s*Any\b', content))
+    
+    # Find functions with type hints
+    typed_funcs = re.findall(r'def\s+\w+\s*\([^)]*:[^)]+\)', content)
+    typed_funcs += re.findall(r'def\s+\w+\s*\([^)]*\)\s*->', content)
+    
+    # Find functions without type hints
+    all_funcs = re.findall(r'def\s+\w+\s*\(', content)
+    
+    return {'untyped_functions': len(all_funcs) - len(typed_funcs), 'typed_functions': len(typed_funcs),
+            'any_count': any_count}
+
+def check_python_coverage(py_files: list, file_count: int) -> dict:
+    """Check Python type hints coverage (py_files: [(file, python_file_stats result)])."""
     issues = []
     passed = []
     stats = {'untyped_functions': 0, 'typed_functions': 0, 'any_count': 0}
     
-    py_files = list(project_path.rglob("*.py"))
-    py_files = [f for f in py_files if not any(x in str(f) for x in ['venv', '__pycache__', '.git', 'node_modules'])]
-    
-    if not py_files:
+    if not file_count:
         return {'type': 'python', 'files': 0, 'passed': [], 'issues': ["[!] No Python files found"], 'stats': stats}
     
-    for file_path in py_files[:30]:  # Limit
-        try:
-            content = file_path.read_text(encoding='utf-8', errors='ignore')
-            
-            # Count Any usage
-            any_matches = re.findall(r':\s*Any\b', content)
-            stats['any_count'] += len(any_matches)
-            
-            # Find functions with type hints
-            typed_funcs = re.findall(r'def\s+\w+\s*\([^)]*:[^)]+\)', content)
-            typed_funcs += re.findall(r'def\s+\w+\s*\([^)]*\)\s*->', content)
-            stats['typed_functions'] += len(typed_funcs)
-            
-            # Find functions without type hints
-            all_funcs = re.findall(r'def\s+\w+\s*\(', content)
-            stats['untyped_functions'] += len(all_funcs) - len(typed_funcs)
-            
-        except Exception:
-            continue
+    for _, file_stats in py_files:
+        for key in stats:
+            stats[key] += file_stats[key]
     
     total = stats['typed_functions'] + stats['untyped_functions']
     
@@ -121,12 +120,30 @@ def check_python_coverage(project_path: Path) -> dict:
     else:
         issues.append(f"[X] {stats['any_count']} 'Any' types found")
     
-    passed.append(f"[OK] Analyzed {len(py_files)} Python files")
+    passed.append(f"[OK] Analyzed {file_count} Python files")
     
-    return {'type': 'python', 'files': len(py_files), 'passed': passed, 'issues': issues, 'stats': stats}
+    return {'type': 'python', 'files': file_count, 'passed': passed, 'issues': issues, 'stats': stats}
+
+def scan_project(project_path: Path, use_cache: bool = True, since: str = None) -> tuple:
+    """
+    One walk for TypeScript and Python files. Returns (ts_result, py_result).
+    With since (a git revision), only files changed since then are re-checked.
+    Every matching file is measured (results are cached per file), so the
+    score no longer depends on which 30 files a walk happens to visit first.
+    """
+    scanner = ProjectScanner(project_path, name='type_coverage', use_cache=use_cache, since=since)
+    scanner.register('typescript', typescript_file_stats, extensions={'.ts', '.tsx'},
+                     accept=lambda f: '.d.ts' not in f.name)
+    scanner.register('python', python_file_stats, extensions={'.py'},
+                     accept=lambda f: not any(x in f.rel for x in ['venv', '__pycache__']))
+    scanned = scanner.run()
+    return (check_typescript_coverage(scanned['typescript'], scanner.matched('typescript')),
+            check_python_coverage(scanned['python'], scanner.matched('python')))
 
 def main():
-    target = sys.argv[1] if len(sys.argv) > 1 else "."
+    argv, since = pop_option(sys.argv[1:], "--since")
+    args = [a for a in argv if not a.startswith("--")]
+    target = args[0] if args else "."
     project_path = Path(target)
     
     print("\n" + "=" * 60)
@@ -134,14 +151,13 @@ def main():
     print("=" * 60 + "\n")
     
     results = []
+    ts_result, py_result = scan_project(project_path, use_cache="--no-cache" not in argv, since=since)
     
     # Check TypeScript
-    ts_result = check_typescript_coverage(project_path)
     if ts_result['files'] > 0:
         results.append(ts_result)
     
     # Check Python
-    py_result = check_python_coverage(project_path)
     if py_result['files'] > 0:
         results.append(py_result)
     
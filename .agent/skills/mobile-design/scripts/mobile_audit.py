@@ -71,12 +71,25 @@ import re
 import json
 from pathlib import Path
 
+# Shared single-pass walker (.agent/.shared/project-scan)
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / ".shared" / "project-scan" / "scripts"))
+from project_scan import ProjectScanner, pop_option
+from pattern_set import first_line
+
+EXTENSIONS = {'.tsx', '.ts', '.jsx', '.js', '.dart'}
+# Native platform projects, on top of the shared ignore list
+SKIP_DIRS = {'ios', 'android'}
+
 class MobileAuditor:
     def __init__(self):
         self.issues = []
         self.warnings = []
         self.passed_count = 0
         self.files_checked = 0
+        # Structured form of issues/warnings: file, line, severity, category, message
+        self.findings = []
+        self._filepath = None
+        self._content = ''
 
     def audit_file(self, filepath: str) -> None:
         try:
@@ -84,8 +97,12 @@ class MobileAuditor:
                 content = f.read()
         except:
             return
+        self.audit_content(content, filepath)
 
+    def audit_content(self, content: str, filepath: str) -> None:
         self.files_checked += 1
+        self._filepath = filepath
+        self._content = content
         filename = os.path.basename(filepath)
 
         # Detect framework
@@ -102,35 +119,35 @@ class MobileAuditor:
         small_sizes = re.findall(r'(?:width|height|size):\s*([0-3]\d)', content)
         for size in small_sizes:
             if int(size) < 44:
-                self.issues.append(f"[Touch Target] {filename}: Touch target size {size}px < 44px minimum (iOS: 44pt, Android: 48dp)")
+                self._issue(f"[Touch Target] {filename}: Touch target size {size}px < 44px minimum (iOS: 44pt, Android: 48dp)", rf'(?:width|height|size):\s*{size}')
 
         # 1.2 Touch Target Spacing Check
         # Look for inadequate spacing between touchable elements
         small_gaps = re.findall(r'(?:margin|gap):\s*([0-7])\s*(?:px|dp)', content)
         for gap in small_gaps:
             if int(gap) < 8:
-                self.warnings.append(f"[Touch Spacing] {filename}: Touch target spacing {gap}px < 8px minimum. Accidental taps risk.")
+                self._warn(f"[Touch Spacing] {filename}: Touch target spacing {gap}px < 8px minimum. Accidental taps risk.", rf'(?:margin|gap):\s*{gap}\s*(?:px|dp)')
 
         # 1.3 Thumb Zone Placement Check
         # Primary CTAs should be at bottom (easy thumb reach)
         primary_buttons = re.findall(r'(?:testID|id):\s*["\'](?:.*(?:primary|cta|submit|confirm)[^"\']*)["\']', content, re.IGNORECASE)
         has_bottom_placement = bool(re.search(r'position:\s*["\']?absolute["\']?|bottom:\s*\d+|style.*bottom|justifyContent:\s*["\']?flex-end', content))
         if primary_buttons and not has_bottom_placement:
-            self.warnings.append(f"[Thumb Zone] {filename}: Primary CTA may not be in thumb zone (bottom). Place primary actions at bottom for easy reach.")
+            self._warn(f"[Thumb Zone] {filename}: Primary CTA may not be in thumb zone (bottom). Place primary actions at bottom for easy reach.", r'(?:testID|id):\s*["\'](?:.*(?:primary|cta|submit|confirm)[^"\']*)["\']')
 
         # 1.4 Gesture Alternatives Check
         # Swipe actions should have visible button alternatives
         has_swipe_gestures = bool(re.search(r'Swipeable|onSwipe|PanGestureHandler|swipe', content))
         has_visible_buttons = bool(re.search(r'Button.*(?:delete|archive|more)|TouchableOpacity|Pressable', content))
         if has_swipe_gestures and not has_visible_buttons:
-            self.warnings.append(f"[Gestures] {filename}: Swipe gestures detected without visible button alternatives. Motor impaired users need alternatives.")
+            self._warn(f"[Gestures] {filename}: Swipe gestures detected without visible button alternatives. Motor impaired users need alternatives.", r'Swipeable|onSwipe|PanGestureHandler|swipe')
 
         # 1.5 Haptic Feedback Check
         # Important actions should have haptic feedback
         has_important_actions = bool(re.search(r'(?:onPress|onSubmit|delete|remove|confirm|purchase)', content))
         has_haptics = bool(re.search(r'Haptics|Vibration|react-native-haptic-feedback|FeedbackManager', content))
         if has_important_actions and not has_haptics:
-            self.warnings.append(f"[Haptics] {filename}: Important actions without haptic feedback. Consider adding haptic confirmation.")
+            self._warn(f"[Haptics] {filename}: Important actions without haptic feedback. Consider adding haptic confirmation.", r'onPress|onSubmit|delete|remove|confirm|purchase')
 
         # 1.6 Touch Feedback Timing Check
         # Touch feedback should be immediate (<50ms)
@@ -138,7 +155,7 @@ class MobileAuditor:
             has_pressable = bool(re.search(r'Pressable|TouchableOpacity', content))
             has_feedback_state = bool(re.search(r'pressed|style.*opacity|underlay', content))
             if has_pressable and not has_feedback_state:
-                self.warnings.append(f"[Touch Feedback] {filename}: Pressable without visual feedback state. Add opacity/scale change for tap confirmation.")
+                self._warn(f"[Touch Feedback] {filename}: Pressable without visual feedback state. Add opacity/scale change for tap confirmation.", r'Pressable|TouchableOpacity')
 
         # --- 2. MOBILE PERFORMANCE CHECKS ---
 
@@ -146,21 +163,21 @@ class MobileAuditor:
         has_scrollview = bool(re.search(r'<ScrollView|ScrollView\.', content))
         has_map_in_scrollview = bool(re.search(r'ScrollView.*\.map\(|ScrollView.*\{.*\.map', content))
         if has_scrollview and has_map_in_scrollview:
-            self.issues.append(f"[Performance CRITICAL] {filename}: ScrollView with .map() detected. Use FlatList for lists to prevent memory explosion.")
+            self._issue(f"[Performance CRITICAL] {filename}: ScrollView with .map() detected. Use FlatList for lists to prevent memory explosion.", r'ScrollView.*\.map\(|ScrollView.*\{.*\.map')
 
         # 2.2 React.memo Check
         if is_react_native:
             has_list = bool(re.search(r'FlatList|FlashList|SectionList', content))
             has_react_memo = bool(re.search(r'React\.memo|memo\(', content))
             if has_list and not has_react_memo:
-                self.warnings.append(f"[Performance] {filename}: FlatList without React.memo on list items. Items will re-render on every parent update.")
+                self._warn(f"[Performance] {filename}: FlatList without React.memo on list items. Items will re-render on every parent update.", r'FlatList|FlashList|SectionList')
 
         # 2.3 useCallback Check
         if is_react_native:
             has_flatlist = bool(re.search(r'FlatList|FlashList', content))
             has_use_callback = bool(re.search(r'useCallback', content))
             if has_flatlist and not has_use_callback:
-                self.warnings.append(f"[Performance] {filename}: FlatList renderItem without useCallback. New function created every render.")
+                self._warn(f"[Performance] {filename}: FlatList renderItem without useCallback. New function created every render.", r'FlatList|FlashList')
 
         # 2.4 keyExtractor Check (CRITICAL)
         if is_react_native:
@@ -168,9 +185,9 @@ class MobileAuditor:
             has_key_extractor = bool(re.search(r'keyExtractor', content))
             uses_index_key = bool(re.search(r'key=\{.*index.*\}|key:\s*index', content))
             if has_flatlist and not has_key_extractor:
-                self.issues.append(f"[Performance CRITICAL] {filename}: FlatList without keyExtractor. Index-based keys cause bugs on reorder/delete.")
+                self._issue(f"[Performance CRITICAL] {filename}: FlatList without keyExtractor. Index-based keys cause bugs on reorder/delete.", r'FlatList')
             if uses_index_key:
-                self.issues.append(f"[Performance CRITICAL] {filename}: Using index as key. This causes bugs when list changes. Use unique ID from data.")
+                self._issue(f"[Performance CRITICAL] {filename}: Using index as key. This causes bugs when list changes. Use unique ID from data.", r'key=\{.*index.*\}|key:\s*index')
 
         # 2.5 useNativeDriver Check
         if is_react_native:
@@ -178,9 +195,9 @@ class MobileAuditor:
             has_native_driver = bool(re.search(r'useNativeDriver:\s*true', content))
             has_native_driver_false = bool(re.search(r'useNativeDriver:\s*false', content))
             if has_animated and has_native_driver_false:
-                self.warnings.append(f"[Performance] {filename}: Animation with useNativeDriver: false. Use true for 60fps (only supports transform/opacity).")
+                self._warn(f"[Performance] {filename}: Animation with useNativeDriver: false. Use true for 60fps (only supports transform/opacity).", r'useNativeDriver:\s*false')
             if has_animated and not has_native_driver:
-                self.warnings.append(f"[Performance] {filename}: Animated component without useNativeDriver. Add useNativeDriver: true for 60fps.")
+                self._warn(f"[Performance] {filename}: Animated component without useNativeDriver. Add useNativeDriver: true for 60fps.", r'Animated\.')
 
         # 2.6 Memory Leak Check
         if is_react_native:
@@ -188,31 +205,31 @@ class MobileAuditor:
             has_cleanup = bool(re.search(r'return\s*\(\)\s*=>|return\s+function', content))
             has_subscriptions = bool(re.search(r'addEventListener|subscribe|\.focus\(\)|\.off\(', content))
             if has_effect and has_subscriptions and not has_cleanup:
-                self.issues.append(f"[Memory Leak] {filename}: useEffect with subscriptions but no cleanup function. Memory leak on unmount.")
+                self._issue(f"[Memory Leak] {filename}: useEffect with subscriptions but no cleanup function. Memory leak on unmount.", r'useEffect')
 
         # 2.7 Console.log Detection
         console_logs = len(re.findall(r'console\.log|console\.warn|console\.error|console\.debug', content))
         if console_logs > 5:
-            self.warnings.append(f"[Performance] {filename}: {console_logs} console.log statements detected. Remove before production (blocks JS thread).")
+            self._warn(f"[Performance] {filename}: {console_logs} console.log statements detected. Remove before production (blocks JS thread).", r'console\.log|console\.warn|console\.error|console\.debug')
 
         # 2.8 Inline Function Detection
         if is_react_native:
             inline_functions = re.findall(r'(?:onPress|onPressIn|onPressOut|renderItem):\s*\([^)]*\)\s*=>', content)
             if len(inline_functions) > 3:
-                self.warnings.append(f"[Performance] {filename}: {len(inline_functions)} inline arrow functions in props. Creates new function every render. Use useCallback.")
+                self._warn(f"[Performance] {filename}: {len(inline_functions)} inline arrow functions in props. Creates new function every render. Use useCallback.", r'(?:onPress|onPressIn|onPressOut|renderItem):\s*\([^)]*\)\s*=>')
 
         # 2.9 Animation Properties Check
         # Warn if animating expensive properties
         animating_layout = bool(re.search(r'Animated\.timing.*(?:width|height|margin|padding)', content))
         if animating_layout:
-            self.issues.append(f"[Performance] {filename}: Animating layout properties (width/height/margin). Use transform/opacity for 60fps.")
+            self._issue(f"[Performance] {filename}: Animating layout properties (width/height/margin). Use transform/opacity for 60fps.", r'Animated\.timing.*(?:width|height|margin|padding)')
 
         # --- 3. MOBILE NAVIGATION CHECKS ---
 
         # 3.1 Tab Bar Max Items Check
         tab_bar_items = len(re.findall(r'Tab\.Screen|createBottomTabNavigator|BottomTab', content))
         if tab_bar_items > 5:
-            self.warnings.append(f"[Navigation] {filename}: {tab_bar_items} tab bar items (max 5 recommended). More than 5 becomes hard to tap.")
+            self._warn(f"[Navigation] {filename}: {tab_bar_items} tab bar items (max 5 recommended). More than 5 becomes hard to tap.", r'Tab\.Screen|createBottomTabNavigator|BottomTab')
 
         # 3.2 Tab State Preservation Check
         has_tab_nav = bool(re.search(r'createBottomTabNavigator|Tab\.Navigator', content))
@@ -220,13 +237,13 @@ class MobileAuditor:
             # Look for lazy prop (false preserves state)
             has_lazy_false = bool(re.search(r'lazy:\s*false', content))
             if not has_lazy_false:
-                self.warnings.append(f"[Navigation] {filename}: Tab navigation without lazy: false. Tabs may lose state on switch.")
+                self._warn(f"[Navigation] {filename}: Tab navigation without lazy: false. Tabs may lose state on switch.", r'createBottomTabNavigator|Tab\.Navigator')
 
         # 3.3 Back Handling Check
         has_back_listener = bool(re.search(r'BackHandler|useFocusEffect|navigation\.addListener', content))
         has_custom_back = bool(re.search(r'onBackPress|handleBackPress', content))
         if has_custom_back and not has_back_listener:
-            self.warnings.append(f"[Navigation] {filename}: Custom back handling without BackHandler listener. May not work correctly.")
+            self._warn(f"[Navigation] {filename}: Custom back handling without BackHandler listener. May not work correctly.", r'onBackPress|handleBackPress')
 
         # 3.4 Deep Link Support Check
         has_linking = bool(re.search(r'Linking\.|Linking\.openURL|deepLink|universalLink', content))
@@ -235,7 +252,7 @@ class MobileAuditor:
             self.passed_count += 1
         else:
             if has_linking and not has_config:
-                self.warnings.append(f"[Navigation] {filename}: Deep linking detected but may lack proper configuration. Test notification/share flows.")
+                self._warn(f"[Navigation] {filename}: Deep linking detected but may lack proper configuration. Test notification/share flows.", r'Linking\.|deepLink|universalLink')
 
         # --- 4. MOBILE TYPOGRAPHY CHECKS ---
 
@@ -244,41 +261,41 @@ class MobileAuditor:
             has_custom_font = bool(re.search(r"fontFamily:\s*[\"'][^\"']+", content))
             has_system_font = bool(re.search(r"fontFamily:\s*[\"']?(?:System|San Francisco|Roboto|-apple-system)", content))
             if has_custom_font and not has_system_font:
-                self.warnings.append(f"[Typography] {filename}: Custom font detected. Consider system fonts (iOS: SF Pro, Android: Roboto) for native feel.")
+                self._warn(f"[Typography] {filename}: Custom font detected. Consider system fonts (iOS: SF Pro, Android: Roboto) for native feel.", r'fontFamily:\s*["\'][^"\']+')
 
         # 4.2 Text Scaling Check (iOS Dynamic Type)
         if is_react_native:
             has_font_sizes = bool(re.search(r'fontSize:', content))
             has_scaling = bool(re.search(r'allowFontScaling:\s*true|responsiveFontSize|useWindowDimensions', content))
             if has_font_sizes and not has_scaling:
-                self.warnings.append(f"[Typography] {filename}: Fixed font sizes without scaling support. Consider allowFontScaling for accessibility.")
+                self._warn(f"[Typography] {filename}: Fixed font sizes without scaling support. Consider allowFontScaling for accessibility.", r'fontSize:')
 
         # 4.3 Mobile Line Height Check
         line_heights = re.findall(r'lineHeight:\s*([\d.]+)', content)
         for lh in line_heights:
             if float(lh) > 1.8:
-                self.warnings.append(f"[Typography] {filename}: lineHeight {lh} too high for mobile. Mobile text needs tighter spacing (1.3-1.5).")
+                self._warn(f"[Typography] {filename}: lineHeight {lh} too high for mobile. Mobile text needs tighter spacing (1.3-1.5).", rf'lineHeight:\s*{re.escape(lh)}')
 
         # 4.4 Font Size Limits
         font_sizes = re.findall(r'fontSize:\s*([\d.]+)', content)
         for fs in font_sizes:
             size = float(fs)
             if size < 12:
-                self.warnings.append(f"[Typography] {filename}: fontSize {size}px below 12px minimum readability.")
+                self._warn(f"[Typography] {filename}: fontSize {size}px below 12px minimum readability.", rf'fontSize:\s*{re.escape(fs)}')
             elif size > 32:
-                self.warnings.append(f"[Typography] {filename}: fontSize {size}px very large. Consider using responsive scaling.")
+                self._warn(f"[Typography] {filename}: fontSize {size}px very large. Consider using responsive scaling.", rf'fontSize:\s*{re.escape(fs)}')
 
         # --- 5. MOBILE COLOR SYSTEM CHECKS ---
 
         # 5.1 Pure Black Avoidance
         if re.search(r'#000000|color:\s*black|backgroundColor:\s*["\']?black', content):
-            self.warnings.append(f"[Color] {filename}: Pure black (#000000) detected. Use dark gray (#1C1C1E iOS, #121212 Android) for better OLED/battery.")
+            self._warn(f"[Color] {filename}: Pure black (#000000) detected. Use dark gray (#1C1C1E iOS, #121212 Android) for better OLED/battery.", r'#000000|color:\s*black|backgroundColor:\s*["\']?black')
 
         # 5.2 Dark Mode Support
         has_color_schemes = bool(re.search(r'useColorScheme|colorScheme|appearance:\s*["\']?dark', content))
         has_dark_mode_style = bool(re.search(r'\\\?.*dark|style:\s*.*dark|isDark', content))
         if not has_color_schemes and not has_dark_mode_style:
-            self.warnings.append(f"[Color] {filename}: No dark mode support detected. Consider useColorScheme for system dark mode.")
+            self._warn(f"[Color] {filename}: No dark mode support detected. Consider useColorScheme for system dark mode.")
 
         # --- 6. PLATFORM iOS CHECKS ---
 
@@ -293,12 +310,12 @@ class MobileAuditor:
             has_haptic_import = bool(re.search(r'expo-haptics|react-native-haptic-feedback', content))
             has_haptic_types = bool(re.search(r'ImpactFeedback|NotificationFeedback|SelectionFeedback', content))
             if has_haptic_import and not has_haptic_types:
-                self.warnings.append(f"[iOS Haptics] {filename}: Haptic library imported but not using typed haptics (Impact/Notification/Selection).")
+                self._warn(f"[iOS Haptics] {filename}: Haptic library imported but not using typed haptics (Impact/Notification/Selection).", r'expo-haptics|react-native-haptic-feedback')
 
             # 6.3 iOS Safe Area
             has_safe_area = bool(re.search(r'SafeAreaView|useSafeAreaInsets|safeArea', content))
             if not has_safe_area:
-                self.warnings.append(f"[iOS] {filename}: No SafeArea detected. Content may be hidden by notch/home indicator.")
+                self._warn(f"[iOS] {filename}: No SafeArea detected. Content may be hidden by notch/home indicator.")
 
         # --- 7. PLATFORM ANDROID CHECKS ---
 
@@ -312,14 +329,14 @@ class MobileAuditor:
             has_ripple = bool(re.search(r'ripple|android_ripple|foregroundRipple', content))
             has_pressable = bool(re.search(r'Pressable|Touchable', content))
             if has_pressable and not has_ripple:
-                self.warnings.append(f"[Android] {filename}: Touchable without ripple effect. Android users expect ripple feedback.")
+                self._warn(f"[Android] {filename}: Touchable without ripple effect. Android users expect ripple feedback.", r'Pressable|Touchable')
 
             # 7.3 Hardware Back Button
             if is_react_native:
                 has_back_button = bool(re.search(r'BackHandler|useBackHandler', content))
                 has_navigation = bool(re.search(r'@react-navigation', content))
                 if has_navigation and not has_back_button:
-                    self.warnings.append(f"[Android] {filename}: React Navigation detected without BackHandler listener. Android hardware back may not work correctly.")
+                    self._warn(f"[Android] {filename}: React Navigation detected without BackHandler listener. Android hardware back may not work correctly.", r'@react-navigation')
 
         # --- 8. MOBILE BACKEND CHECKS ---
 
@@ -328,19 +345,19 @@ class MobileAuditor:
         has_secure_storage = bool(re.search(r'SecureStore|Keychain|EncryptedSharedPreferences', content))
         has_token_storage = bool(re.search(r'token|jwt|auth.*storage', content, re.IGNORECASE))
         if has_token_storage and has_async_storage and not has_secure_storage:
-            self.issues.append(f"[Security] {filename}: Storing auth tokens in AsyncStorage (insecure). Use SecureStore (iOS) / EncryptedSharedPreferences (Android).")
+            self._issue(f"[Security] {filename}: Storing auth tokens in AsyncStorage (insecure). Use SecureStore (iOS) / EncryptedSharedPreferences (Android).", r'AsyncStorage|@react-native-async-storage')
 
         # 8.2 Offline Handling Check
         has_network = bool(re.search(r'fetch|axios|netinfo|@react-native-community/netinfo', content))
         has_offline = bool(re.search(r'offline|isConnected|netInfo|cache.*offline', content))
         if has_network and not has_offline:
-            self.warnings.append(f"[Offline] {filename}: Network requests detected without offline handling. Consider NetInfo for connection status.")
+            self._warn(f"[Offline] {filename}: Network requests detected without offline handling. Consider NetInfo for connection status.", r'fetch|axios|netinfo')
 
         # 8.3 Push Notification Support
         has_push = bool(re.search(r'Notifications|pushNotification|Firebase\.messaging|PushNotificationIOS', content))
         has_push_handler = bool(re.search(r'onNotification|addNotificationListener|notification\.open', content))
         if has_push and not has_push_handler:
-            self.warnings.append(f"[Push] {filename}: Push notifications imported but no handler found. May miss notifications.")
+            self._warn(f"[Push] {filename}: Push notifications imported but no handler found. May miss notifications.", r'Notifications|pushNotification|Firebase\.messaging|PushNotificationIOS')
 
         # --- 9. EXTENDED MOBILE TYPOGRAPHY CHECKS ---
 
@@ -358,7 +375,7 @@ class MobileAuditor:
             matching_ios = sum(1 for size in font_sizes if any(abs(float(size) - ios_size) < 1 for ios_size in ios_scale_sizes))
 
             if len(font_sizes) > 3 and matching_ios < len(font_sizes) / 2:
-                self.warnings.append(f"[iOS Typography] {filename}: Font sizes don't match iOS type scale. Consider iOS text styles for native feel.")
+                self._warn(f"[iOS Typography] {filename}: Font sizes don't match iOS type scale. Consider iOS text styles for native feel.")
 
         # 9.2 Android Material Type Scale Check
         if is_react_native:
@@ -373,7 +390,7 @@ class MobileAuditor:
             uses_sp = bool(re.search(r'\d+\s*sp\b', content))
             if has_display or has_headline_material:
                 if not uses_sp:
-                    self.warnings.append(f"[Android Typography] {filename}: Material typography detected without sp units. Use sp for text to respect user font size preferences.")
+                    self._warn(f"[Android Typography] {filename}: Material typography detected without sp units. Use sp for text to respect user font size preferences.", r'fontSize:\s*[2-6][0-9]|display|headline')
 
         # 9.3 Modular Scale Check
         # Check if font sizes follow modular scale
@@ -389,7 +406,7 @@ class MobileAuditor:
             common_ratios = {1.125, 1.2, 1.25, 1.333, 1.5}
             for ratio in ratios[:3]:
                 if not any(abs(ratio - cr) < 0.03 for cr in common_ratios):
-                    self.warnings.append(f"[Typography] {filename}: Font sizes may not follow modular scale (ratio: {ratio:.2f}). Consider consistent ratio.")
+                    self._warn(f"[Typography] {filename}: Font sizes may not follow modular scale (ratio: {ratio:.2f}). Consider consistent ratio.")
                     break
 
         # 9.4 Line Length Check (Mobile-specific)
@@ -398,7 +415,7 @@ class MobileAuditor:
             has_long_text = bool(re.search(r'<Text[^>]*>[^<]{40,}', content))
             has_max_width = bool(re.search(r'maxWidth|max-w-\d+|width:\s*["\']?\d+', content))
             if has_long_text and not has_max_width:
-                self.warnings.append(f"[Mobile Typography] {filename}: Text without max-width constraint. Mobile text should be 40-60 characters per line for readability.")
+                self._warn(f"[Mobile Typography] {filename}: Text without max-width constraint. Mobile text should be 40-60 characters per line for readability.", r'<Text[^>]*>[^<]{40,}')
 
         # 9.5 Font Weight Pattern Check
         # Check for font weight distribution
@@ -417,7 +434,7 @@ class MobileAuditor:
             bold_count = sum(1 for w in numeric_weights if w >= 700)
             regular_count = sum(1 for w in numeric_weights if 400 <= w < 500)
             if bold_count > regular_count:
-                self.warnings.append(f"[Mobile Typography] {filename}: More bold weights than regular. Mobile typography should be regular-dominant for readability.")
+                self._warn(f"[Mobile Typography] {filename}: More bold weights than regular. Mobile typography should be regular-dominant for readability.")
 
         # --- 10. EXTENDED MOBILE COLOR SYSTEM CHECKS ---
 
@@ -430,7 +447,7 @@ class MobileAuditor:
             pass
         elif re.search(r'backgroundColor:\s*["\']?#[0-9A-Fa-f]{6}', content):
             # Check if using light colors in dark mode (bad for OLED)
-            self.warnings.append(f"[Mobile Color] {filename}: Consider OLED-optimized dark backgrounds (#121212 Android, #000000 iOS) for battery savings.")
+            self._warn(f"[Mobile Color] {filename}: Consider OLED-optimized dark backgrounds (#121212 Android, #000000 iOS) for battery savings.", r'backgroundColor:\s*["\']?#[0-9A-Fa-f]{6}')
 
         # 10.2 Saturated Color Detection (Battery)
         # Highly saturated colors consume more power on OLED
@@ -451,7 +468,7 @@ class MobileAuditor:
                 pass
 
         if saturated_count > 10:
-            self.warnings.append(f"[Mobile Color] {filename}: {saturated_count} highly saturated colors detected. Desaturated colors save battery on OLED screens.")
+            self._warn(f"[Mobile Color] {filename}: {saturated_count} highly saturated colors detected. Desaturated colors save battery on OLED screens.")
 
         # 10.3 Outdoor Visibility Check
         # Low contrast combinations fail in outdoor sunlight
@@ -459,7 +476,7 @@ class MobileAuditor:
         # Check for potential low contrast (light gray on white, dark gray on black)
         potential_low_contrast = bool(re.search(r'#[EeEeEeEe].*#ffffff|#999999.*#ffffff|#333333.*#000000|#666666.*#000000', content))
         if potential_low_contrast:
-            self.warnings.append(f"[Mobile Color] {filename}: Possible low contrast combination detected. Critical for outdoor visibility. Ensure WCAG AAA (7:1) for mobile.")
+            self._warn(f"[Mobile Color] {filename}: Possible low contrast combination detected. Critical for outdoor visibility. Ensure WCAG AAA (7:1) for mobile.", r'#[EeEeEeEe].*#ffffff|#999999.*#ffffff|#333333.*#000000|#666666.*#000000')
 
         # 10.4 Dark Mode Text Color Check
         # In dark mode, text should not be pure white
@@ -467,7 +484,7 @@ class MobileAuditor:
         if has_dark_mode:
             has_pure_white_text = bool(re.search(r'color:\s*["\']?#ffffff|#fff["\']?\}|textColor:\s*["\']?white', content))
             if has_pure_white_text:
-                self.warnings.append(f"[Mobile Color] {filename}: Pure white text (#FFFFFF) in dark mode. Use #E8E8E8 or light gray for better readability.")
+                self._warn(f"[Mobile Color] {filename}: Pure white text (#FFFFFF) in dark mode. Use #E8E8E8 or light gray for better readability.", r'color:\s*["\']?#ffffff|#fff["\']?\}|textColor:\s*["\']?white')
 
         # --- 11. EXTENDED PLATFORM IOS CHECKS ---
 
@@ -476,7 +493,7 @@ class MobileAuditor:
             has_sf_pro = bool(re.search(r'SF Pro|SFPro|fontFamily:\s*["\']?[-\s]*SF', content))
             has_custom_font = bool(re.search(r'fontFamily:\s*["\'][^"\']+', content))
             if has_custom_font and not has_sf_pro:
-                self.warnings.append(f"[iOS] {filename}: Custom font without SF Pro fallback. Consider SF Pro Text for body, SF Pro Display for headings.")
+                self._warn(f"[iOS] {filename}: Custom font without SF Pro fallback. Consider SF Pro Text for body, SF Pro Display for headings.", r'fontFamily:\s*["\'][^"\']+')
 
             # 11.2 iOS System Colors Check
             # Check for semantic color usage
@@ -486,7 +503,7 @@ class MobileAuditor:
 
             has_hardcoded_gray = bool(re.search(r'#[78]0{4}', content))
             if has_hardcoded_gray and not (has_label or has_secondaryLabel):
-                self.warnings.append(f"[iOS] {filename}: Hardcoded gray colors detected. Consider iOS semantic colors (label, secondaryLabel) for automatic dark mode.")
+                self._warn(f"[iOS] {filename}: Hardcoded gray colors detected. Consider iOS semantic colors (label, secondaryLabel) for automatic dark mode.", r'#[78]0{4}')
 
             # 11.3 iOS Accent Colors Check
             ios_blue = bool(re.search(r'#007AFF|#0A84FF|systemBlue', content))
@@ -495,13 +512,13 @@ class MobileAuditor:
 
             has_custom_primary = bool(re.search(r'primaryColor|theme.*primary|colors\.primary', content))
             if has_custom_primary and not (ios_blue or ios_green or ios_red):
-                self.warnings.append(f"[iOS] {filename}: Custom primary color without iOS system color fallback. Consider systemBlue for consistent iOS feel.")
+                self._warn(f"[iOS] {filename}: Custom primary color without iOS system color fallback. Consider systemBlue for consistent iOS feel.", r'primaryColor|theme.*primary|colors\.primary')
 
             # 11.4 iOS Navigation Patterns Check
             has_navigation_bar = bool(re.search(r'navigationOptions|headerStyle|cardStyle', content))
             has_header_title = bool(re.search(r'title:\s*["\']|headerTitle|navigation\.setOptions', content))
             if has_navigation_bar and not has_header_title:
-                self.warnings.append(f"[iOS] {filename}: Navigation bar detected without title. iOS apps should have clear context in nav bar.")
+                self._warn(f"[iOS] {filename}: Navigation bar detected without title. iOS apps should have clear context in nav bar.", r'navigationOptions|headerStyle|cardStyle')
 
             # 11.5 iOS Component Patterns Check
             # Check for iOS-specific components
@@ -519,20 +536,20 @@ class MobileAuditor:
             has_roboto = bool(re.search(r'Roboto|fontFamily:\s*["\']?[-\s]*Roboto', content))
             has_custom_font = bool(re.search(r'fontFamily:\s*["\'][^"\']+', content))
             if has_custom_font and not has_roboto:
-                self.warnings.append(f"[Android] {filename}: Custom font without Roboto fallback. Roboto is optimized for Android displays.")
+                self._warn(f"[Android] {filename}: Custom font without Roboto fallback. Roboto is optimized for Android displays.", r'fontFamily:\s*["\'][^"\']+')
 
             # 12.2 Material 3 Dynamic Color Check
             has_material_colors = bool(re.search(r'MD3|MaterialYou|dynamicColor|useColorScheme', content))
             has_theme_provider = bool(re.search(r'MaterialTheme|ThemeProvider|PaperProvider|ThemeProvider', content))
             if not has_material_colors and not has_theme_provider:
-                self.warnings.append(f"[Android] {filename}: No Material 3 dynamic color detected. Consider Material 3 theming for personalized feel.")
+                self._warn(f"[Android] {filename}: No Material 3 dynamic color detected. Consider Material 3 theming for personalized feel.")
 
             # 12.3 Material Elevation Check
             # Check for elevation values (Material 3 uses elevation for depth)
             has_elevation = bool(re.search(r'elevation:\s*\d+|shadowOpacity|shadowRadius|android:elevation', content))
             has_box_shadow = bool(re.search(r'boxShadow:', content))
             if has_box_shadow and not has_elevation:
-                self.warnings.append(f"[Android] {filename}: CSS box-shadow detected without elevation. Consider Material elevation system for consistent depth.")
+                self._warn(f"[Android] {filename}: CSS box-shadow detected without elevation. Consider Material elevation system for consistent depth.", r'boxShadow:')
 
             # 12.4 Material Component Patterns Check
             # Check for Material components
@@ -553,7 +570,7 @@ class MobileAuditor:
             if has_bottom_nav:
                 self.passed_count += 1  # Good Android pattern
             elif has_top_app_bar and not (has_bottom_nav or has_navigation_rail):
-                self.warnings.append(f"[Android] {filename}: TopAppBar without bottom navigation. Consider BottomNavigation for thumb-friendly access.")
+                self._warn(f"[Android] {filename}: TopAppBar without bottom navigation. Consider BottomNavigation for thumb-friendly access.", r'TopAppBar|AppBar|CollapsingToolbar')
 
         # --- 13. MOBILE TESTING CHECKS ---
 
@@ -570,21 +587,21 @@ class MobileAuditor:
         if has_maestro: testing_tools.append('Maestro')
 
         if len(testing_tools) == 0:
-            self.warnings.append(f"[Testing] {filename}: No testing framework detected. Consider Jest (unit) + Detox/Maestro (E2E) for mobile.")
+            self._warn(f"[Testing] {filename}: No testing framework detected. Consider Jest (unit) + Detox/Maestro (E2E) for mobile.")
 
         # 13.2 Test Pyramid Balance Check
         test_files = len(re.findall(r'\.test\.(tsx|ts|js|jsx)|\.spec\.', content))
         e2e_tests = len(re.findall(r'detox|maestro|e2e|spec\.e2e', content.lower()))
 
         if test_files > 0 and e2e_tests == 0:
-            self.warnings.append(f"[Testing] {filename}: Unit tests found but no E2E tests. Mobile needs E2E on real devices for complete coverage.")
+            self._warn(f"[Testing] {filename}: Unit tests found but no E2E tests. Mobile needs E2E on real devices for complete coverage.", r'\.test\.(tsx|ts|js|jsx)|\.spec\.')
 
         # 13.3 Accessibility Label Check (Mobile-specific)
         if is_react_native:
             has_pressable = bool(re.search(r'Pressable|TouchableOpacity|TouchableHighlight', content))
             has_a11y_label = bool(re.search(r'accessibilityLabel|aria-label|testID', content))
             if has_pressable and not has_a11y_label:
-                self.warnings.append(f"[A11y Mobile] {filename}: Touchable element without accessibilityLabel. Screen readers need labels for all interactive elements.")
+                self._warn(f"[A11y Mobile] {filename}: Touchable element without accessibilityLabel. Screen readers need labels for all interactive elements.", r'Pressable|TouchableOpacity|TouchableHighlight')
 
         # --- 14. MOBILE DEBUGGING CHECKS ---
 
@@ -594,7 +611,7 @@ class MobileAuditor:
         has_debugger = bool(re.search(r'debugger|__DEV__|React\.DevTools', content))
 
         if has_console_log > 10:
-            self.warnings.append(f"[Debugging] {filename}: {has_console_log} console.log statements. Remove before production; they block JS thread.")
+            self._warn(f"[Debugging] {filename}: {has_console_log} console.log statements. Remove before production; they block JS thread.", r'console\.(log|warn|error|debug|info)')
 
         if has_performance:
             self.passed_count += 1  # Good performance monitoring
@@ -602,7 +619,7 @@ class MobileAuditor:
         # 14.2 Error Boundary Check
         has_error_boundary = bool(re.search(r'ErrorBoundary|componentDidCatch|getDerivedStateFromError', content))
         if not has_error_boundary and is_react_native:
-            self.warnings.append(f"[Debugging] {filename}: No ErrorBoundary detected. Consider adding ErrorBoundary to prevent app crashes.")
+            self._warn(f"[Debugging] {filename}: No ErrorBoundary detected. Consider adding ErrorBoundary to prevent app crashes.")
 
         # 14.3 Hermes Check (React Native specific)
         if is_react_native:
@@ -610,41 +627,107 @@ class MobileAuditor:
             # This is more of a configuration check, not code pattern
             self.passed_count += 1  # Hermes is default in RN 0.70+
 
-    def audit_directory(self, directory: str) -> None:
-        extensions = {'.tsx', '.ts', '.jsx', '.js', '.dart'}
-        for root, dirs, files in os.walk(directory):
-            dirs[:] = [d for d in dirs if d not in {'node_modules', '.git', 'dist', 'build', '.next', 'ios', 'android', 'build', '.idea'}]
-            for file in files:
-                if Path(file).suffix in extensions:
-                    self.audit_file(os.path.join(root, file))
+    def _issue(self, message: str, anchor: str = None) -> None:
+        self.issues.append(message)
+        self._record('issue', message, anchor)
+
+    def _warn(self, message: str, anchor: str = None) -> None:
+        self.warnings.append(message)
+        self._record('warning', message, anchor)
+
+    def _record(self, severity: str, message: str, anchor: str = None) -> None:
+        """Add the structured finding; anchor locates the construct that triggered it."""
+        category, _, text = message.partition('] ')
+        text = text.partition(': ')[2]
+        self.findings.append({
+            "file": self._filepath,
+            "line": first_line(self._content, anchor) if anchor else None,
+            "severity": severity,
+            "category": category.lstrip('['),
+            "message": text,
+        })
+
+    def audit_directory(self, directory: str, use_cache: bool = True, workers: int = None, stream=None,
+                        since: str = None) -> None:
+        """
+        Audit every mobile source file under directory, skipping ios/android
+        and the shared project-scan ignore list (build outputs such as
+        .dart_tool and coverage, plus .agentignore entries), which the old
+        os.walk loop did not. Files are visited in sorted path order rather
+        than filesystem order. workers > 1 (0: one per CPU) audits files in
+        parallel; findings are merged in path order either way. With stream, each finding is written to it as a JSON line
+        as soon as its file is done. With since (a git revision), only files
+        changed since then are re-audited; the rest come from the cache.
+        """
+        scanner = ProjectScanner(directory, name='mobile_audit', use_cache=use_cache, since=since)
+        scanner.register('mobile', audit_scan_file, extensions=EXTENSIONS, skip_dirs=SKIP_DIRS)
+        on_result = (lambda _, __, result: write_findings(stream, result)) if stream else None
+        for _, result in scanner.run(workers, on_result)['mobile']:
+            self.merge(result)
+
+    def merge(self, report: dict) -> None:
+        """Fold a per-file report (see audit_scan_file) into this auditor."""
+        self.files_checked += report['files_checked']
+        self.issues.extend(report['issues'])
+        self.warnings.extend(report['warnings'])
+        self.findings.extend(report['findings'])
+        self.passed_count += report['passed_checks']
 
     def get_report(self):
         return {
             "files_checked": self.files_checked,
             "issues": self.issues,
             "warnings": self.warnings,
+            "findings": self.findings,
             "passed_checks": self.passed_count,
             "compliant": len(self.issues) == 0
         }
 
 
+
+def audit_scan_file(scan_file) -> dict:
+    """Audit one file with a fresh MobileAuditor; returns its (cacheable) report."""
+    auditor = MobileAuditor()
+    auditor.audit_content(scan_file.text, scan_file.rel)
+    return auditor.get_report()
+
+
+def write_findings(stream, report: dict) -> None:
+    """Write a report's findings as JSON lines and flush, for streaming consumers."""
+    for finding in report['findings']:
+        stream.write(json.dumps(finding) + "\n")
+    stream.flush()
+
+
 def main():
     if len(sys.argv) < 2:
-        print("Usage: python mobile_audit.py <directory>")
+        print("Usage: python mobile_audit.py <directory> [--json | --jsonl] [--workers N] [--since REV] [--no-cache]")
         sys.exit(1)
 
     path = sys.argv[1]
     is_json = "--json" in sys.argv
+    is_jsonl = "--jsonl" in sys.argv
+    use_cache = "--no-cache" not in sys.argv
+    argv, since = pop_option(sys.argv[1:], "--since")
+    argv, workers = pop_option(argv, "--workers")
+    workers = None if workers is None else int(workers or 0)
 
     auditor = MobileAuditor()
+    stream = sys.stdout if is_jsonl else None
     if os.path.isfile(path):
         auditor.audit_file(path)
+        if stream:
+            write_findings(stream, auditor.get_report())
     else:
-        auditor.audit_directory(path)
+        auditor.audit_directory(path, use_cache, workers, stream, since)
 
     report = auditor.get_report()
 
-    if is_json:
+    if is_jsonl:
+        summary = {k: v for k, v in report.items() if k not in ('issues', 'warnings', 'findings')}
+        summary.update(issues=len(report['issues']), warnings=len(report['warnings']))
+        print(json.dumps({"summary": summary}))
+    elif is_json:
         print(json.dumps(report, indent=2))
     else:
         print(f"\n[MOBILE AUDIT] {report['files_checked']} mobile files checked")
@@ -2,64 +2,113 @@
 """
 Skill: performance-profiling
 Script: lighthouse_audit.py
-Purpose: Run Lighthouse performance audit on a URL
+Purpose: Run Lighthouse performance audit on a URL, or on every route of a static build
 Usage: python lighthouse_audit.py https://example.com
-Output: JSON with performance scores
+       python lighthouse_audit.py --build build/web --routes / /#/settings [--jobs 2]
+           [--routes-file routes.txt] [--baseline lighthouse_baseline.json] [--save-baseline]
+           [--no-cache] [--json]
+Output: JSON with performance scores; in batch mode a budget table (LCP, TBT, CLS, JS size)
+        against the baseline, or JSON with --json
 Note: Requires lighthouse CLI (npm install -g lighthouse)
+
+Batch mode serves the build directory (e.g. Flutter's build/web) on a local
+static server, with unknown extensionless paths falling back to index.html,
+and runs up to --jobs Lighthouse processes at once. Concurrent runs share the
+CPU and inflate TBT/LCP, so compare runs made with the same --jobs.
+
+Metrics are cached per (route, build hash) in .cache/ next to this script, so
+re-running on an unchanged build audits nothing. A route fails when a metric
+is over its budget or worse than the baseline by more than
+REGRESSION_TOLERANCE (and the metric's minimum delta).
 """
+import argparse
+import hashlib
 import subprocess
 import json
 import sys
 import os
 import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import urlsplit
 
-def run_lighthouse(url: str) -> dict:
-    """Run Lighthouse audit on URL."""
+# ============ CONFIGURATION ============
+CACHE_DIR = Path(__file__).parent / ".cache"
+CACHE_VERSION = 1
+DEFAULT_JOBS = 2
+DEFAULT_BASELINE = "lighthouse_baseline.json"
+REGRESSION_TOLERANCE = 0.10
+
+# metric: (column, budget, smallest change worth flagging)
+# The local server does not compress, so JS KB is the raw script size.
+METRICS = {
+    "lcp_ms": ("LCP ms", 2500, 100),
+    "tbt_ms": ("TBT ms", 200, 50),
+    "cls": ("CLS", 0.1, 0.01),
+    "script_kb": ("JS KB", 4000, 10),
+}
+
+def lighthouse_cmd(url: str, output_path: str, categories: str) -> list:
+    return [
+        "lighthouse",
+        url,
+        "--output=json",
+        f"--output-path={output_path}",
+        "--chrome-flags=--headless",
+        f"--only-categories={categories}"
+    ]
+
+def run_report(url: str, categories: str, timeout: int = 120):
+    """(Lighthouse JSON report, None), or (None, error dict)."""
     try:
         with tempfile.NamedTemporaryFile(suffix='.json', delete=False) as f:
             output_path = f.name
-        
-        result = subprocess.run(
-            [
-                "lighthouse",
-                url,
-                "--output=json",
-                f"--output-path={output_path}",
-                "--chrome-flags=--headless",
-                "--only-categories=performance,accessibility,best-practices,seo"
-            ],
-            capture_output=True,
-            text=True,
-            timeout=120
-        )
-        
-        if os.path.exists(output_path):
-            with open(output_path, 'r') as f:
-                report = json.load(f)
-            os.unlink(output_path)
-            
-            categories = report.get("categories", {})
-            return {
-                "url": url,
-                "scores": {
-                    "performance": int(categories.get("performance", {}).get("score", 0) * 100),
-                    "accessibility": int(categories.get("accessibility", {}).get("score", 0) * 100),
-                    "best_practices": int(categories.get("best-practices", {}).get("score", 0) * 100),
-                    "seo": int(categories.get("seo", {}).get("score", 0) * 100)
-                },
-                "summary": get_summary(categories)
-            }
-        else:
-            return {"error": "Lighthouse failed to generate report", "stderr": result.stderr[:500]}
-            
+
+        try:
+            result = subprocess.run(
+                lighthouse_cmd(url, output_path, categories),
+                capture_output=True,
+                text=True,
+                timeout=timeout
+            )
+            if os.path.exists(output_path) and os.path.getsize(output_path):
+                with open(output_path, 'r', encoding='utf-8') as f:
+                    return json.load(f), None
+            return None, {"error": "Lighthouse failed to generate report", "stderr": result.stderr[:500]}
+        finally:
+            if os.path.exists(output_path):
+                os.unlink(output_path)
+
     except subprocess.TimeoutExpired:
-        return {"error": "Lighthouse audit timed out"}
+        return None, {"error": "Lighthouse audit timed out"}
     except FileNotFoundError:
-        return {"error": "Lighthouse CLI not found. Install with: npm install -g lighthouse"}
+        return None, {"error": "Lighthouse CLI not found. Install with: npm install -g lighthouse"}
+
+def run_lighthouse(url: str) -> dict:
+    """Run Lighthouse audit on URL."""
+    report, error = run_report(url, "performance,accessibility,best-practices,seo")
+    if error:
+        return error
+
+    categories = report.get("categories", {})
+    return {
+        "url": url,
+        "scores": {
+            "performance": int((categories.get("performance", {}).get("score") or 0) * 100),
+            "accessibility": int((categories.get("accessibility", {}).get("score") or 0) * 100),
+            "best_practices": int((categories.get("best-practices", {}).get("score") or 0) * 100),
+            "seo": int((categories.get("seo", {}).get("score") or 0) * 100)
+        },
+        "summary": get_summary(categories)
+    }
 
 def get_summary(categories: dict) -> str:
     """Generate summary based on scores."""
-    perf = categories.get("performance", {}).get("score", 0) * 100
+    perf = (categories.get("performance", {}).get("score") or 0) * 100
     if perf >= 90:
         return "[OK] Excellent performance"
     elif perf >= 50:
@@ -67,10 +116,210 @@ def get_summary(categories: dict) -> str:
     else:
         return "[X] Poor performance"
 
+def extract_metrics(report: dict) -> dict:
+    """Budget metrics of a report: performance score, LCP/TBT in ms, CLS, script and total KB."""
+    audits = report.get("audits", {})
+
+    def numeric(audit_id):
+        return audits.get(audit_id, {}).get("numericValue")
+
+    script_bytes = None
+    for item in audits.get("resource-summary", {}).get("details", {}).get("items", []):
+        if item.get("resourceType") == "script":
+            script_bytes = item.get("transferSize")
+
+    lcp, tbt, cls, total = (numeric(a) for a in (
+        "largest-contentful-paint", "total-blocking-time", "cumulative-layout-shift", "total-byte-weight"))
+    score = report.get("categories", {}).get("performance", {}).get("score")
+    return {
+        "performance": int(score * 100) if score is not None else None,
+        "lcp_ms": round(lcp) if lcp is not None else None,
+        "tbt_ms": round(tbt) if tbt is not None else None,
+        "cls": round(cls, 3) if cls is not None else None,
+        "script_kb": round(script_bytes / 1024) if script_bytes is not None else None,
+        "total_kb": round(total / 1024) if total is not None else None,
+    }
+
+# ============ BATCH MODE ============
+
+def build_hash(build_dir: Path) -> str:
+    """sha1 over the relative path and content of every file of the build."""
+    digest = hashlib.sha1()
+    for path in sorted(p for p in build_dir.rglob('*') if p.is_file()):
+        digest.update(path.relative_to(build_dir).as_posix().encode('utf-8') + b'\0')
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+class SpaHandler(SimpleHTTPRequestHandler):
+    """Static files; extensionless paths with no file are the app's routes (index.html)."""
+
+    def send_head(self):
+        if not Path(urlsplit(self.path).path).suffix and not os.path.exists(self.translate_path(self.path)):
+            self.path = '/index.html'
+        return super().send_head()
+
+    def log_message(self, format, *args):
+        pass
+
+@contextmanager
+def serve(build_dir: Path):
+    """Serve build_dir on a free local port for the duration; yields the base URL."""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), partial(SpaHandler, directory=str(build_dir)))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+def audit_url(url: str) -> dict:
+    report, error = run_report(url, "performance")
+    return error if error else extract_metrics(report)
+
+def audit_routes(build_dir: Path, routes: list, jobs: int = DEFAULT_JOBS, use_cache: bool = True):
+    """
+    Audit each route of the build, at most `jobs` at a time. Returns
+    (build hash, [(route, metrics)]) in route order; metrics of cached routes
+    carry 'cached': True, failed routes are an error dict.
+    """
+    digest = build_hash(build_dir)
+    results = {}
+    pending = {}
+    for route in routes:
+        key = hashlib.sha1(f"{CACHE_VERSION}:{route}:{digest}".encode('utf-8')).hexdigest()[:20]
+        cache_path = CACHE_DIR / f"{key}.json"
+        if use_cache and cache_path.exists():
+            try:
+                results[route] = {**json.loads(cache_path.read_text(encoding='utf-8')), "cached": True}
+                continue
+            except ValueError:
+                pass
+        pending[route] = cache_path
+
+    if pending:
+        with serve(build_dir) as base, ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+            futures = {pool.submit(audit_url, base + (route if route.startswith('/') else '/' + route)): route
+                       for route in pending}
+            for future in as_completed(futures):
+                route = futures[future]
+                metrics = future.result()
+                results[route] = metrics
+                if "error" not in metrics:
+                    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+                    pending[route].write_text(json.dumps(metrics), encoding='utf-8')
+
+    return digest, [(route, results[route]) for route in routes]
+
+def metric_status(metric: str, value, base) -> str:
+    """ok, over (budget) or regressed (against the baseline value)."""
+    _, budget, min_delta = METRICS[metric]
+    if value is None:
+        return "ok"
+    if value > budget:
+        return "over"
+    if base is not None and value - base >= min_delta and value > base * (1 + REGRESSION_TOLERANCE):
+        return "regressed"
+    return "ok"
+
+def compare(results: list, baseline: dict) -> list:
+    """Rows of {route, metrics, baseline, status: {metric: ok|over|regressed}} (or error)."""
+    rows = []
+    for route, metrics in results:
+        base = baseline.get(route, {})
+        if "error" in metrics:
+            rows.append({"route": route, "error": metrics["error"]})
+            continue
+        rows.append({
+            "route": route,
+            "metrics": metrics,
+            "baseline": base or None,
+            "status": {m: metric_status(m, metrics.get(m), base.get(m)) for m in METRICS},
+        })
+    return rows
+
+def format_value(value, base) -> str:
+    if value is None:
+        return "-"
+    text = f"{value:g}" if isinstance(value, float) else f"{value:,}"
+    if base is not None and value != base:
+        delta = value - base
+        text += f" ({'+' if delta > 0 else ''}{round(delta, 3):g})" if isinstance(delta, float) else f" ({delta:+,})"
+    return text
+
+def print_table(rows: list, digest: str):
+    marks = {"ok": "", "over": " X", "regressed": " !"}
+    width = max([len("Route")] + [len(r["route"]) for r in rows])
+    print(f"Build {digest[:12]}  (X over budget, ! regressed vs baseline)")
+    print(f"{'Route':<{width}}  {'Perf':>4}  " + "  ".join(f"{label:>16}" for label, _, _ in METRICS.values()))
+    print(f"{'budget':<{width}}  {'':>4}  " + "  ".join(f"{budget:>16g}" for _, budget, _ in METRICS.values()))
+    for row in rows:
+        if "error" in row:
+            print(f"{row['route']:<{width}}  [X] {row['error']}")
+            continue
+        metrics, base = row["metrics"], row["baseline"] or {}
+        perf = metrics.get("performance")
+        cells = [format_value(metrics.get(m), base.get(m)) + marks[row["status"][m]] for m in METRICS]
+        cached = "  (cached)" if metrics.get("cached") else ""
+        print(f"{row['route']:<{width}}  {perf if perf is not None else '-':>4}  "
+              + "  ".join(f"{c:>16}" for c in cells) + cached)
+
+def load_baseline(path: Path) -> dict:
+    try:
+        return json.loads(path.read_text(encoding='utf-8')).get("routes", {})
+    except (OSError, ValueError):
+        return {}
+
+def run_batch(args) -> int:
+    build_dir = Path(args.build).resolve()
+    if not (build_dir / "index.html").exists():
+        print(json.dumps({"error": f"No index.html in {build_dir} (run: flutter build web)"}))
+        return 1
+
+    routes = list(args.routes or [])
+    if args.routes_file:
+        with open(args.routes_file, 'r', encoding='utf-8') as f:
+            routes += [line.strip() for line in f if line.strip() and not line.startswith('#')]
+    routes = list(dict.fromkeys(routes or ["/"]))
+
+    digest, results = audit_routes(build_dir, routes, args.jobs, use_cache=not args.no_cache)
+    baseline_path = Path(args.baseline)
+    rows = compare(results, load_baseline(baseline_path))
+    passed = all("error" not in r and set(r["status"].values()) == {"ok"} for r in rows)
+
+    if args.json:
+        print(json.dumps({"build": digest, "routes": rows, "passed": passed}, indent=2))
+    else:
+        print_table(rows, digest)
+
+    if args.save_baseline:
+        routes_metrics = {route: {k: v for k, v in m.items() if k != "cached"}
+                          for route, m in results if "error" not in m}
+        baseline_path.write_text(json.dumps({"build": digest, "routes": routes_metrics}, indent=2),
+                                 encoding='utf-8')
+        if not args.json:
+            print(f"Baseline saved: {baseline_path}")
+
+    return 0 if passed else 1
+
 if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print(json.dumps({"error": "Usage: python lighthouse_audit.py <url>"}))
+    parser = argparse.ArgumentParser(description="Lighthouse audit of a URL, or of every route of a static build")
+    parser.add_argument("url", nargs="?", help="URL to audit (single mode)")
+    parser.add_argument("--build", help="Static build directory to serve and audit (e.g. build/web)")
+    parser.add_argument("--routes", nargs="*", help="Routes to audit, e.g. / /#/settings")
+    parser.add_argument("--routes-file", help="File with one route per line")
+    parser.add_argument("--jobs", type=int, default=DEFAULT_JOBS, help="Concurrent Lighthouse runs")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline JSON to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="Store this run as the baseline")
+    parser.add_argument("--no-cache", action="store_true", help="Re-audit routes already cached for this build")
+    parser.add_argument("--json", action="store_true", help="JSON output instead of the table")
+    args = parser.parse_args()
+
+    if args.build:
+        sys.exit(run_batch(args))
+    if not args.url:
+        print(json.dumps({"error": "Usage: python lighthouse_audit.py <url> | --build <dir> --routes ..."}))
         sys.exit(1)
-    
-    result = run_lighthouse(sys.argv[1])
+
+    result = run_lighthouse(args.url)
     print(json.dumps(result, indent=2))
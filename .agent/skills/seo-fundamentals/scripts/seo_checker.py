@@ -23,6 +23,10 @@ import re
 from pathlib import Path
 from datetime import datetime
 
+# Shared single-pass walker (.agent/.shared/project-scan)
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / ".shared" / "project-scan" / "scripts"))
+from project_scan import ProjectScanner
+
 # Fix Windows console encoding
 try:
     sys.stdout.reconfigure(encoding='utf-8', errors='replace')
@@ -75,32 +79,26 @@ def is_page_file(file_path: Path) -> bool:
     return False
 
 
-def find_pages(project_path: Path) -> list:
-    """Find page files to check."""
-    patterns = ['**/*.html', '**/*.htm', '**/*.jsx', '**/*.tsx']
-    
-    files = []
-    for pattern in patterns:
-        for f in project_path.glob(pattern):
-            # Skip excluded directories
-            if any(skip in f.parts for skip in SKIP_DIRS):
-                continue
-            
-            # Check if it's likely a page
-            if is_page_file(f):
-                files.append(f)
-    
-    return files[:50]  # Limit to 50 files
+PAGE_EXTENSIONS = {'.html', '.htm', '.jsx', '.tsx'}
+
 
+def scan_pages(project_path: Path, use_cache: bool = True) -> list:
+    """Check the first 50 page files in sorted path order. Returns [(file, check_page result)]."""
+    scanner = ProjectScanner(project_path, name='seo_checker', use_cache=use_cache)
+    scanner.register('seo', check_scan_file, extensions=PAGE_EXTENSIONS,
+                     accept=lambda f: is_page_file(f.path), skip_dirs=SKIP_DIRS, limit=50)
+    return scanner.run()['seo']
 
-def check_page(file_path: Path) -> dict:
+
+def check_page(file_path: Path, content: str = None) -> dict:
     """Check a single page for SEO issues."""
     issues = []
     
-    try:
-        content = file_path.read_text(encoding='utf-8', errors='ignore')
-    except Exception as e:
-        return {"file": str(file_path.name), "issues": [f"Error: {e}"]}
+    if content is None:
+        try:
+            content = file_path.read_text(encoding='utf-8', errors='ignore')
+        except Exception as e:
+            return {"file": str(file_path.name), "issues": [f"Error: {e}"]}
     
     # Detect if this is a layout/template file (has Head component)
     is_layout = 'Head>' in content or '<head' in content.lower()
@@ -145,8 +143,13 @@ def check_page(file_path: Path) -> dict:
     }
 
 
+
+def check_scan_file(scan_file) -> dict:
+    return check_page(scan_file.path, scan_file.text)
+
 def main():
-    project_path = Path(sys.argv[1] if len(sys.argv) > 1 else ".").resolve()
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    project_path = Path(args[0] if args else ".").resolve()
     
     print(f"\n{'='*60}")
     print(f"  SEO CHECKER - Search Engine Optimization Audit")
@@ -155,8 +158,8 @@ def main():
     print(f"Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print("-"*60)
     
-    # Find pages
-    pages = find_pages(project_path)
+    # Find and check pages in one pass
+    pages = scan_pages(project_path, use_cache="--no-cache" not in sys.argv)
     
     if not pages:
         print("\n[!] No page files found.")
@@ -169,8 +172,7 @@ def main():
     
     # Check each page
     all_issues = []
-    for f in pages:
-        result = check_page(f)
+    for _, result in pages:
         if result["issues"]:
             all_issues.append(result)
     
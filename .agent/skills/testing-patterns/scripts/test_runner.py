@@ -4,19 +4,36 @@ Test Runner - Unified test execution and coverage reporting
 Runs tests and generates coverage report based on project type.
 
 Usage:
-    python test_runner.py <project_path> [--coverage]
+    python test_runner.py <project_path> [--coverage] [--no-history]
 
 Supports:
     - Node.js: npm test, jest, vitest
     - Python: pytest, unittest
+
+Counts and per-test durations come from the framework's reporter file
+(pytest JUnit XML, Jest/Vitest JSON) rather than console text, which is
+only parsed when no report was written. The run is timed (wall and CPU
+seconds) and recorded in the shared run history; test files and tests
+that got markedly slower than their recent median are flagged. See
+`run_history.py test_runner <project_path>` for the trend.
 """
 
+import re
 import subprocess
 import sys
 import json
+import tempfile
 from pathlib import Path
 from datetime import datetime
 
+# Shared run timing and history (.agent/.shared/run-history)
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / ".shared" / "run-history" / "scripts"))
+from run_history import RunHistory, file_seconds, parse_jest_json, parse_junit, slowest, timed_run
+
+# With no history, a test file / single test is flagged slow above these
+SLOW_FILE_SECONDS = 10
+SLOW_TEST_SECONDS = 2
+
 # Fix Windows console encoding
 try:
     sys.stdout.reconfigure(encoding='utf-8', errors='replace')
@@ -30,7 +47,8 @@ def detect_test_framework(project_path: Path) -> dict:
         "type": "unknown",
         "framework": None,
         "cmd": None,
-        "coverage_cmd": None
+        "coverage_cmd": None,
+        "reporter": None
     }
     
     # Node.js project
@@ -51,17 +69,21 @@ def detect_test_framework(project_path: Path) -> dict:
                 if "vitest" in deps:
                     result["framework"] = "vitest"
                     result["coverage_cmd"] = ["npx", "vitest", "run", "--coverage"]
+                    result["reporter"] = "vitest-json"
                 elif "jest" in deps:
                     result["framework"] = "jest"
                     result["coverage_cmd"] = ["npx", "jest", "--coverage"]
+                    result["reporter"] = "jest-json"
             elif "vitest" in deps:
                 result["framework"] = "vitest"
                 result["cmd"] = ["npx", "vitest", "run"]
                 result["coverage_cmd"] = ["npx", "vitest", "run", "--coverage"]
+                result["reporter"] = "vitest-json"
             elif "jest" in deps:
                 result["framework"] = "jest"
                 result["cmd"] = ["npx", "jest"]
                 result["coverage_cmd"] = ["npx", "jest", "--coverage"]
+                result["reporter"] = "jest-json"
                 
         except:
             pass
@@ -72,42 +94,75 @@ def detect_test_framework(project_path: Path) -> dict:
         result["framework"] = "pytest"
         result["cmd"] = ["python", "-m", "pytest", "-v"]
         result["coverage_cmd"] = ["python", "-m", "pytest", "--cov", "--cov-report=term-missing"]
+        result["reporter"] = "junit"
     
     return result
 
 
-def run_tests(cmd: list, cwd: Path) -> dict:
-    """Run tests and return results."""
+def reporter_args(reporter: str, report_file: Path, cmd: list) -> list:
+    """Extra arguments that make the framework write its machine-readable report."""
+    if reporter == "junit":
+        # xunit1 keeps the file attribute on every test case
+        args = [f"--junitxml={report_file}", "-o", "junit_family=xunit1"]
+    elif reporter == "jest-json":
+        args = ["--json", f"--outputFile={report_file}"]
+    elif reporter == "vitest-json":
+        args = ["--reporter=default", "--reporter=json", f"--outputFile={report_file}"]
+    else:
+        return []
+    # npm test forwards arguments after "--" to the test script
+    return ["--", *args] if cmd[:2] == ["npm", "test"] else args
+
+
+def read_report(reporter: str, report_file: Path) -> list:
+    """Test cases from the reporter file, or None when it was not written or is unreadable."""
+    if not reporter or not report_file.exists():
+        return None
+    try:
+        return parse_junit(report_file) if reporter == "junit" else parse_jest_json(report_file)
+    except (ValueError, KeyError, OSError):
+        return None
+
+
+def run_tests(cmd: list, cwd: Path, reporter: str = None) -> dict:
+    """Run tests and return results, with timing and per-file / per-test durations."""
     result = {
         "passed": False,
         "output": "",
         "error": "",
         "tests_run": 0,
         "tests_passed": 0,
-        "tests_failed": 0
+        "tests_failed": 0,
+        "timing": {"wall": None, "cpu": None},
+        "files": {},
+        "tests": {}
     }
     
+    tmp = tempfile.TemporaryDirectory()
+    report_file = Path(tmp.name) / ("report.xml" if reporter == "junit" else "report.json")
     try:
-        proc = subprocess.run(
-            cmd,
-            cwd=str(cwd),
-            capture_output=True,
-            text=True,
-            encoding='utf-8',
-            errors='replace',
-            timeout=300  # 5 min timeout for tests
-        )
+        proc, result["timing"] = timed_run(cmd + reporter_args(reporter, report_file, cmd), cwd,
+                                           timeout=300)  # 5 min timeout for tests
         
         result["output"] = proc.stdout[:3000] if proc.stdout else ""
         result["error"] = proc.stderr[:500] if proc.stderr else ""
         result["passed"] = proc.returncode == 0
         
+        # Structured report first; console text only as a fallback
+        cases = read_report(reporter, report_file)
+        if cases is not None:
+            result["tests_passed"] = sum(1 for c in cases if c["status"] == "passed")
+            result["tests_failed"] = sum(1 for c in cases if c["status"] == "failed")
+            result["tests_run"] = result["tests_passed"] + result["tests_failed"]
+            result["files"] = file_seconds(cases)
+            result["tests"] = {c["id"]: round(c["seconds"], 3) for c in cases}
+            return result
+        
         # Try to parse test counts from output
         output = proc.stdout or ""
         
         # Jest/Vitest pattern: "Tests: X passed, Y failed, Z total"
         if "passed" in output.lower() and "failed" in output.lower():
-            import re
             match = re.search(r'(\d+)\s+passed', output, re.IGNORECASE)
             if match:
                 result["tests_passed"] = int(match.group(1))
@@ -118,7 +173,6 @@ def run_tests(cmd: list, cwd: Path) -> dict:
         
         # Pytest pattern: "X passed, Y failed"
         if "pytest" in str(cmd):
-            import re
             match = re.search(r'(\d+)\s+passed', output)
             if match:
                 result["tests_passed"] = int(match.group(1))
@@ -131,15 +185,20 @@ def run_tests(cmd: list, cwd: Path) -> dict:
         result["error"] = f"Command not found: {cmd[0]}"
     except subprocess.TimeoutExpired:
         result["error"] = "Timeout after 300s"
+        result["timing"]["wall"] = 300
     except Exception as e:
         result["error"] = str(e)
+    finally:
+        tmp.cleanup()
     
     return result
 
 
 def main():
-    project_path = Path(sys.argv[1] if len(sys.argv) > 1 else ".").resolve()
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    project_path = Path(args[0] if args else ".").resolve()
     with_coverage = "--coverage" in sys.argv
+    history = None if "--no-history" in sys.argv else RunHistory("test_runner", project_path)
     
     print(f"\n{'='*60}")
     print(f"[TEST RUNNER] Unified Test Execution")
@@ -174,7 +233,7 @@ def main():
     print("-"*60)
     
     # Run tests
-    result = run_tests(cmd, project_path)
+    result = run_tests(cmd, project_path, test_info["reporter"])
     
     # Print output (truncated)
     if result["output"]:
@@ -199,6 +258,26 @@ def main():
     if result["tests_run"] > 0:
         print(f"Tests: {result['tests_run']} total, {result['tests_passed']} passed, {result['tests_failed']} failed")
     
+    # Timing against previous runs
+    timing = result["timing"]
+    if timing["wall"] is not None:
+        print(f"Duration: {timing['wall']}s wall" + (f", {timing['cpu']}s cpu" if timing["cpu"] is not None else ""))
+    slow_files = history.flag_slow("files", result["files"], absolute=SLOW_FILE_SECONDS) if history else []
+    slow_tests = history.flag_slow("tests", result["tests"], absolute=SLOW_TEST_SECONDS) if history else []
+    for entry in (slow_files + slow_tests)[:10]:
+        baseline = f"usually {entry['baseline']}s" if entry["baseline"] is not None else "no history"
+        print(f"[SLOW] {entry['name']}: {entry['seconds']}s ({baseline})")
+    
+    if history and timing["wall"] is not None:
+        history.append({
+            "wall": timing["wall"],
+            "cpu": timing["cpu"],
+            "passed": result["passed"],
+            "coverage": with_coverage,
+            "tests_run": result["tests_run"],
+            "timings": {"files": result["files"], "tests": result["tests"]}
+        })
+    
     output = {
         "script": "test_runner",
         "project": str(project_path),
@@ -207,6 +286,10 @@ def main():
         "tests_run": result["tests_run"],
         "tests_passed": result["tests_passed"],
         "tests_failed": result["tests_failed"],
+        "timing": timing,
+        "slowest_files": slowest(result["files"]),
+        "slowest_tests": slowest(result["tests"]),
+        "slow": {"files": slow_files, "tests": slow_tests},
         "passed": result["passed"]
     }
     
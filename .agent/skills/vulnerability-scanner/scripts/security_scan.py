@@ -22,6 +22,11 @@ from pathlib import Path
 from typing import Dict, List, Any
 from datetime import datetime
 
+# Shared single-pass walker (.agent/.shared/project-scan)
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / ".shared" / "project-scan" / "scripts"))
+from project_scan import ProjectScanner
+from pattern_set import PatternSet
+
 # Fix Windows console encoding for Unicode output
 try:
     sys.stdout.reconfigure(encoding='utf-8', errors='replace')
@@ -34,58 +39,79 @@ except AttributeError:
 #  CONFIGURATION
 # ============================================================================
 
+# (pattern, type, severity, literals): matched together in one pass (see
+# .shared/project-scan/scripts/pattern_set.py). A rule only runs on files
+# that contain one of its literals (case-insensitive). Each rule is tried in
+# its own lookahead, so overlapping rules are all reported: a Google key in
+# an api_key = "..." assignment yields both Google API Key and API Key.
 SECRET_PATTERNS = [
-    # API Keys & Tokens
-    (r'api[_-]?key\s*[=:]\s*["\'][^"\']{10,}["\']', "API Key", "high"),
-    (r'token\s*[=:]\s*["\'][^"\']{10,}["\']', "Token", "high"),
-    (r'bearer\s+[a-zA-Z0-9\-_.]+', "Bearer Token", "critical"),
+    # Provider API Keys
+    (r'AIza[0-9A-Za-z_-]{35}', "Google API Key", "critical", ["AIza"]),
+    (r'sk-(?:ant-|proj-)?[A-Za-z0-9_-]{20,}', "OpenAI/Anthropic API Key", "critical", ["sk-"]),
+    (r'sk_live_[0-9A-Za-z]{24,}', "Stripe Secret Key", "critical", ["sk_live_"]),
+    (r'gh[pousr]_[A-Za-z0-9]{36,}', "GitHub Token", "critical", ["ghp_", "gho_", "ghu_", "ghs_", "ghr_"]),
+    (r'xox[abprs]-[A-Za-z0-9-]{10,}', "Slack Token", "critical", ["xox"]),
     
     # Cloud Credentials
-    (r'AKIA[0-9A-Z]{16}', "AWS Access Key", "critical"),
-    (r'aws[_-]?secret[_-]?access[_-]?key\s*[=:]\s*["\'][^"\']+["\']', "AWS Secret", "critical"),
-    (r'AZURE[_-]?[A-Z_]+\s*[=:]\s*["\'][^"\']+["\']', "Azure Credential", "critical"),
-    (r'GOOGLE[_-]?[A-Z_]+\s*[=:]\s*["\'][^"\']+["\']', "GCP Credential", "critical"),
-    
-    # Database & Connections
-    (r'password\s*[=:]\s*["\'][^"\']{4,}["\']', "Password", "high"),
-    (r'(mongodb|postgres|mysql|redis):\/\/[^\s"\']+', "Database Connection String", "critical"),
+    (r'AKIA[0-9A-Z]{16}', "AWS Access Key", "critical", ["AKIA"]),
+    (r'aws[_-]?secret[_-]?access[_-]?key\s*[=:]\s*["\'][^"\']+["\']', "AWS Secret", "critical", ["aws"]),
+    (r'AZURE[_-]?[A-Z_]+\s*[=:]\s*["\'][^"\']+["\']', "Azure Credential", "critical", ["azure"]),
+    (r'GOOGLE[_-]?[A-Z_]+\s*[=:]\s*["\'][^"\']+["\']', "GCP Credential", "critical", ["google"]),
     
     # Private Keys
-    (r'-----BEGIN\s+(RSA|PRIVATE|EC)\s+KEY-----', "Private Key", "critical"),
-    (r'ssh-rsa\s+[A-Za-z0-9+/]+', "SSH Key", "critical"),
+    (r'-----BEGIN\s+(?:(?:RSA|EC|DSA|OPENSSH)\s+)?PRIVATE\s+KEY-----', "Private Key", "critical", ["-----BEGIN"]),
+    (r'ssh-rsa\s+[A-Za-z0-9+/]+', "SSH Key", "critical", ["ssh-rsa"]),
     
     # JWT
-    (r'eyJ[A-Za-z0-9-_]+\.eyJ[A-Za-z0-9-_]+\.[A-Za-z0-9-_]+', "JWT Token", "high"),
+    (r'eyJ[A-Za-z0-9_-]+\.eyJ[A-Za-z0-9_-]+\.[A-Za-z0-9_-]+', "JWT Token", "high", ["eyJ"]),
+    
+    # API Keys & Tokens
+    (r'api[_-]?key\s*[=:]\s*["\'][^"\']{10,}["\']', "API Key", "high", ["api"]),
+    (r'token\s*[=:]\s*["\'][^"\']{10,}["\']', "Token", "high", ["token"]),
+    (r'bearer\s+[a-zA-Z0-9\-_.]+', "Bearer Token", "critical", ["bearer"]),
+    
+    # Database & Connections
+    (r'password\s*[=:]\s*["\'][^"\']{4,}["\']', "Password", "high", ["password"]),
+    (r'(mongodb|postgres|mysql|redis):\/\/[^\s"\']+', "Database Connection String", "critical", ["://"]),
 ]
 
+# (pattern, name, severity, category, literals). Matched per line, as the
+# character classes exclude newlines.
 DANGEROUS_PATTERNS = [
     # Injection risks
-    (r'eval\s*\(', "eval() usage", "critical", "Code Injection risk"),
-    (r'exec\s*\(', "exec() usage", "critical", "Code Injection risk"),
-    (r'new\s+Function\s*\(', "Function constructor", "high", "Code Injection risk"),
-    (r'child_process\.exec\s*\(', "child_process.exec", "high", "Command Injection risk"),
-    (r'subprocess\.call\s*\([^)]*shell\s*=\s*True', "subprocess with shell=True", "high", "Command Injection risk"),
+    (r'child_process\.exec\s*\(', "child_process.exec", "high", "Command Injection risk", ["child_process"]),
+    (r'subprocess\.call\s*\([^)\n]*shell\s*=\s*True', "subprocess with shell=True", "high", "Command Injection risk", ["shell"]),
+    (r'eval\s*\(', "eval() usage", "critical", "Code Injection risk", ["eval"]),
+    (r'exec\s*\(', "exec() usage", "critical", "Code Injection risk", ["exec"]),
+    (r'new\s+Function\s*\(', "Function constructor", "high", "Code Injection risk", ["function"]),
     
     # XSS risks
-    (r'dangerouslySetInnerHTML', "dangerouslySetInnerHTML", "high", "XSS risk"),
-    (r'\.innerHTML\s*=', "innerHTML assignment", "medium", "XSS risk"),
-    (r'document\.write\s*\(', "document.write", "medium", "XSS risk"),
+    (r'dangerouslySetInnerHTML', "dangerouslySetInnerHTML", "high", "XSS risk", ["dangerouslySetInnerHTML"]),
+    (r'\.innerHTML\s*=', "innerHTML assignment", "medium", "XSS risk", [".innerHTML"]),
+    (r'document\.write\s*\(', "document.write", "medium", "XSS risk", ["document.write"]),
     
     # SQL Injection indicators
-    (r'["\'][^"\']*\+\s*[a-zA-Z_]+\s*\+\s*["\'].*(?:SELECT|INSERT|UPDATE|DELETE)', "SQL String Concat", "critical", "SQL Injection risk"),
-    (r'f"[^"]*(?:SELECT|INSERT|UPDATE|DELETE)[^"]*\{', "SQL f-string", "critical", "SQL Injection risk"),
+    (r'["\'][^"\'\n]*\+\s*[a-zA-Z_]+\s*\+\s*["\'].*(?:SELECT|INSERT|UPDATE|DELETE)', "SQL String Concat", "critical", "SQL Injection risk",
+     ["select", "insert", "update", "delete"]),
+    (r'f"[^"\n]*(?:SELECT|INSERT|UPDATE|DELETE)[^"\n]*\{', "SQL f-string", "critical", "SQL Injection risk",
+     ["select", "insert", "update", "delete"]),
     
     # Insecure configurations
-    (r'verify\s*=\s*False', "SSL Verify Disabled", "high", "MITM risk"),
-    (r'--insecure', "Insecure flag", "medium", "Security disabled"),
-    (r'disable[_-]?ssl', "SSL Disabled", "high", "MITM risk"),
+    (r'verify\s*=\s*False', "SSL Verify Disabled", "high", "MITM risk", ["verify"]),
+    (r'--insecure', "Insecure flag", "medium", "Security disabled", ["--insecure"]),
+    (r'disable[_-]?ssl', "SSL Disabled", "high", "MITM risk", ["disable"]),
     
     # Unsafe deserialization
-    (r'pickle\.loads?\s*\(', "pickle usage", "high", "Deserialization risk"),
-    (r'yaml\.load\s*\([^)]*\)(?!\s*,\s*Loader)', "Unsafe YAML load", "high", "Deserialization risk"),
+    (r'pickle\.loads?\s*\(', "pickle usage", "high", "Deserialization risk", ["pickle"]),
+    (r'yaml\.load\s*\([^)\n]*\)(?!\s*,\s*Loader)', "Unsafe YAML load", "high", "Deserialization risk", ["yaml.load"]),
 ]
 
-SKIP_DIRS = {'node_modules', '.git', 'dist', 'build', '__pycache__', '.venv', 'venv', '.next'}
+# Per file and secret type, further occurrences are only counted
+MAX_LOCATIONS = 20
+
+SECRET_RULES = PatternSet((p, lits, (kind, sev)) for p, kind, sev, lits in SECRET_PATTERNS)
+DANGEROUS_RULES = PatternSet((p, lits, (name, sev, cat)) for p, name, sev, cat, lits in DANGEROUS_PATTERNS)
+
 CODE_EXTENSIONS = {'.js', '.ts', '.jsx', '.tsx', '.py', '.go', '.java', '.rb', '.php'}
 CONFIG_EXTENSIONS = {'.json', '.yaml', '.yml', '.toml', '.env', '.env.local', '.env.development'}
 
@@ -178,7 +204,85 @@ def scan_dependencies(project_path: str) -> Dict[str, Any]:
     return results
 
 
-def scan_secrets(project_path: str) -> Dict[str, Any]:
+CONFIG_FILE_NAMES = {'next.config.js', 'webpack.config.js', '.eslintrc.js'}
+
+CONFIG_ISSUES = [
+    (r'"DEBUG"\s*:\s*true', "Debug mode enabled", "high"),
+    (r'debug\s*=\s*True', "Debug mode enabled", "high"),
+    (r'NODE_ENV.*development', "Development mode in config", "medium"),
+    (r'"CORS_ALLOW_ALL".*true', "CORS allow all origins", "high"),
+    (r'"Access-Control-Allow-Origin".*\*', "CORS wildcard", "high"),
+    (r'allowCredentials.*true.*origin.*\*', "Dangerous CORS combo", "critical"),
+]
+
+
+def check_file_secrets(scan_file) -> List[Dict[str, Any]]:
+    """Secret findings for one file: one per type, with every line:column it occurs at."""
+    by_type = {}
+    for hit in SECRET_RULES.finditer(scan_file.text):
+        secret_type, severity = hit.rule
+        finding = by_type.get(secret_type)
+        if finding is None:
+            finding = by_type[secret_type] = {"type": secret_type, "severity": severity, "count": 0,
+                                              "line": hit.line, "column": hit.column, "locations": []}
+        finding["count"] += 1
+        if len(finding["locations"]) < MAX_LOCATIONS:
+            finding["locations"].append(f"{hit.line}:{hit.column}")
+    return list(by_type.values())
+
+
+def check_file_patterns(scan_file) -> List[Dict[str, Any]]:
+    """Dangerous-pattern findings, one per matching line and pattern."""
+    findings = []
+    seen = set()
+    lines = None
+    for hit in DANGEROUS_RULES.finditer(scan_file.text):
+        name, severity, category = hit.rule
+        if (hit.line, name) in seen:
+            continue
+        seen.add((hit.line, name))
+        lines = lines or scan_file.text.split('\n')
+        findings.append({
+            "line": hit.line,
+            "column": hit.column,
+            "pattern": name,
+            "severity": severity,
+            "category": category,
+            "snippet": lines[hit.line - 1].strip()[:80]
+        })
+    return findings
+
+
+def check_file_config(scan_file) -> List[Dict[str, Any]]:
+    """Insecure configuration settings in one config file."""
+    return [{"issue": issue, "severity": severity}
+            for pattern, issue, severity in CONFIG_ISSUES
+            if re.search(pattern, scan_file.text, re.IGNORECASE)]
+
+
+FILE_CHECKS = {
+    "secrets": (check_file_secrets, CODE_EXTENSIONS | CONFIG_EXTENSIONS, None),
+    "patterns": (check_file_patterns, CODE_EXTENSIONS, None),
+    "config": (check_file_config, None,
+               lambda f: f.suffix in CONFIG_EXTENSIONS or f.name in CONFIG_FILE_NAMES),
+}
+
+
+def scan_files(project_path: str, checks: List[str], use_cache: bool = True,
+               since: str = None) -> Dict[str, list]:
+    """
+    Walk the project once and run the given per-file checks
+    ("secrets", "patterns", "config"). Returns {check: [(scan_file, findings)]}.
+    With since (a git revision), only files changed since then are re-checked.
+    """
+    scanner = ProjectScanner(project_path, name="security_scan", use_cache=use_cache, since=since)
+    for check in checks:
+        fn, extensions, accept = FILE_CHECKS[check]
+        scanner.register(check, fn, extensions=extensions, accept=accept)
+    return scanner.run()
+
+
+def scan_secrets(project_path: str, scanned: Dict[str, list] = None) -> Dict[str, Any]:
     """
     Validate no hardcoded secrets (OWASP A04).
     Checks: API keys, tokens, passwords, cloud credentials.
@@ -191,34 +295,12 @@ def scan_secrets(project_path: str) -> Dict[str, Any]:
         "by_severity": {"critical": 0, "high": 0, "medium": 0}
     }
     
-    for root, dirs, files in os.walk(project_path):
-        dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
-        
-        for file in files:
-            ext = Path(file).suffix.lower()
-            if ext not in CODE_EXTENSIONS and ext not in CONFIG_EXTENSIONS:
-                continue
-                
-            filepath = Path(root) / file
-            results["scanned_files"] += 1
-            
-            try:
-                with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
-                    content = f.read()
-                    
-                    for pattern, secret_type, severity in SECRET_PATTERNS:
-                        matches = re.findall(pattern, content, re.IGNORECASE)
-                        if matches:
-                            results["findings"].append({
-                                "file": str(filepath.relative_to(project_path)),
-                                "type": secret_type,
-                                "severity": severity,
-                                "count": len(matches)
-                            })
-                            results["by_severity"][severity] += len(matches)
-                            
-            except Exception:
-                pass
+    scanned = scanned or scan_files(project_path, ["secrets"])
+    for scan_file, findings in scanned["secrets"]:
+        results["scanned_files"] += 1
+        for finding in findings:
+            results["findings"].append({"file": scan_file.rel, **finding})
+            results["by_severity"][finding["severity"]] += finding["count"]
     
     if results["by_severity"]["critical"] > 0:
         results["status"] = "[!!] CRITICAL: Secrets exposed!"
@@ -233,7 +315,7 @@ def scan_secrets(project_path: str) -> Dict[str, Any]:
     return results
 
 
-def scan_code_patterns(project_path: str) -> Dict[str, Any]:
+def scan_code_patterns(project_path: str, scanned: Dict[str, list] = None) -> Dict[str, Any]:
     """
     Validate dangerous code patterns (OWASP A05).
     Checks: Injection risks, XSS, unsafe deserialization.
@@ -246,36 +328,13 @@ def scan_code_patterns(project_path: str) -> Dict[str, Any]:
         "by_category": {}
     }
     
-    for root, dirs, files in os.walk(project_path):
-        dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
-        
-        for file in files:
-            ext = Path(file).suffix.lower()
-            if ext not in CODE_EXTENSIONS:
-                continue
-                
-            filepath = Path(root) / file
-            results["scanned_files"] += 1
-            
-            try:
-                with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
-                    lines = f.readlines()
-                    
-                    for line_num, line in enumerate(lines, 1):
-                        for pattern, name, severity, category in DANGEROUS_PATTERNS:
-                            if re.search(pattern, line, re.IGNORECASE):
-                                results["findings"].append({
-                                    "file": str(filepath.relative_to(project_path)),
-                                    "line": line_num,
-                                    "pattern": name,
-                                    "severity": severity,
-                                    "category": category,
-                                    "snippet": line.strip()[:80]
-                                })
-                                results["by_category"][category] = results["by_category"].get(category, 0) + 1
-                                
-            except Exception:
-                pass
+    scanned = scanned or scan_files(project_path, ["patterns"])
+    for scan_file, findings in scanned["patterns"]:
+        results["scanned_files"] += 1
+        for finding in findings:
+            results["findings"].append({"file": scan_file.rel, **finding})
+            category = finding["category"]
+            results["by_category"][category] = results["by_category"].get(category, 0) + 1
     
     critical_count = sum(1 for f in results["findings"] if f["severity"] == "critical")
     high_count = sum(1 for f in results["findings"] if f["severity"] == "high")
@@ -293,7 +352,7 @@ def scan_code_patterns(project_path: str) -> Dict[str, Any]:
     return results
 
 
-def scan_configuration(project_path: str) -> Dict[str, Any]:
+def scan_configuration(project_path: str, scanned: Dict[str, list] = None) -> Dict[str, Any]:
     """
     Validate security configuration (OWASP A02).
     Checks: Security headers, CORS, debug modes.
@@ -305,40 +364,10 @@ def scan_configuration(project_path: str) -> Dict[str, Any]:
         "checks": {}
     }
     
-    # Check common config files for issues
-    config_issues = [
-        (r'"DEBUG"\s*:\s*true', "Debug mode enabled", "high"),
-        (r'debug\s*=\s*True', "Debug mode enabled", "high"),
-        (r'NODE_ENV.*development', "Development mode in config", "medium"),
-        (r'"CORS_ALLOW_ALL".*true', "CORS allow all origins", "high"),
-        (r'"Access-Control-Allow-Origin".*\*', "CORS wildcard", "high"),
-        (r'allowCredentials.*true.*origin.*\*', "Dangerous CORS combo", "critical"),
-    ]
-    
-    for root, dirs, files in os.walk(project_path):
-        dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
-        
-        for file in files:
-            ext = Path(file).suffix.lower()
-            if ext not in CONFIG_EXTENSIONS and file not in ['next.config.js', 'webpack.config.js', '.eslintrc.js']:
-                continue
-                
-            filepath = Path(root) / file
-            
-            try:
-                with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
-                    content = f.read()
-                    
-                    for pattern, issue, severity in config_issues:
-                        if re.search(pattern, content, re.IGNORECASE):
-                            results["findings"].append({
-                                "file": str(filepath.relative_to(project_path)),
-                                "issue": issue,
-                                "severity": severity
-                            })
-                            
-            except Exception:
-                pass
+    scanned = scanned or scan_files(project_path, ["config"])
+    for scan_file, findings in scanned["config"]:
+        for finding in findings:
+            results["findings"].append({"file": scan_file.rel, **finding})
     
     # Check for security header configurations
     header_files = ["next.config.js", "next.config.mjs", "middleware.ts", "nginx.conf"]
@@ -369,7 +398,8 @@ def scan_configuration(project_path: str) -> Dict[str, Any]:
 #  MAIN
 # ============================================================================
 
-def run_full_scan(project_path: str, scan_type: str = "all") -> Dict[str, Any]:
+def run_full_scan(project_path: str, scan_type: str = "all", use_cache: bool = True,
+                  since: str = None) -> Dict[str, Any]:
     """Execute security validation scans."""
     
     report = {
@@ -392,9 +422,13 @@ def run_full_scan(project_path: str, scan_type: str = "all") -> Dict[str, Any]:
         "config": ("configuration", scan_configuration),
     }
     
+    # One walk of the project serves every file-content scan
+    checks = [key for key in FILE_CHECKS if scan_type in ("all", key)]
+    scanned = scan_files(project_path, checks, use_cache, since) if checks else {}
+    
     for key, (name, scanner) in scanners.items():
         if scan_type == "all" or scan_type == key:
-            result = scanner(project_path)
+            result = scanner(project_path, scanned) if key in FILE_CHECKS else scanner(project_path)
             report["scans"][name] = result
             
             findings_count = len(result.get("findings", []))
@@ -427,6 +461,10 @@ def main():
                         default="all", help="Type of scan to run")
     parser.add_argument("--output", choices=["json", "summary"], default="json",
                         help="Output format")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Re-read every file instead of reusing results for unchanged files")
+    parser.add_argument("--since", metavar="REV",
+                        help="Incremental: only re-check files git reports changed since REV")
     
     args = parser.parse_args()
     
@@ -434,7 +472,7 @@ def main():
         print(json.dumps({"error": f"Directory not found: {args.project_path}"}))
         sys.exit(1)
     
-    result = run_full_scan(args.project_path, args.scan_type)
+    result = run_full_scan(args.project_path, args.scan_type, use_cache=not args.no_cache, since=args.since)
     
     if args.output == "summary":
         print(f"\n{'='*60}")
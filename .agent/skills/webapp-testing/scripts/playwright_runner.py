@@ -3,15 +3,28 @@
 Skill: webapp-testing
 Script: playwright_runner.py
 Purpose: Run basic Playwright browser tests
-Usage: python playwright_runner.py <url> [--screenshot]
-Output: JSON with page info, health status, and optional screenshot path
+Usage: python playwright_runner.py <url> [<url> ...] [--screenshot] [--a11y] [--concurrency N]
+       python playwright_runner.py --base http://localhost:8080 / /#/settings /#/quran
+Output: JSON with page info, health status, performance timing and optional screenshot path;
+        with several URLs, one result per URL under "results"
 Note: Requires playwright (pip install playwright && playwright install chromium)
 Screenshots: Saved to system temp directory (auto-cleaned by OS)
+
+All URLs are checked in one headless Chromium: each page gets its own
+browser context (no shared cookies or storage), and at most --concurrency
+pages run at once. Performance timing comes from the page itself:
+navigation timing, first contentful paint, long tasks (main-thread blocks
+over 50 ms, observed from before the first page script) and the JS heap
+(Chromium's performance.memory).
 """
 import sys
 import json
 import os
+import asyncio
+import hashlib
 import tempfile
+import time
+from contextlib import asynccontextmanager
 from datetime import datetime
 
 # Fix Windows console encoding for Unicode output
@@ -22,152 +35,317 @@ except AttributeError:
     pass  # Python < 3.7
 
 try:
-    from playwright.sync_api import sync_playwright
+    from playwright.async_api import async_playwright
     PLAYWRIGHT_AVAILABLE = True
 except ImportError:
     PLAYWRIGHT_AVAILABLE = False
 
+DEFAULT_CONCURRENCY = 4
+NAV_TIMEOUT_MS = 30000
+VIEWPORT = {"width": 1280, "height": 720}
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
 
-def run_basic_test(url: str, take_screenshot: bool = False) -> dict:
-    """Run basic browser test on URL."""
-    if not PLAYWRIGHT_AVAILABLE:
-        return {
-            "error": "Playwright not installed",
-            "fix": "pip install playwright && playwright install chromium"
-        }
-    
+# Runs before any page script, so long tasks during startup are seen too
+LONG_TASK_OBSERVER = """
+window.__longTasks = [];
+try {
+    new PerformanceObserver(list => {
+        for (const entry of list.getEntries()) window.__longTasks.push(entry.duration);
+    }).observe({type: 'longtask', buffered: true});
+} catch (e) {}
+"""
+
+PERFORMANCE_SNAPSHOT = """() => {
+    const nav = performance.getEntriesByType('navigation')[0];
+    const fcp = performance.getEntriesByName('first-contentful-paint')[0];
+    const tasks = window.__longTasks || [];
+    const memory = performance.memory;
+    return {
+        navigation: nav ? {
+            ttfb: nav.responseStart,
+            dom_content_loaded: nav.domContentLoadedEventEnd,
+            load_complete: nav.loadEventEnd,
+            transfer_bytes: nav.transferSize
+        } : null,
+        first_contentful_paint: fcp ? fcp.startTime : null,
+        long_tasks: tasks,
+        js_heap: memory ? {
+            used_bytes: memory.usedJSHeapSize,
+            total_bytes: memory.totalJSHeapSize,
+            limit_bytes: memory.jsHeapSizeLimit
+        } : null
+    };
+}"""
+
+
+class BrowserPool:
+    """One headless Chromium shared by many pages, each in its own context."""
+
+    def __init__(self, concurrency: int = DEFAULT_CONCURRENCY):
+        self.concurrency = max(1, concurrency)
+        self.contexts_opened = 0
+        self._semaphore = None
+        self._playwright = None
+        self.browser = None
+
+    async def __aenter__(self):
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self._playwright = await async_playwright().start()
+        try:
+            self.browser = await self._playwright.chromium.launch(headless=True)
+        except Exception:
+            await self._playwright.stop()
+            raise
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.browser.close()
+        await self._playwright.stop()
+
+    @asynccontextmanager
+    async def page(self):
+        """A page in a fresh context; waits while `concurrency` pages are open."""
+        async with self._semaphore:
+            context = await self.browser.new_context(viewport=VIEWPORT, user_agent=USER_AGENT)
+            self.contexts_opened += 1
+            try:
+                await context.add_init_script(LONG_TASK_OBSERVER)
+                yield await context.new_page()
+            finally:
+                await context.close()
+
+
+async def count_all(page, selectors: dict) -> dict:
+    """{name: number of elements matching selector}, counted concurrently."""
+    counts = await asyncio.gather(*(page.locator(s).count() for s in selectors.values()))
+    return dict(zip(selectors, counts))
+
+
+async def performance_timing(page) -> dict:
+    """Navigation timing, FCP, long-task totals and JS heap of the loaded page (ms, bytes)."""
+    snapshot = await page.evaluate(PERFORMANCE_SNAPSHOT)
+    nav = snapshot["navigation"] or {}
+    tasks = snapshot["long_tasks"]
+    fcp = snapshot["first_contentful_paint"]
+    return {
+        "dom_content_loaded": round(nav["dom_content_loaded"]) if nav else None,
+        "load_complete": round(nav["load_complete"]) if nav else None,
+        "ttfb": round(nav["ttfb"]) if nav else None,
+        "transfer_bytes": nav.get("transfer_bytes"),
+        "first_contentful_paint": round(fcp) if fcp is not None else None,
+        "long_tasks": {
+            "count": len(tasks),
+            "total_ms": round(sum(tasks)),
+            "max_ms": round(max(tasks, default=0)),
+            "blocking_ms": round(sum(max(0, d - 50) for d in tasks))
+        },
+        "js_heap": snapshot["js_heap"]
+    }
+
+
+async def basic_checks(page, url: str, take_screenshot: bool = False) -> dict:
+    """Health, element counts, console errors and performance timing of one page."""
     result = {
         "url": url,
         "timestamp": datetime.now().isoformat(),
         "status": "pending"
     }
-    
+
+    # Console errors (listening from before navigation)
+    console_errors = []
+    page.on("console", lambda msg: console_errors.append(msg.text) if msg.type == "error" else None)
+
+    # Navigate
+    response = await page.goto(url, wait_until="networkidle", timeout=NAV_TIMEOUT_MS)
+    title = await page.title()
+
+    # Basic info
+    result["page"] = {
+        "title": title,
+        "url": page.url,
+        "status_code": response.status if response else None
+    }
+
+    # Element counts
+    result["elements"] = await count_all(page, {
+        "links": "a",
+        "buttons": "button",
+        "inputs": "input",
+        "images": "img",
+        "forms": "form",
+        "h1": "h1"
+    })
+
+    # Health checks
+    result["health"] = {
+        "loaded": response.ok if response else False,
+        "has_title": bool(title),
+        "has_h1": result["elements"].pop("h1") > 0,
+        "has_links": result["elements"]["links"] > 0,
+        "has_images": result["elements"]["images"] > 0
+    }
+
+    # Performance metrics
+    result["performance"] = await performance_timing(page)
+    result["console_errors"] = console_errors[:20]
+
+    # Screenshot - uses system temp directory (cross-platform, auto-cleaned)
+    if take_screenshot:
+        # Cross-platform: Windows=%TEMP%, Linux/macOS=/tmp
+        screenshot_dir = os.path.join(tempfile.gettempdir(), "maestro_screenshots")
+        os.makedirs(screenshot_dir, exist_ok=True)
+        url_key = hashlib.sha1(url.encode('utf-8')).hexdigest()[:8]
+        screenshot_path = os.path.join(screenshot_dir, f"screenshot_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{url_key}.png")
+        await page.screenshot(path=screenshot_path, full_page=True)
+        result["screenshot"] = screenshot_path
+        result["screenshot_note"] = "Saved to temp directory (auto-cleaned by OS)"
+
+    result["status"] = "success" if result["health"]["loaded"] else "failed"
+    result["summary"] = "[OK] Page loaded successfully" if result["status"] == "success" else "[X] Page failed to load"
+    return result
+
+
+async def accessibility_checks(page, url: str) -> dict:
+    """Basic accessibility counts of one page."""
+    result = {"url": url, "accessibility": {}}
+    await page.goto(url, wait_until="networkidle", timeout=NAV_TIMEOUT_MS)
+
+    # Basic a11y checks
+    counts = await count_all(page, {
+        "images_with_alt": "img[alt]",
+        "images_without_alt": "img:not([alt])",
+        "buttons_with_label": "button[aria-label], button:has-text('')",
+        "links_with_text": "a:has-text('')",
+        "form_labels": "label",
+        "h1": "h1",
+        "h2": "h2",
+        "h3": "h3"
+    })
+    result["accessibility"] = {
+        **{k: v for k, v in counts.items() if k not in ("h1", "h2", "h3")},
+        "headings": {h: counts[h] for h in ("h1", "h2", "h3")}
+    }
+    result["status"] = "success"
+    return result
+
+
+def error_result(url: str, error: Exception, check_a11y: bool) -> dict:
+    if check_a11y:
+        return {"url": url, "accessibility": {}, "status": "error", "error": str(error)}
+    return {
+        "url": url,
+        "timestamp": datetime.now().isoformat(),
+        "status": "error",
+        "error": str(error),
+        "summary": f"[X] Error: {str(error)[:100]}"
+    }
+
+
+async def run_checks(urls: list, take_screenshot: bool = False, check_a11y: bool = False,
+                     concurrency: int = DEFAULT_CONCURRENCY) -> dict:
+    """
+    Check every URL in one shared browser, at most `concurrency` at a time.
+    Returns {"results": [...] in URL order, "contexts", "duration_s"}.
+    """
+    start = time.perf_counter()
     try:
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=True)
-            context = browser.new_context(
-                viewport={"width": 1280, "height": 720},
-                user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-            )
-            page = context.new_page()
-            
-            # Navigate
-            response = page.goto(url, wait_until="networkidle", timeout=30000)
-            
-            # Basic info
-            result["page"] = {
-                "title": page.title(),
-                "url": page.url,
-                "status_code": response.status if response else None
-            }
-            
-            # Health checks
-            result["health"] = {
-                "loaded": response.ok if response else False,
-                "has_title": bool(page.title()),
-                "has_h1": page.locator("h1").count() > 0,
-                "has_links": page.locator("a").count() > 0,
-                "has_images": page.locator("img").count() > 0
-            }
-            
-            # Console errors
-            console_errors = []
-            page.on("console", lambda msg: console_errors.append(msg.text) if msg.type == "error" else None)
-            
-            # Performance metrics
-            result["performance"] = {
-                "dom_content_loaded": page.evaluate("window.performance.timing.domContentLoadedEventEnd - window.performance.timing.navigationStart"),
-                "load_complete": page.evaluate("window.performance.timing.loadEventEnd - window.performance.timing.navigationStart")
-            }
-            
-            # Screenshot - uses system temp directory (cross-platform, auto-cleaned)
-            if take_screenshot:
-                # Cross-platform: Windows=%TEMP%, Linux/macOS=/tmp
-                screenshot_dir = os.path.join(tempfile.gettempdir(), "maestro_screenshots")
-                os.makedirs(screenshot_dir, exist_ok=True)
-                screenshot_path = os.path.join(screenshot_dir, f"screenshot_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png")
-                page.screenshot(path=screenshot_path, full_page=True)
-                result["screenshot"] = screenshot_path
-                result["screenshot_note"] = "Saved to temp directory (auto-cleaned by OS)"
-            
-            # Element counts
-            result["elements"] = {
-                "links": page.locator("a").count(),
-                "buttons": page.locator("button").count(),
-                "inputs": page.locator("input").count(),
-                "images": page.locator("img").count(),
-                "forms": page.locator("form").count()
-            }
-            
-            browser.close()
-            
-            result["status"] = "success" if result["health"]["loaded"] else "failed"
-            result["summary"] = "[OK] Page loaded successfully" if result["status"] == "success" else "[X] Page failed to load"
-            
+        async with BrowserPool(concurrency) as pool:
+            async def check(url):
+                try:
+                    async with pool.page() as page:
+                        page_start = time.perf_counter()
+                        if check_a11y:
+                            result = await accessibility_checks(page, url)
+                        else:
+                            result = await basic_checks(page, url, take_screenshot)
+                        result["duration_ms"] = round((time.perf_counter() - page_start) * 1000)
+                        return result
+                except Exception as e:
+                    return error_result(url, e, check_a11y)
+
+            results = await asyncio.gather(*(check(url) for url in urls))
+            contexts = pool.contexts_opened
     except Exception as e:
-        result["status"] = "error"
-        result["error"] = str(e)
-        result["summary"] = f"[X] Error: {str(e)[:100]}"
-    
-    return result
+        # Browser failed to start
+        results, contexts = [error_result(url, e, check_a11y) for url in urls], 0
+
+    return {"results": results, "contexts": contexts, "duration_s": round(time.perf_counter() - start, 2)}
+
+
+def run_basic_test(url: str, take_screenshot: bool = False) -> dict:
+    """Run basic browser test on URL."""
+    if not PLAYWRIGHT_AVAILABLE:
+        return {
+            "error": "Playwright not installed",
+            "fix": "pip install playwright && playwright install chromium"
+        }
+    return asyncio.run(run_checks([url], take_screenshot=take_screenshot))["results"][0]
 
 
 def run_accessibility_check(url: str) -> dict:
     """Run basic accessibility check."""
     if not PLAYWRIGHT_AVAILABLE:
         return {"error": "Playwright not installed"}
-    
-    result = {"url": url, "accessibility": {}}
-    
-    try:
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=True)
-            page = browser.new_page()
-            page.goto(url, wait_until="networkidle", timeout=30000)
-            
-            # Basic a11y checks
-            result["accessibility"] = {
-                "images_with_alt": page.locator("img[alt]").count(),
-                "images_without_alt": page.locator("img:not([alt])").count(),
-                "buttons_with_label": page.locator("button[aria-label], button:has-text('')").count(),
-                "links_with_text": page.locator("a:has-text('')").count(),
-                "form_labels": page.locator("label").count(),
-                "headings": {
-                    "h1": page.locator("h1").count(),
-                    "h2": page.locator("h2").count(),
-                    "h3": page.locator("h3").count()
-                }
-            }
-            
-            browser.close()
-            result["status"] = "success"
-            
-    except Exception as e:
-        result["status"] = "error"
-        result["error"] = str(e)
-    
-    return result
+    return asyncio.run(run_checks([url], check_a11y=True))["results"][0]
+
+
+def run_pooled(urls: list, take_screenshot: bool = False, check_a11y: bool = False,
+               concurrency: int = DEFAULT_CONCURRENCY) -> dict:
+    """Check many URLs with one browser launch."""
+    if not PLAYWRIGHT_AVAILABLE:
+        return {
+            "error": "Playwright not installed",
+            "fix": "pip install playwright && playwright install chromium"
+        }
+
+    run = asyncio.run(run_checks(urls, take_screenshot, check_a11y, concurrency))
+    passed = sum(1 for r in run["results"] if r.get("status") == "success")
+    return {
+        "browser_launches": 1,
+        "contexts": run["contexts"],
+        "concurrency": max(1, concurrency),
+        "duration_s": run["duration_s"],
+        "results": run["results"],
+        "summary": f"[{'OK' if passed == len(urls) else 'X'}] {passed}/{len(urls)} pages passed"
+    }
+
+
+def parse_args(argv: list):
+    """(urls, take_screenshot, check_a11y, concurrency); relative routes are joined to --base."""
+    urls, base, concurrency = [], None, DEFAULT_CONCURRENCY
+    args = iter(argv)
+    for arg in args:
+        if arg == "--base":
+            base = next(args, "").rstrip("/")
+        elif arg == "--concurrency":
+            concurrency = int(next(args, DEFAULT_CONCURRENCY))
+        elif not arg.startswith("--"):
+            urls.append(arg)
+    if base:
+        urls = [base + (u if u.startswith("/") else "/" + u) if "://" not in u else u for u in urls]
+    return urls, "--screenshot" in argv, "--a11y" in argv, concurrency
 
 
 if __name__ == "__main__":
-    if len(sys.argv) < 2:
+    urls, take_screenshot, check_a11y, concurrency = parse_args(sys.argv[1:])
+
+    if not urls:
         print(json.dumps({
-            "error": "Usage: python playwright_runner.py <url> [--screenshot] [--a11y]",
+            "error": "Usage: python playwright_runner.py <url> [<url> ...] [--screenshot] [--a11y] [--concurrency N] [--base URL]",
             "examples": [
                 "python playwright_runner.py https://example.com",
                 "python playwright_runner.py https://example.com --screenshot",
-                "python playwright_runner.py https://example.com --a11y"
+                "python playwright_runner.py https://example.com --a11y",
+                "python playwright_runner.py --base http://localhost:8080 / /#/settings --concurrency 4"
             ]
         }, indent=2))
         sys.exit(1)
-    
-    url = sys.argv[1]
-    take_screenshot = "--screenshot" in sys.argv
-    check_a11y = "--a11y" in sys.argv
-    
-    if check_a11y:
-        result = run_accessibility_check(url)
+
+    if len(urls) > 1:
+        result = run_pooled(urls, take_screenshot, check_a11y, concurrency)
+    elif check_a11y:
+        result = run_accessibility_check(urls[0])
     else:
-        result = run_basic_test(url, take_screenshot)
-    
+        result = run_basic_test(urls[0], take_screenshot)
+
     print(json.dumps(result, indent=2))
@@ -1,96 +1,319 @@
+import argparse
+import glob
+import hashlib
 import json
 import os
+import re
 import sys
+from concurrent.futures import ProcessPoolExecutor
 
-def format_json_file(input_file, output_file=None, indent=4):
+# Per-directory record of what the formatter last wrote, so unchanged files
+# are skipped on a hash comparison instead of a parse + dump
+MANIFEST_NAME = ".format_json_manifest.json"
+
+AYAH_KEY = re.compile(r'^\d{1,3}:\d{1,3}$')
+
+# Declared shapes of the data files. Each schema lists required keys with
+# their accepted types, plus the same for every element of its item list.
+SCHEMAS = {
+    'hadith_book': {
+        'type': dict,
+        'required': {'hadiths': list},
+        'optional': {'metadata': dict, 'chapters': list, 'id': (int, str)},
+        'items': 'hadiths',
+        'item_required': {},
+        'item_optional': {'id': (int, str), 'idInBook': (int, str), 'chapterId': (int, str, type(None)),
+                          'arabic': (str, type(None)), 'english': (dict, str, type(None)),
+                          'burmese': (dict, str, type(None))},
+    },
+    'tafseer_part': {
+        'type': list,
+        'items': None,
+        'item_required': {'ayah_key': str, 'text': str},
+        'item_optional': {'group_ayah_key': str, 'from_ayah': str, 'to_ayah': str, 'ayah_keys': (str, list)},
+    },
+    'sunnah_chapter': {
+        'type': dict,
+        'required': {'chapter_id': int, 'items': list},
+        'optional': {'chapter_title': (str, type(None))},
+        'items': 'items',
+        'item_required': {'id': (int, str)},
+        'item_optional': {'text': (str, type(None)), 'arabic_text': (str, type(None)),
+                          'urdu_translation': (str, type(None)), 'references': (list, type(None))},
+    },
+}
+
+
+def detect_schema(data):
+    """Pick the schema for a parsed file by its shape; None if unknown."""
+    if isinstance(data, dict):
+        if 'hadiths' in data:
+            return 'hadith_book'
+        if 'chapter_id' in data and 'items' in data:
+            return 'sunnah_chapter'
+    elif isinstance(data, list) and data and isinstance(data[0], dict) and 'ayah_key' in data[0]:
+        return 'tafseer_part'
+    return None
+
+
+def _check_fields(obj, required, optional, where, errors):
+    for key, types in required.items():
+        if key not in obj:
+            errors.append(f"{where}: missing '{key}'")
+        elif not isinstance(obj[key], types):
+            errors.append(f"{where}: '{key}' has type {type(obj[key]).__name__}")
+    for key, types in optional.items():
+        if key in obj and not isinstance(obj[key], types):
+            errors.append(f"{where}: '{key}' has type {type(obj[key]).__name__}")
+
+
+def validate(data, schema_name, max_errors=5):
+    """Return a list of schema violations (empty when the file is valid)."""
+    schema = SCHEMAS[schema_name]
+    errors = []
+    if not isinstance(data, schema['type']):
+        return [f"expected a JSON {schema['type'].__name__}"]
+
+    if schema['type'] is dict:
+        _check_fields(data, schema['required'], schema['optional'], 'root', errors)
+        items = data.get(schema['items']) if isinstance(data.get(schema['items']), list) else []
+    else:
+        items = data
+
+    for i, item in enumerate(items):
+        if len(errors) >= max_errors:
+            break
+        if not isinstance(item, dict):
+            errors.append(f"item {i}: expected an object")
+            continue
+        _check_fields(item, schema['item_required'], schema['item_optional'], f"item {i}", errors)
+        if schema_name == 'tafseer_part' and isinstance(item.get('ayah_key'), str) \
+                and not AYAH_KEY.match(item['ayah_key']):
+            errors.append(f"item {i}: bad ayah_key '{item['ayah_key']}'")
+
+    return errors[:max_errors]
+
+
+def _digest(data):
+    return hashlib.sha1(data).hexdigest()
+
+
+def _style(indent, minify):
+    return "min" if minify else f"indent={indent}"
+
+
+def serialize(data, indent=4, minify=False):
+    if minify:
+        return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    return json.dumps(data, ensure_ascii=False, indent=indent).encode('utf-8')
+
+
+def write_atomic(path, payload):
+    """Write to a sibling temp file and rename over the target."""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def normalize_file(input_file, output_file=None, indent=4, minify=False, schema='auto'):
     """
-    Format a single-line JSON file into a nicely indented format.
-    
+    Parse, validate and re-serialize one file. Never leaves a partial file:
+    output is written atomically, and only when the bytes actually change.
+
+    Returns (status, detail, source_hash, output_hash); status is one of
+    'formatted', 'unchanged', 'invalid' or 'error'.
+    """
+    in_place = not output_file or os.path.abspath(output_file) == os.path.abspath(input_file)
+    output_file = output_file or input_file
+    try:
+        with open(input_file, 'rb') as f:
+            raw = f.read()
+        data = json.loads(raw)
+    except (OSError, ValueError) as e:
+        return 'error', str(e), None, None
+
+    schema_name = detect_schema(data) if schema == 'auto' else schema
+    if schema_name and schema_name != 'none':
+        errors = validate(data, schema_name)
+        if errors:
+            return 'invalid', f"{schema_name}: " + "; ".join(errors), None, None
+
+    payload = serialize(data, indent, minify)
+    source_hash = _digest(raw)
+    output_hash = _digest(payload)
+
+    if in_place and source_hash == output_hash:
+        return 'unchanged', schema_name or 'unknown', source_hash, output_hash
+    if not in_place and os.path.exists(output_file):
+        with open(output_file, 'rb') as f:
+            if _digest(f.read()) == output_hash:
+                return 'unchanged', schema_name or 'unknown', source_hash, output_hash
+
+    try:
+        write_atomic(output_file, payload)
+    except OSError as e:
+        return 'error', str(e), None, None
+    return 'formatted', schema_name or 'unknown', source_hash, output_hash
+
+
+def format_json_file(input_file, output_file=None, indent=4, minify=False, schema='auto'):
+    """
+    Format a single JSON file (in place unless output_file is given).
+
     Args:
         input_file (str): Path to the input JSON file
         output_file (str): Path to the output JSON file (optional, defaults to overwriting input)
         indent (int): Number of spaces for indentation (default: 4)
+        minify (bool): Emit compact JSON for shipping instead of indenting
+        schema (str): Schema name, 'auto' to detect it, or 'none' to skip validation
     """
-    try:
-        # Read the JSON file
-        print(f"Reading {input_file}...")
-        with open(input_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
-        # Determine output file
-        if output_file is None:
-            output_file = input_file
-        
-        # Write formatted JSON
-        print(f"Writing formatted JSON to {output_file}...")
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=indent)
-        
-        print(f"✓ Successfully formatted {input_file}")
+    status, detail, _, _ = normalize_file(input_file, output_file, indent, minify, schema)
+    if status in ('formatted', 'unchanged'):
+        print(f"✓ {status.capitalize()} {input_file} ({detail})")
         return True
-        
-    except json.JSONDecodeError as e:
-        print(f"✗ Error: Invalid JSON in {input_file}")
-        print(f"  {str(e)}")
-        return False
-    except FileNotFoundError:
-        print(f"✗ Error: File not found - {input_file}")
-        return False
-    except Exception as e:
-        print(f"✗ Error formatting {input_file}: {str(e)}")
+    print(f"✗ Error: {input_file}: {detail}")
+    return False
+
+
+def _load_manifest(root):
+    try:
+        with open(os.path.join(root, MANIFEST_NAME), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_manifest(root, manifest):
+    write_atomic(os.path.join(root, MANIFEST_NAME),
+                 json.dumps(manifest, indent=1, sort_keys=True).encode('utf-8'))
+
+
+def _is_current(entry, source_path, output_path, style):
+    """True when neither the source nor the formatted output changed since the last run."""
+    if not entry or entry.get('style') != style or not os.path.exists(output_path):
         return False
+    with open(source_path, 'rb') as f:
+        if _digest(f.read()) != entry.get('source'):
+            return False
+    if output_path == source_path:
+        return True
+    with open(output_path, 'rb') as f:
+        return _digest(f.read()) == entry.get('output')
 
-def format_directory(directory, pattern="*.json", indent=4):
+
+def _normalize_job(job):
+    rel_path, input_file, output_file, indent, minify, schema = job
+    return (rel_path, *normalize_file(input_file, output_file, indent, minify, schema))
+
+
+def normalize_tree(input_dir, output_dir=None, pattern="**/*.json", indent=4, minify=False,
+                   schema='auto', workers=None, force=False):
+    """
+    Normalize every matching file under input_dir across a process pool,
+    mirroring into output_dir when given (in place otherwise). Files whose
+    hashes match the manifest from the previous run are skipped unread.
+
+    Returns {status: count}.
+    """
+    output_dir = output_dir or input_dir
+    style = _style(indent, minify)
+    manifest = {} if force else _load_manifest(output_dir)
+
+    jobs = []
+    skipped = 0
+    for input_file in sorted(glob.glob(os.path.join(input_dir, pattern), recursive=True)):
+        if os.path.basename(input_file) == MANIFEST_NAME or not os.path.isfile(input_file):
+            continue
+        rel_path = os.path.relpath(input_file, input_dir).replace(os.sep, '/')
+        input_file = os.path.normpath(input_file)
+        output_file = os.path.normpath(os.path.join(output_dir, rel_path))
+        if _is_current(manifest.get(rel_path), input_file, output_file, style):
+            skipped += 1
+            continue
+        jobs.append((rel_path, input_file, output_file, indent, minify, schema))
+
+    counts = {'formatted': 0, 'unchanged': 0, 'skipped': skipped, 'invalid': 0, 'error': 0}
+    if jobs:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for rel_path, status, detail, source_hash, output_hash in pool.map(
+                    _normalize_job, jobs, chunksize=max(1, len(jobs) // 64)):
+                counts[status] += 1
+                if status in ('formatted', 'unchanged'):
+                    # In place, the source is now the formatted output
+                    if os.path.abspath(output_dir) == os.path.abspath(input_dir):
+                        source_hash = output_hash
+                    manifest[rel_path] = {'source': source_hash, 'output': output_hash, 'style': style}
+                    if status == 'formatted':
+                        print(f"✓ {rel_path} ({detail})")
+                else:
+                    manifest.pop(rel_path, None)
+                    print(f"✗ {rel_path}: {detail}")
+
+    _save_manifest(output_dir, manifest)
+    return counts
+
+
+def format_directory(directory, pattern="*.json", indent=4, minify=False, schema='auto',
+                     workers=None, force=False):
     """
     Format all JSON files in a directory.
-    
+
     Args:
         directory (str): Path to the directory
-        pattern (str): File pattern to match (default: "*.json")
+        pattern (str): File pattern to match (default: "*.json"; "**/*.json" recurses)
         indent (int): Number of spaces for indentation (default: 4)
     """
-    import glob
-    
-    json_files = glob.glob(os.path.join(directory, pattern))
-    
-    if not json_files:
+    counts = normalize_tree(directory, pattern=pattern, indent=indent, minify=minify,
+                            schema=schema, workers=workers, force=force)
+    total = sum(counts.values())
+    if not total:
         print(f"No JSON files found in {directory}")
-        return
-    
-    print(f"Found {len(json_files)} JSON file(s) to format\n")
-    
-    success_count = 0
-    for json_file in json_files:
-        if format_json_file(json_file, indent=indent):
-            success_count += 1
-        print()
-    
-    print(f"Summary: {success_count}/{len(json_files)} files formatted successfully")
+        return counts
+
+    print(f"\nSummary: {counts['formatted']} formatted, {counts['unchanged'] + counts['skipped']} unchanged "
+          f"({counts['skipped']} skipped by hash), {counts['invalid']} invalid, {counts['error']} errors "
+          f"of {total} files")
+    return counts
+
 
 def main():
-    if len(sys.argv) < 2:
-        print("JSON Formatter")
-        print("=" * 50)
-        print("\nUsage:")
-        print("  python format_json.py <file_or_directory> [indent]")
-        print("\nExamples:")
-        print("  python format_json.py my-abudawud.json")
-        print("  python format_json.py my-abudawud.json 2")
-        print("  python format_json.py ./db/by_book/the_9_books/")
-        print("  python format_json.py ./db/by_book/the_9_books/ 4")
-        return
-    
-    path = sys.argv[1]
-    indent = int(sys.argv[2]) if len(sys.argv) > 2 else 4
-    
-    if os.path.isfile(path):
+    parser = argparse.ArgumentParser(
+        description="JSON Formatter - parallel, schema-validated, atomic",
+        epilog="Examples:\n"
+               "  python format_json.py my-abudawud.json\n"
+               "  python format_json.py my-abudawud.json 2\n"
+               "  python format_json.py ./db/by_book/the_9_books/\n"
+               "  python format_json.py ./db/ --pattern '**/*.json' --minify",
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('path', help="JSON file or directory")
+    parser.add_argument('indent', nargs='?', type=int, default=4)
+    parser.add_argument('--pattern', default="*.json", help="Glob for directories ('**/*.json' recurses)")
+    parser.add_argument('--minify', action='store_true', help="Write compact JSON for shipping")
+    parser.add_argument('--schema', default='auto', choices=['auto', 'none'] + sorted(SCHEMAS))
+    parser.add_argument('--workers', type=int, help="Worker processes (default: CPU count)")
+    parser.add_argument('--force', action='store_true', help="Ignore the hash manifest")
+    args = parser.parse_args()
+
+    if os.path.isfile(args.path):
         # Format single file
-        format_json_file(path, indent=indent)
-    elif os.path.isdir(path):
+        ok = format_json_file(args.path, indent=args.indent, minify=args.minify, schema=args.schema)
+        return 0 if ok else 1
+    elif os.path.isdir(args.path):
         # Format all JSON files in directory
-        format_directory(path, indent=indent)
+        counts = format_directory(args.path, args.pattern, args.indent, args.minify, args.schema,
+                                  args.workers, args.force)
+        return 1 if counts['invalid'] or counts['error'] else 0
     else:
-        print(f"✗ Error: '{path}' is not a valid file or directory")
+        print(f"✗ Error: '{args.path}' is not a valid file or directory")
+        return 1
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,143 @@
+import re
+import zlib
+from collections import defaultdict
+
+# Character shingles survive single-letter spelling variants that would break word shingles
+SHINGLE_SIZE = 5
+NUM_BINS = 32
+BAND_SIZE = 2
+MIN_SIMILARITY = 0.6
+
+TASHKEEL = re.compile(r'[\u0617-\u061A\u064B-\u0652]+')
+NON_WORD = re.compile(r'[^\w\s\u0600-\u06FF]')
+
+
+def remove_tashkeel(text):
+    """
+    Remove Arabic diacritics (tashkeel) from text for better matching.
+    """
+    if not text:
+        return ""
+    return TASHKEEL.sub('', text)
+
+
+def normalize_text(text):
+    """
+    Normalize text by removing tashkeel, punctuation, and extra whitespace.
+    """
+    if not text:
+        return ""
+    text = remove_tashkeel(text)
+    text = NON_WORD.sub(' ', text)
+    return ' '.join(text.split())
+
+
+def fold_variants(text):
+    """
+    Fold common Arabic orthographic variants (alef forms, ya/alef maqsura,
+    ta marbuta) so they do not count as differences in fuzzy matching.
+    """
+    text = re.sub(r'[\u0622\u0623\u0625\u0671]', '\u0627', text)
+    text = text.replace('\u0649', '\u064A').replace('\u0629', '\u0647')
+    return text.replace(' ', '')
+
+
+def shingle_hash(shingle):
+    # crc32, not hash(): str hashes are salted per process, so buckets and
+    # matches would change from run to run
+    return zlib.crc32(shingle.encode('utf-8'))
+
+
+def shingles(text):
+    """Set of hashed character shingles of a folded text."""
+    if len(text) <= SHINGLE_SIZE:
+        return {shingle_hash(text)} if text else set()
+    return {shingle_hash(text[i:i + SHINGLE_SIZE]) for i in range(len(text) - SHINGLE_SIZE + 1)}
+
+
+def signature(shingle_set):
+    """
+    One-permutation MinHash: each shingle hash is routed to one of NUM_BINS
+    bins and the minimum per bin is kept. One hash per shingle instead of
+    one per shingle per permutation keeps indexing 30k hadiths in seconds.
+    """
+    mins = [None] * NUM_BINS
+    for h in shingle_set:
+        b = h % NUM_BINS
+        if mins[b] is None or h < mins[b]:
+            mins[b] = h
+    return mins
+
+
+def jaccard(a, b):
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+class ShingleIndex:
+    """
+    LSH index over MinHash signatures of normalized Arabic text. Only the
+    signature, folded text and shingle count are kept per document; shingle
+    sets are rebuilt on demand for the handful of candidates that need
+    verifying.
+    """
+
+    def __init__(self):
+        self.docs = {}
+        self.sizes = {}
+        self.buckets = defaultdict(list)
+
+    def add(self, key, text):
+        folded = fold_variants(text)
+        shingle_set = shingles(folded)
+        sig = signature(shingle_set)
+        self.docs[key] = folded
+        self.sizes[key] = len(shingle_set)
+        for start in range(0, NUM_BINS, BAND_SIZE):
+            band = tuple(sig[start:start + BAND_SIZE])
+            if any(v is None for v in band):
+                continue
+            self.buckets[(start, band)].append(key)
+
+    def candidates(self, sig):
+        found = set()
+        for start in range(0, NUM_BINS, BAND_SIZE):
+            band = tuple(sig[start:start + BAND_SIZE])
+            if any(v is None for v in band):
+                continue
+            found.update(self.buckets.get((start, band), ()))
+        return found
+
+    def best_match(self, text, exclude=(), min_similarity=MIN_SIMILARITY):
+        """
+        Return (key, score, runner_up_score) for the most similar indexed
+        document, or (None, best_score, 0.0) when nothing reaches min_similarity.
+
+        Candidates are verified with exact shingle Jaccard. The ratio of the
+        two shingle-set sizes is an upper bound on Jaccard, so candidates
+        that cannot beat the current best are skipped without building their
+        shingle sets.
+        """
+        folded = fold_variants(text)
+        query = shingles(folded)
+        if not query:
+            return None, 0.0, 0.0
+
+        best_key, best, runner_up = None, 0.0, 0.0
+        for key in self.candidates(signature(query)):
+            if key in exclude:
+                continue
+            size = self.sizes[key]
+            bound = min(len(query), size) / max(len(query), size)
+            if bound <= runner_up:
+                continue
+            score = jaccard(query, shingles(self.docs[key]))
+            if score > best:
+                best_key, best, runner_up = key, score, best
+            elif score > runner_up:
+                runner_up = score
+
+        if best < min_similarity:
+            return None, best, 0.0
+        return best_key, best, runner_up
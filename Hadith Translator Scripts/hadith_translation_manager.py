@@ -1,5 +1,6 @@
 import json
 import os
+import sys
 import time
 import threading
 import queue
@@ -67,6 +68,24 @@ def extract_text_from_json(json_path, output_txt_path):
         log(f"Error extracting text: {e}")
         return False
 
+def extract_cached(json_path, output_path, force=False):
+    """extract_text_from_json, skipped when the input and this script are unchanged (scripts/build_cache.py)."""
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts"))
+    from build_cache import BuildCache, BuildFailed
+
+    # True only after a successful extraction or a verified cache restore
+    cache = BuildCache()
+    try:
+        cache.build("hadith_extract", [json_path], [output_path],
+                    lambda: extract_text_from_json(json_path, output_path),
+                    generator=__file__, force=force)
+    except BuildFailed as e:
+        log(f"Extraction failed: {e}")
+        return False
+    finally:
+        cache.close()
+    return True
+
 # --- Translation Logic ---
 def translate_batch(batch_items, api_key, model_name=DEFAULT_MODEL):
     """Translates a batch of hadith objects.
@@ -432,11 +451,12 @@ if __name__ == "__main__":
     parser.add_argument("--output", required=True, help="Output file path")
     parser.add_argument("--keys", help="Path to file containing API keys (one per line)")
     parser.add_argument("--original", help="Original JSON file (required for merge)")
+    parser.add_argument("--force", action="store_true", help="Re-extract even when the build cache is current")
     
     args = parser.parse_args()
     
     if args.action == "extract":
-        extract_text_from_json(args.input, args.output)
+        extract_cached(args.input, args.output, args.force)
         
     elif args.action == "translate":
         if not args.keys:
@@ -469,6 +489,6 @@ if __name__ == "__main__":
         with open(args.keys, 'r') as f:
             keys = [line.strip() for line in f if line.strip()]
             
-        if extract_text_from_json(json_file, txt_file):
+        if extract_cached(json_file, txt_file, args.force):
             run_translation(txt_file, trans_jsonl, keys)
             create_burmese_json(json_file, trans_jsonl, final_json)
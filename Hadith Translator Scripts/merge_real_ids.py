@@ -2,6 +2,10 @@ import json
 import os
 import re
 import sys
+import time
+from collections import Counter
+
+from hadith_matcher import ShingleIndex, normalize_text
 
 # Mapping from our internal filenames to the dataset filenames
 BOOK_MAPPING = {
@@ -15,28 +19,11 @@ BOOK_MAPPING = {
 
 DATASET_DIR = "hadith_datasets"
 TARGET_DIR = "db/by_book/the_9_books"
+REPORT_DIR = "match_reports"
 
-def remove_tashkeel(text):
-    """
-    Remove Arabic diacritics (tashkeel) from text for better matching.
-    """
-    if not text:
-        return ""
-    # Arabic diacritics unicode range
-    tashkeel = re.compile(r'[\u0617-\u061A\u064B-\u0652]')
-    return tashkeel.sub('', text)
-
-def normalize_text(text):
-    """
-    Normalize text by removing tashkeel, punctuation, and extra whitespace.
-    """
-    if not text:
-        return ""
-    text = remove_tashkeel(text)
-    # Remove non-alphanumeric characters (keep Arabic letters)
-    # This is a simple regex, might need refinement
-    text = re.sub(r'[^\w\s\u0600-\u06FF]', ' ', text)
-    return ' '.join(text.split())
+# Confidence assigned to positional gap-fill matches
+GAP_CONFIDENCE_BOTH = 0.8   # prev + 1 == next - 1
+GAP_CONFIDENCE_PREV = 0.5   # only the previous neighbour agrees
 
 def extract_sunnah_id(reference):
     """
@@ -56,6 +43,24 @@ def extract_sunnah_id(reference):
         return val
     return None
 
+def apply_source_info(hadith, source_info):
+    hadith['sunnahHadithId'] = source_info['id']
+    if source_info['grade']:
+        hadith['grade'] = source_info['grade']
+    if source_info['chapter_title_arabic']:
+        hadith['chapterTitleArabic'] = source_info['chapter_title_arabic']
+    if source_info['chapter_title_english']:
+        hadith['chapterTitleEnglish'] = source_info['chapter_title_english']
+
+
+def confidence_band(score):
+    if score >= 0.9:
+        return 'high'
+    if score >= 0.75:
+        return 'medium'
+    return 'low'
+
+
 def merge_book(target_filename):
     if target_filename not in BOOK_MAPPING:
         print(f"Skipping {target_filename}: No corresponding dataset found.")
@@ -73,39 +78,38 @@ def merge_book(target_filename):
         return
 
     print(f"Processing {target_filename} using {dataset_filename}...")
+    started = time.perf_counter()
 
     # Load Dataset (Source)
     print("  Loading source dataset...")
     with open(dataset_path, 'r', encoding='utf-8') as f:
         source_data = json.load(f)
 
-    # Build Lookup Dictionary
-    # We'll use normalized Arabic text as the key
+    # Build exact lookup on normalized Arabic text, plus an ID lookup for gap filling
     print("  Building lookup index...")
     lookup_map = {}
-    
-    # Also keep track of "Chapter:Hadith" mapping if Arabic text fails?
-    # For now let's try Arabic text.
-    
+    id_to_info = {}
+
     for item in source_data:
         arabic_text = item.get('Arabic_Text', '')
         reference = item.get('Reference', '')
-        
+
         if not arabic_text or not reference:
             continue
-            
+
         sunnah_id = extract_sunnah_id(reference)
         if sunnah_id is None:
             continue
-            
-        norm_text = normalize_text(arabic_text)
-        # Store the info we want to transfer
-        lookup_map[norm_text] = {
+
+        info = {
             'id': sunnah_id,
+            'norm_text': normalize_text(arabic_text),
             'grade': item.get('Grade', '').strip(),
             'chapter_title_arabic': item.get('Chapter_Title_Arabic', '').strip(),
             'chapter_title_english': item.get('Chapter_Title_English', '').strip()
         }
+        lookup_map[info['norm_text']] = info
+        id_to_info[sunnah_id] = info
 
     print(f"  Indexed {len(lookup_map)} hadiths from source.")
 
@@ -114,88 +118,109 @@ def merge_book(target_filename):
     with open(target_path, 'r', encoding='utf-8') as f:
         target_data = json.load(f)
 
-    # Update Target Data
+    hadiths = target_data.get('hadiths', [])
+    total_count = len(hadiths)
+    matches = [None] * total_count   # (method, confidence, runner_up)
+    used_ids = set()
+
+    # Pass 1: exact match on normalized text
     print("  Matching and updating...")
-    matched_count = 0
-    total_count = len(target_data.get('hadiths', []))
-    
-    for hadith in target_data.get('hadiths', []):
-        arabic = hadith.get('arabic', '')
-        norm_arabic = normalize_text(arabic)
-        
-        if norm_arabic in lookup_map:
-            source_info = lookup_map[norm_arabic]
-            
-            # Update fields
-            hadith['sunnahHadithId'] = source_info['id']
-            
-            # Add new fields if they exist in source
-            if source_info['grade']:
-                hadith['grade'] = source_info['grade']
-            
-            # For chapter titles, we might want to store them in the hadith object 
-            # or check if we should update the chapter object? 
-            # The user asked for "chapter title arabic. chapter title english" to be added.
-            # Since the structure separates chapters, adding them to the hadith object 
-            # might be redundant but it's what was requested.
-            if source_info['chapter_title_arabic']:
-                hadith['chapterTitleArabic'] = source_info['chapter_title_arabic']
-            if source_info['chapter_title_english']:
-                hadith['chapterTitleEnglish'] = source_info['chapter_title_english']
-                
-            matched_count += 1
-        else:
-            # Fallback: Try matching by English text? 
-            # Arabic is usually more reliable if normalized correctly.
-            # Let's just log it for now.
-            pass
+    norm_targets = [normalize_text(h.get('arabic', '')) for h in hadiths]
+    for i, norm_arabic in enumerate(norm_targets):
+        source_info = lookup_map.get(norm_arabic)
+        if source_info:
+            apply_source_info(hadiths[i], source_info)
+            used_ids.add(source_info['id'])
+            matches[i] = ('exact', 1.0, None)
+
+    exact_count = sum(1 for m in matches if m)
+
+    # Pass 2: fuzzy match via shingle index over sources not already claimed
+    index = ShingleIndex()
+    for sunnah_id, info in id_to_info.items():
+        if sunnah_id not in used_ids and info['norm_text']:
+            index.add(sunnah_id, info['norm_text'])
+
+    for i, norm_arabic in enumerate(norm_targets):
+        if matches[i] or not norm_arabic:
+            continue
+        sunnah_id, score, runner_up = index.best_match(norm_arabic, exclude=used_ids)
+        if sunnah_id is not None:
+            apply_source_info(hadiths[i], id_to_info[sunnah_id])
+            used_ids.add(sunnah_id)
+            matches[i] = ('fuzzy', round(score, 3), round(runner_up, 3))
 
-    print(f"  Matched {matched_count}/{total_count} hadiths ({matched_count/total_count*100:.1f}%) via text match.")
+    fuzzy_count = sum(1 for m in matches if m) - exact_count
 
-    # Second Pass: Gap Filling
+    # Pass 3: gap filling
     # If we have a sequence like: Match(10), ???, Match(12), the missing one is likely 11.
-    # We can also just assume sequential order if the text match failed but the position is logical.
-    
-    # Build a map of ID -> Source Info for easy lookup by ID
-    id_to_info = {}
-    for info in lookup_map.values():
-        id_to_info[info['id']] = info
+    # Unmatched hadiths that already carry an ID keep it, and it is not handed out again.
+    kept_ids = {h.get('sunnahHadithId') for i, h in enumerate(hadiths)
+                if not matches[i] and h.get('sunnahHadithId') is not None}
+    for i in range(total_count):
+        if matches[i] or hadiths[i].get('sunnahHadithId') is not None:
+            continue
 
-    filled_count = 0
-    hadiths = target_data.get('hadiths', [])
-    
-    for i in range(len(hadiths)):
-        if 'sunnahHadithId' in hadiths[i]:
+        prev_id = hadiths[i - 1].get('sunnahHadithId') if i > 0 else None
+        if not isinstance(prev_id, int):
             continue
-            
-        # Look at previous hadith
-        prev_id = None
-        if i > 0 and 'sunnahHadithId' in hadiths[i-1]:
-            prev_id = hadiths[i-1]['sunnahHadithId']
-            
-        # Look at next hadith (to verify sequence if possible, but strictly next ID is a good guess)
-        # For now, let's just try (prev_id + 1)
-        
-        if prev_id is not None and isinstance(prev_id, int):
-            candidate_id = prev_id + 1
-            
-            # Check if this candidate ID exists in our source data
-            if candidate_id in id_to_info:
-                # Assign it!
-                source_info = id_to_info[candidate_id]
-                hadiths[i]['sunnahHadithId'] = candidate_id
-                
-                if source_info['grade']:
-                    hadiths[i]['grade'] = source_info['grade']
-                if source_info['chapter_title_arabic']:
-                    hadiths[i]['chapterTitleArabic'] = source_info['chapter_title_arabic']
-                if source_info['chapter_title_english']:
-                    hadiths[i]['chapterTitleEnglish'] = source_info['chapter_title_english']
-                
-                filled_count += 1
-                
-    total_matched = matched_count + filled_count
-    print(f"  Filled {filled_count} gaps. Total matched: {total_matched}/{total_count} ({total_matched/total_count*100:.1f}%)")
+
+        candidate_id = prev_id + 1
+        if candidate_id not in id_to_info or candidate_id in used_ids or candidate_id in kept_ids:
+            continue
+
+        next_id = hadiths[i + 1].get('sunnahHadithId') if i + 1 < total_count else None
+        confidence = GAP_CONFIDENCE_BOTH if next_id == candidate_id + 1 else GAP_CONFIDENCE_PREV
+
+        apply_source_info(hadiths[i], id_to_info[candidate_id])
+        used_ids.add(candidate_id)
+        matches[i] = ('gap', confidence, None)
+
+    filled_count = sum(1 for m in matches if m) - exact_count - fuzzy_count
+    total_matched = exact_count + fuzzy_count + filled_count
+    elapsed = time.perf_counter() - started
+
+    # Confidence-scored match report
+    rows = []
+    bands = Counter()
+    for i, hadith in enumerate(hadiths):
+        method, confidence, runner_up = matches[i] or ('unmatched', 0.0, None)
+        band = confidence_band(confidence) if matches[i] else 'none'
+        bands[band] += 1
+        rows.append({
+            'index': i,
+            'idInBook': hadith.get('idInBook'),
+            'sunnahHadithId': hadith.get('sunnahHadithId') if matches[i] else None,
+            'method': method,
+            'confidence': confidence,
+            'runnerUp': runner_up,
+            'band': band,
+        })
+
+    report = {
+        'target': target_filename,
+        'source': dataset_filename,
+        'total': total_count,
+        'exact': exact_count,
+        'fuzzy': fuzzy_count,
+        'gap': filled_count,
+        'unmatched': total_count - total_matched,
+        'bands': dict(bands),
+        'seconds': round(elapsed, 2),
+        'matches': rows,
+    }
+
+    os.makedirs(REPORT_DIR, exist_ok=True)
+    report_path = os.path.join(REPORT_DIR, target_filename.replace('.json', '.match_report.json'))
+    with open(report_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False)
+
+    pct = lambda n: n / total_count * 100 if total_count else 0.0
+    print(f"  Exact: {exact_count}  Fuzzy: {fuzzy_count}  Gap-filled: {filled_count}  "
+          f"Unmatched: {total_count - total_matched}")
+    print(f"  Total matched: {total_matched}/{total_count} ({pct(total_matched):.1f}%) in {elapsed:.1f}s")
+    print(f"  Confidence: high={bands['high']} medium={bands['medium']} low={bands['low']}")
+    print(f"  Report written to {report_path}")
 
     # Save updated file
     print(f"  Saving updated {target_filename}...")
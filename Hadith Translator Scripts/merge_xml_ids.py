@@ -1,10 +1,13 @@
 import json
 import os
 import re
+import sqlite3
+import sys
 import xml.etree.ElementTree as ET
 
 TARGET_FILE = 'db/by_book/the_9_books/my-muslim.json'
 XML_FILE = 'Muslim.xml'
+INDEX_DB = 'xml_index.db'
 
 def remove_tashkeel(text):
     tashkeel = re.compile(r'[\u0617-\u061A\u064B-\u0652]')
@@ -18,63 +21,115 @@ def normalize_text(text):
     text = re.sub(r'[^\w\s\u0600-\u06FF]', ' ', text)
     return ' '.join(text.split())
 
-def parse_xml_hadiths(xml_path):
+def _parse_ref_value(val):
+    if val is None:
+        return None
+    val = val.strip()
+    return int(val) if val.isdigit() else val
+
+
+def extract_references(hadith_elem):
+    """
+    Single pass over a <hadith>'s <reference> children.
+    Returns (sunnah_id, book_num, hadith_num).
+    """
+    sunnah_id = None
+    book_num = None
+    hadith_num = None
+
+    for ref in hadith_elem.iter('reference'):
+        code = ref.findtext('code')
+        parts = [p.text for p in ref.iter('part')]
+
+        if code == 'Reference' and sunnah_id is None and parts:
+            val = parts[0] or ''
+            # User requested to ignore suffix and take the integer part
+            if val.isdigit():
+                sunnah_id = int(val)
+            else:
+                # Try to extract leading digits if mixed
+                match = re.match(r'^(\d+)', val)
+                sunnah_id = int(match.group(1)) if match else val
+        elif code == 'In-Book' and book_num is None and len(parts) >= 2:
+            book_num = _parse_ref_value(parts[0])
+            hadith_num = _parse_ref_value(parts[1])
+
+    return sunnah_id, book_num, hadith_num
+
+
+def open_index(db_path=INDEX_DB):
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript("""
+    CREATE TABLE IF NOT EXISTS xml_sources (
+        path TEXT PRIMARY KEY,
+        size INTEGER NOT NULL,
+        mtime_ns INTEGER NOT NULL,
+        hadith_count INTEGER NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS xml_hadiths (
+        source TEXT NOT NULL,
+        book_num,
+        hadith_num,
+        sunnah_id,
+        PRIMARY KEY (source, book_num, hadith_num)
+    ) WITHOUT ROWID;
+    """)
+    return conn
+
+
+def parse_xml_hadiths(xml_path, conn, rebuild=False):
+    """
+    Stream <hadith> elements from a sunnah.com XML export into the SQLite
+    index. Each element is cleared as soon as its references are extracted,
+    so memory stays bounded regardless of export size. The index is reused
+    as long as the XML file's size and mtime are unchanged.
+    """
+    source = os.path.abspath(xml_path)
+    stat = os.stat(xml_path)
+
+    row = conn.execute("SELECT size, mtime_ns, hadith_count FROM xml_sources WHERE path = ?",
+                       (source,)).fetchone()
+    if row and not rebuild and row[0] == stat.st_size and row[1] == stat.st_mtime_ns:
+        print(f"Reusing index for {xml_path} ({row[2]} hadiths).")
+        return source
+
     print(f"Parsing {xml_path}...")
-    tree = ET.parse(xml_path)
-    root = tree.getroot()
-    
-    hadiths = []
-    
-    for hadith_elem in root.findall('.//hadith'):
-        # Extract Reference (Sunnah ID)
-        sunnah_id = None
-        for ref in hadith_elem.findall('.//reference'):
-            if ref.find('code').text == 'Reference':
-                parts = ref.findall('.//part')
-                if parts:
-                    val = parts[0].text
-                    # User requested to ignore suffix and take the integer part
-                    # suffix = ref.find('suffix').text
-                    # if suffix:
-                    #     val += suffix
-                    
-                    if val.isdigit():
-                        sunnah_id = int(val)
-                    else:
-                        # Try to extract leading digits if mixed
-                        match = re.match(r'^(\d+)', val)
-                        if match:
-                            sunnah_id = int(match.group(1))
-                        else:
-                            sunnah_id = val
-                break
-        
-        if sunnah_id is None:
+    conn.execute("DELETE FROM xml_hadiths WHERE source = ?", (source,))
+
+    batch = []
+    count = 0
+    context = ET.iterparse(xml_path, events=('start', 'end'))
+    _, root = next(context)
+
+    for event, elem in context:
+        if event != 'end' or elem.tag != 'hadith':
             continue
-            
-        # Extract In-Book Reference
-        book_num = None
-        hadith_num = None
-        
-        for ref in hadith_elem.findall('.//reference'):
-            if ref.find('code').text == 'In-Book':
-                parts = ref.findall('.//part')
-                if len(parts) >= 2:
-                    book_num = parts[0].text
-                    hadith_num = parts[1].text
-                break
-                
-        if book_num and hadith_num:
-            hadiths.append({
-                'id': sunnah_id,
-                'book_num': int(book_num) if book_num.isdigit() else book_num,
-                'hadith_num': int(hadith_num) if hadith_num.isdigit() else hadith_num
-            })
-        
-    print(f"Parsed {len(hadiths)} hadiths from XML.")
-    return hadiths
 
-def merge_xml():
+        sunnah_id, book_num, hadith_num = extract_references(elem)
+        if sunnah_id is not None and book_num is not None and hadith_num is not None:
+            batch.append((source, book_num, hadith_num, sunnah_id))
+            count += 1
+
+        elem.clear()
+        root.clear()
+
+        if len(batch) >= 5000:
+            conn.executemany("INSERT OR REPLACE INTO xml_hadiths VALUES (?, ?, ?, ?)", batch)
+            batch = []
+
+    if batch:
+        conn.executemany("INSERT OR REPLACE INTO xml_hadiths VALUES (?, ?, ?, ?)", batch)
+
+    conn.execute("INSERT OR REPLACE INTO xml_sources VALUES (?, ?, ?, ?)",
+                 (source, stat.st_size, stat.st_mtime_ns, count))
+    conn.commit()
+
+    print(f"Parsed {count} hadiths from XML.")
+    return source
+
+def merge_xml(rebuild=False):
     if not os.path.exists(TARGET_FILE):
         print(f"Target file not found: {TARGET_FILE}")
         return
@@ -87,13 +142,13 @@ def merge_xml():
     with open(TARGET_FILE, 'r', encoding='utf-8') as f:
         target_data = json.load(f)
 
-    # Parse XML
-    xml_hadiths = parse_xml_hadiths(XML_FILE)
+    # Parse XML (or reuse the on-disk index)
+    conn = open_index()
+    source = parse_xml_hadiths(XML_FILE, conn, rebuild=rebuild)
     
     # Debug: Print some keys from XML
     print("Sample XML keys (Book, Hadith):")
-    xml_keys = list(lookup_map.keys())
-    for k in xml_keys[:10]:
+    for k in conn.execute("SELECT book_num, hadith_num FROM xml_hadiths WHERE source = ? LIMIT 10", (source,)):
         print(f"  {k}")
         
     # Match
@@ -116,9 +171,13 @@ def merge_xml():
             continue
             
         key = (chapter_id, id_in_book)
+        row = conn.execute(
+            "SELECT sunnah_id FROM xml_hadiths WHERE source = ? AND book_num = ? AND hadith_num = ?",
+            (source, chapter_id, id_in_book)
+        ).fetchone()
         
-        if key in lookup_map:
-            new_id = lookup_map[key]
+        if row:
+            new_id = row[0]
             
             # Always update to ensure we get the integer version
             if 'sunnahHadithId' not in hadith or hadith['sunnahHadithId'] != new_id:
@@ -131,6 +190,7 @@ def merge_xml():
                 unmatched_keys.append(key)
             pass
             
+    conn.close()
     print(f"Sample unmatched keys from target: {unmatched_keys}")
             
     print(f"Already matched (verified): {already_matched}")
@@ -150,4 +210,4 @@ def merge_xml():
         print("No new matches found.")
 
 if __name__ == "__main__":
-    merge_xml()
+    merge_xml(rebuild='--rebuild' in sys.argv)
@@ -2,58 +2,128 @@ import json
 import sqlite3
 import os
 
+# Range-aware store: every commentary text is kept once in tafseer_text and
+# referenced by the (surah, from_ayah, to_ayah) interval it covers. Member
+# ayahs of a range (the empty-text rows in the source JSON) are not stored at
+# all - an ayah lookup finds them through the interval index instead.
+SCHEMA = '''
+    CREATE TABLE tafseer_text (
+        id INTEGER PRIMARY KEY,
+        text TEXT NOT NULL
+    );
+
+    CREATE TABLE tafseer_ranges (
+        surah INTEGER NOT NULL,
+        from_ayah INTEGER NOT NULL,
+        to_ayah INTEGER NOT NULL,
+        text_id INTEGER NOT NULL REFERENCES tafseer_text(id),
+        PRIMARY KEY (surah, from_ayah, to_ayah)
+    ) WITHOUT ROWID;
+
+    -- Ranges in a surah do not overlap, so the first range ending at or after
+    -- an ayah is the only candidate that can contain it
+    CREATE INDEX idx_tafseer_interval ON tafseer_ranges(surah, to_ayah, from_ayah);
+
+    -- Legacy row shape (ayah_key, group_ayah_key, from_ayah, to_ayah, text)
+    -- for the chunker and other readers of the old flat table
+    CREATE VIEW tafseer AS
+        SELECT r.surah || ':' || r.from_ayah AS ayah_key,
+               r.surah || ':' || r.from_ayah AS group_ayah_key,
+               r.surah || ':' || r.from_ayah AS from_ayah,
+               r.surah || ':' || r.to_ayah AS to_ayah,
+               t.text AS text
+        FROM tafseer_ranges r
+        JOIN tafseer_text t ON t.id = r.text_id;
+'''
+
+
+def parse_key(key):
+    """'2:255' -> (2, 255); None for anything else."""
+    surah, sep, ayah = str(key or '').partition(':')
+    if not sep or not surah.isdigit() or not ayah.isdigit():
+        return None
+    return int(surah), int(ayah)
+
+
+def iter_ranges(items):
+    """
+    Yield (surah, from_ayah, to_ayah, text) once per commentary range.
+
+    Items without text are member ayahs of a range whose text sits on the
+    group's first ayah (or ayahs with no commentary at all); both are
+    covered by the interval lookup and are dropped here.
+    """
+    seen = set()
+    for item in items:
+        text = (item.get('text') or '').strip()
+        start = parse_key(item.get('from_ayah') or item.get('ayah_key'))
+        if not text or start is None:
+            continue
+
+        end = parse_key(item.get('to_ayah')) or start
+        if end[0] != start[0] or end[1] < start[1]:
+            end = start
+
+        key = (start[0], start[1], end[1])
+        if key in seen:
+            continue
+        seen.add(key)
+        yield start[0], start[1], end[1], text
+
+
+def lookup_tafseer(conn, surah, ayah):
+    """Text of the range covering surah:ayah, or None."""
+    row = conn.execute('''
+        SELECT t.text
+        FROM tafseer_ranges r
+        JOIN tafseer_text t ON t.id = r.text_id
+        WHERE r.surah = ? AND r.to_ayah >= ? AND r.from_ayah <= ?
+        ORDER BY r.to_ayah
+        LIMIT 1
+    ''', (surah, ayah, ayah)).fetchone()
+    return row[0] if row else None
+
+
 def json_to_sqlite(json_path, db_path):
     """Convert JSON file to SQLite database for better performance"""
-    
+
     # Load JSON data
     with open(json_path, 'r', encoding='utf-8') as f:
         data = json.load(f)
-    
+
     # Create SQLite database
+    if os.path.exists(db_path):
+        os.remove(db_path)
     conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
-    
-    # Create table
-    cursor.execute('''
-        CREATE TABLE tafseer (
-            ayah_key TEXT,
-            group_ayah_key TEXT,
-            from_ayah TEXT,
-            to_ayah TEXT,
-            ayah_keys TEXT,
-            text TEXT
-        )
-    ''')
-    
-    # Insert data
-    for item in data:
-        cursor.execute('''
-            INSERT INTO tafseer (ayah_key, group_ayah_key, from_ayah, to_ayah, ayah_keys, text)
-            VALUES (?, ?, ?, ?, ?, ?)
-        ''', (
-            item.get('ayah_key', ''),
-            item.get('group_ayah_key', ''),
-            item.get('from_ayah', ''),
-            item.get('to_ayah', ''),
-            item.get('ayah_keys', ''),
-            item.get('text', '')
-        ))
-    
-    # Create index for better performance
-    cursor.execute('CREATE INDEX idx_ayah_key ON tafseer(ayah_key)')
-    cursor.execute('CREATE INDEX idx_text_empty ON tafseer(text)')
-    
+    conn.executescript(SCHEMA)
+
+    # Identical commentary under different ranges is stored once
+    text_ids = {}
+    ranges = 0
+    for surah, from_ayah, to_ayah, text in iter_ranges(data):
+        text_id = text_ids.get(text)
+        if text_id is None:
+            text_id = conn.execute('INSERT INTO tafseer_text (text) VALUES (?)', (text,)).lastrowid
+            text_ids[text] = text_id
+        conn.execute('''
+            INSERT INTO tafseer_ranges (surah, from_ayah, to_ayah, text_id)
+            VALUES (?, ?, ?, ?)
+        ''', (surah, from_ayah, to_ayah, text_id))
+        ranges += 1
+
     conn.commit()
+    conn.execute('VACUUM')
     conn.close()
-    
-    print(f"Converted {len(data)} items to SQLite database: {db_path}")
+
+    print(f"Converted {len(data)} items to {ranges} ranges ({len(text_ids)} distinct texts) "
+          f"in SQLite database: {db_path}")
 
 if __name__ == "__main__":
     script_dir = os.path.dirname(os.path.abspath(__file__))
     json_path = os.path.join(script_dir, "tafseer_ibn_kasir.json")
     db_path = os.path.join(script_dir, "tafseer_ibn_kasir.db")
-    
+
     if os.path.exists(json_path):
         json_to_sqlite(json_path, db_path)
     else:
-        print(f"JSON file not found: {json_path}")
\ No newline at end of file
+        print(f"JSON file not found: {json_path}")
@@ -1,130 +1,292 @@
+import hashlib
 import json
+import math
 import os
+import re
 import sqlite3
+import sys
 
-def smart_chunk_from_db(db_path, output_dir, max_chunk_size=15000, min_chunk_size=14000):
+try:
+    import tiktoken
+    _ENCODING = tiktoken.get_encoding("cl100k_base")
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    _ENCODING = None
+    TIKTOKEN_AVAILABLE = False
+
+# Words, HTML tags and single punctuation marks, for the offline token estimate
+TOKEN_PIECES = re.compile(r"<[^>]{1,80}>|[A-Za-z0-9]+|[^\W\d_A-Za-z]+|\S")
+
+# Reading order for "surah:ayah" keys ("2:10" before "2:100", "10:1" after "9:129")
+AYAH_KEY_ORDER = ("CAST(substr(ayah_key, 1, instr(ayah_key, ':') - 1) AS INTEGER), "
+                  "CAST(substr(ayah_key, instr(ayah_key, ':') + 1) AS INTEGER), ayah_key")
+
+
+def count_tokens(text):
+    """
+    Model tokens in `text`. Uses tiktoken when installed; otherwise an
+    estimate: ~4 chars per token for Latin words, ~2 for Arabic/Burmese
+    script, one per tag or punctuation mark.
+    """
+    if TIKTOKEN_AVAILABLE:
+        return len(_ENCODING.encode(text))
+
+    tokens = 0
+    for piece in TOKEN_PIECES.findall(text):
+        if piece.startswith('<') and len(piece) > 1:
+            tokens += max(1, len(piece) // 4)
+        elif piece.isascii():
+            tokens += max(1, math.ceil(len(piece) / 4))
+        else:
+            tokens += max(1, math.ceil(len(piece) / 2))
+    return tokens
+
+
+def plan_chunks(token_counts, max_chunk_tokens, min_items=5):
+    """
+    Balanced ordered partition: choose the chunk count from the total, then
+    close each chunk at whichever boundary lands closest to the per-chunk
+    target. Items stay in ayah order (neighbouring ayahs share context) and
+    sizes come out even instead of a long tail of tiny final chunks.
+
+    Returns the index of the last item in each chunk.
     """
-    Smart chunker that reads from SQLite DB, separates empty items, and chunks non-empty items.
-    
+    packable = sum(t for t in token_counts if t <= max_chunk_tokens)
+    chunk_count = max(1, math.ceil(packable / max_chunk_tokens))
+    target = packable / chunk_count
+
+    boundaries = []
+    current = 0
+    items = 0
+    for i, tokens in enumerate(token_counts):
+        # Oversized items always get a chunk of their own
+        if tokens > max_chunk_tokens:
+            if items:
+                boundaries.append(i - 1)
+            boundaries.append(i)
+            current = items = 0
+            continue
+
+        if items and current + tokens > max_chunk_tokens:
+            boundaries.append(i - 1)
+            current = items = 0
+        elif items >= min_items and abs(current + tokens - target) > abs(current - target):
+            boundaries.append(i - 1)
+            current = items = 0
+
+        current += tokens
+        items += 1
+
+    if items:
+        boundaries.append(len(token_counts) - 1)
+    return boundaries
+
+
+def smart_chunk_from_db(db_path, output_dir, max_chunk_tokens=4000, jobs_path=None):
+    """
+    Smart chunker that streams from the SQLite DB, separates empty items, and
+    chunks non-empty items by model tokens.
+
     Args:
         db_path (str): Path to the SQLite database file
         output_dir (str): Directory to write output chunk files
-        max_chunk_size (int): Maximum characters per chunk
-        min_chunk_size (int): Minimum characters per chunk
+        max_chunk_tokens (int): Maximum model tokens per chunk
+        jobs_path (str): Optional translation job JSONL ({"id", "text"} per
+            line, as read by run_translation) to append items to as well
+
+    The chunk -> ayah_key manifest is recorded in the DB's chunk_manifest table.
     """
     os.makedirs(output_dir, exist_ok=True)
-    
+
     # Connect to database
     conn = sqlite3.connect(db_path)
     conn.row_factory = sqlite3.Row  # Enable column access by name
     cursor = conn.cursor()
-    
-    # Get table name
-    cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
+
+    # Get table name (range-aware DBs from json_to_db expose a `tafseer` view)
+    cursor.execute("SELECT name FROM sqlite_master WHERE type IN ('table', 'view') "
+                   "AND name NOT IN ('chunk_manifest', 'tafseer_text', 'tafseer_ranges');")
     tables = cursor.fetchall()
     if not tables:
         print("No tables found in database")
         return
-    
+
     print("Available tables:")
     for i, table in enumerate(tables):
         print(f"  {i+1}. {table[0]}")
-    
-    table_name = tables[0][0]  # Use first table by default
+
+    names = [table[0] for table in tables]
+    table_name = 'tafseer' if 'tafseer' in names else names[0]  # Use first table by default
     print(f"Using table: {table_name}")
-    
+    print(f"Token counter: {'tiktoken cl100k_base' if TIKTOKEN_AVAILABLE else 'offline estimate'}")
+
     # Count total items
     cursor.execute(f"SELECT COUNT(*) FROM {table_name}")
     total_count = cursor.fetchone()[0]
     print(f"Total items in database: {total_count}")
-    
+
     # Count and save empty items
     cursor.execute(f"SELECT * FROM {table_name} WHERE text IS NULL OR TRIM(text) = ''")
     empty_rows = cursor.fetchall()
-    
+
     if empty_rows:
         empty_items = [dict(row) for row in empty_rows]
         empty_path = os.path.join(output_dir, "empty_items.json")
         with open(empty_path, "w", encoding="utf-8") as f:
             json.dump(empty_items, f, ensure_ascii=False, indent=2)
         print(f"Saved {len(empty_items)} empty items to: empty_items.json")
-    
-    # Get non-empty items for chunking
-    cursor.execute(f"SELECT * FROM {table_name} WHERE text IS NOT NULL AND TRIM(text) != '' ORDER BY ayah_key")
-    
-    chunks = []
+
+    select_items = (f"SELECT * FROM {table_name} WHERE text IS NOT NULL AND TRIM(text) != '' "
+                    f"ORDER BY {AYAH_KEY_ORDER}")
+
+    # Pass 1: token counts only (one int per item), to plan even chunks
+    token_counts = []
+    cursor.execute(select_items)
+    while True:
+        rows = cursor.fetchmany(500)
+        if not rows:
+            break
+        for row in rows:
+            token_counts.append(count_tokens(json.dumps(dict(row), ensure_ascii=False)))
+
+    boundaries = plan_chunks(token_counts, max_chunk_tokens)
+    print(f"Planned {len(boundaries)} chunks for {sum(token_counts):,} tokens "
+          f"(max {max_chunk_tokens:,} per chunk)")
+
+    conn.executescript("""
+        DROP TABLE IF EXISTS chunk_manifest;
+        CREATE TABLE chunk_manifest (
+            chunk INTEGER NOT NULL,
+            position INTEGER NOT NULL,
+            ayah_key TEXT NOT NULL,
+            tokens INTEGER NOT NULL,
+            PRIMARY KEY (chunk, position)
+        ) WITHOUT ROWID;
+        CREATE INDEX idx_chunk_manifest_ayah ON chunk_manifest(ayah_key);
+    """)
+
+    jobs_file = open(jobs_path, "a", encoding="utf-8") if jobs_path else None
+    # Manifest rows go through a second cursor on the same connection
+    write_cursor = conn.cursor()
+
+    # Pass 2: stream rows again and write each chunk as soon as it closes
+    chunk_sizes = []
     current_chunk = []
-    current_size = 0
-    
+    chunk_index = 1
+    next_boundary = 0
+    item_index = 0
+
+    cursor.execute(select_items)
     while True:
-        rows = cursor.fetchmany(100)  # Process in batches
+        rows = cursor.fetchmany(500)
         if not rows:
             break
-            
+
         for row in rows:
-            item = dict(row)
-            item_json = json.dumps(item, ensure_ascii=False)
-            item_size = len(item_json)
-            
-            # If single item is too large, put it in its own chunk
-            if item_size > max_chunk_size:
-                if current_chunk:
-                    chunks.append(current_chunk)
-                    current_chunk = []
-                    current_size = 0
-                
-                chunks.append([item])
-                print(f"Large item (ayah {item.get('ayah_key', 'unknown')}): {item_size:,} chars - separate chunk")
-                continue
-            
-            # If adding this item would exceed max_chunk_size, start new chunk
-            if current_size + item_size > max_chunk_size and current_chunk:
-                chunks.append(current_chunk)
-                current_chunk = []
-                current_size = 0
-            
-            current_chunk.append(item)
-            current_size += item_size
-            
-            # If reached good size, consider closing chunk
-            if current_size >= min_chunk_size and len(current_chunk) >= 5:
-                chunks.append(current_chunk)
+            current_chunk.append(dict(row))
+
+            if item_index == boundaries[next_boundary]:
+                tokens = token_counts[item_index - len(current_chunk) + 1:item_index + 1]
+                write_chunk(output_dir, chunk_index, current_chunk, tokens, write_cursor, jobs_file)
+                chunk_sizes.append(sum(tokens))
                 current_chunk = []
-                current_size = 0
-    
-    # Add last chunk if it has items
-    if current_chunk:
-        chunks.append(current_chunk)
-    
+                chunk_index += 1
+                next_boundary += 1
+
+            item_index += 1
+
+    conn.commit()
     conn.close()
-    
-    print(f"Created {len(chunks)} chunks for translation")
-    
-    # Save chunks
-    for i, chunk in enumerate(chunks, 1):
-        chunk_name = f"part_{i:03d}.json"
-        chunk_path = os.path.join(output_dir, chunk_name)
-        
-        chunk_json = json.dumps(chunk, ensure_ascii=False, indent=2)
-        chunk_size = len(chunk_json)
-        
-        with open(chunk_path, "w", encoding="utf-8") as f:
-            f.write(chunk_json)
-        
-        # Show ayah range
-        first_ayah = chunk[0].get('ayah_key', 'unknown')
-        last_ayah = chunk[-1].get('ayah_key', 'unknown')
-        ayah_range = f"{first_ayah}-{last_ayah}" if first_ayah != last_ayah else first_ayah
-        
-        print(f"Chunk {i:2d}: {chunk_name:<15} ({ayah_range:<15}) - {len(chunk):3d} items, {chunk_size:6,} chars")
+    if jobs_file:
+        jobs_file.close()
+
+    if chunk_sizes:
+        mean = sum(chunk_sizes) / len(chunk_sizes)
+        spread = math.sqrt(sum((s - mean) ** 2 for s in chunk_sizes) / len(chunk_sizes))
+        print(f"Created {len(chunk_sizes)} chunks: mean {mean:,.0f} tokens, "
+              f"min {min(chunk_sizes):,}, max {max(chunk_sizes):,}, stddev {spread:,.0f}")
+
+
+def write_chunk(output_dir, index, chunk, tokens, cursor, jobs_file=None):
+    chunk_name = f"part_{index:03d}.json"
+    chunk_path = os.path.join(output_dir, chunk_name)
+
+    # Write-then-rename so an interrupted run never leaves a half-written part
+    tmp_path = chunk_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(chunk, f, ensure_ascii=False, separators=(',', ':'))
+    os.replace(tmp_path, chunk_path)
+
+    cursor.executemany(
+        "INSERT INTO chunk_manifest (chunk, position, ayah_key, tokens) VALUES (?, ?, ?, ?)",
+        [(index, pos, item.get('ayah_key', ''), t) for pos, (item, t) in enumerate(zip(chunk, tokens))]
+    )
+
+    if jobs_file:
+        for item in chunk:
+            jobs_file.write(json.dumps({"id": item.get('ayah_key', ''), "text": item['text'].strip()},
+                                       ensure_ascii=False) + "\n")
+        jobs_file.flush()
+
+    # Show ayah range
+    first_ayah = chunk[0].get('ayah_key', 'unknown')
+    last_ayah = chunk[-1].get('ayah_key', 'unknown')
+    ayah_range = f"{first_ayah}-{last_ayah}" if first_ayah != last_ayah else first_ayah
+
+    print(f"Chunk {index:2d}: {chunk_name:<15} ({ayah_range:<15}) - {len(chunk):3d} items, {sum(tokens):6,} tokens")
+
+
+def source_digest(db_path):
+    """
+    Hash of the tafseer rows themselves. The DB file is not a usable cache
+    input: every run writes chunk_manifest into it. Returns None when the
+    manifest is missing, so it gets rebuilt.
+    """
+    conn = sqlite3.connect(db_path)
+    try:
+        names = [r[0] for r in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type IN ('table', 'view')")]
+        if 'chunk_manifest' not in names:
+            return None
+        table_name = 'tafseer' if 'tafseer' in names else next(
+            n for n in names if n not in ('chunk_manifest', 'tafseer_text', 'tafseer_ranges'))
+        digest = hashlib.sha256()
+        for row in conn.execute(f"SELECT * FROM {table_name} ORDER BY {AYAH_KEY_ORDER}"):
+            digest.update(json.dumps(row, ensure_ascii=False).encode('utf-8'))
+        return digest.hexdigest()
+    finally:
+        conn.close()
+
 
 if __name__ == "__main__":
     script_dir = os.path.dirname(os.path.abspath(__file__))
     db_path = r"E:\Munajat App\munajat_e_maqbool_app\assets\quran_data\en-tafisr-ibn-kathir.db"
-    
-    smart_chunk_from_db(
-        db_path=db_path,
-        output_dir=os.path.join(script_dir, "en-ibn-kasir"),
-        max_chunk_size=15000,
-        min_chunk_size=14000
-    )
\ No newline at end of file
+
+    args = [a for a in sys.argv[1:] if a != '--force']
+    db_path = args[0] if len(args) > 0 else db_path
+    output_dir = os.path.join(script_dir, "en-ibn-kasir")
+    jobs_path = args[1] if len(args) > 1 else None
+    max_chunk_tokens = 4000
+
+    def build():
+        smart_chunk_from_db(
+            db_path=db_path,
+            output_dir=output_dir,
+            max_chunk_tokens=max_chunk_tokens,
+            jobs_path=jobs_path,
+        )
+
+    # The jobs file is appended to, so runs that feed it always execute
+    rows_digest = None if jobs_path else source_digest(db_path)
+    if rows_digest is None:
+        build()
+    else:
+        sys.path.insert(0, os.path.join(script_dir, "..", "..", "..", "scripts"))
+        from build_cache import BuildCache
+
+        cache = BuildCache()
+        cache.build('tafseer_chunks', [], [output_dir], build, generator=__file__,
+                    params={'rows': rows_digest, 'max_chunk_tokens': max_chunk_tokens,
+                            'tiktoken': TIKTOKEN_AVAILABLE},
+                    force='--force' in sys.argv)
+        cache.close()
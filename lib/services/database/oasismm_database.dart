@@ -10,6 +10,11 @@ class OasisMMDatabase {
   static Database? _database;
   static const String _dbName = 'oasismm.db';
 
+  /// Schema version of the bundled database (PRAGMA user_version, set by
+  /// scripts/create_oasismm_db.py). Installed copies older than this are
+  /// replaced from assets so new tables such as nav_ayah_page are available.
+  static const int _dbVersion = 2;
+
   /// Get the database instance (singleton)
   static Future<Database> get database async {
     if (_database != null) return _database!;
@@ -26,9 +31,21 @@ class OasisMMDatabase {
     debugPrint('OasisMMDatabase: Target path: $path');
 
     // Check if database already exists
-    final exists = await databaseExists(path);
+    var exists = await databaseExists(path);
     debugPrint('OasisMMDatabase: Database exists at path: $exists');
 
+    if (exists) {
+      final installedVersion = await _installedVersion(path);
+      if (installedVersion < _dbVersion) {
+        debugPrint(
+          'OasisMMDatabase: Installed version $installedVersion < $_dbVersion, '
+          'replacing from assets...',
+        );
+        await deleteDatabase(path);
+        exists = false;
+      }
+    }
+
     if (!exists) {
       // Copy from assets
       debugPrint('OasisMMDatabase: Copying database from assets...');
@@ -94,6 +111,26 @@ class OasisMMDatabase {
     }
   }
 
+  /// Read PRAGMA user_version of an installed database (0 if unreadable)
+  static Future<int> _installedVersion(String path) async {
+    try {
+      final db = await openDatabase(
+        path,
+        readOnly: true,
+        singleInstance: false,
+      );
+      try {
+        final rows = await db.rawQuery('PRAGMA user_version');
+        return rows.isNotEmpty ? rows.first.values.first as int? ?? 0 : 0;
+      } finally {
+        await db.close();
+      }
+    } catch (e) {
+      debugPrint('OasisMMDatabase: Could not read installed version: $e');
+      return 0;
+    }
+  }
+
   /// Close database connection
   static Future<void> close() async {
     if (_database != null) {
@@ -205,11 +242,26 @@ class OasisMMDatabase {
     String language,
   ) async {
     final db = await database;
+    // Ranges are stored once and never overlap; the interval index resolves
+    // member ayahs with a single seek
+    final results = await db.query(
+      'tafseer',
+      where:
+          'language = ? AND surah_id = ? AND verse_end >= ? AND verse_start <= ?',
+      whereArgs: [language, surahId, ayahNumber, ayahNumber],
+      orderBy: 'verse_end',
+      limit: 1,
+    );
+    if (results.isNotEmpty) return results;
+
+    // Databases built before the range schema left verse_end NULL
     return db.query(
       'tafseer',
       where:
-          'surah_id = ? AND verse_start <= ? AND (verse_end >= ? OR verse_end IS NULL) AND language = ?',
-      whereArgs: [surahId, ayahNumber, ayahNumber, language],
+          'language = ? AND surah_id = ? AND verse_end IS NULL AND verse_start <= ?',
+      whereArgs: [language, surahId, ayahNumber],
+      orderBy: 'verse_start DESC',
+      limit: 1,
     );
   }
 
@@ -452,4 +504,74 @@ class OasisMMDatabase {
       orderBy: 'line',
     );
   }
+
+  // ============================================
+  // MUSHAF NAVIGATION QUERIES
+  // ============================================
+
+  /// Get the page/line where an ayah starts
+  static Future<Map<String, dynamic>?> getAyahPosition(
+    int surah,
+    int ayah,
+  ) async {
+    final db = await database;
+    final results = await db.query(
+      'nav_ayah_page',
+      columns: ['page', 'line'],
+      where: 'surah = ? AND ayah = ?',
+      whereArgs: [surah, ayah],
+      limit: 1,
+    );
+    return results.isNotEmpty ? results.first : null;
+  }
+
+  /// Get the first/last word ids of a page
+  static Future<Map<String, dynamic>?> getPageWordRange(int page) async {
+    final db = await database;
+    final results = await db.query(
+      'nav_page_words',
+      where: 'page = ?',
+      whereArgs: [page],
+      limit: 1,
+    );
+    return results.isNotEmpty ? results.first : null;
+  }
+
+  /// Get the start page of a juz, hizb or rub (`kind` is 'juz', 'hizb' or 'rub')
+  static Future<int?> getDivisionStartPage(String kind, int number) async {
+    final db = await database;
+    final results = await db.query(
+      'nav_division_page',
+      columns: ['page'],
+      where: 'kind = ? AND number = ?',
+      whereArgs: [kind, number],
+      limit: 1,
+    );
+    return results.isNotEmpty ? results.first['page'] as int? : null;
+  }
+
+  /// Get the juz/hizb/ruku/manzil/rub number containing an ayah
+  /// (`kind` is 'juz', 'hizb', 'ruku', 'manzil' or 'rub')
+  static Future<int?> getDivisionForAyah(
+    String kind,
+    int surah,
+    int ayah,
+  ) async {
+    const kinds = {'juz', 'hizb', 'ruku', 'manzil', 'rub'};
+    if (!kinds.contains(kind)) return null;
+
+    final db = await database;
+    final key = surah * 1000 + ayah;
+    final results = await db.query(
+      'quran_$kind',
+      columns: ['id', 'end_key'],
+      where: 'start_key <= ?',
+      whereArgs: [key],
+      orderBy: 'start_key DESC',
+      limit: 1,
+    );
+    if (results.isEmpty) return null;
+    final endKey = results.first['end_key'] as int? ?? 0;
+    return key <= endKey ? results.first['id'] as int? : null;
+  }
 }
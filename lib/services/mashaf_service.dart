@@ -110,23 +110,14 @@ class MashafService {
 
   Future<int> getSurahStartPage(int surahNumber) async {
     try {
-      final db = await OasisMMDatabase.database;
-      final result = await db.query(
-        'mashaf_pages',
-        columns: ['page_number'],
-        where: 'surah = ?',
-        whereArgs: [surahNumber],
-        orderBy: 'page_number ASC',
-        limit: 1,
-      );
-
-      if (result.isNotEmpty) {
-        return result.first['page_number'] as int? ?? 1;
+      final position = await OasisMMDatabase.getAyahPosition(surahNumber, 1);
+      if (position != null) {
+        return position['page'] as int? ?? 1;
       }
     } catch (e) {
       debugPrint('Error getting surah start page: $e');
     }
-    return 1;
+    return await _layoutPage('surah = ?', [surahNumber]) ?? 1;
   }
 
   Future<int> getSurahForPage(int pageNumber) async {
@@ -142,23 +133,44 @@ class MashafService {
   }
 
   Future<int> getPageForAyah(int surahNumber, int ayahNumber) async {
+    try {
+      final position = await OasisMMDatabase.getAyahPosition(
+        surahNumber,
+        ayahNumber,
+      );
+      if (position != null) {
+        return position['page'] as int? ?? 0;
+      }
+    } catch (e) {
+      debugPrint('Error getting page for ayah: $e');
+    }
+    final page = await _layoutPage('surah = ? AND ayah = ?', [
+      surahNumber,
+      ayahNumber,
+    ]);
+    return page ?? 0;
+  }
+
+  /// Fallback for databases without (or with an empty) nav_ayah_page:
+  /// first mashaf_pages page matching [where]
+  Future<int?> _layoutPage(String where, List<Object> whereArgs) async {
     try {
       final db = await OasisMMDatabase.database;
       final result = await db.query(
         'mashaf_pages',
         columns: ['page_number'],
-        where: 'surah = ? AND ayah = ?',
-        whereArgs: [surahNumber, ayahNumber],
+        where: where,
+        whereArgs: whereArgs,
+        orderBy: 'page_number ASC',
         limit: 1,
       );
-
       if (result.isNotEmpty) {
-        return result.first['page_number'] as int? ?? 0;
+        return result.first['page_number'] as int?;
       }
     } catch (e) {
-      debugPrint('Error getting page for ayah: $e');
+      debugPrint('Error getting page from mashaf layout: $e');
     }
-    return 0;
+    return null;
   }
 
   Future<List<Map<String, int>>> getVersesOnPage(int pageNumber) async {
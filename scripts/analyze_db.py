@@ -1,72 +1,259 @@
-import sqlite3
+#!/usr/bin/env python3
+"""
+Database size profiler.
+
+Reads page-level accounting from SQLite's `dbstat` virtual table instead of
+scanning column values, so every b-tree is measured exactly as stored on
+disk: tables, indexes (including autoindexes) and FTS shadow tables, which
+are attributed to the FTS table that owns them.
+
+Per object the report has pages, bytes, payload, unused bytes, row count
+(b-tree cells holding rows), average row size and fragmentation (share of pages that are
+not physically adjacent to their predecessor in b-tree order). Row
+estimates from sqlite_stat1 are included when ANALYZE has been run.
+
+Usage:
+  python scripts/analyze_db.py [assets/oasismm.db] [--json analyze_results.json]
+  python scripts/analyze_db.py --diff old_report.json          # compare with a previous build
+  python scripts/analyze_db.py --diff old.json --max-growth 5  # exit 1 if any object grew > 5%
+"""
+
+import argparse
+import json
 import os
+import sqlite3
+import sys
+from collections import defaultdict
 
-def analyze_db(db_path):
-    if not os.path.exists(db_path):
-        print(f"File {db_path} not found.")
+DEFAULT_DB = "assets/oasismm.db"
+DEFAULT_REPORT = "analyze_results.json"
+
+FTS_SHADOW_SUFFIXES = ('_data', '_idx', '_content', '_docsize', '_config')
+
+
+def _owners(conn):
+    """
+    name -> (kind, owner table, keyed) for every b-tree dbstat can report.
+    `keyed` marks index-format b-trees (indexes, WITHOUT ROWID tables), whose
+    interior cells hold rows too.
+    """
+    owners = {'sqlite_schema': ('schema', 'sqlite_schema', False),
+              'sqlite_master': ('schema', 'sqlite_master', False)}
+    fts_tables = set()
+    for name, kind, tbl_name, sql in conn.execute(
+            "SELECT name, type, tbl_name, sql FROM sqlite_master WHERE type IN ('table', 'index')"):
+        sql = (sql or '').upper()
+        keyed = kind == 'index' or 'WITHOUT ROWID' in sql
+        if kind == 'table' and sql.startswith('CREATE VIRTUAL TABLE'):
+            fts_tables.add(name)
+            owners[name] = ('fts', name, False)
+        else:
+            owners[name] = (kind, tbl_name, keyed)
+
+    for name, (kind, _, keyed) in list(owners.items()):
+        for fts in fts_tables:
+            if name != fts and name.startswith(fts) and name[len(fts):] in FTS_SHADOW_SUFFIXES:
+                owners[name] = ('fts_shadow', fts, keyed)
+    return owners
+
+
+def _stat1(conn):
+    """(tbl, idx) -> estimated rows from sqlite_stat1, when present."""
+    try:
+        rows = conn.execute("SELECT tbl, idx, stat FROM sqlite_stat1").fetchall()
+    except sqlite3.OperationalError:
+        return {}
+    return {(tbl, idx): int(stat.split()[0]) for tbl, idx, stat in rows if stat}
+
+
+def page_summary(conn):
+    """
+    File-level part of the report (page counts only), with no per-object
+    entries. Usable on SQLite builds without the dbstat virtual table.
+    """
+    page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+    page_count = conn.execute("PRAGMA page_count").fetchone()[0]
+    freelist = conn.execute("PRAGMA freelist_count").fetchone()[0]
+    return {
+        'file': {
+            'page_size': page_size,
+            'page_count': page_count,
+            'freelist_pages': freelist,
+            'bytes': page_size * page_count,
+            'free_bytes': page_size * freelist,
+        },
+        'objects': {},
+        'tables': {},
+    }
+
+
+def profile_db(conn):
+    """
+    Build the size report for an open connection. Returns a JSON-ready dict:
+    {"file": {...}, "objects": {name: {...}}, "tables": {table: {...}}}.
+    Raises sqlite3.OperationalError when SQLite lacks dbstat (see page_summary).
+    """
+    owners = _owners(conn)
+    stat1 = _stat1(conn)
+
+    objects = {}
+    keyed_names = {name for name, (_, _, keyed) in owners.items() if keyed}
+    previous = {}
+    for name, pageno, pagetype, ncell, payload, unused, pgsize in conn.execute(
+            "SELECT name, pageno, pagetype, ncell, payload, unused, pgsize FROM dbstat ORDER BY name, path"):
+        entry = objects.get(name)
+        if entry is None:
+            kind, owner, _ = owners.get(name, ('table', name, False))
+            entry = objects[name] = {
+                'kind': kind, 'owner': owner, 'pages': 0, 'bytes': 0, 'payload': 0,
+                'unused': 0, 'rows': 0, 'out_of_order_pages': 0,
+            }
+        entry['pages'] += 1
+        entry['bytes'] += pgsize
+        entry['payload'] += payload
+        entry['unused'] += unused
+        if pagetype == 'leaf' or (pagetype == 'internal' and name in keyed_names):
+            entry['rows'] += ncell
+        if name in previous and pageno != previous[name] + 1:
+            entry['out_of_order_pages'] += 1
+        previous[name] = pageno
+
+    for name, entry in objects.items():
+        rows = entry['rows']
+        entry['avg_row_bytes'] = round(entry['payload'] / rows, 1) if rows else 0
+        entry['unused_pct'] = round(100 * entry['unused'] / entry['bytes'], 1) if entry['bytes'] else 0
+        entry['fragmentation_pct'] = (round(100 * entry['out_of_order_pages'] / (entry['pages'] - 1), 1)
+                                      if entry['pages'] > 1 else 0)
+        if entry['kind'] == 'index':
+            estimate = stat1.get((entry['owner'], name))
+        else:
+            estimate = stat1.get((name, None))
+        if estimate is not None:
+            entry['stat1_rows'] = estimate
+
+    # Roll indexes and FTS shadow tables up into the table they serve
+    tables = defaultdict(lambda: {'rows': 0, 'table_bytes': 0, 'index_bytes': 0, 'fts_bytes': 0, 'total_bytes': 0})
+    for name, entry in objects.items():
+        table = tables[entry['owner']]
+        if entry['kind'] == 'index':
+            table['index_bytes'] += entry['bytes']
+        elif entry['kind'] in ('fts', 'fts_shadow'):
+            table['fts_bytes'] += entry['bytes']
+        else:
+            table['table_bytes'] += entry['bytes']
+            table['rows'] = entry['rows']
+        table['total_bytes'] += entry['bytes']
+
+    return {
+        'file': page_summary(conn)['file'],
+        'objects': dict(sorted(objects.items(), key=lambda kv: -kv[1]['bytes'])),
+        'tables': dict(sorted(tables.items(), key=lambda kv: -kv[1]['total_bytes'])),
+    }
+
+
+def _mb(n):
+    return n / (1024 * 1024)
+
+
+def print_report(report, top=None, out=print):
+    info = report['file']
+    out(f"Database: {_mb(info['bytes']):.2f} MB ({info['page_count']} pages of {info['page_size']} B, "
+        f"{info['freelist_pages']} free)")
+    if not report['objects']:
         return
+    out("-" * 96)
+    out(f"{'Table':<30} {'Rows':>9} {'Table MB':>9} {'Index MB':>9} {'FTS MB':>8} {'Total MB':>9} {'%':>6}")
+    out("-" * 96)
+    for name, t in list(report['tables'].items())[:top]:
+        share = 100 * t['total_bytes'] / info['bytes'] if info['bytes'] else 0
+        out(f"{name:<30} {t['rows']:>9} {_mb(t['table_bytes']):>9.2f} {_mb(t['index_bytes']):>9.2f} "
+            f"{_mb(t['fts_bytes']):>8.2f} {_mb(t['total_bytes']):>9.2f} {share:>6.1f}")
+
+    out("")
+    out(f"{'Object':<40} {'Kind':<10} {'MB':>8} {'Avg row B':>10} {'Unused %':>9} {'Frag %':>7}")
+    out("-" * 96)
+    for name, o in list(report['objects'].items())[:top]:
+        out(f"{name:<40} {o['kind']:<10} {_mb(o['bytes']):>8.2f} {o['avg_row_bytes']:>10} "
+            f"{o['unused_pct']:>9} {o['fragmentation_pct']:>7}")
+
+
+def diff_reports(old, new, out=print):
+    """
+    Print per-object byte deltas. Returns the largest growth in percent of
+    the whole file or of any object that existed before (new objects are
+    listed, and count through the file total).
+    """
+    names = set(old['objects']) | set(new['objects'])
+    rows = []
+    for name in names:
+        before = old['objects'].get(name, {}).get('bytes', 0)
+        after = new['objects'].get(name, {}).get('bytes', 0)
+        if before != after:
+            rows.append((after - before, name, before, after))
+    rows.sort(reverse=True)
+
+    total_before, total_after = old['file']['bytes'], new['file']['bytes']
+    out(f"Database: {_mb(total_before):.2f} MB -> {_mb(total_after):.2f} MB "
+        f"({_mb(total_after - total_before):+.2f} MB)")
+    worst = 100 * (total_after - total_before) / total_before if total_before else 0.0
+    for delta, name, before, after in rows:
+        pct = 100 * delta / before if before else 0.0
+        worst = max(worst, pct)
+        label = "new" if not before else ("dropped" if not after else f"{pct:+.1f}%")
+        out(f"  {name:<40} {_mb(before):>9.2f} -> {_mb(after):>9.2f} MB  {label}")
+    if not rows:
+        out("  No size changes")
+    return worst
 
-    file_size = os.path.getsize(db_path) / (1024 * 1024)
-    print(f"Total Database Size: {file_size:.2f} MB")
-    print("-" * 50)
+
+def analyze_db(db_path, report_path=DEFAULT_REPORT, top=None):
+    if not os.path.exists(db_path):
+        print(f"File {db_path} not found.")
+        return None
 
     conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
-
-    # Get row counts
-    cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
-    tables = [row[0] for row in cursor.fetchall()]
-
-    stats = []
-    for table in tables:
-        try:
-            cursor.execute(f"SELECT COUNT(*) FROM {table}")
-            count = cursor.fetchone()[0]
-            
-            # Estimate size by summing length of all columns
-            cursor.execute(f"PRAGMA table_info({table})")
-            columns = [col[1] for col in cursor.fetchall()]
-            
-            size_query = " + ".join([f"SUM(LENGTH(CAST(COALESCE(\"{col}\", '') AS BLOB)))" for col in columns])
-            cursor.execute(f"SELECT {size_query} FROM {table}")
-            size_bytes = cursor.fetchone()[0] or 0
-            
-            stats.append((table, count, size_bytes))
-        except Exception as e:
-            # print(f"Error reading {table}: {e}")
-            stats.append((table, count, 0))
-
-    # Sort by estimated size
-    stats.sort(key=lambda x: x[2], reverse=True)
-
-    with open("analyze_results.txt", "w", encoding="utf-8") as f_out:
-        f_out.write(f"Total Database Size: {file_size:.2f} MB\n")
-        f_out.write("-" * 65 + "\n")
-        f_out.write(f"{'Table Name':<30} | {'Count':<10} | {'Est. Size (MB)':<15}\n")
-        f_out.write("-" * 65 + "\n")
-        for table, count, size_bytes in stats:
-            f_out.write(f"{table:<30} | {count:<10} | {size_bytes / (1024*1024):<15.2f}\n")
-
-        f_out.write("\nDetailed breakdown of specific content types:\n")
-        
-        # Check JSON blob sizes
-        blob_tables = [
-            ('mashaf_pages', 'data_json'),
-            ('munajat', 'data_json'),
-            ('sunnah_items', 'references_json')
-        ]
-        
-        for table, col in blob_tables:
-            try:
-                cursor.execute(f"SELECT SUM(LENGTH({col})) FROM {table}")
-                size = cursor.fetchone()[0] or 0
-                f_out.write(f"{table} ({col}): {size / 1024:.2f} KB\n")
-            except:
-                pass
-
-    print("Results written to analyze_results.txt")
-
-    conn.close()
+    try:
+        report = profile_db(conn)
+    finally:
+        conn.close()
+    report['file']['path'] = db_path
+
+    print_report(report, top=top)
+    if report_path:
+        with open(report_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+        print(f"\nReport written to {report_path}")
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Exact on-disk size profile of a SQLite database")
+    parser.add_argument('db', nargs='?', default=DEFAULT_DB)
+    parser.add_argument('--json', default=DEFAULT_REPORT, help="Where to write the JSON report ('' to skip)")
+    parser.add_argument('--top', type=int, help="Only print the N largest tables/objects")
+    parser.add_argument('--diff', help="Previous JSON report to compare against")
+    parser.add_argument('--max-growth', type=float,
+                        help="With --diff: exit 1 if any object grew by more than this percent")
+    args = parser.parse_args()
+
+    if args.diff and args.json and os.path.abspath(args.diff) == os.path.abspath(args.json):
+        parser.error("--diff and --json point at the same file")
+
+    report = analyze_db(args.db, args.json or None, args.top)
+    if report is None:
+        return 1
+
+    if args.diff:
+        with open(args.diff, "r", encoding="utf-8") as f:
+            old = json.load(f)
+        print()
+        worst = diff_reports(old, report)
+        if args.max_growth is not None and worst > args.max_growth:
+            print(f"\nFAILED: size grew by {worst:.1f}% (limit {args.max_growth}%)")
+            return 1
+    return 0
+
 
 if __name__ == "__main__":
-    analyze_db("assets/oasismm.db")
+    sys.exit(main())
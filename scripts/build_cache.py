@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""
+Build Artifact Cache
+
+Content-addressed cache for the data pipeline's intermediate artifacts
+(quran_tajweed_indopak.json, the Indopak page pack, tafseer part_NNN.json
+chunks, translation *_extracted files). Each artifact is keyed on:
+
+  - the sha256 of every input file (or directory tree),
+  - the generator script's source, plus an optional explicit version,
+  - any parameters that change the output.
+
+When the key is unchanged, the cached outputs are copied back (and checked
+against their stored digests) and the generator does not run. A build whose
+build_fn returns False, raises, or leaves an output missing is not cached:
+BuildFailed (or the original exception) propagates to the caller. Input digests are memoized on (size, mtime), so a
+rebuild with no changes hashes nothing and completes in seconds.
+
+Objects are evicted least-recently-used once the cache is over
+DEFAULT_MAX_BYTES, and unconditionally after DEFAULT_MAX_AGE_DAYS unused.
+
+Usage:
+    cache = BuildCache()
+    cache.build('convert_tajweed', inputs=[src], outputs=[dst],
+                build_fn=lambda: generate(src, dst), generator=__file__)
+
+    python scripts/build_cache.py stats
+    python scripts/build_cache.py evict [--max-mb 500] [--max-age-days 7]
+    python scripts/build_cache.py clear
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+DEFAULT_CACHE_DIR = Path(__file__).parent / '.cache' / 'artifacts'
+DEFAULT_MAX_BYTES = 2 * 1024 ** 3
+DEFAULT_MAX_AGE_DAYS = 30
+
+HASH_CHUNK = 1 << 20
+
+
+class BuildFailed(RuntimeError):
+    """build_fn reported failure or did not write every output."""
+
+
+def _sha256_file(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(HASH_CHUNK), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _tree_size(path):
+    if path.is_dir():
+        return sum(p.stat().st_size for p in path.rglob('*') if p.is_file())
+    return path.stat().st_size
+
+
+class BuildCache:
+    """Artifact store plus an index of entries and memoized input digests."""
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES,
+                 max_age_days=DEFAULT_MAX_AGE_DAYS):
+        self.cache_dir = Path(cache_dir)
+        self.objects_dir = self.cache_dir / 'objects'
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.max_age_days = max_age_days
+
+        self.conn = sqlite3.connect(str(self.cache_dir / 'index.db'))
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS artifacts (
+                key TEXT PRIMARY KEY,
+                name TEXT NOT NULL,
+                outputs TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created REAL NOT NULL,
+                last_used REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS digests (
+                path TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                digest TEXT NOT NULL
+            ) WITHOUT ROWID;
+        """)
+
+    # -- keys ---------------------------------------------------------------
+
+    def digest(self, path):
+        """sha256 of a file, or of a directory's (relative path, digest) list."""
+        path = Path(path)
+        if path.is_dir():
+            entries = [(p.relative_to(path).as_posix(), self.digest(p))
+                       for p in sorted(path.rglob('*')) if p.is_file()]
+            return hashlib.sha256(json.dumps(entries).encode('utf-8')).hexdigest()
+
+        stat = path.stat()
+        resolved = str(path.resolve())
+        row = self.conn.execute("SELECT size, mtime_ns, digest FROM digests WHERE path = ?",
+                                (resolved,)).fetchone()
+        if row and row[0] == stat.st_size and row[1] == stat.st_mtime_ns:
+            return row[2]
+
+        value = _sha256_file(path)
+        self.conn.execute("INSERT OR REPLACE INTO digests (path, size, mtime_ns, digest) VALUES (?, ?, ?, ?)",
+                          (resolved, stat.st_size, stat.st_mtime_ns, value))
+        return value
+
+    def key(self, name, inputs, generator=None, version=None, params=None):
+        """Deterministic key for one artifact build."""
+        material = {
+            'name': name,
+            'inputs': [self.digest(p) for p in inputs],
+            'generator': self.digest(generator) if generator else None,
+            'version': version,
+            'params': params,
+        }
+        blob = json.dumps(material, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(blob.encode('utf-8')).hexdigest()
+
+    # -- store / restore ----------------------------------------------------
+
+    def restore(self, key, outputs):
+        """
+        Copy cached outputs into place, replacing whatever is there. False
+        when the key is not cached or a restored output does not match its
+        stored digest (the entry is dropped).
+        """
+        row = self.conn.execute("SELECT outputs FROM artifacts WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return False
+        stored = json.loads(row[0])
+        object_dir = self.objects_dir / key
+        if len(stored) != len(outputs) or not object_dir.exists():
+            self._drop(key)
+            return False
+
+        for i, (output, digest) in enumerate(zip(outputs, stored)):
+            output = Path(output)
+            if output.exists() and self.digest(output) == digest:
+                continue
+            source = object_dir / str(i)
+            output.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = output.with_name(f"{output.name}.{os.getpid()}.tmp")
+            if source.is_dir():
+                # Replace the whole tree so files absent from the artifact do not linger
+                shutil.rmtree(tmp_path, ignore_errors=True)
+                shutil.copytree(source, tmp_path)
+                if output.is_dir():
+                    shutil.rmtree(output)
+                elif output.exists():
+                    output.unlink()
+                os.replace(tmp_path, output)
+            else:
+                if output.is_dir():
+                    shutil.rmtree(output)
+                shutil.copy2(source, tmp_path)
+                os.replace(tmp_path, output)
+            if self.digest(output) != digest:
+                print(f"[build-cache] cached copy of {output} is corrupt, rebuilding")
+                self._drop(key)
+                return False
+
+        self.conn.execute("UPDATE artifacts SET last_used = ? WHERE key = ?", (time.time(), key))
+        self.conn.commit()
+        return True
+
+    def store(self, key, name, outputs):
+        object_dir = self.objects_dir / key
+        tmp_dir = self.objects_dir / f"{key}.{os.getpid()}.tmp"
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        tmp_dir.mkdir(parents=True)
+
+        digests = []
+        for i, output in enumerate(outputs):
+            output = Path(output)
+            if output.is_dir():
+                shutil.copytree(output, tmp_dir / str(i))
+            else:
+                shutil.copy2(output, tmp_dir / str(i))
+            digests.append(self.digest(output))
+
+        shutil.rmtree(object_dir, ignore_errors=True)
+        os.replace(tmp_dir, object_dir)
+
+        now = time.time()
+        self.conn.execute("""
+            INSERT OR REPLACE INTO artifacts (key, name, outputs, size, created, last_used)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, (key, name, json.dumps(digests), _tree_size(object_dir), now, now))
+        self.conn.commit()
+        self.evict()
+
+    def build(self, name, inputs, outputs, build_fn, generator=None, version=None, params=None,
+              force=False):
+        """
+        Restore `outputs` from the cache, or run build_fn() and cache what it
+        wrote. Returns True on a cache hit, False after a successful build.
+        Raises BuildFailed (nothing is cached) when build_fn returns False or
+        an output is missing afterwards; exceptions from build_fn propagate.
+        """
+        key = self.key(name, inputs, generator, version, params)
+        if not force and self.restore(key, outputs):
+            print(f"[build-cache] {name}: up to date ({key[:12]})")
+            return True
+
+        start = time.perf_counter()
+        if build_fn() is False:
+            raise BuildFailed(f"{name}: build failed, not cached")
+        missing = [str(o) for o in outputs if not Path(o).exists()]
+        if missing:
+            raise BuildFailed(f"{name}: outputs missing, not cached: {', '.join(missing)}")
+        self.store(key, name, outputs)
+        print(f"[build-cache] {name}: built in {time.perf_counter() - start:.1f}s ({key[:12]})")
+        return False
+
+    # -- eviction -----------------------------------------------------------
+
+    def _drop(self, key):
+        shutil.rmtree(self.objects_dir / key, ignore_errors=True)
+        self.conn.execute("DELETE FROM artifacts WHERE key = ?", (key,))
+        self.conn.commit()
+
+    def evict(self, max_bytes=None, max_age_days=None):
+        """Drop entries unused for max_age_days, then LRU entries above max_bytes."""
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+        max_age_days = self.max_age_days if max_age_days is None else max_age_days
+
+        cutoff = time.time() - max_age_days * 86400
+        evicted = [k for (k,) in self.conn.execute(
+            "SELECT key FROM artifacts WHERE last_used < ?", (cutoff,))]
+
+        total = 0
+        for key, size in self.conn.execute(
+                "SELECT key, size FROM artifacts WHERE last_used >= ? ORDER BY last_used DESC", (cutoff,)):
+            total += size
+            if total > max_bytes:
+                evicted.append(key)
+
+        for key in evicted:
+            self._drop(key)
+
+        # Forget digests of inputs that no longer exist
+        gone = [(p,) for (p,) in self.conn.execute("SELECT path FROM digests") if not os.path.exists(p)]
+        self.conn.executemany("DELETE FROM digests WHERE path = ?", gone)
+        self.conn.commit()
+        return len(evicted)
+
+    def stats(self):
+        rows = self.conn.execute("""
+            SELECT name, COUNT(*), SUM(size), MAX(last_used) FROM artifacts GROUP BY name ORDER BY name
+        """).fetchall()
+        return [{'name': n, 'entries': c, 'bytes': s, 'last_used': u} for n, c, s, u in rows]
+
+    def clear(self):
+        shutil.rmtree(self.objects_dir, ignore_errors=True)
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        self.conn.execute("DELETE FROM artifacts")
+        self.conn.commit()
+
+    def close(self):
+        self.conn.commit()
+        self.conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect or prune the build artifact cache")
+    parser.add_argument('action', choices=['stats', 'evict', 'clear'])
+    parser.add_argument('--cache-dir', default=str(DEFAULT_CACHE_DIR))
+    parser.add_argument('--max-mb', type=float, help="Size cap for evict (default: 2048)")
+    parser.add_argument('--max-age-days', type=float, help=f"Age cap for evict (default: {DEFAULT_MAX_AGE_DAYS})")
+    args = parser.parse_args()
+
+    cache = BuildCache(args.cache_dir)
+    if args.action == 'stats':
+        total = 0
+        for entry in cache.stats():
+            total += entry['bytes']
+            used = time.strftime('%Y-%m-%d %H:%M', time.localtime(entry['last_used']))
+            print(f"  {entry['name']:<30} {entry['entries']:>4} entries  "
+                  f"{entry['bytes'] / 1048576:>9.1f} MB  last used {used}")
+        print(f"Total: {total / 1048576:.1f} MB in {cache.cache_dir}")
+    elif args.action == 'evict':
+        max_bytes = int(args.max_mb * 1048576) if args.max_mb is not None else None
+        print(f"Evicted {cache.evict(max_bytes, args.max_age_days)} entries")
+    else:
+        cache.clear()
+        print("Cache cleared")
+    cache.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,109 +1,202 @@
-import sqlite3
+#!/usr/bin/env python3
+"""
+Export the Indopak 15-line mushaf as a page-addressable pack file.
+
+Instead of one pretty-printed indopak_full.json that must be parsed whole,
+pages are written as compact JSON blobs into a single pack file with an
+offset table up front. Opening any page reads the header, one table entry
+and that page's bytes - nothing else.
+
+Pack layout (little-endian):
+    header   : magic b'MMPK', version u16, reserved u16, page_count u32,
+               info_offset u32, info_length u32
+    table    : page_count x (page_number u32, offset u32, length u32),
+               sorted by page_number
+    payload  : info JSON, then one compact JSON object per page
+               {"page_number": n, "lines": [...]} - same shape as before
+
+Pages are streamed from a single ordered join of `pages` and `words`, so
+neither table is ever fully materialized.
+
+Usage:
+    python scripts/convert_db_to_json.py [words_db] [layout_db] [output_pack]
+    python scripts/convert_db_to_json.py --read 604
+    python scripts/convert_db_to_json.py --force     # ignore the build cache
+"""
+
+import bisect
 import json
+import mmap
 import os
+import sqlite3
+import struct
+import sys
+
+from build_cache import BuildCache
 
 # Paths to the databases
 words_db_path = r"e:\Munajat App\munajat_e_maqbool_app\assets\quran_data\quran_scripts\indopak.db"
 layout_db_path = r"e:\Munajat App\munajat_e_maqbool_app\assets\quran_data\mushaf_layout_data\qudratullah-indopak-15-lines.db"
-output_json_path = r"e:\Munajat App\munajat_e_maqbool_app\assets\quran_data\quran_scripts\indopak_full.json"
+output_pack_path = r"e:\Munajat App\munajat_e_maqbool_app\assets\quran_data\quran_scripts\indopak_pages.pack"
+
+PACK_MAGIC = b'MMPK'
+PACK_VERSION = 1
+HEADER = struct.Struct('<4sHHIII')
+ENTRY = struct.Struct('<III')
+
+
+def _compact(obj):
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def iter_pages(conn):
+    """
+    Yield {"page_number", "lines"} dicts in page order from one ordered
+    LEFT JOIN of layout lines against the attached words table.
+    """
+    word_cols = [col[1] for col in conn.execute("PRAGMA w.table_info(words)")]
+    select_words = ', '.join(f'w."{c}"' for c in word_cols)
+
+    cursor = conn.execute(f"""
+        SELECT p.page_number, p.line_number, p.line_type, p.is_centered, p.surah_number,
+               {select_words}
+        FROM pages p
+        LEFT JOIN w.words w
+          ON typeof(p.first_word_id) = 'integer'
+         AND typeof(p.last_word_id) = 'integer'
+         AND w.id BETWEEN p.first_word_id AND p.last_word_id
+        ORDER BY p.page_number ASC, p.line_number ASC, w.id ASC
+    """)
+
+    page = None
+    line = None
+    line_key = None
+
+    for row in cursor:
+        page_number, line_number, line_type, is_centered, surah_number = row[:5]
+
+        if page is None or page['page_number'] != page_number:
+            if page is not None:
+                yield page
+            page = {"page_number": page_number, "lines": []}
+            line_key = None
+
+        if line_key != line_number:
+            line = {
+                "line_number": line_number,
+                "line_type": line_type or 'text',
+                "is_centered": is_centered == 1,
+                "surah_number": surah_number,
+                "words": []
+            }
+            page["lines"].append(line)
+            line_key = line_number
 
-if not os.path.exists(words_db_path) or not os.path.exists(layout_db_path):
-    print("Error: One or both database files not found.")
-    exit(1)
+        word = row[5:]
+        if word[0] is not None:
+            line["words"].append(dict(zip(word_cols, word)))
 
-try:
-    # Connect to databases
-    conn_words = sqlite3.connect(words_db_path)
-    cursor_words = conn_words.cursor()
+    if page is not None:
+        yield page
 
-    conn_layout = sqlite3.connect(layout_db_path)
-    cursor_layout = conn_layout.cursor()
+
+def export_pack(words_db, layout_db, output_path):
+    conn = sqlite3.connect(layout_db)
+    conn.execute("ATTACH DATABASE ? AS w", (words_db,))
 
     # Get Info
-    cursor_layout.execute("SELECT * FROM info")
-    info_row = cursor_layout.fetchone()
-    cursor_layout.execute("PRAGMA table_info(info)")
-    info_cols = [col[1] for col in cursor_layout.fetchall()]
+    cursor = conn.execute("SELECT * FROM info")
+    info_row = cursor.fetchone()
+    info_cols = [d[0] for d in cursor.description]
     info_data = dict(zip(info_cols, info_row)) if info_row else {}
-    
     print(f"Info loaded: {info_data}")
 
-    # Get Pages
-    print("Loading pages...")
-    cursor_layout.execute("SELECT * FROM pages ORDER BY page_number ASC, line_number ASC")
-    pages_rows = cursor_layout.fetchall()
-    cursor_layout.execute("PRAGMA table_info(pages)")
-    pages_cols = [col[1] for col in cursor_layout.fetchall()]
-    
-    # Get Words
-    print("Loading words...")
-    cursor_words.execute("SELECT * FROM words ORDER BY id ASC")
-    words_rows = cursor_words.fetchall()
-    cursor_words.execute("PRAGMA table_info(words)")
-    words_cols = [col[1] for col in cursor_words.fetchall()]
-    
-    # Index words by ID for fast lookup
-    words_map = {}
-    for row in words_rows:
-        word_dict = dict(zip(words_cols, row))
-        words_map[word_dict['id']] = word_dict
-
-    # Construct the full structure
-    full_data = {
-        "info": info_data,
-        "pages": []
-    }
-
-    current_page_num = -1
-    current_page_data = None
-
-    for row in pages_rows:
-        page_dict = dict(zip(pages_cols, row))
-        page_num = page_dict['page_number']
-        
-        if page_num != current_page_num:
-            if current_page_data:
-                full_data["pages"].append(current_page_data)
-            current_page_data = {
-                "page_number": page_num,
-                "lines": []
-            }
-            current_page_num = page_num
-        
-        # Process Line
-        first_word_id_raw = page_dict['first_word_id']
-        last_word_id_raw = page_dict['last_word_id']
-        
-        line_words = []
-        
-        # Handle cases where IDs are empty strings or None
-        if isinstance(first_word_id_raw, int) and isinstance(last_word_id_raw, int):
-            for word_id in range(first_word_id_raw, last_word_id_raw + 1):
-                if word_id in words_map:
-                    line_words.append(words_map[word_id])
-        
-        line_data = {
-            "line_number": page_dict['line_number'],
-            "line_type": page_dict.get('line_type', 'text'),
-            "is_centered": page_dict.get('is_centered', 0) == 1,
-            "surah_number": page_dict.get('surah_number'),
-            "words": line_words
-        }
-        current_page_data["lines"].append(line_data)
-
-    if current_page_data:
-        full_data["pages"].append(current_page_data)
-
-    # Write to JSON
-    print(f"Writing to {output_json_path}...")
-    with open(output_json_path, 'w', encoding='utf-8') as f:
-        json.dump(full_data, f, ensure_ascii=False, indent=2)
-
-    print("Conversion complete.")
-    conn_words.close()
-    conn_layout.close()
-
-except Exception as e:
-    print(f"Error: {e}")
-    import traceback
-    traceback.print_exc()
+    page_count = conn.execute("SELECT COUNT(DISTINCT page_number) FROM pages").fetchone()[0]
+    table_size = ENTRY.size * page_count
+    info_blob = _compact(info_data)
+    info_offset = HEADER.size + table_size
+
+    entries = []
+    tmp_path = output_path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        # Reserve header + table, stream pages, then come back to fill the table
+        f.write(b'\0' * info_offset)
+        f.write(info_blob)
+
+        offset = info_offset + len(info_blob)
+        for page in iter_pages(conn):
+            blob = _compact(page)
+            f.write(blob)
+            entries.append((page['page_number'], offset, len(blob)))
+            offset += len(blob)
+            if len(entries) % 100 == 0:
+                print(f"  Wrote {len(entries)}/{page_count} pages...")
+
+        entries.sort()
+        f.seek(0)
+        f.write(HEADER.pack(PACK_MAGIC, PACK_VERSION, 0, len(entries), info_offset, len(info_blob)))
+        for entry in entries:
+            f.write(ENTRY.pack(*entry))
+
+    os.replace(tmp_path, output_path)
+    conn.close()
+    print(f"Wrote {len(entries)} pages ({offset / 1024 / 1024:.1f} MB) to {output_path}")
+
+
+class PagePack:
+    """Memory-mapped reader: each page() call decodes only that page's bytes."""
+
+    def __init__(self, path):
+        self._file = open(path, 'rb')
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, _, count, self._info_offset, self._info_length = HEADER.unpack_from(self._mm, 0)
+        if magic != PACK_MAGIC or version != PACK_VERSION:
+            raise ValueError(f"{path} is not a v{PACK_VERSION} mushaf pack")
+        self._count = count
+        self._page_numbers = [ENTRY.unpack_from(self._mm, HEADER.size + i * ENTRY.size)[0]
+                              for i in range(count)]
+
+    def info(self):
+        start = self._info_offset
+        return json.loads(self._mm[start:start + self._info_length])
+
+    def page(self, page_number):
+        i = bisect.bisect_left(self._page_numbers, page_number)
+        if i == self._count or self._page_numbers[i] != page_number:
+            raise KeyError(page_number)
+        _, offset, length = ENTRY.unpack_from(self._mm, HEADER.size + i * ENTRY.size)
+        return json.loads(self._mm[offset:offset + length])
+
+    def close(self):
+        self._mm.close()
+        self._file.close()
+
+
+def main():
+    args = sys.argv[1:]
+    force = '--force' in args
+    args = [a for a in args if a != '--force']
+    if args and args[0] == '--read':
+        pack = PagePack(args[2] if len(args) > 2 else output_pack_path)
+        page = pack.page(int(args[1]))
+        print(json.dumps(page, ensure_ascii=False, indent=2))
+        pack.close()
+        return
+
+    words_db = args[0] if len(args) > 0 else words_db_path
+    layout_db = args[1] if len(args) > 1 else layout_db_path
+    output_path = args[2] if len(args) > 2 else output_pack_path
+
+    if not os.path.exists(words_db) or not os.path.exists(layout_db):
+        print("Error: One or both database files not found.")
+        sys.exit(1)
+
+    cache = BuildCache()
+    cache.build('indopak_pages_pack', [words_db, layout_db], [output_path],
+                lambda: export_pack(words_db, layout_db, output_path),
+                generator=__file__, params={'version': PACK_VERSION}, force=force)
+    cache.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -5,6 +5,12 @@ import difflib
 import os
 import sys
 
+from build_cache import BuildCache
+from tajweed_cache import TajweedMemo
+
+# Bump when process_word/get_char_analysis change output
+CONVERTER_VERSION = 'convert-v1'
+
 # Tajweed rules extraction regex
 TAG_REGEX = re.compile(r'<rule class=([^>]+)>(.*?)</rule>')
 
@@ -162,6 +168,13 @@ def main():
         print(f"Error: {input_path} not found.")
         return
 
+    cache = BuildCache()
+    cache.build('convert_tajweed', [input_path], [output_path],
+                lambda: convert_file(input_path, output_path),
+                generator=__file__, version=CONVERTER_VERSION, force='--force' in sys.argv)
+    cache.close()
+
+def convert_file(input_path, output_path):
     print("Loading JSON...")
     with open(input_path, 'r', encoding='utf-8') as f:
         data = json.load(f)
@@ -172,6 +185,7 @@ def main():
     match_issues = 0
     
     new_data = []
+    memo = TajweedMemo('convert', version=CONVERTER_VERSION)
     
     for item in data:
         # Create copy
@@ -183,7 +197,7 @@ def main():
         if u_text and i_text:
             try:
                 # Generate converted text
-                converted = process_word(u_text, i_text)
+                converted = memo.lookup(f"{u_text}\x00{i_text}", lambda: process_word(u_text, i_text))
                 new_item['text_tajweed_indopak'] = converted
                 
                 # Check for major mismatches (heuristic)
@@ -202,6 +216,8 @@ def main():
         
         if processed_count % 5000 == 0:
             print(f"Processed {processed_count}...")
+    
+    memo.close()
             
     print("Saving output...")
     with open(output_path, 'w', encoding='utf-8') as f:
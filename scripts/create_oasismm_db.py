@@ -5,10 +5,12 @@ Creates a consolidated SQLite database from all JSON/TXT/DB assets.
 Database: oasismm.db
 """
 
+import argparse
 import sqlite3
 import json
 import os
 import re
+import sys
 from pathlib import Path
 from typing import Dict, List, Any
 
@@ -17,6 +19,11 @@ from typing import Dict, List, Any
 ASSETS_DIR = Path("assets").absolute()
 ARCHIVE_DIR = Path("data_archive").absolute()
 OUTPUT_DB = ASSETS_DIR / "oasismm.db"
+# Stored as PRAGMA user_version; the app re-copies its bundled database when the
+# installed copy is older (keep in sync with OasisMMDatabase._dbVersion)
+SCHEMA_VERSION = 2
+# json_to_db.py (range folding for Ibn Kathir tafseer) lives with the tafseer sources
+TAFSEER_TOOLS_DIR = Path(__file__).resolve().parent.parent / "data_archive" / "quran_data" / "tasfeer-ibn-kasir"
 
 
 def log(message: str):
@@ -77,9 +84,16 @@ def create_schema(conn: sqlite3.Connection):
     DROP TABLE IF EXISTS indopak_words;
     DROP TABLE IF EXISTS qpc_glyphs;
     DROP TABLE IF EXISTS mashaf_pages;
+    DROP TABLE IF EXISTS nav_ayah_page;
+    DROP TABLE IF EXISTS nav_page_words;
+    DROP TABLE IF EXISTS nav_division_page;
     DROP TABLE IF EXISTS _migration_info;
     DROP TABLE IF EXISTS verses_fts;
     DROP TABLE IF EXISTS translations_fts;
+    DROP TABLE IF EXISTS hadiths_fts;
+    DROP TABLE IF EXISTS tafseer_fts;
+    DROP TABLE IF EXISTS sunnah_items_fts;
+    DROP TABLE IF EXISTS text_dictionaries;
 
     -- ============================================
     -- QURAN TABLES
@@ -127,35 +141,80 @@ def create_schema(conn: sqlite3.Connection):
     -- QURAN METADATA TABLES
     -- ============================================
     
+    -- Division tables share one typed range layout. start_key/end_key are
+    -- surah * 1000 + verse, so "which juz is 2:255 in" is a single seek on
+    -- the start_key index (see find_division).
     CREATE TABLE quran_juz (
         id INTEGER PRIMARY KEY,
-        start_surah INTEGER,
-        start_verse INTEGER,
-        end_surah INTEGER,
-        end_verse INTEGER,
-        data TEXT
+        start_surah INTEGER NOT NULL,
+        start_verse INTEGER NOT NULL,
+        end_surah INTEGER NOT NULL,
+        end_verse INTEGER NOT NULL,
+        start_key INTEGER NOT NULL,
+        end_key INTEGER NOT NULL,
+        verses_count INTEGER,
+        first_page INTEGER
     );
     
+    CREATE UNIQUE INDEX idx_quran_juz_range ON quran_juz(start_key, end_key, id);
+    
     CREATE TABLE quran_hizb (
         id INTEGER PRIMARY KEY,
-        data TEXT
+        start_surah INTEGER NOT NULL,
+        start_verse INTEGER NOT NULL,
+        end_surah INTEGER NOT NULL,
+        end_verse INTEGER NOT NULL,
+        start_key INTEGER NOT NULL,
+        end_key INTEGER NOT NULL,
+        verses_count INTEGER,
+        first_page INTEGER
     );
     
+    CREATE UNIQUE INDEX idx_quran_hizb_range ON quran_hizb(start_key, end_key, id);
+    
     CREATE TABLE quran_ruku (
         id INTEGER PRIMARY KEY,
-        data TEXT
+        start_surah INTEGER NOT NULL,
+        start_verse INTEGER NOT NULL,
+        end_surah INTEGER NOT NULL,
+        end_verse INTEGER NOT NULL,
+        start_key INTEGER NOT NULL,
+        end_key INTEGER NOT NULL,
+        surah_ruku_number INTEGER,
+        verses_count INTEGER,
+        first_page INTEGER
     );
     
+    CREATE UNIQUE INDEX idx_quran_ruku_range ON quran_ruku(start_key, end_key, id);
+    
     CREATE TABLE quran_manzil (
         id INTEGER PRIMARY KEY,
-        data TEXT
+        start_surah INTEGER NOT NULL,
+        start_verse INTEGER NOT NULL,
+        end_surah INTEGER NOT NULL,
+        end_verse INTEGER NOT NULL,
+        start_key INTEGER NOT NULL,
+        end_key INTEGER NOT NULL,
+        verses_count INTEGER,
+        first_page INTEGER
     );
     
+    CREATE UNIQUE INDEX idx_quran_manzil_range ON quran_manzil(start_key, end_key, id);
+    
     CREATE TABLE quran_rub (
         id INTEGER PRIMARY KEY,
-        data TEXT
+        start_surah INTEGER NOT NULL,
+        start_verse INTEGER NOT NULL,
+        end_surah INTEGER NOT NULL,
+        end_verse INTEGER NOT NULL,
+        start_key INTEGER NOT NULL,
+        end_key INTEGER NOT NULL,
+        verses_count INTEGER,
+        first_page INTEGER
     );
     
+    CREATE UNIQUE INDEX idx_quran_rub_range ON quran_rub(start_key, end_key, id);
+    
     CREATE TABLE quran_sajda (
         id INTEGER PRIMARY KEY,
         surah_id INTEGER,
@@ -182,13 +241,15 @@ def create_schema(conn: sqlite3.Connection):
         id INTEGER PRIMARY KEY AUTOINCREMENT,
         surah_id INTEGER NOT NULL,
         verse_start INTEGER NOT NULL,
-        verse_end INTEGER,
+        verse_end INTEGER NOT NULL,
         language TEXT NOT NULL,
         source TEXT NOT NULL,
         text TEXT NOT NULL
     );
     
-    CREATE INDEX idx_tafseer_surah ON tafseer(surah_id, verse_start);
+    -- One row per commentary range; member ayahs resolve through the interval
+    -- index (ranges never overlap, so verse_end >= ayah seeks straight to it)
+    CREATE INDEX idx_tafseer_interval ON tafseer(language, surah_id, verse_end, verse_start);
     
     -- ============================================
     -- HADITH TABLES
@@ -375,12 +436,44 @@ def create_schema(conn: sqlite3.Connection):
         y_position REAL,
         width REAL,
         height REAL,
+        first_word_id INTEGER,
+        last_word_id INTEGER,
         data_json TEXT
     );
     
     CREATE INDEX idx_mashaf_pages_page ON mashaf_pages(page_number);
     CREATE INDEX idx_mashaf_pages_location ON mashaf_pages(surah, ayah);
     
+    -- ============================================
+    -- MUSHAF NAVIGATION (precomputed, one index seek per lookup)
+    -- ============================================
+    
+    -- ayah -> page/line where the ayah starts
+    CREATE TABLE nav_ayah_page (
+        surah INTEGER NOT NULL,
+        ayah INTEGER NOT NULL,
+        page INTEGER NOT NULL,
+        line INTEGER NOT NULL,
+        PRIMARY KEY (surah, ayah)
+    ) WITHOUT ROWID;
+    
+    -- page -> word id range and the ayah it opens with
+    CREATE TABLE nav_page_words (
+        page INTEGER PRIMARY KEY,
+        first_word_id INTEGER NOT NULL,
+        last_word_id INTEGER NOT NULL,
+        first_surah INTEGER,
+        first_ayah INTEGER
+    ) WITHOUT ROWID;
+    
+    -- juz / hizb / rub -> page where the division starts
+    CREATE TABLE nav_division_page (
+        kind TEXT NOT NULL,
+        number INTEGER NOT NULL,
+        page INTEGER NOT NULL,
+        PRIMARY KEY (kind, number)
+    ) WITHOUT ROWID;
+    
     -- ============================================
     -- MIGRATION METADATA
     -- ============================================
@@ -522,6 +615,69 @@ def migrate_translations(conn: sqlite3.Connection):
         conn.commit()
         log(f"  Migrated {count} translation verses")
 
+VERSE_KEY_FACTOR = 1000
+
+DIVISION_NUMBER_FIELDS = {
+    "quran_juz": "juz_number",
+    "quran_hizb": "hizb_number",
+    "quran_ruku": "ruku_number",
+    "quran_manzil": "manzil_number",
+    "quran_rub": "rub_number",
+}
+
+
+def verse_ordinal(surah: int, verse: int) -> int:
+    """Sortable integer key for a verse (surah * 1000 + verse)"""
+    return surah * VERSE_KEY_FACTOR + verse
+
+
+def parse_verse_key(verse_key: str):
+    """Parse "surah:verse" into (surah, verse), or None"""
+    parts = str(verse_key or '').split(':')
+    if len(parts) != 2 or not parts[0].isdigit() or not parts[1].isdigit():
+        return None
+    return int(parts[0]), int(parts[1])
+
+
+def parse_division(table_name: str, key: str, item: Dict[str, Any], position: int):
+    """Turn one juz/hizb/ruku/manzil/rub record into typed range columns"""
+    start = parse_verse_key(item.get('first_verse_key'))
+    end = parse_verse_key(item.get('last_verse_key'))
+    if not start or not end:
+        return None
+    
+    number = item.get(DIVISION_NUMBER_FIELDS[table_name]) or item.get('rub_el_hizb_number')
+    if not isinstance(number, int):
+        number = int(key) if str(key).isdigit() else position
+    
+    division = {
+        'id': number,
+        'start_surah': start[0],
+        'start_verse': start[1],
+        'end_surah': end[0],
+        'end_verse': end[1],
+        'start_key': verse_ordinal(*start),
+        'end_key': verse_ordinal(*end),
+        'verses_count': item.get('verses_count'),
+    }
+    if table_name == "quran_ruku":
+        division['surah_ruku_number'] = item.get('surah_ruku_number')
+    return division
+
+
+def find_division(conn: sqlite3.Connection, table_name: str, surah: int, verse: int):
+    """Return the id of the juz/hizb/ruku/manzil/rub containing surah:verse, or None"""
+    key = verse_ordinal(surah, verse)
+    row = conn.execute(f"""
+        SELECT id, end_key FROM {table_name}
+        WHERE start_key <= ?
+        ORDER BY start_key DESC LIMIT 1
+    """, (key,)).fetchone()
+    if row and key <= row[1]:
+        return row[0]
+    return None
+
+
 def migrate_quran_metadata(conn: sqlite3.Connection):
     """Migrate Quran metadata JSON files"""
     metadata_files = [
@@ -542,19 +698,28 @@ def migrate_quran_metadata(conn: sqlite3.Connection):
         with open(file_path, 'r', encoding='utf-8') as f:
             data = json.load(f)
         
-        if isinstance(data, list):
-            for i, item in enumerate(data, 1):
-                conn.execute(f"""
-                    INSERT INTO {table_name} (id, data) VALUES (?, ?)
-                """, (i, json.dumps(item, ensure_ascii=False)))
-        elif isinstance(data, dict):
-            for key, value in data.items():
-                conn.execute(f"""
-                    INSERT INTO {table_name} (id, data) VALUES (?, ?)
-                """, (int(key) if key.isdigit() else hash(key), json.dumps(value, ensure_ascii=False)))
+        # Keep the file's own order; IDs come from the record or its key, never hash()
+        if isinstance(data, dict):
+            entries = list(data.items())
+        else:
+            entries = [(str(i), item) for i, item in enumerate(data, 1)]
+        
+        count = 0
+        for position, (key, item) in enumerate(entries, 1):
+            division = parse_division(table_name, key, item, position)
+            if division is None:
+                log(f"  Skipping malformed {table_name} record {key}")
+                continue
+            
+            columns = list(division.keys())
+            conn.execute(f"""
+                INSERT INTO {table_name} ({', '.join(columns)})
+                VALUES ({', '.join('?' for _ in columns)})
+            """, [division[c] for c in columns])
+            count += 1
         
         conn.commit()
-        log(f"  Migrated {table_name}")
+        log(f"  Migrated {count} {table_name} ranges")
     
     # Migrate sajda positions
     sajda_file = get_asset_file("quran_data/quran-metadata-sajda.json")
@@ -599,6 +764,17 @@ def migrate_quran_metadata(conn: sqlite3.Connection):
                 item.get('rub'), item.get('page')
             ))
             count += 1
+        
+        # Fill juz/hizb/rub from the typed ranges when the source file omits them
+        for column, table_name in (("juz", "quran_juz"), ("hizb", "quran_hizb"), ("rub", "quran_rub")):
+            conn.execute(f"""
+                UPDATE quran_ayah_metadata SET {column} = (
+                    SELECT d.id FROM {table_name} d
+                    WHERE d.start_key <= quran_ayah_metadata.surah_id * {VERSE_KEY_FACTOR} + quran_ayah_metadata.verse_number
+                    ORDER BY d.start_key DESC LIMIT 1
+                )
+                WHERE {column} IS NULL
+            """)
         conn.commit()
         log(f"  Migrated {count} ayah metadata records")
 
@@ -768,8 +944,55 @@ def migrate_hadith(conn: sqlite3.Connection):
         conn.commit()
         log(f"  Migrated {len(chapters)} chapters, {hadith_count} hadiths")
 
+def insert_sunnah_book_info(conn: sqlite3.Connection, info: Dict[str, Any]):
+    contact = info.get('contact') or {}
+    conn.execute("""
+        INSERT OR REPLACE INTO sunnah_book_info (id, title, author, publisher, language, edition, contact_phone, contact_mobile, contact_email)
+        VALUES (1, ?, ?, ?, ?, ?, ?, ?, ?)
+    """, (
+        info.get('title'), info.get('author'), info.get('publisher'),
+        info.get('language'), info.get('edition'),
+        contact.get('phone'), contact.get('mobile'), contact.get('email')
+    ))
+
+def insert_sunnah_chapter(conn: sqlite3.Connection, chapter_data: Dict[str, Any]) -> int:
+    """
+    Write one chapter and its items in a single batch. A chapter that is
+    written again replaces the earlier version (last writer wins).
+    Returns the number of items written.
+    """
+    chapter_id = chapter_data.get('chapter_id')
+    conn.execute("""
+        INSERT OR REPLACE INTO sunnah_chapters (id, chapter_number, title)
+        VALUES (?, ?, ?)
+    """, (chapter_id, chapter_id, chapter_data.get('chapter_title')))
+    conn.execute("DELETE FROM sunnah_items WHERE chapter_id = ?", (chapter_id,))
+    
+    items = chapter_data.get('items', [])
+    conn.executemany("""
+        INSERT INTO sunnah_items (chapter_id, item_number, text, arabic_text, urdu_translation, references_json)
+        VALUES (?, ?, ?, ?, ?, ?)
+    """, [(
+        chapter_id,
+        item.get('id'),
+        item.get('text'),
+        item.get('arabic_text'),
+        item.get('urdu_translation'),
+        json.dumps(item.get('references', []), ensure_ascii=False)
+    ) for item in items])
+    return len(items)
+
 def migrate_sunnah(conn: sqlite3.Connection):
     """Migrate Sunnah collection"""
+    # Prefer streaming straight from the source text over the split chapter files
+    source_txt = get_asset_file("PyarayNabi.txt")
+    if source_txt:
+        from process_sunnah import feed_database
+        log(f"Migrating Sunnah collection from {source_txt}...")
+        chapter_count, item_count = feed_database(conn, source_txt)
+        log(f"  Migrated {chapter_count} chapters, {item_count} items")
+        return
+    
     sunnah_dir = get_asset_file("sunnah collection")
     if not sunnah_dir:
         log("Sunnah collection not found in assets or archive, skipping...")
@@ -780,17 +1003,7 @@ def migrate_sunnah(conn: sqlite3.Connection):
     if book_info_file.exists():
         log("Migrating Sunnah book info...")
         with open(book_info_file, 'r', encoding='utf-8') as f:
-            info = json.load(f)
-        
-        contact = info.get('contact', {})
-        conn.execute("""
-            INSERT INTO sunnah_book_info (id, title, author, publisher, language, edition, contact_phone, contact_mobile, contact_email)
-            VALUES (1, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            info.get('title'), info.get('author'), info.get('publisher'),
-            info.get('language'), info.get('edition'),
-            contact.get('phone'), contact.get('mobile'), contact.get('email')
-        ))
+            insert_sunnah_book_info(conn, json.load(f))
         conn.commit()
     
     # Migrate chapters
@@ -800,31 +1013,8 @@ def migrate_sunnah(conn: sqlite3.Connection):
     
     for chapter_file in sorted(sunnah_dir.glob("chapter_*.json")):
         with open(chapter_file, 'r', encoding='utf-8') as f:
-            chapter_data = json.load(f)
-        
-        chapter_id = chapter_data.get('chapter_id')
-        chapter_title = chapter_data.get('chapter_title')
-        
-        cursor = conn.execute("""
-            INSERT INTO sunnah_chapters (id, chapter_number, title)
-            VALUES (?, ?, ?)
-        """, (chapter_id, chapter_id, chapter_title))
-        db_chapter_id = cursor.lastrowid
+            item_count += insert_sunnah_chapter(conn, json.load(f))
         chapter_count += 1
-        
-        for item in chapter_data.get('items', []):
-            conn.execute("""
-                INSERT INTO sunnah_items (chapter_id, item_number, text, arabic_text, urdu_translation, references_json)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """, (
-                db_chapter_id,
-                item.get('id'),
-                item.get('text'),
-                item.get('arabic_text'),
-                item.get('urdu_translation'),
-                json.dumps(item.get('references', []), ensure_ascii=False)
-            ))
-            item_count += 1
     
     conn.commit()
     log(f"  Migrated {chapter_count} chapters, {item_count} items")
@@ -895,6 +1085,19 @@ def migrate_munajat(conn: sqlite3.Connection):
     conn.commit()
     log(f"  Migrated {count} munajat entries")
 
+def insert_tafseer_ranges(conn: sqlite3.Connection, items, language: str) -> int:
+    """Insert one row per commentary range (see json_to_db.iter_ranges)"""
+    sys.path.insert(0, str(TAFSEER_TOOLS_DIR))
+    from json_to_db import iter_ranges
+    
+    rows = [(surah_id, verse_start, verse_end, language, 'ibn-kathir', text)
+            for surah_id, verse_start, verse_end, text in iter_ranges(items)]
+    conn.executemany("""
+        INSERT INTO tafseer (surah_id, verse_start, verse_end, language, source, text)
+        VALUES (?, ?, ?, ?, ?, ?)
+    """, rows)
+    return len(rows)
+
 def migrate_tafseer_ibn_kathir_en(conn: sqlite3.Connection):
     """Migrate English Ibn Kathir Tafseer from external DB"""
     db_path = get_asset_file("quran_data/en-tafisr-ibn-kathir.db")
@@ -904,84 +1107,56 @@ def migrate_tafseer_ibn_kathir_en(conn: sqlite3.Connection):
     
     log(f"Migrating English Ibn Kathir Tafseer from {db_path}...")
     src_conn = sqlite3.connect(str(db_path))
-    src_cursor = src_conn.cursor()
+    src_conn.row_factory = sqlite3.Row
     
     try:
-        # Check table structure
-        src_cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
-        tables = [r[0] for r in src_cursor.fetchall()]
+        # Both the range-aware store (tafseer view over tafseer_ranges) and the
+        # legacy flat table expose ayah_key/text; from_ayah/to_ayah are optional
+        names = {r[0] for r in src_conn.execute(
+            "SELECT name FROM sqlite_master WHERE type IN ('table', 'view')")}
+        if 'tafseer' not in names:
+            log(f"  No tafseer table in {db_path.name} (found: {', '.join(sorted(names))}), skipping")
+            return
         
-        if 'tafseer' in tables:
-            src_cursor.execute("SELECT * FROM tafseer")
-            count = 0
-            for row in src_cursor.fetchall():
-                # Parse surah:ayah from the row
-                # Table structure might vary, adapt as needed
-                conn.execute("""
-                    INSERT INTO tafseer (surah_id, verse_start, verse_end, language, source, text)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                """, (
-                    row[1] if len(row) > 1 else 1,  # surah_id
-                    row[2] if len(row) > 2 else 1,  # verse_start
-                    row[3] if len(row) > 3 else None,  # verse_end
-                    'en',
-                    'ibn-kathir',
-                    row[4] if len(row) > 4 else str(row)
-                ))
-                count += 1
-            conn.commit()
-            log(f"  Migrated {count} English tafseer entries")
-    except Exception as e:
-        log(f"  Error migrating English tafseer: {e}")
+        columns = {r[1] for r in src_conn.execute("PRAGMA table_info(tafseer)")}
+        missing = {'ayah_key', 'text'} - columns
+        if missing:
+            raise RuntimeError(
+                f"English tafseer table lacks column(s) {', '.join(sorted(missing))} "
+                f"(has: {', '.join(sorted(columns))})"
+            )
+        
+        selected = ", ".join(c if c in columns else f"NULL AS {c}"
+                             for c in ('ayah_key', 'from_ayah', 'to_ayah', 'text'))
+        cursor = src_conn.execute(f"SELECT {selected} FROM tafseer")
+        count = insert_tafseer_ranges(conn, (dict(row) for row in cursor), 'en')
+        conn.commit()
+        log(f"  Migrated {count} English tafseer ranges")
     finally:
         src_conn.close()
 
 def migrate_tafseer_ibn_kathir_mm(conn: sqlite3.Connection):
     """Migrate Myanmar Ibn Kathir Tafseer from JSON files"""
-    tafseer_dir = get_asset_file("quran_data/tasfeer-ibn-kasir")
+    tafseer_dir = get_asset_file("quran_data/tasfeer-ibn-kasir/my-ibn-kasir")
     if not tafseer_dir:
         log("Myanmar Tafseer directory not found, skipping...")
         return
     
     log("Migrating Myanmar Ibn Kathir Tafseer...")
-    count = 0
+    items = []
     
-    for json_file in sorted(tafseer_dir.glob("*.json")):
+    for json_file in sorted(tafseer_dir.glob("part_*.json")):
         try:
             with open(json_file, 'r', encoding='utf-8') as f:
                 data = json.load(f)
-            
             if isinstance(data, list):
-                for item in data:
-                    ayah_key = item.get('ayah_key', '')
-                    from_ayah = item.get('from_ayah', ayah_key)
-                    to_ayah = item.get('to_ayah', from_ayah)
-                    text = item.get('text', '')
-                    
-                    # Parse surah:verse from ayah_key
-                    if ':' in from_ayah:
-                        surah_id, verse_start = from_ayah.split(':')
-                        surah_id = int(surah_id)
-                        verse_start = int(verse_start)
-                    else:
-                        continue
-                    
-                    if ':' in to_ayah:
-                        _, verse_end = to_ayah.split(':')
-                        verse_end = int(verse_end)
-                    else:
-                        verse_end = verse_start
-                    
-                    conn.execute("""
-                        INSERT INTO tafseer (surah_id, verse_start, verse_end, language, source, text)
-                        VALUES (?, ?, ?, ?, ?, ?)
-                    """, (surah_id, verse_start, verse_end, 'mm', 'ibn-kathir', text))
-                    count += 1
+                items.extend(data)
         except Exception as e:
             log(f"  Error processing {json_file.name}: {e}")
     
+    count = insert_tafseer_ranges(conn, items, 'mm')
     conn.commit()
-    log(f"  Migrated {count} Myanmar tafseer entries")
+    log(f"  Migrated {count} Myanmar tafseer ranges ({len(items)} source entries)")
 
 def migrate_surah_info_additional(conn: sqlite3.Connection):
     """Migrate additional Surah Info files (Urdu, Myanmar)"""
@@ -1297,13 +1472,15 @@ def migrate_mashaf_layout(conn: sqlite3.Connection):
                         surah, ayah = res
                 
                 conn.execute("""
-                    INSERT INTO mashaf_pages (page_number, surah, ayah, line, data_json)
-                    VALUES (?, ?, ?, ?, ?)
+                    INSERT INTO mashaf_pages (page_number, surah, ayah, line, first_word_id, last_word_id, data_json)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
                 """, (
                     row_dict.get('page_number'),
                     surah,
                     ayah,
                     row_dict.get('line_number'),
+                    fwid,
+                    row_dict.get('last_word_id'),
                     json.dumps(row_dict, ensure_ascii=False),
                 ))
                 count += 1
@@ -1314,6 +1491,78 @@ def migrate_mashaf_layout(conn: sqlite3.Connection):
     finally:
         src_conn.close()
 
+def build_navigation_tables(conn: sqlite3.Connection):
+    """Precompute ayah/page/division lookups from the mashaf layout and metadata"""
+    log("Building mushaf navigation tables...")
+    
+    # Drive from layout lines and range-scan indopak_words by primary key.
+    # Words are visited in reading order, so the first row per ayah is its start.
+    conn.execute("""
+        INSERT OR IGNORE INTO nav_ayah_page (surah, ayah, page, line)
+        SELECT w.surah, w.ayah, p.page_number, p.line
+        FROM mashaf_pages p
+        CROSS JOIN indopak_words w
+        WHERE p.first_word_id IS NOT NULL AND p.last_word_id IS NOT NULL
+          AND w.id BETWEEN p.first_word_id AND p.last_word_id
+        ORDER BY w.id
+    """)
+    
+    conn.execute("""
+        INSERT INTO nav_page_words (page, first_word_id, last_word_id, first_surah, first_ayah)
+        SELECT r.page_number, r.first_id, r.last_id, w.surah, w.ayah
+        FROM (
+            SELECT page_number, MIN(first_word_id) AS first_id, MAX(last_word_id) AS last_id
+            FROM mashaf_pages
+            WHERE first_word_id IS NOT NULL AND last_word_id IS NOT NULL
+            GROUP BY page_number
+        ) r
+        LEFT JOIN indopak_words w ON w.id = r.first_id
+    """)
+    
+    # Division starts are mapped onto this mushaf's pages via their first ayah
+    for kind in ("juz", "hizb", "rub", "ruku", "manzil"):
+        conn.execute(f"""
+            UPDATE quran_{kind} SET first_page = (
+                SELECT n.page FROM nav_ayah_page n
+                WHERE n.surah = quran_{kind}.start_surah AND n.ayah = quran_{kind}.start_verse
+            )
+        """)
+    for kind in ("juz", "hizb", "rub"):
+        conn.execute(f"""
+            INSERT INTO nav_division_page (kind, number, page)
+            SELECT ?, id, first_page FROM quran_{kind}
+            WHERE first_page IS NOT NULL
+        """, (kind,))
+    
+    conn.commit()
+    
+    counts = {}
+    for table in ("nav_ayah_page", "nav_page_words", "nav_division_page"):
+        counts[table] = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+        log(f"  {table}: {counts[table]} rows")
+    
+    # The optional IndoPak words DB may be absent; the app then falls back to
+    # mashaf_pages. Empty tables are only an error when their sources were there.
+    has_pages = conn.execute(
+        "SELECT 1 FROM mashaf_pages WHERE first_word_id IS NOT NULL LIMIT 1").fetchone() is not None
+    has_words = conn.execute("SELECT 1 FROM indopak_words LIMIT 1").fetchone() is not None
+    has_divisions = conn.execute("SELECT 1 FROM quran_juz LIMIT 1").fetchone() is not None
+    if not (has_pages and has_words):
+        empty = [t for t, n in counts.items() if not n]
+        if empty:
+            log(f"  [WARN] {', '.join(empty)} left empty: mashaf layout or IndoPak words not migrated "
+                "(the app falls back to mashaf_pages)")
+        return
+    
+    empty = [t for t in ("nav_ayah_page", "nav_page_words") if not counts[t]]
+    if has_divisions and not counts["nav_division_page"]:
+        empty.append("nav_division_page")
+    if empty:
+        raise RuntimeError(
+            f"Navigation tables are empty: {', '.join(empty)} "
+            "(mashaf_pages word ranges do not match indopak_words ids)"
+        )
+
 def build_fts_indexes(conn: sqlite3.Connection):
     """Build Full-Text Search indexes"""
     log("Building FTS indexes...")
@@ -1329,54 +1578,57 @@ def build_fts_indexes(conn: sqlite3.Connection):
     conn.commit()
     log("  FTS indexes built")
 
+def compress_large_text(conn: sqlite3.Connection):
+    """Index then dictionary-compress hadith, tafseer and sunnah text (--compress)"""
+    import text_codec
+    
+    log("Building FTS indexes for compressed tables...")
+    text_codec.create_fts_tables(conn)
+    
+    log("Compressing large text columns...")
+    text_codec.compress_text_columns(conn, log=log)
+    
+    # Reclaim the pages freed by the smaller rows
+    conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    conn.execute("VACUUM")
+
 def record_migration(conn: sqlite3.Connection, source_files: List[str]):
     """Record migration metadata"""
     from datetime import datetime
     
     conn.execute("""
         INSERT INTO _migration_info (id, version, created_at, source_files)
-        VALUES (1, 1, ?, ?)
-    """, (datetime.now().isoformat(), json.dumps(source_files)))
+        VALUES (1, ?, ?, ?)
+    """, (SCHEMA_VERSION, datetime.now().isoformat(), json.dumps(source_files)))
+    conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
     conn.commit()
 
 def print_statistics(conn: sqlite3.Connection):
-    """Print database statistics"""
+    """Print database statistics (exact on-disk sizes, see scripts/analyze_db.py)"""
+    from analyze_db import page_summary, print_report, profile_db
+    
     log("\n" + "="*50)
     log("DATABASE STATISTICS")
     log("="*50)
     
-    tables = [
-        ("surahs", "Surahs"),
-        ("verses", "Verses"),
-        ("translations", "Translations"),
-        ("quran_ayah_metadata", "Ayah Metadata"),
-        ("tafseer", "Tafseer"),
-        ("hadith_books", "Hadith Books"),
-        ("hadith_chapters", "Hadith Chapters"),
-        ("hadiths", "Hadiths"),
-        ("sunnah_chapters", "Sunnah Chapters"),
-        ("sunnah_items", "Sunnah Items"),
-        ("allah_names", "99 Names"),
-        ("dua_categories", "Dua Categories"),
-        ("duas", "Duas"),
-        ("munajat", "Munajat"),
-    ]
-    
-    for table, name in tables:
-        try:
-            cursor = conn.execute(f"SELECT COUNT(*) FROM {table}")
-            count = cursor.fetchone()[0]
-            log(f"  {name:.<30} {count:>8} rows")
-        except:
-            pass
-    
-    # Database file size
-    db_size = OUTPUT_DB.stat().st_size / (1024 * 1024)
-    log(f"\n  Database Size: {db_size:.2f} MB")
+    conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    try:
+        report = profile_db(conn)
+    except sqlite3.OperationalError as e:
+        # SQLite built without SQLITE_ENABLE_DBSTAT_VTAB
+        log(f"  Per-table sizes unavailable ({e}), page counts only")
+        report = page_summary(conn)
+    print_report(report, out=log)
     log("="*50)
 
 def main():
     """Main migration function"""
+    parser = argparse.ArgumentParser(description="Build assets/oasismm.db")
+    parser.add_argument('--compress', action='store_true',
+                        help="Store large text columns as dictionary-compressed zstd blobs "
+                             "(readers must decode them, see scripts/text_codec.py)")
+    args = parser.parse_args()
+    
     log("Starting OasisMM Database Migration")
     log(f"Output: {OUTPUT_DB}")
     log("")
@@ -1406,9 +1658,12 @@ def main():
         migrate_indopak_words(conn)
         migrate_qpc_glyphs(conn)
         migrate_mashaf_layout(conn)
+        build_navigation_tables(conn)
         
         # Build FTS indexes
         build_fts_indexes(conn)
+        if args.compress:
+            compress_large_text(conn)
         
         # Record migration
         source_files = list(str(f) for f in ASSETS_DIR.rglob("*.json"))
@@ -1,97 +1,242 @@
 #!/usr/bin/env python3
 """
 Fetch Tajweed data from Quran.com API - Full version
+
+Chapters are fetched concurrently over one pooled session with retry/backoff.
+Every response body is cached on disk under a hash of its request, so reruns
+(and offline runs against recorded responses) cost no network at all.
+Words are streamed to JSONL chapter by chapter, in chapter order, then
+written as the JSON array (quran_tajweed_api.json) the downstream scripts
+read. --jsonl keeps the JSONL stream as well.
+
+Usage:
+  python scripts/fetch_quran_api.py
+  python scripts/fetch_quran_api.py --workers 16 --jsonl     # also keep quran_tajweed_api.jsonl
+  python scripts/fetch_quran_api.py --offline                # only use cached/recorded responses
+  python scripts/fetch_quran_api.py --base-url http://127.0.0.1:8000/api/qdc   # local stub server
 """
 
-import requests
+import argparse
+import hashlib
 import json
-import time
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
+BASE_URL = 'https://api.qurancdn.com/api/qdc'
 OUTPUT_FILE = 'quran_tajweed_api.json'
+OUTPUT_JSONL = 'quran_tajweed_api.jsonl'
+CACHE_DIR = Path(__file__).parent / '.cache' / 'quran_api'
+TOTAL_CHAPTERS = 114
+
+WORD_FIELDS = 'text_uthmani_tajweed,text_uthmani,text_indopak,location'
+
+
+class CacheMiss(Exception):
+    pass
+
+
+class QuranApiClient:
+    """Pooled, retrying HTTP client with an on-disk response cache."""
 
-def fetch_chapter_words(chapter_num):
+    def __init__(self, base_url=BASE_URL, cache_dir=CACHE_DIR, workers=8, retries=5,
+                 backoff=0.5, offline=False):
+        self.base_url = base_url.rstrip('/')
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.offline = offline
+        self.hits = 0
+        self.misses = 0
+
+        self.session = requests.Session()
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=('GET',),
+            respect_retry_after_header=True,
+        )
+        adapter = HTTPAdapter(pool_connections=workers, pool_maxsize=workers, max_retries=retry)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def _cache_path(self, url, params):
+        # Key on the logical request, not the host, so stub servers share recordings
+        path = url[len(self.base_url):] if url.startswith(self.base_url) else url
+        key = json.dumps([path, sorted(params.items())], ensure_ascii=False)
+        digest = hashlib.sha256(key.encode('utf-8')).hexdigest()
+        return self.cache_dir / digest[:2] / f"{digest}.json"
+
+    def get_json(self, path, params):
+        url = f"{self.base_url}{path}"
+        cache_path = self._cache_path(url, params)
+
+        if cache_path.exists():
+            self.hits += 1
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+
+        if self.offline:
+            raise CacheMiss(f"No recorded response for {path} {params}")
+
+        self.misses += 1
+        response = self.session.get(url, params=params, timeout=30)
+        response.raise_for_status()
+        data = response.json()
+
+        # Write-then-rename so an interrupted run never leaves a torn cache entry
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_suffix(f'.{os.getpid()}.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, cache_path)
+        return data
+
+
+def fetch_chapter_words(client, chapter_num):
     """Fetch all words with Tajweed for a chapter"""
-    url = f"https://api.qurancdn.com/api/qdc/verses/by_chapter/{chapter_num}"
     params = {
         'words': 'true',
-        'word_fields': 'text_uthmani_tajweed,text_uthmani,text_indopak,location',
+        'word_fields': WORD_FIELDS,
         'per_page': 300,
     }
-    
+
     all_verses = []
     page = 1
-    
+
     while True:
         params['page'] = page
-        try:
-            response = requests.get(url, params=params, timeout=30)
-            
-            if response.status_code != 200:
-                print(f"Error {response.status_code} for chapter {chapter_num}")
-                break
-            
-            data = response.json()
-            verses = data.get('verses', [])
-            
-            if not verses:
-                break
-            
-            all_verses.extend(verses)
-            
-            pagination = data.get('pagination', {})
-            if page >= pagination.get('total_pages', 1):
-                break
-            
-            page += 1
-            time.sleep(0.1)
-            
-        except Exception as e:
-            print(f"Error: {e}")
+        data = client.get_json(f"/verses/by_chapter/{chapter_num}", params)
+
+        verses = data.get('verses', [])
+        if not verses:
+            break
+
+        all_verses.extend(verses)
+
+        pagination = data.get('pagination', {})
+        if page >= pagination.get('total_pages', 1):
             break
-    
+
+        page += 1
+
     return all_verses
 
+
+def extract_words(surah, verses):
+    words = []
+    for verse in verses:
+        for word in verse.get('words', []):
+            if word.get('char_type_name') == 'word':
+                words.append({
+                    'surah': surah,
+                    'ayah': verse.get('verse_number'),
+                    'word': word.get('position'),
+                    'text_uthmani': word.get('text_uthmani', ''),
+                    'text_indopak': word.get('text_indopak', ''),
+                    'text_tajweed': word.get('text_uthmani_tajweed', ''),
+                })
+    return words
+
+
+def fetch_all(client, chapters, output_jsonl, workers):
+    """
+    Fetch chapters concurrently and stream them to JSONL in chapter order.
+    Completed chapters wait in `ready` only until every earlier one is written.
+    """
+    total_words = 0
+    ready = {}
+    order = list(chapters)
+    next_idx = 0
+
+    with open(output_jsonl, 'w', encoding='utf-8') as out, \
+            ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(fetch_chapter_words, client, c): c for c in order}
+
+        for future in as_completed(futures):
+            surah = futures[future]
+            verses = future.result()
+            ready[surah] = extract_words(surah, verses)
+            print(f"Fetched Surah {surah}/{TOTAL_CHAPTERS}: {len(verses)} verses, {len(ready[surah])} words")
+
+            while next_idx < len(order) and order[next_idx] in ready:
+                for word in ready.pop(order[next_idx]):
+                    out.write(json.dumps(word, ensure_ascii=False))
+                    out.write('\n')
+                    total_words += 1
+                out.flush()
+                next_idx += 1
+
+    return total_words
+
+
+def jsonl_to_json(jsonl_path, json_path):
+    """Write the JSON array expected by downstream scripts, one word at a time."""
+    with open(jsonl_path, 'r', encoding='utf-8') as src, open(json_path, 'w', encoding='utf-8') as dst:
+        dst.write('[\n')
+        first = True
+        for line in src:
+            if not line.strip():
+                continue
+            if not first:
+                dst.write(',\n')
+            dst.write('  ')
+            dst.write(line.rstrip('\n'))
+            first = False
+        dst.write('\n]\n')
+
+
 def main():
+    parser = argparse.ArgumentParser(description="Fetch Tajweed word data from the Quran.com API")
+    parser.add_argument('--base-url', default=BASE_URL, help="API root (point at a local stub server for offline tests)")
+    parser.add_argument('--cache-dir', default=str(CACHE_DIR), help="On-disk response cache / recorded fixtures")
+    parser.add_argument('--workers', type=int, default=8, help="Concurrent chapter fetches")
+    parser.add_argument('--retries', type=int, default=5)
+    parser.add_argument('--offline', action='store_true', help="Fail on cache miss instead of hitting the network")
+    parser.add_argument('--output', default=OUTPUT_FILE, help="JSON array output path")
+    parser.add_argument('--jsonl', nargs='?', const=OUTPUT_JSONL,
+                        help=f"Also keep the JSONL stream (default path: {OUTPUT_JSONL})")
+    parser.add_argument('--chapters', type=int, nargs='*', help="Subset of chapters (default: all 114)")
+    args = parser.parse_args()
+
+    client = QuranApiClient(
+        base_url=args.base_url,
+        cache_dir=args.cache_dir,
+        workers=args.workers,
+        retries=args.retries,
+        offline=args.offline,
+    )
+    chapters = args.chapters or range(1, TOTAL_CHAPTERS + 1)
+
     print("Fetching Tajweed data from Quran.com API...")
-    print("This will take a few minutes...\n")
-    
-    all_words = []
-    
-    for surah in range(1, 115):
-        print(f"Fetching Surah {surah}/114...", end=' ')
-        verses = fetch_chapter_words(surah)
-        
-        word_count = 0
-        for verse in verses:
-            for word in verse.get('words', []):
-                if word.get('char_type_name') == 'word':
-                    word_count += 1
-                    all_words.append({
-                        'surah': surah,
-                        'ayah': verse.get('verse_number'),
-                        'word': word.get('position'),
-                        'text_uthmani': word.get('text_uthmani', ''),
-                        'text_indopak': word.get('text_indopak', ''),
-                        'text_tajweed': word.get('text_uthmani_tajweed', ''),
-                    })
-        
-        print(f"{len(verses)} verses, {word_count} words")
-        time.sleep(0.2)
-    
-    # Save to file
-    print(f"\nSaving to {OUTPUT_FILE}...")
-    with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
-        json.dump(all_words, f, ensure_ascii=False, indent=2)
-    
-    print(f"Done! Total words: {len(all_words)}")
-    
+    start = time.perf_counter()
+    jsonl_path = args.jsonl or f"{args.output}.{os.getpid()}.jsonl"
+    total = fetch_all(client, chapters, jsonl_path, args.workers)
+    elapsed = time.perf_counter() - start
+
+    jsonl_to_json(jsonl_path, args.output)
+    print(f"\nDone! Total words: {total} -> {args.output}")
+    if args.jsonl:
+        print(f"JSONL stream: {args.jsonl}")
+    print(f"Requests: {client.hits} cached, {client.misses} fetched in {elapsed:.1f}s")
+
     # Show sample of Tajweed tags
     print("\n=== Sample Tajweed Tags ===")
-    for word in all_words[:5]:
-        print(f"{word['surah']}:{word['ayah']}:{word['word']}")
-        print(f"  Text: {word['text_uthmani']}")
-        print(f"  Tajweed: {word['text_tajweed'][:100]}...")
+    with open(jsonl_path, 'r', encoding='utf-8') as f:
+        for _, line in zip(range(5), f):
+            word = json.loads(line)
+            print(f"{word['surah']}:{word['ayah']}:{word['word']}")
+            print(f"  Text: {word['text_uthmani']}")
+            print(f"  Tajweed: {word['text_tajweed'][:100]}...")
+
+    if not args.jsonl:
+        os.remove(jsonl_path)
+
 
 if __name__ == '__main__':
     main()
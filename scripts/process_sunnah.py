@@ -1,81 +1,167 @@
+"""
+Split PyarayNabi.txt into the sunnah collection (book_info.json + chapter_N.json).
+
+The source is scanned once, line by line. Each ```json block is decoded as
+soon as its closing fence is read, and every chapter in it is written out
+immediately. A chapter that appears again in a later block replaces the
+earlier file (last writer wins: later blocks are corrections).
+
+With --db the chapters are also (or, with --no-files, only) written straight
+into the sunnah tables of an existing oasismm.db through the builder's batch
+writer, skipping the chapter-file round trip.
+
+Usage:
+    python scripts/process_sunnah.py [--input PyarayNabi.txt] [--output-dir "sunnah collection"]
+    python scripts/process_sunnah.py --db assets/oasismm.db --no-files
+"""
+
+import argparse
 import json
 import os
-import re
+import sqlite3
 
 # Paths
 input_file_path = r'e:\Munajat App\munajat_e_maqbool_app\PyarayNabi.txt'
 output_dir = r'e:\Munajat App\munajat_e_maqbool_app\sunnah collection'
 
-def process_sunnah_data():
-    if not os.path.exists(output_dir):
-        os.makedirs(output_dir)
+FENCE_OPEN = '```json'
+FENCE_CLOSE = '```'
+
+
+def iter_json_blocks(path):
+    """
+    Yield (block_number, data, error) for each ```json fenced block, reading
+    the file one line at a time. Only the current block is held in memory.
+    """
+    block = None
+    number = 0
+
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            while line:
+                if block is None:
+                    start = line.find(FENCE_OPEN)
+                    if start < 0:
+                        break
+                    block = []
+                    line = line[start + len(FENCE_OPEN):]
+                else:
+                    end = line.find(FENCE_CLOSE)
+                    if end < 0:
+                        block.append(line)
+                        break
+                    block.append(line[:end])
+                    line = line[end + len(FENCE_CLOSE):]
+
+                    number += 1
+                    try:
+                        yield number, json.loads(''.join(block)), None
+                    except json.JSONDecodeError as e:
+                        yield number, None, e
+                    block = None
+
+
+def iter_sunnah_records(path):
+    """Yield ('book_info', info) and ('chapter', chapter) records in source order."""
+    for number, data, error in iter_json_blocks(path):
+        if error is not None:
+            print(f"Error decoding JSON in block {number}: {error}")
+            continue
+        if not isinstance(data, dict):
+            continue
+
+        if 'book_info' in data:
+            print(f"Found book_info in block {number}")
+            yield 'book_info', data['book_info']
 
-    with open(input_file_path, 'r', encoding='utf-8') as f:
-        content = f.read()
+        chapters = data.get('chapters') or []
+        if chapters:
+            print(f"Found {len(chapters)} chapters in block {number}")
+        for chapter in chapters:
+            yield 'chapter', chapter
 
-    # Split content by markdown code blocks
-    # Looking for ```json ... ```
-    # Using regex to capture content between ```json and ```
-    json_blocks = re.findall(r'```json(.*?)```', content, re.DOTALL)
 
-    all_chapters = {}
-    book_info = None
+def write_json_atomic(path, data):
+    """Write via temp file + rename; unchanged files are left untouched."""
+    payload = json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8')
+    if os.path.exists(path):
+        with open(path, 'rb') as f:
+            if f.read() == payload:
+                return False
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(payload)
+    os.replace(tmp_path, path)
+    return True
 
-    print(f"Found {len(json_blocks)} JSON blocks.")
 
-    for i, block in enumerate(json_blocks):
+def process_records(path, out_dir=None):
+    """Yield the source records, writing each to out_dir (if given) as it is read."""
+    if out_dir:
+        os.makedirs(out_dir, exist_ok=True)
+    seen = set()
+
+    for kind, record in iter_sunnah_records(path):
+        if out_dir:
+            if kind == 'book_info':
+                if write_json_atomic(os.path.join(out_dir, 'book_info.json'), record):
+                    print("Written book_info.json")
+            else:
+                c_id = record['chapter_id']
+                if c_id in seen:
+                    print(f"Overwriting Chapter {c_id} with newer version.")
+                seen.add(c_id)
+                filename = f"chapter_{c_id}.json"
+                if write_json_atomic(os.path.join(out_dir, filename), record):
+                    print(f"Written {filename}")
+        yield kind, record
+
+
+def feed_database(conn, path, out_dir=None):
+    """
+    Stream the source into the sunnah tables (and chapter files when out_dir
+    is given). Returns (chapters, items) as finally stored.
+    """
+    from create_oasismm_db import insert_sunnah_book_info, insert_sunnah_chapter
+
+    item_counts = {}
+    for kind, record in process_records(path, out_dir):
+        if kind == 'book_info':
+            insert_sunnah_book_info(conn, record)
+        else:
+            item_counts[record['chapter_id']] = insert_sunnah_chapter(conn, record)
+    conn.commit()
+    return len(item_counts), sum(item_counts.values())
+
+
+def process_sunnah_data(source=input_file_path, out_dir=output_dir, db_path=None, write_files=True):
+    out_dir = out_dir if write_files else None
+
+    if db_path:
+        conn = sqlite3.connect(db_path)
         try:
-            # Clean up whitespace
-            cleaned_block = block.strip()
-            data = json.loads(cleaned_block)
-
-            # Extract book_info if present (should be in the first block)
-            if 'book_info' in data:
-                print(f"Found book_info in block {i+1}")
-                book_info = data['book_info']
-
-            # Extract chapters
-            if 'chapters' in data:
-                print(f"Found {len(data['chapters'])} chapters in block {i+1}")
-                for chapter in data['chapters']:
-                    c_id = chapter['chapter_id']
-                    # Overwrite if exists, assuming later blocks are corrections/updates
-                    if c_id in all_chapters:
-                        print(f"Overwriting Chapter {c_id} with newer version.")
-                    all_chapters[c_id] = chapter
-
-        except json.JSONDecodeError as e:
-            print(f"Error decoding JSON in block {i+1}: {e}")
-            # print(block[:100]) # Print start of block for debugging
-
-    # Write book_info.json
-    if book_info:
-        book_info_path = os.path.join(output_dir, 'book_info.json')
-        with open(book_info_path, 'w', encoding='utf-8') as f:
-            json.dump(book_info, f, ensure_ascii=False, indent=2)
-        print(f"Written book_info.json")
-
-    # Write chapter files
-    sorted_chapter_ids = sorted(all_chapters.keys())
-    for c_id in sorted_chapter_ids:
-        chapter = all_chapters[c_id]
-        filename = f"chapter_{c_id}.json"
-        file_path = os.path.join(output_dir, filename)
-        
-        # We wrap the chapter in the structure the user might expect or just the chapter itself.
-        # User prompt: "make the structure .json format in a folder a chapter a file"
-        # And user provided example:
-        # { "book_info": ..., "chapters": [...] }
-        # But since we are splitting, `book_info` is separate.
-        # It's cleaner to just dump the chapter object.
-        # However, to be extra safe and comprehensive, let's keep it simple: just the chapter object.
-        # Unless I want to replicate the 'full structure' in every file (redundant).
-        # Given "book data into .json file" (singular) vs "a file" per chapter.
-        # I will stick to just the chapter content in the chapter file.
-        
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(chapter, f, ensure_ascii=False, indent=2)
-        print(f"Written {filename}")
+            chapters, items = feed_database(conn, source, out_dir)
+        finally:
+            conn.close()
+        print(f"Fed {chapters} chapters, {items} items into {db_path}")
+    else:
+        chapters = {record['chapter_id'] for kind, record in process_records(source, out_dir)
+                    if kind == 'chapter'}
+        print(f"Processed {len(chapters)} chapters")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Split PyarayNabi.txt into sunnah chapter files")
+    parser.add_argument('--input', default=input_file_path)
+    parser.add_argument('--output-dir', default=output_dir)
+    parser.add_argument('--db', help="Also write chapters into this oasismm.db's sunnah tables")
+    parser.add_argument('--no-files', action='store_true', help="With --db: skip the chapter JSON files")
+    args = parser.parse_args()
+
+    if args.no_files and not args.db:
+        parser.error("--no-files needs --db")
+    process_sunnah_data(args.input, args.output_dir, args.db, write_files=not args.no_files)
+
 
 if __name__ == '__main__':
-    process_sunnah_data()
+    main()
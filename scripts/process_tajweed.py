@@ -27,6 +27,8 @@ import re
 import os
 from pathlib import Path
 
+from tajweed_cache import TajweedMemo
+
 # Tajweed Rule indices (matching the Dart enum order)
 RULE_LAFZATULLAH = 0
 RULE_IZHAR = 1
@@ -178,10 +180,11 @@ def process_database(db_path):
     # Process each word
     count = 0
     batch_size = 1000
+    memo = TajweedMemo('uthmani', PATTERNS, tokenizer=tokenize_word)
     
     for word_id, text in words:
         if text:
-            tokens = tokenize_word(text)
+            tokens = memo.lookup(text, lambda: tokenize_word(text))
             serialized = serialize_tokens(tokens)
             cursor.execute(
                 "UPDATE words SET text_tajweed = ? WHERE id = ?",
@@ -195,6 +198,7 @@ def process_database(db_path):
     
     conn.commit()
     conn.close()
+    memo.close()
     
     print(f"Finished processing {count} words.")
     print("Database updated successfully!")
@@ -9,6 +9,8 @@ import re
 import sys
 from pathlib import Path
 
+from tajweed_cache import TajweedMemo
+
 # Rule indices
 GHUNNA, QALQALA, IKHFAA, IDGHAM_G, IDGHAM_NG, IQLAB, NONE = range(7)
 
@@ -143,9 +145,10 @@ def main():
     
     batch = []
     stats = {i: 0 for i in range(7)}
+    memo = TajweedMemo('indopak', PATTERNS, tokenizer=tokenize)
     
     for i, (wid, text) in enumerate(words):
-        tokens = tokenize(text) if text else [(text, NONE)]
+        tokens = memo.lookup(text, lambda: tokenize(text)) if text else [(text, NONE)]
         batch.append((serialize(tokens), wid))
         for _, r in tokens:
             stats[r] += 1
@@ -161,6 +164,7 @@ def main():
         conn.commit()
     
     conn.close()
+    memo.close()
     
     print(f"\nDone! Processed {total} words.")
     print("\nStatistics:")
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Tajweed Memo Cache
+
+Content-addressed memo layer for the Tajweed tokenizers. Word forms repeat
+heavily across the Quran (lafz al-jalalah, particles, repeated phrases), so
+each distinct form is tokenized once and the result is persisted in a small
+SQLite file keyed on (namespace, rule-set version, sha1(word)).
+
+The rule-set version is derived from the compiled pattern list and from the
+source of the tokenizer function, so editing a pattern or the tokenizer
+(overlap filtering, token building) automatically produces a new version.
+When only patterns changed, cached forms from the previous version are
+carried forward unless one of the changed patterns matches them - only
+affected forms are re-tokenized. A tokenizer change drops the whole memo.
+
+Usage:
+    memo = TajweedMemo('indopak', PATTERNS, tokenizer=tokenize)
+    tokens = memo.lookup(text, lambda: tokenize(text))
+    memo.close()   # persists new entries and prints the hit-rate report
+"""
+
+import hashlib
+import inspect
+import json
+import re
+import sqlite3
+import time
+from pathlib import Path
+
+DEFAULT_CACHE_PATH = Path(__file__).parent / '.cache' / 'tajweed_memo.db'
+
+
+def content_key(text):
+    """Content address of a word form."""
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+def ruleset_signature(patterns):
+    """Serializable description of a [(compiled_regex, rule), ...] list."""
+    return [[p.pattern, p.flags, rule] for p, rule in patterns]
+
+
+def ruleset_version(signature):
+    """Stable version hash for a rule-set signature (or any JSON value)."""
+    blob = json.dumps(signature, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha1(blob.encode('utf-8')).hexdigest()[:16]
+
+
+def tokenizer_version(fn):
+    """Hash of a tokenizer function's qualified name and source code."""
+    digest = hashlib.sha1(f"{fn.__module__}.{fn.__qualname__}".encode('utf-8'))
+    try:
+        digest.update(inspect.getsource(fn).encode('utf-8'))
+    except (TypeError, OSError):
+        # No source available: fall back to the whole module file
+        with open(inspect.getsourcefile(fn), 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+
+def _decode(value):
+    # Token lists round-trip through JSON as lists of lists
+    if isinstance(value, list):
+        return [tuple(t) for t in value]
+    return value
+
+
+class TajweedMemo:
+    """Persistent memo of word form -> tokenizer output for one rule set."""
+
+    def __init__(self, namespace, patterns=None, version=None, tokenizer=None,
+                 cache_path=DEFAULT_CACHE_PATH):
+        if patterns is None and version is None:
+            raise ValueError("TajweedMemo needs either patterns or an explicit version")
+
+        self.namespace = namespace
+        self.signature = ruleset_signature(patterns) if patterns is not None else None
+        self.tokenizer = tokenizer_version(tokenizer) if tokenizer is not None else None
+        self.version = version or ruleset_version({'patterns': self.signature, 'tokenizer': self.tokenizer})
+
+        self.hits = 0
+        self.misses = 0
+        self.carried = 0
+        self.compute_seconds = 0.0
+        self._entries = {}
+        self._pending = []
+
+        cache_path = Path(cache_path)
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(cache_path))
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self._create_schema()
+        self._load()
+
+    def _create_schema(self):
+        self.conn.executescript("""
+        CREATE TABLE IF NOT EXISTS rulesets (
+            namespace TEXT NOT NULL,
+            version TEXT NOT NULL,
+            signature TEXT,
+            created_at REAL NOT NULL,
+            PRIMARY KEY (namespace, version)
+        );
+        CREATE TABLE IF NOT EXISTS memo (
+            namespace TEXT NOT NULL,
+            version TEXT NOT NULL,
+            key TEXT NOT NULL,
+            word TEXT NOT NULL,
+            value TEXT NOT NULL,
+            PRIMARY KEY (namespace, version, key)
+        ) WITHOUT ROWID;
+        """)
+
+    def _load(self):
+        cur = self.conn.cursor()
+        cur.execute("SELECT 1 FROM rulesets WHERE namespace = ? AND version = ?",
+                    (self.namespace, self.version))
+        is_new = cur.fetchone() is None
+
+        if is_new:
+            cur.execute(
+                "INSERT INTO rulesets (namespace, version, signature, created_at) VALUES (?, ?, ?, ?)",
+                (self.namespace, self.version,
+                 json.dumps({'patterns': self.signature, 'tokenizer': self.tokenizer}, ensure_ascii=False)
+                 if self.signature is not None else None,
+                 time.time())
+            )
+        else:
+            cur.execute("SELECT key, word, value FROM memo WHERE namespace = ? AND version = ?",
+                        (self.namespace, self.version))
+            for key, word, value in cur:
+                self._entries[key] = _decode(json.loads(value))
+
+        # Carry unaffected forms forward from the previous rule set, then evict it
+        cur.execute(
+            "SELECT version, signature FROM rulesets WHERE namespace = ? AND version != ? "
+            "ORDER BY created_at DESC",
+            (self.namespace, self.version)
+        )
+        previous = cur.fetchall()
+        if is_new and previous:
+            self._carry_forward(*previous[0])
+        for old_version, _ in previous:
+            cur.execute("DELETE FROM memo WHERE namespace = ? AND version = ?", (self.namespace, old_version))
+            cur.execute("DELETE FROM rulesets WHERE namespace = ? AND version = ?", (self.namespace, old_version))
+        self.conn.commit()
+
+    def _carry_forward(self, old_version, old_signature):
+        """
+        With the same tokenizer, a word's tokens depend only on the ordered
+        sub-list of patterns that match it. If no added/removed pattern
+        matches the word and the shared patterns kept their relative order,
+        the old result is still valid.
+        """
+        if self.signature is None or old_signature is None:
+            return
+
+        stored = json.loads(old_signature)
+        # Rule sets recorded before tokenizer versioning carry nothing forward
+        if not isinstance(stored, dict) or stored.get('tokenizer') != self.tokenizer:
+            return
+
+        old = [tuple(s) for s in stored['patterns']]
+        new = [tuple(s) for s in self.signature]
+        old_set, new_set = set(old), set(new)
+        common_old = [s for s in old if s in new_set]
+        common_new = [s for s in new if s in old_set]
+        if common_old != common_new:
+            return
+
+        changed = [re.compile(src, flags) for src, flags, _ in set(old) ^ set(new)]
+
+        cur = self.conn.cursor()
+        cur.execute("SELECT key, word, value FROM memo WHERE namespace = ? AND version = ?",
+                    (self.namespace, old_version))
+        for key, word, value in cur.fetchall():
+            if any(p.search(word) for p in changed):
+                continue
+            self._entries[key] = _decode(json.loads(value))
+            self._pending.append((key, word, value))
+            self.carried += 1
+
+    def lookup(self, word, compute):
+        """Return the memoized result for `word`, calling `compute()` on a miss."""
+        key = content_key(word)
+        value = self._entries.get(key)
+        if value is not None:
+            self.hits += 1
+            return value
+
+        self.misses += 1
+        start = time.perf_counter()
+        value = compute()
+        self.compute_seconds += time.perf_counter() - start
+
+        self._entries[key] = value
+        self._pending.append((key, word, json.dumps(value, ensure_ascii=False)))
+        return value
+
+    def flush(self):
+        """Persist entries computed since the last flush."""
+        if not self._pending:
+            return
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO memo (namespace, version, key, word, value) VALUES (?, ?, ?, ?, ?)",
+            [(self.namespace, self.version, key, word, value) for key, word, value in self._pending]
+        )
+        self.conn.commit()
+        self._pending = []
+
+    def report(self):
+        """Print hit rate and an estimate of the tokenization time saved."""
+        total = self.hits + self.misses
+        rate = 100.0 * self.hits / total if total else 0.0
+        avg = self.compute_seconds / self.misses if self.misses else 0.0
+        print(f"\nMemo [{self.namespace}@{self.version[:8]}]:")
+        print(f"  Lookups: {total}  Hits: {self.hits} ({rate:.1f}%)  Computed: {self.misses}")
+        print(f"  Carried over from previous rule set: {self.carried}")
+        print(f"  Distinct forms cached: {len(self._entries)}")
+        print(f"  Compute time: {self.compute_seconds:.2f}s  Est. saved: {self.hits * avg:.2f}s")
+
+    def close(self, report=True):
+        self.flush()
+        self.conn.close()
+        if report:
+            self.report()
@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""
+Tajweed Regression & Throughput Harness
+
+Runs each Tajweed engine against the golden corpus in
+scripts/fixtures/tajweed_golden.json and reports:
+  - per-rule accuracy with a diff for every changed word
+  - throughput (words/sec) for each engine
+
+Corpus words are verbatim from data_archive/quran_data/quran-simple.json and
+every `expected` value must carry its labelled rule; both are checked before
+anything runs. The goldens are the colors the app ships today, so any engine
+change (or a faster replacement engine) that alters a word's tokens shows up
+here before it reaches the app. Entries with `known_issue` hold the correct
+output for a rule the engine misses today: they count against per-rule
+accuracy but not the exit status, and are reported once they start passing.
+
+Engines:
+  uthmani  -> process_tajweed.tokenize_word(text)
+  indopak  -> process_tajweed_indopak.tokenize(text)
+  convert  -> convert_tajweed.process_word(text_tajweed, text_indopak)
+
+Usage:
+  python scripts/tajweed_regression.py
+  python scripts/tajweed_regression.py --engine indopak --rounds 500
+  python scripts/tajweed_regression.py --candidate indopak=fast_tajweed:tokenize
+  python scripts/tajweed_regression.py --update      # re-record goldens (review the git diff!)
+"""
+
+import argparse
+import importlib
+import json
+import re
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+import convert_tajweed
+import process_tajweed
+import process_tajweed_indopak
+
+CORPUS_PATH = Path(__file__).parent / 'fixtures' / 'tajweed_golden.json'
+SOURCE_PATH = Path(__file__).parent.parent / 'data_archive' / 'quran_data' / 'quran-simple.json'
+
+RULES = ['ghunna', 'ikhfaa', 'iqlab', 'idgham', 'qalqala', 'madd', 'lafzatullah', 'izhar']
+
+# Token rules (or <rule class=...> names for convert) that count as each labelled rule
+RULE_TAGS = {
+    'uthmani': {
+        'lafzatullah': {process_tajweed.RULE_LAFZATULLAH},
+        'izhar': {process_tajweed.RULE_IZHAR},
+        'ikhfaa': {process_tajweed.RULE_IKHFAA},
+        'idgham': {process_tajweed.RULE_IDGHAM_WITH_GHUNNA, process_tajweed.RULE_IDGHAM_WITHOUT_GHUNNA},
+        'iqlab': {process_tajweed.RULE_IQLAB},
+        'qalqala': {process_tajweed.RULE_QALQALA},
+        'ghunna': {process_tajweed.RULE_GHUNNA},
+        'madd': {process_tajweed.RULE_PROLONGING},
+    },
+    'indopak': {
+        'ghunna': {process_tajweed_indopak.GHUNNA},
+        'qalqala': {process_tajweed_indopak.QALQALA},
+        'ikhfaa': {process_tajweed_indopak.IKHFAA},
+        'idgham': {process_tajweed_indopak.IDGHAM_G, process_tajweed_indopak.IDGHAM_NG},
+        'iqlab': {process_tajweed_indopak.IQLAB},
+    },
+    'convert': {
+        'ghunna': {'ghunnah'},
+        'ikhfaa': {'ikhafa', 'ikhafa_shafawi'},
+        'iqlab': {'iqlab'},
+        'idgham': {'idgham_ghunnah', 'idgham_wo_ghunnah', 'idgham_shafawi',
+                   'idgham_mutajanisayn', 'idgham_mutaqaribayn'},
+        'qalqala': {'qalaqah'},
+        'madd': {'madda_normal', 'madda_permissible', 'madda_necessary', 'madda_obligatory'},
+    },
+}
+
+RULE_TAG_RE = re.compile(r'<rule class=(\w+)>')
+
+
+def _uthmani(entry, fn=process_tajweed.tokenize_word):
+    return fn(entry['text'])
+
+
+def _indopak(entry, fn=process_tajweed_indopak.tokenize):
+    return fn(entry['text'])
+
+
+def _convert(entry, fn=convert_tajweed.process_word):
+    return fn(entry['text_tajweed'], entry['text_indopak'])
+
+
+ENGINES = {
+    'uthmani': _uthmani,
+    'indopak': _indopak,
+    'convert': _convert,
+}
+
+
+def normalize(result):
+    """Tokens come back as tuples; goldens are stored as JSON lists."""
+    return json.loads(json.dumps(result, ensure_ascii=False))
+
+
+def carries_rule(engine, rule, expected):
+    """True when the expected output tags at least one span with the labelled rule."""
+    if isinstance(expected, str):
+        found = set(RULE_TAG_RE.findall(expected))
+    else:
+        found = {token_rule for _, token_rule in expected}
+    return bool(found & RULE_TAGS[engine].get(rule, set()))
+
+
+def load_source_words(path=SOURCE_PATH):
+    """{'surah:ayah:word': text} from the Quran text the corpus is taken from."""
+    with open(path, 'r', encoding='utf-8') as f:
+        surahs = json.load(f)
+    return {f"{surah['id']}:{verse['id']}:{i}": word
+            for surah in surahs for verse in surah['verses']
+            for i, word in enumerate(verse['text'].split(), 1)}
+
+
+def source_text(words, ref):
+    """Text of 'surah:ayah:word' or 'surah:ayah:first-last' (words joined by a space)."""
+    surah, ayah, span = ref.split(':')
+    first, _, last = span.partition('-')
+    return ' '.join(words[f"{surah}:{ayah}:{i}"] for i in range(int(first), int(last or first) + 1))
+
+
+def check_corpus(corpus):
+    """
+    Problems with the corpus itself: words that are not the source text at
+    their ref, token lists that do not spell the word, and expected values
+    missing their labelled rule.
+    """
+    words = load_source_words() if SOURCE_PATH.exists() else None
+    problems = []
+    for engine, entries in corpus['engines'].items():
+        for entry in entries:
+            where = f"{engine} [{entry['rule']}] {entry.get('ref', '')}"
+            expected = entry['expected']
+            if not carries_rule(engine, entry['rule'], expected):
+                problems.append(f"{where}: expected output has no {entry['rule']} tag")
+
+            if engine == 'convert':
+                spelled = RULE_TAG_RE.sub('', expected).replace('</rule>', '')
+                if spelled != entry['text_indopak']:
+                    problems.append(f"{where}: expected output does not spell text_indopak")
+                texts = [entry['text_indopak'], RULE_TAG_RE.sub('', entry['text_tajweed']).replace('</rule>', '')]
+            else:
+                if ''.join(text for text, _ in expected) != entry['text']:
+                    problems.append(f"{where}: expected tokens do not spell the word")
+                texts = [entry['text']]
+
+            if words is not None:
+                try:
+                    source = source_text(words, entry['ref'])
+                except (KeyError, ValueError):
+                    problems.append(f"{where}: ref not in {SOURCE_PATH.name}")
+                    continue
+                # Engines fed Quran.com text see U+0652 where the source has U+06E1
+                if not all(text in (source, source.replace('\u06e1', '\u0652')) for text in texts):
+                    problems.append(f"{where}: text differs from {SOURCE_PATH.name}")
+    return problems
+
+
+def load_candidate(spec):
+    """Parse 'engine=module:function' into (engine, runner)."""
+    engine, _, target = spec.partition('=')
+    module_name, _, func_name = target.partition(':')
+    if engine not in ENGINES or not module_name or not func_name:
+        raise SystemExit(f"Invalid --candidate '{spec}', expected <engine>=<module>:<function>")
+    fn = getattr(importlib.import_module(module_name), func_name)
+    runner = ENGINES[engine]
+    return engine, lambda entry: runner(entry, fn)
+
+
+def check_accuracy(name, runner, entries):
+    """
+    Compare engine output with goldens. Returns the failing entries; misses
+    on known_issue entries are listed but not returned.
+    """
+    per_rule = defaultdict(lambda: [0, 0, 0])
+    failures = []
+    known = []
+    fixed = []
+
+    for entry in entries:
+        actual = normalize(runner(entry))
+        stats = per_rule[entry['rule']]
+        stats[1] += 1
+        if actual == entry['expected']:
+            stats[0] += 1
+            if entry.get('known_issue'):
+                fixed.append(entry)
+        elif entry.get('known_issue'):
+            stats[2] += 1
+            known.append((entry, actual))
+        else:
+            failures.append((entry, actual))
+
+    print(f"\n=== {name} ===")
+    for rule in RULES + sorted(set(per_rule) - set(RULES)):
+        if rule in per_rule:
+            ok, total, missed = per_rule[rule]
+            note = f"  ({missed} known issue{'s' if missed != 1 else ''})" if missed else ""
+            print(f"  {rule:<12} {ok}/{total}{note}")
+
+    for label, items in (("DIFF", failures), ("KNOWN", known)):
+        for entry, actual in items:
+            print(f"  {label} [{entry['rule']}] {entry.get('ref', '')}")
+            if label == "KNOWN":
+                print(f"    issue:    {entry['known_issue']}")
+            print(f"    expected: {json.dumps(entry['expected'], ensure_ascii=False)}")
+            print(f"    actual:   {json.dumps(actual, ensure_ascii=False)}")
+    for entry in fixed:
+        print(f"  FIXED [{entry['rule']}] {entry.get('ref', '')}: now matches, drop its known_issue")
+
+    return failures
+
+
+def measure_throughput(runner, entries, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for entry in entries:
+            runner(entry)
+    elapsed = time.perf_counter() - start
+    words = rounds * len(entries)
+    return words / elapsed if elapsed else float('inf'), elapsed
+
+
+def update_goldens(corpus):
+    """
+    Re-record expected outputs. known_issue entries keep their hand-written
+    output, and an output that lost its labelled rule is not recorded.
+    """
+    rejected = []
+    for name, entries in corpus['engines'].items():
+        runner = ENGINES[name]
+        for entry in entries:
+            if entry.get('known_issue'):
+                continue
+            actual = normalize(runner(entry))
+            if carries_rule(name, entry['rule'], actual):
+                entry['expected'] = actual
+            else:
+                rejected.append(f"{name} [{entry['rule']}] {entry.get('ref', '')}")
+    with open(CORPUS_PATH, 'w', encoding='utf-8') as f:
+        json.dump(corpus, f, ensure_ascii=False, indent=2)
+        f.write('\n')
+    print(f"Re-recorded goldens in {CORPUS_PATH}")
+    for where in rejected:
+        print(f"  KEPT {where}: new output has no {where.split('[')[1].split(']')[0]} tag")
+    return 1 if rejected else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tajweed regression and throughput harness")
+    parser.add_argument('--engine', choices=sorted(ENGINES), action='append',
+                        help="Engine(s) to run (default: all)")
+    parser.add_argument('--rounds', type=int, default=200,
+                        help="Passes over the corpus for the throughput measurement")
+    parser.add_argument('--candidate', action='append', default=[],
+                        help="Alternative engine to check, e.g. indopak=fast_tajweed:tokenize")
+    parser.add_argument('--update', action='store_true',
+                        help="Re-record expected outputs from the current engines")
+    args = parser.parse_args()
+
+    with open(CORPUS_PATH, 'r', encoding='utf-8') as f:
+        corpus = json.load(f)
+
+    if args.update:
+        return update_goldens(corpus)
+
+    problems = check_corpus(corpus)
+    if problems:
+        print(f"Invalid golden corpus {CORPUS_PATH}:")
+        for problem in problems:
+            print(f"  {problem}")
+        return 2
+
+    runs = [(name, ENGINES[name], name) for name in (args.engine or sorted(ENGINES))]
+    for spec in args.candidate:
+        engine, runner = load_candidate(spec)
+        runs.append((f"{engine} (candidate {spec.partition('=')[2]})", runner, engine))
+
+    total_failures = 0
+    throughput = []
+    for label, runner, engine in runs:
+        entries = corpus['engines'][engine]
+        total_failures += len(check_accuracy(label, runner, entries))
+        throughput.append((label, len(entries), *measure_throughput(runner, entries, args.rounds)))
+
+    print(f"\n=== Throughput ({args.rounds} rounds) ===")
+    for label, count, rate, elapsed in throughput:
+        print(f"  {label:<40} {count:>4} words  {rate:>12,.0f} words/sec  ({elapsed:.2f}s)")
+
+    if total_failures:
+        print(f"\nFAILED: {total_failures} word(s) differ from the golden corpus")
+        return 1
+    print("\nAll engines match the golden corpus")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Dictionary-compressed text columns for oasismm.db.
+
+Hadith texts, tafseer HTML and sunnah items are the bulk of the database.
+In compressed builds each large text value is stored as a zstd frame (BLOB)
+compressed against a dictionary trained per (table, column, language). The
+dictionaries live in the `text_dictionaries` table; every frame carries its
+dictionary id in the frame header, so decoding needs nothing but the blob.
+
+Values shorter than MIN_COMPRESS_BYTES, and anything that would not get
+smaller, stay plain TEXT - readers must accept both (decode_text does).
+
+Usage:
+  python scripts/create_oasismm_db.py --compress          # build with compression
+  python scripts/text_codec.py bench assets/oasismm.db    # size / decode latency
+  python scripts/text_codec.py decode assets/oasismm.db hadiths text_english 42
+"""
+
+import sqlite3
+import sys
+import time
+from collections import defaultdict
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+# table -> (text columns, language column or None)
+COMPRESSED_COLUMNS = {
+    'hadiths': (('text_arabic', 'text_english', 'text_myanmar'), None),
+    'tafseer': (('text',), 'language'),
+    'sunnah_items': (('text', 'arabic_text', 'urdu_translation'), None),
+}
+
+# FTS5 external-content indexes over the compressed tables. They are filled
+# from the plain text before compression; MATCH returns rowids to decode.
+FTS_TABLES = {
+    'hadiths': 'hadiths_fts',
+    'tafseer': 'tafseer_fts',
+    'sunnah_items': 'sunnah_items_fts',
+}
+
+DICT_SIZE = 112 * 1024
+MIN_COMPRESS_BYTES = 64
+MIN_TRAINING_SAMPLES = 32
+LEVEL = 19
+
+DICTIONARY_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS text_dictionaries (
+        dict_id INTEGER PRIMARY KEY,
+        table_name TEXT NOT NULL,
+        column_name TEXT NOT NULL,
+        language TEXT,
+        data BLOB NOT NULL
+    );
+"""
+
+
+def _require_zstd():
+    if not ZSTD_AVAILABLE:
+        raise RuntimeError("zstandard is not installed: pip install zstandard")
+
+
+def create_fts_tables(conn: sqlite3.Connection):
+    """Create and fill the external-content FTS tables from the plain text."""
+    for table, fts in FTS_TABLES.items():
+        columns, _ = COMPRESSED_COLUMNS[table]
+        conn.execute(f"DROP TABLE IF EXISTS {fts}")
+        conn.execute(f"""
+            CREATE VIRTUAL TABLE {fts} USING fts5(
+                {', '.join(columns)},
+                content='{table}',
+                content_rowid='id'
+            )
+        """)
+        # 'rebuild' would read the content table, which is about to hold
+        # blobs, so the rows are fed explicitly while they are still text
+        conn.execute(f"""
+            INSERT INTO {fts} (rowid, {', '.join(columns)})
+            SELECT id, {', '.join(columns)} FROM {table}
+        """)
+    conn.commit()
+
+
+def _training_groups(conn, table, column, language_column):
+    """Yield (language, [(id, text), ...]) for one column."""
+    if language_column:
+        query = f"SELECT {language_column}, id, {column} FROM {table} WHERE typeof({column}) = 'text'"
+    else:
+        query = f"SELECT NULL, id, {column} FROM {table} WHERE typeof({column}) = 'text'"
+
+    groups = defaultdict(list)
+    for language, row_id, text in conn.execute(query):
+        if len(text.encode('utf-8')) >= MIN_COMPRESS_BYTES:
+            groups[language].append((row_id, text))
+    return groups.items()
+
+
+def _train(samples):
+    """Train a dictionary; None when there is too little data to be worth it."""
+    if len(samples) < MIN_TRAINING_SAMPLES:
+        return None
+    try:
+        return zstandard.train_dictionary(DICT_SIZE, samples, level=LEVEL)
+    except zstandard.ZstdError:
+        return None
+
+
+def compress_text_columns(conn: sqlite3.Connection, log=print):
+    """
+    Replace large text values in COMPRESSED_COLUMNS with dictionary-compressed
+    zstd blobs. Returns {(table, column, language): (rows, raw_bytes, stored_bytes)}.
+    """
+    _require_zstd()
+    conn.executescript(DICTIONARY_SCHEMA)
+    report = {}
+
+    for table, (columns, language_column) in COMPRESSED_COLUMNS.items():
+        for column in columns:
+            for language, rows in _training_groups(conn, table, column, language_column):
+                samples = [text.encode('utf-8') for _, text in rows]
+                dictionary = _train(samples)
+                if dictionary is not None:
+                    conn.execute("""
+                        INSERT INTO text_dictionaries (dict_id, table_name, column_name, language, data)
+                        VALUES (?, ?, ?, ?, ?)
+                    """, (dictionary.dict_id(), table, column, language, dictionary.as_bytes()))
+                    compressor = zstandard.ZstdCompressor(level=LEVEL, dict_data=dictionary)
+                else:
+                    compressor = zstandard.ZstdCompressor(level=LEVEL)
+
+                updates = []
+                raw = stored = 0
+                for (row_id, _), data in zip(rows, samples):
+                    blob = compressor.compress(data)
+                    raw += len(data)
+                    if len(blob) < len(data):
+                        updates.append((blob, row_id))
+                        stored += len(blob)
+                    else:
+                        stored += len(data)
+
+                conn.executemany(f"UPDATE {table} SET {column} = ? WHERE id = ?", updates)
+                report[(table, column, language)] = (len(rows), raw, stored)
+                label = f"{table}.{column}" + (f" [{language}]" if language else "")
+                log(f"  {label:<36} {len(rows):>7} rows  {raw / 1048576:7.2f} MB -> "
+                    f"{stored / 1048576:7.2f} MB" + ("" if dictionary else "  (no dictionary)"))
+
+    conn.commit()
+    return report
+
+
+class TextDecoder:
+    """
+    Decode values from compressed columns. One instance per connection;
+    decompressors are built lazily, once per dictionary.
+    """
+
+    def __init__(self, conn: sqlite3.Connection):
+        _require_zstd()
+        self._conn = conn
+        self._decompressors = {}
+
+    def _decompressor(self, dict_id):
+        decompressor = self._decompressors.get(dict_id)
+        if decompressor is None:
+            if dict_id:
+                row = self._conn.execute(
+                    "SELECT data FROM text_dictionaries WHERE dict_id = ?", (dict_id,)).fetchone()
+                if row is None:
+                    raise KeyError(f"Unknown text dictionary {dict_id}")
+                dictionary = zstandard.ZstdCompressionDict(row[0])
+                decompressor = zstandard.ZstdDecompressor(dict_data=dictionary)
+            else:
+                decompressor = zstandard.ZstdDecompressor()
+            self._decompressors[dict_id] = decompressor
+        return decompressor
+
+    def decode(self, value):
+        """Plain text passes through; zstd blobs are decompressed to str."""
+        if not isinstance(value, (bytes, memoryview)):
+            return value
+        dict_id = zstandard.get_frame_parameters(value).dict_id
+        return self._decompressor(dict_id).decompress(value).decode('utf-8')
+
+
+def decode_text(conn: sqlite3.Connection, value):
+    """One-off convenience wrapper; keep a TextDecoder around for bulk reads."""
+    return TextDecoder(conn).decode(value)
+
+
+def benchmark(db_path, sample_rows=2000):
+    """Print stored size per compressed column and per-row decode latency."""
+    conn = sqlite3.connect(db_path)
+    decoder = TextDecoder(conn)
+
+    print(f"{'column':<32} {'rows':>7} {'blobs':>7} {'stored MB':>10} {'plain MB':>10} "
+          f"{'ratio':>6} {'decode us/row':>14}")
+    for table, (columns, _) in COMPRESSED_COLUMNS.items():
+        for column in columns:
+            try:
+                values = [r[0] for r in conn.execute(
+                    f"SELECT {column} FROM {table} WHERE {column} IS NOT NULL")]
+            except sqlite3.OperationalError:
+                continue
+            if not values:
+                continue
+
+            blobs = [v for v in values if isinstance(v, bytes)]
+            stored = sum(len(v) if isinstance(v, bytes) else len(v.encode('utf-8')) for v in values)
+            plain = sum(len(decoder.decode(v).encode('utf-8')) for v in values)
+
+            timed = blobs[:sample_rows]
+            latency = 0.0
+            if timed:
+                start = time.perf_counter()
+                for blob in timed:
+                    decoder.decode(blob)
+                latency = (time.perf_counter() - start) / len(timed) * 1e6
+
+            print(f"{table + '.' + column:<32} {len(values):>7} {len(blobs):>7} "
+                  f"{stored / 1048576:>10.2f} {plain / 1048576:>10.2f} "
+                  f"{plain / stored if stored else 0:>6.2f} {latency:>14.1f}")
+
+    dict_bytes = conn.execute("SELECT COALESCE(SUM(LENGTH(data)), 0) FROM text_dictionaries").fetchone()[0]
+    print(f"\nDictionaries: {dict_bytes / 1024:.0f} KB")
+    conn.close()
+
+
+def main():
+    args = sys.argv[1:]
+    if len(args) >= 2 and args[0] == 'bench':
+        benchmark(args[1])
+    elif len(args) == 5 and args[0] == 'decode':
+        _, db_path, table, column, row_id = args
+        conn = sqlite3.connect(db_path)
+        value = conn.execute(f"SELECT {column} FROM {table} WHERE id = ?", (int(row_id),)).fetchone()
+        print(TextDecoder(conn).decode(value[0]) if value else f"No row {row_id} in {table}")
+        conn.close()
+    else:
+        print(__doc__)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())